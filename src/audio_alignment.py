@@ -3,21 +3,27 @@
 from __future__ import annotations
 
 import datetime as _dt
+import functools
+import hashlib
+import io
 import json
 import logging
 import math
 import os
 import subprocess
 import tempfile
+import threading
 import tomllib
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from shutil import which
 from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, cast
 
 from src.frame_compare import subproc as _subproc
+from src.frame_compare.artifact_index import open_artifact_index, stat_token
 
 logger = logging.getLogger(__name__)
 FpsHint = float | tuple[int, int]
@@ -67,6 +73,27 @@ class AudioAlignmentError(RuntimeError):
     """Raised when audio alignment cannot be completed."""
 
 
+@dataclass
+class OffsetSegment:
+    """
+    Span of the reference track over which one offset model holds.
+
+    ``offset_seconds`` is the offset at ``start_seconds``; ``drift`` is the change in
+    offset per second of reference time (``0.0`` for ``model == "constant"``).
+    """
+
+    start_seconds: float
+    end_seconds: float
+    offset_seconds: float
+    drift: float = 0.0
+    windows: int = 0
+    model: str = "constant"
+
+    def offset_at(self, seconds: float) -> float:
+        """Return the modelled offset at reference time *seconds*."""
+        return self.offset_seconds + self.drift * (seconds - self.start_seconds)
+
+
 @dataclass
 class AlignmentMeasurement:
     """Measurement details for a clip relative to the chosen reference."""
@@ -78,12 +105,22 @@ class AlignmentMeasurement:
     reference_fps: Optional[float]
     target_fps: Optional[float]
     error: Optional[str] = None
+    offset_map: Optional[List[OffsetSegment]] = None
 
     @property
     def key(self) -> str:
         """Return the file stem used when indexing alignment results."""
         return self.file.name
 
+    @property
+    def drift_model(self) -> Optional[str]:
+        """Summarise :attr:`offset_map` as ``constant``, ``linear``, or ``piecewise``."""
+        if not self.offset_map:
+            return None
+        if len(self.offset_map) > 1:
+            return "piecewise"
+        return self.offset_map[0].model
+
 
 @dataclass
 class AudioStreamInfo:
@@ -110,32 +147,136 @@ def ensure_external_tools() -> None:
         )
 
 
-_OPTIONAL_MODULES: Optional[Tuple[Any, Any, Any]] = None
+@dataclass
+class MediaProbe:
+    """Audio streams, nominal video frame rate, and container duration read by one ffprobe call."""
+
+    audio_streams: List[AudioStreamInfo]
+    fps: Optional[float] = None
+    duration: Optional[float] = None
+
+
+_MEDIA_PROBES: Dict[Tuple[str, str], MediaProbe] = {}
+_MEDIA_PROBES_LOCK = threading.Lock()
+
 
+def _media_probe_key(path: Path) -> Optional[Tuple[str, str]]:
+    token = stat_token(path)
+    if token is None:
+        return None
+    return os.path.realpath(path), token
+
+
+def cached_media_probe(path: Path) -> Optional[MediaProbe]:
+    """Return the in-process probe for *path* when the file is unchanged since probing."""
+
+    key = _media_probe_key(path)
+    if key is None:
+        return None
+    with _MEDIA_PROBES_LOCK:
+        return _MEDIA_PROBES.get(key)
 
-def _load_optional_modules() -> Tuple[Any, Any, Any]:
-    global _OPTIONAL_MODULES
-    if _OPTIONAL_MODULES is not None:
-        return _OPTIONAL_MODULES
 
+def remember_media_probe(path: Path, probe: MediaProbe) -> None:
+    """Seed the in-process probe cache, e.g. from a persisted probe snapshot."""
+
+    key = _media_probe_key(path)
+    if key is None:
+        return
+    with _MEDIA_PROBES_LOCK:
+        _MEDIA_PROBES[key] = probe
+
+
+def media_probe_payload(probe: MediaProbe) -> Dict[str, Any]:
+    """Return a JSON-serialisable form of *probe* for the probe snapshot cache."""
+
+    return {
+        "fps": probe.fps,
+        "duration": probe.duration,
+        "audio_streams": [asdict(info) for info in probe.audio_streams],
+    }
+
+
+def media_probe_from_payload(payload: Mapping[str, Any]) -> Optional[MediaProbe]:
+    """
+    Rebuild a :class:`MediaProbe` from :func:`media_probe_payload`.
+
+    Returns ``None`` if *payload* is malformed or predates the recorded duration.
+    """
+
+    if "duration" not in payload:
+        return None
     try:
-        with _suppress_flush_to_zero_warning():
-            import librosa  # type: ignore
-            import numpy as np  # type: ignore
-            import soundfile as sf  # type: ignore
-    except Exception as exc:  # pragma: no cover - optional dependency
-        message = (
-            "Audio alignment requires optional dependencies: numpy, librosa, soundfile."
-            if isinstance(exc, ModuleNotFoundError)
-            else f"Audio alignment failed to load optional dependencies: {exc}"
+        fps_value = payload.get("fps")
+        duration_value = payload.get("duration")
+        streams = [AudioStreamInfo(**dict(entry)) for entry in payload.get("audio_streams") or []]
+        return MediaProbe(
+            audio_streams=streams,
+            fps=float(fps_value) if fps_value is not None else None,
+            duration=float(duration_value) if duration_value is not None else None,
         )
-        raise AudioAlignmentError(message) from exc
-    _OPTIONAL_MODULES = (np, librosa, sf)
-    return _OPTIONAL_MODULES
+    except (TypeError, ValueError):
+        return None
 
 
-def probe_audio_streams(path: Path) -> List[AudioStreamInfo]:
-    """Return metadata for all audio streams in *path*."""
+def _parse_frame_rate(value: object) -> Optional[float]:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    if "/" in text:
+        num_str, den_str = text.split("/", 1)
+        try:
+            num = float(num_str)
+            den = float(den_str)
+            if den == 0:
+                return None
+            return num / den
+        except ValueError:
+            return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _parse_audio_stream(entry_dict: dict[str, object]) -> Optional[AudioStreamInfo]:
+    index = _to_int(entry_dict.get("index"), default=-1)
+    if index < 0:
+        return None
+    tags = _as_str_dict(entry_dict.get("tags"))
+    disposition = _as_str_dict(entry_dict.get("disposition"))
+    language = str(tags.get("language") or "").strip()
+    codec_name = str(entry_dict.get("codec_name") or "").strip()
+    channels = _to_int(entry_dict.get("channels"))
+    channel_layout = str(entry_dict.get("channel_layout") or "").strip()
+    sample_rate = _to_int(entry_dict.get("sample_rate"))
+    bitrate = _to_int(entry_dict.get("bit_rate"))
+    is_default = bool(_to_int(disposition.get("default")))
+    is_forced = bool(_to_int(disposition.get("forced")))
+    return AudioStreamInfo(
+        index=index,
+        language=language.lower(),
+        codec_name=codec_name.lower(),
+        channels=channels,
+        channel_layout=channel_layout.lower(),
+        sample_rate=sample_rate,
+        bitrate=bitrate,
+        is_default=is_default,
+        is_forced=is_forced,
+    )
+
+
+def probe_media(path: Path) -> MediaProbe:
+    """
+    Return audio stream metadata, video FPS, and duration for *path* from a single ffprobe run.
+
+    Results are memoised per process keyed by the file's path and ``size:mtime``
+    token, so stream selection and FPS lookups for the same file share one probe.
+    """
+
+    cached = cached_media_probe(path)
+    if cached is not None:
+        return cached
 
     if which("ffprobe") is None:
         raise AudioAlignmentError("ffprobe not found in PATH")
@@ -144,10 +285,9 @@ def probe_audio_streams(path: Path) -> List[AudioStreamInfo]:
         "ffprobe",
         "-v",
         "error",
-        "-select_streams",
-        "a",
         "-show_entries",
-        "stream=index,codec_name,channels,channel_layout,sample_rate,bit_rate,disposition:stream_tags=language",
+        "stream=index,codec_type,codec_name,channels,channel_layout,sample_rate,bit_rate,r_frame_rate,"
+        "disposition:stream_tags=language:format=duration",
         "-of",
         "json",
         str(path),
@@ -169,45 +309,46 @@ def probe_audio_streams(path: Path) -> List[AudioStreamInfo]:
     except json.JSONDecodeError as exc:
         raise AudioAlignmentError(f"Unable to parse ffprobe output for {path.name}") from exc
 
-    if not isinstance(payload, dict) or not all(isinstance(key, str) for key in payload):
-        return []
-    payload_dict: dict[str, object] = cast(dict[str, object], payload)
-    streams_data = payload_dict.get("streams", [])
-    if not isinstance(streams_data, list):
-        return []
     streams: List[AudioStreamInfo] = []
-    for entry in streams_data or []:
+    fps: Optional[float] = None
+    streams_data: object = []
+    duration: Optional[float] = None
+    if isinstance(payload, dict) and all(isinstance(key, str) for key in payload):
+        payload_dict = cast(dict[str, object], payload)
+        streams_data = payload_dict.get("streams", [])
+        try:
+            duration = float(str(_as_str_dict(payload_dict.get("format")).get("duration")))
+        except ValueError:
+            duration = None
+    for entry in streams_data if isinstance(streams_data, list) else []:
         if not isinstance(entry, dict) or not all(isinstance(key, str) for key in entry):
             continue
         entry_dict: dict[str, object] = cast(dict[str, object], entry)
-        index = _to_int(entry_dict.get("index"), default=-1)
-        if index < 0:
+        codec_type = str(entry_dict.get("codec_type") or "").lower()
+        if codec_type == "video":
+            disposition = _as_str_dict(entry_dict.get("disposition"))
+            if fps is None and not _to_int(disposition.get("attached_pic")):
+                fps = _parse_frame_rate(entry_dict.get("r_frame_rate"))
             continue
-        tags = _as_str_dict(entry_dict.get("tags"))
-        disposition = _as_str_dict(entry_dict.get("disposition"))
-        language = str(tags.get("language") or "").strip()
-        codec_name = str(entry_dict.get("codec_name") or "").strip()
-        channels = _to_int(entry_dict.get("channels"))
-        channel_layout = str(entry_dict.get("channel_layout") or "").strip()
-        sample_rate = _to_int(entry_dict.get("sample_rate"))
-        bitrate = _to_int(entry_dict.get("bit_rate"))
-        is_default = bool(_to_int(disposition.get("default")))
-        is_forced = bool(_to_int(disposition.get("forced")))
-        streams.append(
-            AudioStreamInfo(
-                index=index,
-                language=language.lower(),
-                codec_name=codec_name.lower(),
-                channels=channels,
-                channel_layout=channel_layout.lower(),
-                sample_rate=sample_rate,
-                bitrate=bitrate,
-                is_default=is_default,
-                is_forced=is_forced,
-            )
-        )
+        if codec_type != "audio":
+            continue
+        info = _parse_audio_stream(entry_dict)
+        if info is not None:
+            streams.append(info)
     streams.sort(key=lambda info: info.index)
-    return streams
+    probe = MediaProbe(audio_streams=streams, fps=fps, duration=duration if duration and duration > 0 else None)
+    remember_media_probe(path, probe)
+    return probe
+
+
+def probe_audio_streams(path: Path) -> List[AudioStreamInfo]:
+    """Return metadata for all audio streams in *path*."""
+
+    return list(probe_media(path).audio_streams)
+
+
+_PCM_SAMPLE_BYTES = 4
+_PCM_DEFAULT_CAPACITY_SECONDS = 120.0
 
 
 def _extract_audio(
@@ -217,11 +358,17 @@ def _extract_audio(
     start_seconds: Optional[float],
     duration_seconds: Optional[float],
     stream_index: int,
-) -> Path:
-    handle = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-    path = Path(handle.name)
-    handle.close()
-    cmd: List[str] = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+) -> Any:
+    """
+    Decode one audio stream to mono float32 PCM at *sample_rate*.
+
+    ffmpeg writes raw ``f32le`` samples to stdout, which are read straight into a
+    preallocated NumPy buffer (sized from *duration_seconds* and grown geometrically
+    when the window is open-ended), so no temporary WAV touches disk.
+    """
+
+    np = _load_numpy()
+    cmd: List[str] = ["ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error"]
     if start_seconds is not None:
         cmd += ["-ss", f"{start_seconds}"]
     cmd += ["-i", str(infile)]
@@ -235,147 +382,625 @@ def _extract_audio(
         "-ar",
         str(sample_rate),
         "-vn",
-        "-y",
-        str(path),
+        "-f",
+        "f32le",
+        "-acodec",
+        "pcm_f32le",
+        "pipe:1",
     ]
-    completed: subprocess.CompletedProcess[str] | None = None
+
+    expected_seconds = duration_seconds if duration_seconds is not None else _PCM_DEFAULT_CAPACITY_SECONDS
+    # One spare second absorbs resampler rounding so bounded windows never regrow.
+    capacity = max(1, int(math.ceil((expected_seconds + 1.0) * sample_rate)))
+    buffer = np.empty(capacity, dtype=np.float32)
+    filled = 0
+    with tempfile.TemporaryFile() as stderr_sink:
+        try:
+            process = _subproc.open_process(cmd, stdout=subprocess.PIPE, stderr=stderr_sink)
+        except OSError as exc:
+            raise AudioAlignmentError(f"ffmpeg could not be started for {infile.name}: {exc}") from exc
+        with process:
+            if process.stdout is None:  # pragma: no cover - stdout is always piped
+                raise AudioAlignmentError(f"ffmpeg produced no output pipe for {infile.name}")
+            stdout = cast(io.BufferedReader, process.stdout)
+            while True:
+                if filled == buffer.nbytes:
+                    grown = np.empty(buffer.size * 2, dtype=np.float32)
+                    grown[: buffer.size] = buffer
+                    buffer = grown
+                view = memoryview(buffer).cast("B")
+                read = stdout.readinto(view[filled:])
+                view.release()
+                if not read:
+                    break
+                filled += read
+            returncode = process.wait()
+        if returncode != 0:  # pragma: no cover - data dependent
+            stderr_sink.seek(0)
+            stderr = stderr_sink.read().decode("utf-8", "replace").strip()
+            detail = f": {stderr}" if stderr else ""
+            raise AudioAlignmentError(f"ffmpeg failed to extract audio from {infile.name}{detail}")
+
+    samples = buffer[: filled // _PCM_SAMPLE_BYTES]
+    if samples.size == 0:
+        raise AudioAlignmentError(f"No audio samples extracted from {infile.name}")
+    return samples
+
+
+def _load_numpy() -> Any:
+    """Import NumPy lazily so the module stays importable without the audio stack."""
+
     try:
-        completed = _subproc.run_checked(
-            cmd,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        with _suppress_flush_to_zero_warning():
+            import numpy as np  # type: ignore
+    except Exception as exc:  # pragma: no cover - optional dependency
+        message = (
+            "Audio alignment requires optional dependency: numpy."
+            if isinstance(exc, ModuleNotFoundError)
+            else f"Audio alignment failed to load optional dependencies: {exc}"
         )
-    except subprocess.CalledProcessError as exc:  # pragma: no cover - data dependent
-        stderr = exc.stderr.strip() if isinstance(exc.stderr, str) else ""
-        detail = f": {stderr}" if stderr else ""
-        raise AudioAlignmentError(
-            f"ffmpeg failed to extract audio from {infile.name}{detail}"
-        ) from exc
-    finally:
-        # Ensure ffmpeg output doesn't spam stdout when successful
-        if completed is not None and completed.stdout:
-            logger.debug("ffmpeg audio extract stdout: %s", completed.stdout.strip())
-    return path
+        raise AudioAlignmentError(message) from exc
+    return np
+
+
+# Spectral-flux parameters mirror ``librosa.onset.onset_strength`` defaults so
+# envelopes (and therefore correlation scores) match the librosa reference.
+_ONSET_N_FFT = 2048
+_ONSET_N_MELS = 128
+_ONSET_TOP_DB = 80.0
+_ONSET_AMIN = 1e-10
+_ONSET_LAG = 1
+_STFT_CHUNK_FRAMES = 512
+_COARSE_HOP_SECONDS = 0.05
+_COARSE_WINDOW_SECONDS = 0.128
+_REFINE_MARGIN_HOPS = 4
+
+
+def _hz_to_mel(np: Any, freqs: Any) -> Any:
+    """Slaney-style Hz→mel conversion (linear below 1 kHz, logarithmic above)."""
+
+    freqs = np.asanyarray(freqs, dtype=np.float64)
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = math.log(6.4) / 27.0
+    mels = freqs / f_sp
+    log_region = freqs >= min_log_hz
+    return np.where(
+        log_region,
+        min_log_mel + np.log(np.maximum(freqs, min_log_hz) / min_log_hz) / logstep,
+        mels,
+    )
 
 
-@contextmanager
-def _temporary_audio(
-    infile: Path,
+def _mel_to_hz(np: Any, mels: Any) -> Any:
+    """Inverse of :func:`_hz_to_mel`."""
+
+    mels = np.asanyarray(mels, dtype=np.float64)
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = math.log(6.4) / 27.0
+    freqs = f_sp * mels
+    return np.where(mels >= min_log_mel, min_log_hz * np.exp(logstep * (mels - min_log_mel)), freqs)
+
+
+@functools.lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> Any:
+    """Return a Slaney-normalised triangular mel filterbank shaped ``(n_mels, n_fft // 2 + 1)``."""
+
+    np = _load_numpy()
+    fft_freqs = np.fft.rfftfreq(n_fft, d=1.0 / sample_rate)
+    mel_edges = _mel_to_hz(np, np.linspace(0.0, float(_hz_to_mel(np, sample_rate / 2.0)), n_mels + 2))
+    widths = np.diff(mel_edges)
+    ramps = mel_edges[:, None] - fft_freqs[None, :]
+    lower = -ramps[:-2] / widths[:-1, None]
+    upper = ramps[2:] / widths[1:, None]
+    weights = np.maximum(0.0, np.minimum(lower, upper))
+    weights *= (2.0 / (mel_edges[2:] - mel_edges[:-2]))[:, None]
+    weights = weights.astype(np.float32)
+    weights.setflags(write=False)
+    return weights
+
+
+def _onset_mel_bands(n_fft: int) -> int:
+    """Scale the mel band count down with shorter FFTs so low-rate filters stay populated."""
+    if n_fft >= _ONSET_N_FFT:
+        return _ONSET_N_MELS
+    return max(32, _ONSET_N_MELS * n_fft // _ONSET_N_FFT)
+
+
+def _coarse_analysis(sample_rate: int) -> Tuple[int, int]:
+    """Return ``(hop_length, n_fft)`` for coarse-stage envelopes at *sample_rate*."""
+    hop_length = max(1, int(round(sample_rate * _COARSE_HOP_SECONDS)))
+    n_fft = max(256, 1 << int(round(math.log2(max(1.0, sample_rate * _COARSE_WINDOW_SECONDS)))))
+    return hop_length, n_fft
+
+
+def _onset_strength(
+    np: Any,
+    samples: Any,
     *,
     sample_rate: int,
-    start_seconds: Optional[float],
-    duration_seconds: Optional[float],
-    stream_index: int,
-) -> Iterator[Path]:
-    path = _extract_audio(
-        infile,
-        sample_rate=sample_rate,
-        start_seconds=start_seconds,
-        duration_seconds=duration_seconds,
-        stream_index=stream_index,
-    )
-    try:
-        yield path
-    finally:
-        try:
-            os.unlink(path)
-        except OSError:
-            pass
+    hop_length: int,
+    n_fft: int = _ONSET_N_FFT,
+) -> Any:
+    """
+    Spectral-flux onset envelope computed with NumPy only.
+
+    Centred Hann-window STFT frames are taken as strided views and transformed with
+    ``numpy.fft.rfft`` in fixed-size chunks, projected onto a mel filterbank, log
+    compressed (power→dB with an 80 dB floor), differenced along time, half-wave
+    rectified, and averaged over mel bands. Framing, padding, and the leading
+    zero padding follow ``librosa.onset.onset_strength(center=True)``, so the output
+    has ``1 + len(samples) // hop_length`` frames. Shorter *n_fft* values (coarse
+    search) use proportionally fewer mel bands.
+    """
+
+    n_mels = _onset_mel_bands(n_fft)
+    signal = np.asarray(samples, dtype=np.float32).reshape(-1)
+    padded = np.pad(signal, n_fft // 2, mode="constant")
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop_length]
+    n_frames = int(frames.shape[0])
+    window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+    filterbank = _mel_filterbank(sample_rate, n_fft, n_mels)
+
+    mel_power = np.empty((n_mels, n_frames), dtype=np.float32)
+    for start in range(0, n_frames, _STFT_CHUNK_FRAMES):
+        stop = min(start + _STFT_CHUNK_FRAMES, n_frames)
+        spectrum = np.fft.rfft(frames[start:stop] * window, n=n_fft, axis=1)
+        power = (spectrum.real**2 + spectrum.imag**2).astype(np.float32)
+        mel_power[:, start:stop] = filterbank @ power.T
+
+    log_power = 10.0 * np.log10(np.maximum(_ONSET_AMIN, mel_power))
+    log_power = np.maximum(log_power, log_power.max() - _ONSET_TOP_DB)
+
+    flux = np.maximum(0.0, log_power[:, _ONSET_LAG:] - log_power[:, :-_ONSET_LAG]).mean(axis=0)
+    lead = _ONSET_LAG + n_fft // (2 * hop_length)
+    envelope = np.zeros(n_frames, dtype=np.float32)
+    usable = max(0, min(flux.size, n_frames - lead))
+    envelope[lead : lead + usable] = flux[:usable]
+    return envelope
 
 
 def _onset_envelope(
-    wav_path: Path,
+    samples: Any,
     *,
     sample_rate: int,
     hop_length: int,
+    n_fft: int = _ONSET_N_FFT,
 ) -> Tuple[Any, int]:
-    np, librosa, sf = _load_optional_modules()
+    np = _load_numpy()
 
     try:
         with _suppress_flush_to_zero_warning():
-            data, native_sr = sf.read(str(wav_path))
+            data = np.asarray(samples, dtype=np.float32)
             if data.size == 0:
-                raise AudioAlignmentError(f"No audio samples extracted from {wav_path}")
-            if data.ndim > 1:
-                data = np.mean(data, axis=1)
-            if native_sr != sample_rate:
-                data = librosa.resample(data, orig_sr=native_sr, target_sr=sample_rate)
+                raise AudioAlignmentError("No audio samples available for onset envelope")
 
             peak = float(np.max(np.abs(data))) if data.size else 0.0
             if peak > 0:
                 data = data / peak
 
-            onset_env = librosa.onset.onset_strength(
-                y=data,
-                sr=sample_rate,
+            onset_env = _onset_strength(
+                np,
+                data,
+                sample_rate=sample_rate,
                 hop_length=hop_length,
-                center=True,
+                n_fft=n_fft,
             )
     except AudioAlignmentError:
         raise
-    except Exception as exc:  # pragma: no cover - optional dependency runtime
-        message = (
-            "Audio alignment failed during onset envelope calculation because an optional "
-            f"dependency raised an error: {exc}. Install numpy, librosa, and soundfile "
-            "(and their dependencies)."
-        )
+    except Exception as exc:
+        message = f"Audio alignment failed during onset envelope calculation: {exc}"
         raise AudioAlignmentError(message) from exc
     return onset_env.astype(np.float32), hop_length
 
 
-def _cross_correlation(a, b) -> Tuple[int, float]:
-    np, _, _ = _load_optional_modules()
-    a = np.asarray(a, dtype=np.float32)
-    b = np.asarray(b, dtype=np.float32)
-    if a.size == 0 or b.size == 0:
+def _next_fast_len(size: int) -> int:
+    """Return the smallest 5-smooth integer >= *size* (fast for ``numpy.fft``)."""
+
+    target = max(1, int(size))
+    best = 1 << (target - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            candidate = power35
+            while candidate < target:
+                candidate *= 2
+            if candidate < best:
+                best = candidate
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+class _ReferenceSpectrum:
+    """
+    Normalised reference envelope whose forward FFTs are reused across targets.
+
+    ``measure_offsets`` correlates every target against the same reference, so the
+    z-scored reference and its conjugate spectra (one per FFT size) are computed once.
+    """
+
+    __slots__ = ("np", "values", "_spectra")
+
+    def __init__(self, envelope: Any) -> None:
+        np = _load_numpy()
+        values = np.asarray(envelope, dtype=np.float32)
+        if values.size == 0:
+            raise AudioAlignmentError("Empty onset envelope encountered during correlation")
+        self.np = np
+        self.values = _zscore(np, values)
+        self._spectra: Dict[int, Any] = {}
+
+    @property
+    def size(self) -> int:
+        return int(self.values.size)
+
+    def conj_spectrum(self, nfft: int) -> Any:
+        spectrum = self._spectra.get(nfft)
+        if spectrum is None:
+            spectrum = self.np.conj(self.np.fft.rfft(self.values.astype(self.np.float64), n=nfft))
+            self._spectra[nfft] = spectrum
+        return spectrum
+
+
+def _zscore(np: Any, values: Any) -> Any:
+    return (values - np.mean(values)) / (np.std(values) + 1e-8)
+
+
+def _correlation_curve(a: Any, b: Any, *, max_lag: Optional[int]) -> Tuple[Any, Any, Any]:
+    """Return ``(np, lags, corr)`` for the bounded z-scored correlation of *b* against *a*."""
+
+    reference = a if isinstance(a, _ReferenceSpectrum) else _ReferenceSpectrum(a)
+    np = reference.np
+    target = np.asarray(b, dtype=np.float32)
+    if target.size == 0:
         raise AudioAlignmentError("Empty onset envelope encountered during correlation")
-    a = (a - np.mean(a)) / (np.std(a) + 1e-8)
-    b = (b - np.mean(b)) / (np.std(b) + 1e-8)
-    corr = np.correlate(b, a, mode="full")
-    idx = int(np.argmax(corr)) - (len(a) - 1)
-    return idx, float(np.max(corr))
+    target = _zscore(np, target)
+
+    ref_len = reference.size
+    target_len = int(target.size)
+    lowest = -(ref_len - 1)
+    highest = target_len - 1
+    if max_lag is not None:
+        bound = max(0, int(max_lag))
+        lowest = max(lowest, -bound)
+        highest = min(highest, bound)
+    # Lags within [lowest, highest] stay alias-free once the circular correlation
+    # length covers the longer envelope plus the widest searched lag.
+    span = max(ref_len, target_len) + max(-lowest, highest)
+    nfft = _next_fast_len(min(span, ref_len + target_len - 1))
+    spectrum = np.fft.rfft(target.astype(np.float64), n=nfft) * reference.conj_spectrum(nfft)
+    circular = np.fft.irfft(spectrum, n=nfft)
+    lags = np.arange(lowest, highest + 1)
+    return np, lags, circular[lags % nfft]
+
+
+def _cross_correlation(
+    a: Any,
+    b: Any,
+    *,
+    max_lag: Optional[int] = None,
+) -> Tuple[int, float]:
+    """
+    Return ``(lag, peak)`` for the z-scored cross-correlation of *b* against *a*.
+
+    The result matches ``np.correlate(b, a, mode="full")`` restricted to lags in
+    ``[-max_lag, max_lag]``: ``lag`` is the offset of the first maximum in increasing
+    lag order and ``peak`` is the raw (un-normalised by length) correlation sum, so
+    existing correlation thresholds keep their meaning. The correlation is computed
+    with an FFT sized for the bounded lag window rather than every possible lag.
+    *a* may be a prepared :class:`_ReferenceSpectrum` to reuse its spectrum.
+    """
+
+    np, lags, corr = _correlation_curve(a, b, max_lag=max_lag)
+    peak_index = int(np.argmax(corr))
+    return int(lags[peak_index]), float(corr[peak_index])
+
+
+def _parabolic_offset(np: Any, left: Any, mid: Any, right: Any) -> Any:
+    """Return the vertex offset (within ±0.5 samples) of the parabola through a peak and its neighbours."""
+
+    curvature = left - 2.0 * mid + right
+    safe = np.where(curvature < 0, curvature, -1.0)
+    return np.where(curvature < 0, np.clip(0.5 * (left - right) / safe, -0.5, 0.5), 0.0)
+
+
+def _refined_lag(
+    a: Any,
+    b: Any,
+    *,
+    max_lag: Optional[int] = None,
+) -> Tuple[float, float]:
+    """:func:`_cross_correlation` with the peak lag refined to a fraction of an onset frame."""
+
+    np, lags, corr = _correlation_curve(a, b, max_lag=max_lag)
+    peak_index = int(np.argmax(corr))
+    delta = 0.0
+    if 0 < peak_index < corr.size - 1:
+        delta = float(_parabolic_offset(np, corr[peak_index - 1], corr[peak_index], corr[peak_index + 1]))
+    return float(lags[peak_index]) + delta, float(corr[peak_index])
+
+
+def _active_window_start(np: Any, envelope: Any, frames: int) -> int:
+    """Return the start frame of the *frames*-long span with the most onset energy."""
+
+    values = np.asarray(envelope, dtype=np.float64)
+    width = max(1, min(int(frames), int(values.size)))
+    sums = np.concatenate([np.zeros(1), np.cumsum(values)])
+    return int(np.argmax(sums[width:] - sums[:-width]))
+
+
+_DRIFT_MIN_CONFIDENCE = 0.3
+_DRIFT_JUMP_TOLERANCE_SECONDS = 0.1
+_DRIFT_MAX_RATE = 0.002
+
+
+def _window_lags(np: Any, blocks: Any, segments: Any, *, radius: int) -> Tuple[Any, Any]:
+    """
+    Match each row of *blocks* against the same row of *segments* in one batch.
+
+    ``segments`` rows are ``2 * radius`` onsets longer than ``blocks`` rows, so lag
+    ``0`` aligns a block with the middle of its segment. Every row shares one FFT
+    size, so the forward transforms, spectrum products, and inverse transforms run
+    as single 2-D ``rfft``/``irfft`` calls instead of one correlate pass per window.
+    Returns ``(lags, scores)``: lags in ``[-radius, radius]`` with parabolic
+    sub-onset refinement, and the Pearson correlation of each peak.
+    """
+
+    blocks = blocks - blocks.mean(axis=1, keepdims=True)
+    width = int(blocks.shape[1])
+    span = int(segments.shape[1])
+    n_lags = 2 * radius + 1
+
+    nfft = _next_fast_len(span)
+    spectrum = np.fft.rfft(segments, n=nfft, axis=1) * np.conj(np.fft.rfft(blocks, n=nfft, axis=1))
+    covariance = np.fft.irfft(spectrum, n=nfft, axis=1)[:, :n_lags]
+
+    # Sliding sums give the target variance under each lag without another pass.
+    zeros = np.zeros((segments.shape[0], 1))
+    sums = np.concatenate([zeros, np.cumsum(segments, axis=1)], axis=1)
+    squares = np.concatenate([zeros, np.cumsum(segments * segments, axis=1)], axis=1)
+    local_sum = sums[:, width:width + n_lags] - sums[:, :n_lags]
+    local_sq = squares[:, width:width + n_lags] - squares[:, :n_lags]
+    target_var = np.maximum(local_sq - local_sum * local_sum / width, 0.0)
+    ref_var = np.sum(blocks * blocks, axis=1, keepdims=True)
+    denom = np.sqrt(target_var * ref_var)
+    scores = np.where(denom > 1e-9, covariance / np.maximum(denom, 1e-9), 0.0)
+
+    rows = np.arange(scores.shape[0])
+    peaks = np.argmax(scores, axis=1)
+    inner = np.clip(peaks, 1, n_lags - 2) if n_lags >= 3 else peaks
+    left = scores[rows, np.maximum(inner - 1, 0)]
+    mid = scores[rows, inner]
+    right = scores[rows, np.minimum(inner + 1, n_lags - 1)]
+    refine = np.where(peaks == inner, _parabolic_offset(np, left, mid, right), 0.0)
+    return peaks + refine - radius, scores[rows, peaks]
+
+
+def _window_offsets(
+    np: Any,
+    reference: Any,
+    target: Any,
+    *,
+    center_lag: int,
+    window_frames: int,
+    windows: int,
+    radius: int,
+) -> Tuple[Any, Any, Any]:
+    """
+    Correlate evenly spaced reference windows against *target* in one batch.
+
+    Each window of ``window_frames`` onsets is searched over lags
+    ``center_lag ± radius`` with :func:`_window_lags`. Returns
+    ``(centres, lags, scores)``: window centres in onset frames, refined lags, and
+    the Pearson correlation of each peak.
+    """
+
+    ref = np.asarray(reference, dtype=np.float64)
+    tgt = np.asarray(target, dtype=np.float64)
+    ref_len = int(ref.size)
+    width = max(2, min(int(window_frames), ref_len))
+    radius = max(1, int(radius))
+    starts = np.unique(np.linspace(0, ref_len - width, num=max(1, int(windows))).round().astype(np.int64))
+    span = width + 2 * radius
+
+    first = center_lag - radius
+    pad_left = max(0, -first)
+    pad_right = max(0, ref_len + center_lag + radius - int(tgt.size))
+    padded = np.concatenate([np.zeros(pad_left), tgt, np.zeros(pad_right)])
+    segments = padded[(starts + first + pad_left)[:, None] + np.arange(span)[None, :]]
+    blocks = ref[starts[:, None] + np.arange(width)[None, :]]
+
+    lags, scores = _window_lags(np, blocks, segments, radius=radius)
+    return starts + width / 2.0, center_lag + lags, scores
+
+
+def _segment_runs(points: Sequence[Tuple[float, float]]) -> List[List[Tuple[float, float]]]:
+    runs: List[List[Tuple[float, float]]] = []
+    for time_s, offset in points:
+        if runs:
+            run = runs[-1]
+            last_time, last_offset = run[-1]
+            if len(run) >= 2:
+                prev_time, prev_offset = run[-2]
+                slope = (last_offset - prev_offset) / max(last_time - prev_time, 1e-9)
+                predicted = last_offset + slope * (time_s - last_time)
+                tolerance = _DRIFT_JUMP_TOLERANCE_SECONDS
+            else:
+                predicted = last_offset
+                tolerance = _DRIFT_JUMP_TOLERANCE_SECONDS + _DRIFT_MAX_RATE * (time_s - last_time)
+            if abs(offset - predicted) <= tolerance:
+                run.append((time_s, offset))
+                continue
+        runs.append([(time_s, offset)])
+    return runs
+
+
+def _fit_offset_map(
+    np: Any,
+    times: Any,
+    offsets: Any,
+    scores: Any,
+    *,
+    start_seconds: float,
+    end_seconds: float,
+    seconds_per_onset: float,
+    min_confidence: float = _DRIFT_MIN_CONFIDENCE,
+) -> List[OffsetSegment]:
+    """
+    Fit a piecewise offset map to per-window ``(time, offset)`` estimates.
+
+    Windows below *min_confidence* are ignored. Consecutive windows are grouped until
+    an offset jumps away from the run's trend (a cut or padded scene); isolated
+    single-window runs are treated as outliers. Each run becomes a constant segment
+    (median offset) unless a least-squares line drifts by at least one onset frame
+    across the run, in which case it becomes a linear segment.
+    """
+
+    points = [
+        (float(time_s), float(offset))
+        for time_s, offset, score in zip(times, offsets, scores)
+        if score >= min_confidence
+    ]
+    if not points:
+        return []
+    runs = _segment_runs(points)
+    if len(runs) > 1:
+        survivors = [point for run in runs if len(run) > 1 for point in run]
+        if survivors:
+            runs = _segment_runs(survivors)
+
+    segments: List[OffsetSegment] = []
+    for index, run in enumerate(runs):
+        run_times = np.asarray([point[0] for point in run], dtype=np.float64)
+        run_offsets = np.asarray([point[1] for point in run], dtype=np.float64)
+        seg_start = start_seconds if index == 0 else (runs[index - 1][-1][0] + run[0][0]) / 2.0
+        seg_end = end_seconds if index == len(runs) - 1 else (run[-1][0] + runs[index + 1][0][0]) / 2.0
+        model = "constant"
+        drift = 0.0
+        offset = float(np.median(run_offsets))
+        if run_offsets.size >= 3:
+            slope, intercept = np.polyfit(run_times, run_offsets, 1)
+            if abs(float(slope)) * float(run_times[-1] - run_times[0]) >= seconds_per_onset:
+                model = "linear"
+                drift = float(slope)
+                offset = float(intercept + slope * seg_start)
+        segments.append(
+            OffsetSegment(
+                start_seconds=float(seg_start),
+                end_seconds=float(seg_end),
+                offset_seconds=offset,
+                drift=drift,
+                windows=len(run),
+                model=model,
+            )
+        )
+    return segments
+
+
+def _offset_map(
+    np: Any,
+    reference: Any,
+    target: Any,
+    *,
+    lag: int,
+    windows: int,
+    window_frames: int,
+    radius: int,
+    seconds_per_onset: float,
+    start_seconds: float,
+) -> List[OffsetSegment]:
+    """Return the drift-aware offset map for one target around its global *lag*."""
+
+    centres, lags, scores = _window_offsets(
+        np,
+        reference,
+        target,
+        center_lag=lag,
+        window_frames=window_frames,
+        windows=windows,
+        radius=radius,
+    )
+    return _fit_offset_map(
+        np,
+        start_seconds + centres * seconds_per_onset,
+        lags * seconds_per_onset,
+        scores,
+        start_seconds=start_seconds,
+        end_seconds=start_seconds + int(np.asarray(reference).size) * seconds_per_onset,
+        seconds_per_onset=seconds_per_onset,
+    )
+
+
+def _fit_length(np: Any, values: Any, size: int, *, lead: int = 0) -> Any:
+    """Return *values* shifted right by *lead* zeros and padded or trimmed to *size*."""
+
+    out = np.zeros(size, dtype=np.float64)
+    data = np.asarray(values, dtype=np.float64)[: max(0, size - lead)]
+    out[lead:lead + data.size] = data
+    return out
+
+
+def _drift_window_starts(np: Any, start: float, end: float, *, windows: int, window_seconds: float) -> List[float]:
+    """Return up to *windows* evenly spaced window starts covering ``[start, end]``."""
+
+    last = max(start, end - window_seconds)
+    starts = np.unique(np.round(np.linspace(start, last, num=max(1, int(windows))), 6))
+    return [float(value) for value in starts]
+
+
+def _decoded_offset_map(
+    np: Any,
+    reference_windows: Sequence[Any],
+    target_windows: Sequence[Any],
+    *,
+    window_starts: Sequence[float],
+    offset_seconds: float,
+    window_frames: int,
+    radius: int,
+    seconds_per_onset: float,
+    start_seconds: float,
+    end_seconds: float,
+) -> List[OffsetSegment]:
+    """
+    Return the offset map from per-window envelopes decoded around *offset_seconds*.
+
+    ``reference_windows[i]`` covers ``window_frames`` onsets from ``window_starts[i]``;
+    ``target_windows[i]`` covers the matching target span widened by *radius* onsets
+    on both sides (left-padded where the clip starts later than the span).
+    """
+
+    span = window_frames + 2 * radius
+    blocks = np.stack([_fit_length(np, window, window_frames) for window in reference_windows])
+    segments = np.stack([_fit_length(np, window, span) for window in target_windows])
+    lags, scores = _window_lags(np, blocks, segments, radius=radius)
+    centres = np.asarray(window_starts, dtype=np.float64) + window_frames * seconds_per_onset / 2.0
+    return _fit_offset_map(
+        np,
+        centres,
+        offset_seconds + lags * seconds_per_onset,
+        scores,
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+        seconds_per_onset=seconds_per_onset,
+    )
 
 
 def _probe_fps(infile: Path) -> Optional[float]:
     try:
-        result = _subproc.run_checked(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                "stream=r_frame_rate",
-                "-of",
-                "default=nokey=1:noprint_wrappers=1",
-                str(infile),
-            ],
-            stderr=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            text=True,
-            check=True,
-        )
-    except subprocess.CalledProcessError:
-        return None
-    text = (result.stdout or "").strip()
-    if not text:
+        return probe_media(infile).fps
+    except AudioAlignmentError:
         return None
-    if "/" in text:
-        num_str, den_str = text.split("/", 1)
-        try:
-            num = float(num_str)
-            den = float(den_str)
-            if den == 0:
-                return None
-            return num / den
-        except ValueError:
-            return None
+
+
+def _probe_duration(infile: Path) -> Optional[float]:
     try:
-        return float(text)
-    except ValueError:
+        return probe_media(infile).duration
+    except AudioAlignmentError:
         return None
 
 
@@ -400,6 +1025,200 @@ def _normalize_fps_hint(value: FpsHint | None) -> Optional[float]:
     return fps_value
 
 
+_DEFAULT_AUDIO_WORKERS = 4
+
+
+def resolve_audio_workers(requested: Optional[int], job_count: int) -> int:
+    """Clamp the extraction worker count to the job count and available CPUs."""
+
+    if requested is not None and requested > 0:
+        return max(1, min(int(requested), max(1, job_count)))
+    cpu_total = os.cpu_count() or 2
+    return max(1, min(_DEFAULT_AUDIO_WORKERS, cpu_total, job_count))
+
+
+_ENVELOPE_ARTIFACT_KIND = "audio_envelope"
+_ENVELOPE_CACHE_VERSION = 2
+
+
+def _window_value(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 6)
+
+
+class EnvelopeCache:
+    """
+    Onset envelopes persisted in the artifact index under *cache_root*.
+
+    Rows are keyed by the resolved path, audio stream index, sample rate, hop length,
+    and start/duration window; the file's ``size:mtime_ns`` token is the row
+    fingerprint, so edited or replaced files miss. Envelopes are stored as
+    little-endian float32 blobs. ``hits``/``misses``/``writes`` count lookups made
+    through this instance and are safe to update from worker threads.
+    """
+
+    def __init__(self, cache_root: Path) -> None:
+        self.cache_root = cache_root
+        self._index = open_artifact_index(cache_root)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @staticmethod
+    def key_for(
+        path: Path,
+        *,
+        stream_index: int,
+        sample_rate: int,
+        hop_length: int,
+        start_seconds: Optional[float],
+        duration_seconds: Optional[float],
+        n_fft: int = _ONSET_N_FFT,
+    ) -> str:
+        """Return the artifact key for one extraction window of *path*."""
+
+        payload = {
+            "version": _ENVELOPE_CACHE_VERSION,
+            "path": os.path.realpath(path),
+            "stream": int(stream_index),
+            "sample_rate": int(sample_rate),
+            "hop_length": int(hop_length),
+            "n_fft": int(n_fft),
+            "start": _window_value(start_seconds),
+            "duration": _window_value(duration_seconds),
+        }
+        serialized = json.dumps(payload, sort_keys=True)
+        return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+    def _count(self, field_name: str) -> None:
+        with self._lock:
+            setattr(self, field_name, getattr(self, field_name) + 1)
+
+    def load(self, path: Path, key: str) -> Optional[Any]:
+        """Return the cached envelope for *key* when *path* is unchanged, else ``None``."""
+
+        token = stat_token(path)
+        record = self._index.get(_ENVELOPE_ARTIFACT_KIND, key) if token is not None else None
+        envelope: Optional[Any] = None
+        if record is not None and record.fingerprint == token and record.blob:
+            np = _load_numpy()
+            try:
+                frames = int(json.loads(record.payload).get("frames", -1))
+            except (ValueError, AttributeError):
+                frames = -1
+            decoded = np.frombuffer(record.blob, dtype="<f4")
+            if decoded.size == frames:
+                envelope = decoded.astype(np.float32)
+        self._count("hits" if envelope is not None else "misses")
+        return envelope
+
+    def store(self, path: Path, key: str, envelope: Any) -> None:
+        """Persist *envelope* for *key*; silently skipped when *path* cannot be stat'ed."""
+
+        token = stat_token(path)
+        if token is None:
+            return
+        np = _load_numpy()
+        blob = np.ascontiguousarray(envelope, dtype="<f4").tobytes()
+        payload = json.dumps(
+            {"version": _ENVELOPE_CACHE_VERSION, "file": path.name, "frames": len(blob) // 4},
+            sort_keys=True,
+        )
+        if self._index.put(_ENVELOPE_ARTIFACT_KIND, key, fingerprint=token, payload=payload, blob=blob):
+            self._count("writes")
+
+
+def _envelope_for(
+    path: Path,
+    *,
+    sample_rate: int,
+    hop_length: int,
+    start_seconds: Optional[float],
+    duration_seconds: Optional[float],
+    stream_index: int,
+    cache: Optional[EnvelopeCache] = None,
+    n_fft: int = _ONSET_N_FFT,
+) -> Any:
+    key: Optional[str] = None
+    if cache is not None:
+        key = cache.key_for(
+            path,
+            stream_index=stream_index,
+            sample_rate=sample_rate,
+            hop_length=hop_length,
+            start_seconds=start_seconds,
+            duration_seconds=duration_seconds,
+            n_fft=n_fft,
+        )
+        cached = cache.load(path, key)
+        if cached is not None:
+            return cached
+    samples = _extract_audio(
+        path,
+        sample_rate=sample_rate,
+        start_seconds=start_seconds,
+        duration_seconds=duration_seconds,
+        stream_index=stream_index,
+    )
+    envelope, _ = _onset_envelope(samples, sample_rate=sample_rate, hop_length=hop_length, n_fft=n_fft)
+    if cache is not None and key is not None:
+        cache.store(path, key, envelope)
+    return envelope
+
+
+def compute_envelopes(
+    jobs: Sequence[Tuple[Path, int]],
+    *,
+    sample_rate: int,
+    hop_length: int,
+    start_seconds: Optional[float],
+    duration_seconds: Optional[float],
+    cache: EnvelopeCache,
+    max_workers: Optional[int] = None,
+    coarse_sample_rate: Optional[int] = None,
+) -> Dict[Path, Optional[str]]:
+    """
+    Populate *cache* with onset envelopes for ``(path, stream_index)`` *jobs*.
+
+    Used by ``cache warm`` so a later ``measure_offsets`` run with the same window
+    parameters only reads envelopes. With *coarse_sample_rate*, the coarse-stage
+    envelopes of a two-stage search are warmed instead (refinement windows depend on
+    the measured offset). Returns a per-path error message (``None`` on success) in
+    job order.
+    """
+
+    ensure_external_tools()
+    n_fft = _ONSET_N_FFT
+    if coarse_sample_rate is not None and coarse_sample_rate > 0:
+        sample_rate = int(coarse_sample_rate)
+        hop_length, n_fft = _coarse_analysis(sample_rate)
+    outcomes: Dict[Path, Optional[str]] = {}
+    workers = resolve_audio_workers(max_workers, len(jobs))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="audio-warm") as pool:
+        futures = [
+            pool.submit(
+                _envelope_for,
+                path,
+                sample_rate=sample_rate,
+                hop_length=hop_length,
+                start_seconds=start_seconds,
+                duration_seconds=duration_seconds,
+                stream_index=stream_index,
+                cache=cache,
+                n_fft=n_fft,
+            )
+            for path, stream_index in jobs
+        ]
+        for (path, _stream), future in zip(jobs, futures):
+            try:
+                future.result()
+            except AudioAlignmentError as exc:
+                outcomes[path] = str(exc)
+            else:
+                outcomes[path] = None
+    return outcomes
+
+
 def measure_offsets(
     reference: Path,
     targets: Sequence[Path],
@@ -413,85 +1232,299 @@ def measure_offsets(
     window_overrides: Mapping[Path, Tuple[Optional[float], Optional[float]]] | None = None,
     progress_callback: Callable[[int], None] | None = None,
     fps_hints: FpsHintMap | None = None,
+    max_offset_seconds: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    envelope_cache: Optional[EnvelopeCache] = None,
+    drift_windows: int = 0,
+    drift_window_seconds: float = 30.0,
+    coarse_sample_rate: Optional[int] = None,
+    refine_seconds: float = 20.0,
 ) -> List[AlignmentMeasurement]:
     """
     Estimate relative audio offsets for *targets* against *reference*.
 
     Cached FPS hints take precedence whenever provided; otherwise `_probe_fps()` is used.
+    When *max_offset_seconds* is set, only lags within that bound are searched.
+
+    Audio extraction and onset envelopes for the reference and every target run on a
+    bounded thread pool (*max_workers*, default ``min(4, cpu_count)``). Results keep
+    the order of *targets*; ``progress_callback(1)`` fires on the calling thread as
+    each target finishes.
+
+    With *envelope_cache*, envelopes for unchanged files and windows are read back
+    from the artifact index and only new or modified files are extracted.
+
+    With *drift_windows* > 0, each target additionally gets an ``offset_map``: that
+    many ``drift_window_seconds`` windows, spread evenly from *start_seconds* to the
+    end of the reference track, are correlated around the global lag in one batched
+    FFT and fitted to constant or linear segments. When *duration_seconds* bounds the
+    analysis window, only the drift windows are decoded, each seeked to directly
+    (target windows widened by the search margin); otherwise the whole-track
+    envelopes are sliced. The global offset and correlation are unchanged.
+
+    With *coarse_sample_rate*, the search runs in two stages. Envelopes for the
+    configured window are computed at that low rate (50 ms hops) to find the offset;
+    then a *refine_seconds* window at *sample_rate*/*hop_length*, placed over the
+    most active part of the reference, is matched against the target only around
+    the coarse lag, with parabolic peak interpolation for sub-hop precision. Targets
+    whose refinement fails keep the coarse offset. Correlation strength and drift
+    maps come from the coarse stage.
     """
     ensure_external_tools()
 
+    two_stage = False
+    search_rate, search_hop, search_n_fft = sample_rate, hop_length, _ONSET_N_FFT
+    if coarse_sample_rate is not None and coarse_sample_rate > 0:
+        two_stage = True
+        search_rate = int(coarse_sample_rate)
+        search_hop, search_n_fft = _coarse_analysis(search_rate)
+
     def _resolve_fps(path: Path) -> Optional[float]:
         hint = _normalize_fps_hint(fps_hints.get(path)) if fps_hints is not None else None
         if hint is not None:
             return hint
         return _probe_fps(path)
 
-    ref_env: Optional[Any] = None
-    hop: int
-    with _temporary_audio(
-        reference,
-        sample_rate=sample_rate,
-        start_seconds=start_seconds,
-        duration_seconds=duration_seconds,
-        stream_index=reference_stream,
-    ) as ref_audio:
-        ref_env, hop = _onset_envelope(ref_audio, sample_rate=sample_rate, hop_length=hop_length)
-
-    if ref_env is None:
-        raise AudioAlignmentError(f"Failed to compute onset envelope for {reference.name}")
-
-    results: List[AlignmentMeasurement] = []
-    reference_fps = _resolve_fps(reference)
-
-    for target in targets:
+    def _target_stream(target: Path) -> int:
+        if target_streams is None:
+            return 0
+        return int(target_streams.get(target, 0))
+
+    def _target_window(target: Path) -> Tuple[Optional[float], Optional[float]]:
+        win_start = start_seconds
+        win_dur = duration_seconds
+        if window_overrides is not None and target in window_overrides:
+            override_start, override_dur = window_overrides[target]
+            if override_start is not None:
+                win_start = override_start
+            if override_dur is not None:
+                win_dur = override_dur
+        return win_start, win_dur
+
+    def _analyse_target(target: Path) -> Tuple[Optional[float], Any, Optional[AudioAlignmentError]]:
         target_fps = _resolve_fps(target)
+        win_start, win_dur = _target_window(target)
         try:
-            stream_idx = 0
-            if target_streams is not None:
-                stream_idx = int(target_streams.get(target, 0))
-            win_start = start_seconds
-            win_dur = duration_seconds
-            if window_overrides is not None and target in window_overrides:
-                override_start, override_dur = window_overrides[target]
-                if override_start is not None:
-                    win_start = override_start
-                if override_dur is not None:
-                    win_dur = override_dur
-            with _temporary_audio(
+            envelope = _envelope_for(
                 target,
-                sample_rate=sample_rate,
+                sample_rate=search_rate,
+                hop_length=search_hop,
                 start_seconds=win_start,
                 duration_seconds=win_dur,
-                stream_index=stream_idx,
-            ) as target_audio:
-                target_env, _ = _onset_envelope(
-                    target_audio,
-                    sample_rate=sample_rate,
-                    hop_length=hop_length,
-                )
-            lag_frames, strength = _cross_correlation(ref_env, target_env)
-            seconds_per_onset = hop_length / float(sample_rate)
-            offset_seconds = lag_frames * seconds_per_onset
+                stream_index=_target_stream(target),
+                cache=envelope_cache,
+                n_fft=search_n_fft,
+            )
+        except AudioAlignmentError as exc:
+            return target_fps, None, exc
+        return target_fps, envelope, None
+
+    seconds_per_onset = search_hop / float(search_rate)
+    max_lag: Optional[int] = None
+    if max_offset_seconds is not None and max_offset_seconds > 0:
+        max_lag = int(math.ceil(max_offset_seconds / seconds_per_onset))
+    drift_frames = max(2, int(round(drift_window_seconds / seconds_per_onset)))
+    drift_radius = drift_frames // 2 if max_lag is None else max(1, min(drift_frames // 2, max_lag))
+    # A bounded analysis window does not cover the track, so drift windows are decoded on their own.
+    decode_drift = drift_windows > 0 and duration_seconds is not None
+
+    reference_start = float(start_seconds or 0.0)
+    refine_spo = hop_length / float(sample_rate)
+    refine_margin = _REFINE_MARGIN_HOPS * seconds_per_onset
+
+    def _refine_target(target: Path, reference_window: float, shift: float) -> Tuple[float, Any]:
+        # ``shift`` is the coarse estimate of (target time - reference time).
+        target_start = max(0.0, reference_window + shift - refine_margin)
+        lead = reference_window + shift - target_start
+        envelope = _envelope_for(
+            target,
+            sample_rate=sample_rate,
+            hop_length=hop_length,
+            start_seconds=target_start,
+            duration_seconds=refine_seconds + lead + refine_margin,
+            stream_index=_target_stream(target),
+            cache=envelope_cache,
+        )
+        return target_start, envelope
+
+    def _drift_window(path: Path, stream_index: int, window_start: float, frames: int) -> Any:
+        # Spans starting before the clip are left-padded; undecodable spans stay silent.
+        np = _load_numpy()
+        lead = max(0, int(round(-window_start / seconds_per_onset)))
+        if lead >= frames:
+            return np.zeros(frames)
+        try:
+            envelope = _envelope_for(
+                path,
+                sample_rate=search_rate,
+                hop_length=search_hop,
+                start_seconds=max(0.0, window_start),
+                duration_seconds=(frames - lead) * seconds_per_onset,
+                stream_index=stream_index,
+                cache=envelope_cache,
+                n_fft=search_n_fft,
+            )
+        except AudioAlignmentError as exc:
+            logger.debug("Drift window at %.3fs skipped for %s: %s", window_start, path.name, exc)
+            return np.zeros(frames)
+        return _fit_length(np, envelope, frames, lead=lead)
+
+    workers = resolve_audio_workers(max_workers, len(targets) + 1)
+    results: List[Optional[AlignmentMeasurement]] = [None] * len(targets)
+    refine_futures: Dict[Future[Tuple[float, Any]], Tuple[int, float]] = {}
+
+    def _advance() -> None:
+        if progress_callback is not None:
+            try:
+                progress_callback(1)
+            except Exception:  # pragma: no cover - defensive
+                pass
 
-            frames = None
-            if target_fps and target_fps > 0:
-                frames = int(round(offset_seconds * target_fps))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="audio-align")
+    try:
+        reference_future = pool.submit(
+            _envelope_for,
+            reference,
+            sample_rate=search_rate,
+            hop_length=search_hop,
+            start_seconds=start_seconds,
+            duration_seconds=duration_seconds,
+            stream_index=reference_stream,
+            cache=envelope_cache,
+            n_fft=search_n_fft,
+        )
+        target_futures: Dict[Future[Tuple[Optional[float], Any, Optional[AudioAlignmentError]]], int] = {
+            pool.submit(_analyse_target, target): index for index, target in enumerate(targets)
+        }
+
+        ref_env = reference_future.result()
+        if ref_env is None:
+            raise AudioAlignmentError(f"Failed to compute onset envelope for {reference.name}")
+        reference_fps = _resolve_fps(reference)
+        reference_spectrum: Optional[_ReferenceSpectrum] = None
+
+        drift_starts: List[float] = []
+        drift_reference: List[Future[Any]] = []
+        drift_end = reference_start + len(ref_env) * seconds_per_onset
+        if decode_drift:
+            track_seconds = _probe_duration(reference)
+            if track_seconds is None:
+                logger.warning(
+                    "Duration of %s is unknown; drift windows only cover the analysis window",
+                    reference.name,
+                )
+            else:
+                drift_end = max(reference_start, track_seconds)
+            drift_starts = _drift_window_starts(
+                _load_numpy(),
+                reference_start,
+                drift_end,
+                windows=drift_windows,
+                window_seconds=drift_frames * seconds_per_onset,
+            )
+            drift_reference = [
+                pool.submit(_drift_window, reference, reference_stream, window_start, drift_frames)
+                for window_start in drift_starts
+            ]
+
+        reference_window = reference_start
+        reference_fine_future: Optional[Future[Any]] = None
+        if two_stage:
+            refine_frames = max(1, int(round(refine_seconds / seconds_per_onset)))
+            reference_window += _active_window_start(_load_numpy(), ref_env, refine_frames) * seconds_per_onset
+            reference_fine_future = pool.submit(
+                _envelope_for,
+                reference,
+                sample_rate=sample_rate,
+                hop_length=hop_length,
+                start_seconds=reference_window,
+                duration_seconds=refine_seconds,
+                stream_index=reference_stream,
+                cache=envelope_cache,
+            )
 
-            results.append(
-                AlignmentMeasurement(
+        for future in as_completed(target_futures):
+            index = target_futures[future]
+            target = targets[index]
+            target_fps, target_env, error = future.result()
+            refining = False
+            try:
+                if error is not None:
+                    raise error
+                if reference_spectrum is None:
+                    reference_spectrum = _ReferenceSpectrum(ref_env)
+                lag_frames, strength = _cross_correlation(
+                    reference_spectrum,
+                    target_env,
+                    max_lag=max_lag,
+                )
+                offset_seconds = lag_frames * seconds_per_onset
+
+                frames = None
+                if target_fps and target_fps > 0:
+                    frames = int(round(offset_seconds * target_fps))
+                # Offsets are relative to each clip's own window start.
+                window_delta = float(_target_window(target)[0] or 0.0) - reference_start
+
+                offset_map: Optional[List[OffsetSegment]] = None
+                if decode_drift:
+                    shift = offset_seconds + window_delta - drift_radius * seconds_per_onset
+                    target_windows = [
+                        pool.submit(
+                            _drift_window,
+                            target,
+                            _target_stream(target),
+                            window_start + shift,
+                            drift_frames + 2 * drift_radius,
+                        )
+                        for window_start in drift_starts
+                    ]
+                    offset_map = _decoded_offset_map(
+                        reference_spectrum.np,
+                        [window.result() for window in drift_reference],
+                        [window.result() for window in target_windows],
+                        window_starts=drift_starts,
+                        offset_seconds=offset_seconds,
+                        window_frames=drift_frames,
+                        radius=drift_radius,
+                        seconds_per_onset=seconds_per_onset,
+                        start_seconds=reference_start,
+                        end_seconds=drift_end,
+                    )
+                elif drift_windows > 0:
+                    offset_map = _offset_map(
+                        reference_spectrum.np,
+                        ref_env,
+                        target_env,
+                        lag=lag_frames,
+                        windows=drift_windows,
+                        window_frames=drift_frames,
+                        radius=drift_radius,
+                        seconds_per_onset=seconds_per_onset,
+                        start_seconds=reference_start,
+                    )
+
+                results[index] = AlignmentMeasurement(
                     file=target,
                     offset_seconds=offset_seconds,
                     frames=frames,
                     correlation=strength,
                     reference_fps=reference_fps,
                     target_fps=target_fps,
+                    offset_map=offset_map,
                 )
-            )
-        except AudioAlignmentError as exc:
-            logger.warning("Audio alignment failed for %s: %s", target.name, exc)
-            results.append(
-                AlignmentMeasurement(
+                if two_stage:
+                    refine_future = pool.submit(
+                        _refine_target,
+                        target,
+                        reference_window,
+                        offset_seconds + window_delta,
+                    )
+                    refine_futures[refine_future] = (index, window_delta)
+                    refining = True
+            except AudioAlignmentError as exc:
+                logger.warning("Audio alignment failed for %s: %s", target.name, exc)
+                results[index] = AlignmentMeasurement(
                     file=target,
                     offset_seconds=0.0,
                     frames=None,
@@ -500,14 +1533,40 @@ def measure_offsets(
                     target_fps=target_fps,
                     error=str(exc),
                 )
-            )
-        if progress_callback is not None:
+            if not refining:
+                _advance()
+
+        reference_fine: Optional[_ReferenceSpectrum] = None
+        for future in as_completed(refine_futures):
+            index, window_delta = refine_futures[future]
+            measurement = results[index]
+            if measurement is None or measurement.offset_seconds is None:  # pragma: no cover - defensive
+                _advance()
+                continue
+            shift = measurement.offset_seconds + window_delta
             try:
-                progress_callback(1)
-            except Exception:  # pragma: no cover - defensive
-                pass
+                target_start, fine_env = future.result()
+                if reference_fine is None:
+                    assert reference_fine_future is not None
+                    reference_fine = _ReferenceSpectrum(reference_fine_future.result())
+                bound = int(math.ceil((reference_window + shift - target_start + refine_margin) / refine_spo)) + 1
+                fine_lag, _ = _refined_lag(reference_fine, fine_env, max_lag=bound)
+                refined = target_start - reference_window + fine_lag * refine_spo
+                if abs(refined - shift) > refine_margin:
+                    raise AudioAlignmentError(
+                        f"refined offset {refined:.3f}s strayed from coarse estimate {shift:.3f}s"
+                    )
+            except AudioAlignmentError as exc:
+                logger.debug("Audio offset refinement skipped for %s: %s", measurement.file.name, exc)
+            else:
+                measurement.offset_seconds = refined - window_delta
+                if measurement.target_fps and measurement.target_fps > 0:
+                    measurement.frames = int(round(measurement.offset_seconds * measurement.target_fps))
+            _advance()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
-    return results
+    return [measurement for measurement in results if measurement is not None]
 
 
 def load_offsets(path: Path) -> Tuple[Optional[str], Dict[str, Dict[str, Any]]]:
@@ -624,6 +1683,21 @@ def update_offsets_file(
             note = notes_map.get(key)
             if isinstance(note, str):
                 block.append(f'note = "{_toml_quote(note)}"')
+        if measurement.offset_map:
+            block.append(f'drift_model = "{measurement.drift_model}"')
+            block.append("offset_map = [")
+            for segment in measurement.offset_map:
+                block.append(
+                    "  { "
+                    f"start_seconds = {_format_float(segment.start_seconds)}, "
+                    f"end_seconds = {_format_float(segment.end_seconds)}, "
+                    f"offset_seconds = {_format_float(segment.offset_seconds)}, "
+                    f"drift = {segment.drift:.9f}, "
+                    f"windows = {int(segment.windows)}, "
+                    f'model = "{_toml_quote(segment.model)}"'
+                    " },"
+                )
+            block.append("]")
         block.append("")
         lines.extend(block)
 
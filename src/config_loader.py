@@ -462,6 +462,8 @@ def load_config(path: str) -> AppConfig:
         raise ConfigError("screenshots.compression_level must be 0, 1, or 2")
     if app.screenshots.mod_crop < 0:
         raise ConfigError("screenshots.mod_crop must be >= 0")
+    if app.screenshots.recompress_workers < 0:
+        raise ConfigError("screenshots.recompress_workers must be >= 0")
     if not isinstance(app.screenshots.letterbox_px_tolerance, int):
         raise ConfigError("screenshots.letterbox_px_tolerance must be an integer")
     if app.screenshots.letterbox_px_tolerance < 0:
@@ -499,6 +501,14 @@ def load_config(path: str) -> AppConfig:
         raise ConfigError("slowpics.remove_after_days must be >= 0")
     if app.slowpics.image_upload_timeout_seconds <= 0:
         raise ConfigError("slowpics.image_upload_timeout_seconds must be > 0")
+    upload_engine = str(app.slowpics.upload_engine).strip().lower()
+    if upload_engine not in {"threads", "async"}:
+        raise ConfigError("slowpics.upload_engine must be 'threads' or 'async'")
+    app.slowpics.upload_engine = upload_engine
+    if app.slowpics.max_upload_concurrency < 1:
+        raise ConfigError("slowpics.max_upload_concurrency must be >= 1")
+    if app.slowpics.max_upload_bytes_per_second < 0:
+        raise ConfigError("slowpics.max_upload_bytes_per_second must be >= 0")
 
     if app.tmdb.year_tolerance < 0:
         raise ConfigError("tmdb.year_tolerance must be >= 0")
@@ -635,8 +645,8 @@ def load_config(path: str) -> AppConfig:
     app.color.overlay_mode = overlay_mode
 
     preferred = app.source.preferred.strip().lower()
-    if preferred not in {"lsmas", "ffms2"}:
-        raise ConfigError("source.preferred must be either 'lsmas' or 'ffms2'")
+    if preferred not in {"lsmas", "ffms2", "auto"}:
+        raise ConfigError("source.preferred must be 'lsmas', 'ffms2', or 'auto'")
     app.source.preferred = preferred
 
     audio_cfg = app.audio_alignment
@@ -652,6 +662,28 @@ def load_config(path: str) -> AppConfig:
         raise ConfigError("audio_alignment.correlation_threshold must be between 0 and 1")
     if audio_cfg.max_offset_seconds <= 0:
         raise ConfigError("audio_alignment.max_offset_seconds must be > 0")
+    if audio_cfg.workers < 0:
+        raise ConfigError("audio_alignment.workers must be >= 0")
+    if audio_cfg.drift_windows < 0:
+        raise ConfigError("audio_alignment.drift_windows must be >= 0")
+    if audio_cfg.drift_window_seconds <= 0:
+        raise ConfigError("audio_alignment.drift_window_seconds must be > 0")
+    if audio_cfg.coarse_sample_rate <= 0:
+        raise ConfigError("audio_alignment.coarse_sample_rate must be > 0")
+    if audio_cfg.coarse_to_fine and audio_cfg.coarse_sample_rate > audio_cfg.sample_rate:
+        raise ConfigError("audio_alignment.coarse_sample_rate must be <= sample_rate")
+    if audio_cfg.refine_seconds <= 0:
+        raise ConfigError("audio_alignment.refine_seconds must be > 0")
+    signal = audio_cfg.signal.strip().lower()
+    if signal not in {"audio", "video"}:
+        raise ConfigError("audio_alignment.signal must be 'audio' or 'video'")
+    audio_cfg.signal = signal
+    if audio_cfg.video_signature_height < 8:
+        raise ConfigError("audio_alignment.video_signature_height must be >= 8")
+    if audio_cfg.video_signature_step <= 0:
+        raise ConfigError("audio_alignment.video_signature_step must be > 0")
+    if audio_cfg.video_correlation_threshold < 0 or audio_cfg.video_correlation_threshold > 1:
+        raise ConfigError("audio_alignment.video_correlation_threshold must be between 0 and 1")
     if not audio_cfg.offsets_filename.strip():
         raise ConfigError("audio_alignment.offsets_filename must be set")
     if audio_cfg.random_seed < 0:
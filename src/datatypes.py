@@ -101,6 +101,8 @@ class ScreenshotConfig:
     odd_geometry_policy: OddGeometryPolicy = OddGeometryPolicy.AUTO
     rgb_dither: RGBDither = RGBDither.ERROR_DIFFUSION
     export_range: ExportRange = ExportRange.FULL
+    recompress_png: bool = False
+    recompress_workers: int = 0
 
 
 @dataclass
@@ -167,6 +169,10 @@ class SlowpicsConfig:
     create_url_shortcut: bool = True
     delete_screen_dir_after_upload: bool = True
     image_upload_timeout_seconds: float = 180.0
+    upload_engine: str = "threads"
+    adaptive_concurrency: bool = True
+    max_upload_concurrency: int = 12
+    max_upload_bytes_per_second: int = 0
 
 
 @dataclass
@@ -180,6 +186,10 @@ class TMDBConfig:
     enable_anime_parsing: bool = True
     cache_ttl_seconds: int = 86400
     cache_max_entries: int = 256
+    persistent_cache: bool = True
+    cache_dir: str = ""
+    offline: bool = False
+    title_index: str = ""
     category_preference: Optional[str] = None
 
 
@@ -227,11 +237,12 @@ class RuntimeConfig:
     ram_limit_mb: int = 8000
     vapoursynth_python_paths: List[str] = field(default_factory=list)
     force_reprobe: bool = False
+    fast_probe: bool = True
 
 
 @dataclass
 class SourceConfig:
-    """Preferred VapourSynth source plugin selection."""
+    """Preferred VapourSynth source plugin selection ("lsmas", "ffms2", or per-file "auto")."""
 
     preferred: str = "lsmas"
 
@@ -274,6 +285,16 @@ class AudioAlignmentConfig:
     duration_seconds: Optional[float] = None
     correlation_threshold: float = 0.55
     max_offset_seconds: float = 12.0
+    workers: int = 0
+    drift_windows: int = 0
+    drift_window_seconds: float = 30.0
+    coarse_to_fine: bool = False
+    coarse_sample_rate: int = 4000
+    refine_seconds: float = 20.0
+    signal: str = "audio"
+    video_signature_height: int = 64
+    video_signature_step: int = 1
+    video_correlation_threshold: float = 0.4
     offsets_filename: str = "generated.audio_offsets.toml"
     random_seed: int = 2025
 
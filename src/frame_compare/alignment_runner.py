@@ -7,8 +7,9 @@ import math
 import sys
 import time
 from collections.abc import Mapping as MappingABC
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -26,7 +27,7 @@ import click
 
 from src import audio_alignment
 from src.datatypes import AppConfig
-from src.frame_compare import vspreview
+from src.frame_compare import alignment_signature, vspreview
 from src.frame_compare.alignment_helpers import derive_frame_hint
 from src.frame_compare.cli_runtime import (
     CLIAppError,
@@ -46,7 +47,8 @@ def resolve_subdir(root: Path, relative: str, *, purpose: str, allow_absolute: b
     return _preflight.resolve_subdir(root, relative, purpose=purpose, allow_absolute=allow_absolute)
 
 if TYPE_CHECKING:
-    from src.audio_alignment import AlignmentMeasurement, AudioStreamInfo
+    from src.audio_alignment import AlignmentMeasurement, AudioStreamInfo, EnvelopeCache
+    from src.datatypes import AudioAlignmentConfig
     from src.frame_compare.cli_runtime import CliOutputManagerProtocol, JsonTail
 
 logger = logging.getLogger(__name__)
@@ -145,6 +147,7 @@ class _AudioMeasurementDetail:
     status: str
     applied: bool
     note: Optional[str] = None
+    offset_map: Optional[List[Dict[str, object]]] = None
 
 
 @dataclass
@@ -176,6 +179,16 @@ AudioMeasurementDetail = _AudioMeasurementDetail
 AudioAlignmentDisplayData = _AudioAlignmentDisplayData
 
 
+def _log_envelope_cache(
+    cache: "EnvelopeCache",
+    reporter: CliOutputManagerProtocol | None,
+) -> None:
+    message = f"[CACHE] Audio envelopes: reused={cache.hits} extracted={cache.misses} writes={cache.writes}"
+    logger.info(message)
+    if reporter is not None and not getattr(reporter, "quiet", False):
+        reporter.console.print(f"[dim]{message}[/]")
+
+
 def _resolve_alignment_reference(
     plans: Sequence[ClipPlan],
     analyze_path: Path,
@@ -209,6 +222,204 @@ def _resolve_alignment_reference(
 resolve_alignment_reference = _resolve_alignment_reference
 
 
+def _default_stream_index(streams: Sequence["AudioStreamInfo"]) -> int:
+    """Return default stream index, falling back to the first entry or zero."""
+    if not streams:
+        return 0
+    for stream in streams:
+        if stream.is_default:
+            return stream.index
+    return streams[0].index
+
+
+def _score_stream_candidate(
+    candidate: "AudioStreamInfo",
+    reference_stream_info: "AudioStreamInfo | None",
+) -> float:
+    """
+    Compute a heuristic quality score for an audio stream candidate relative to the reference stream.
+
+    Parameters:
+        candidate (audio_alignment.AudioStreamInfo): Audio stream metadata to evaluate.
+        reference_stream_info (audio_alignment.AudioStreamInfo | None): Stream chosen for the reference clip.
+
+    Returns:
+        score (float): Higher values indicate a better match to the reference stream based on language, codec, channels, sample rate, bitrate, and flags (`is_default`, `is_forced`); used for ranking candidate streams.
+    """
+    base = 0.0
+    if reference_stream_info is not None:
+        if reference_stream_info.language and candidate.language == reference_stream_info.language:
+            base += 100.0
+        elif reference_stream_info.language and not candidate.language:
+            base += 10.0
+        if candidate.codec_name == reference_stream_info.codec_name:
+            base += 30.0
+        elif candidate.codec_name.split(".")[0] == reference_stream_info.codec_name.split(".")[0]:
+            base += 20.0
+        if candidate.channels == reference_stream_info.channels:
+            base += 10.0
+        if reference_stream_info.channel_layout and candidate.channel_layout == reference_stream_info.channel_layout:
+            base += 5.0
+        if reference_stream_info.sample_rate and candidate.sample_rate == reference_stream_info.sample_rate:
+            base += 10.0
+        elif reference_stream_info.sample_rate and candidate.sample_rate:
+            base -= abs(candidate.sample_rate - reference_stream_info.sample_rate) / 1000.0
+        if reference_stream_info.bitrate and candidate.bitrate:
+            base -= abs(candidate.bitrate - reference_stream_info.bitrate) / 10000.0
+    base += 3.0 if candidate.is_default else 0.0
+    base += 1.0 if candidate.is_forced else 0.0
+    if candidate.bitrate:
+        base += candidate.bitrate / 1e5
+    return base
+
+
+def _alignment_window(audio_cfg: "AudioAlignmentConfig") -> tuple[float, Optional[float], int]:
+    """
+    Return the ``(start, duration, hop_length)`` used for envelope extraction.
+
+    Drift mapping (``drift_windows > 0``) keeps this window for the global offset and
+    decodes its own windows on demand.
+    """
+    start = float(audio_cfg.start_seconds or 0.0)
+    duration = float(audio_cfg.duration_seconds) if audio_cfg.duration_seconds is not None else None
+    hop_length = max(1, min(audio_cfg.hop_length, max(1, audio_cfg.sample_rate // 100)))
+    return start, duration, hop_length
+
+
+def _probe_stream_infos(
+    plans: Sequence[ClipPlan],
+    root: Path,
+    *,
+    max_workers: Optional[int] = None,
+) -> Dict[Path, List["AudioStreamInfo"]]:
+    """
+    Return audio streams for every plan, probing files concurrently.
+
+    Plans whose probe snapshot already carries an audio probe (same cache key, so the
+    file is unchanged) skip ffprobe entirely; the stored FPS also seeds the in-process
+    probe cache used by ``measure_offsets``. Fresh probes are written back into the
+    probe snapshot cache.
+    """
+    from src.frame_compare.cache import record_audio_probe
+
+    stream_infos: Dict[Path, List["AudioStreamInfo"]] = {}
+    pending: List[ClipPlan] = []
+    for plan in plans:
+        snapshot = plan.probe_snapshot
+        cached = None
+        if snapshot is not None and snapshot.audio_probe is not None and snapshot.cache_key == plan.probe_cache_key:
+            cached = audio_alignment.media_probe_from_payload(snapshot.audio_probe)
+        if cached is None:
+            pending.append(plan)
+            continue
+        audio_alignment.remember_media_probe(plan.path, cached)
+        stream_infos[plan.path] = list(cached.audio_streams)
+
+    def _probe(plan: ClipPlan) -> Optional[List["AudioStreamInfo"]]:
+        try:
+            return audio_alignment.probe_audio_streams(plan.path)
+        except audio_alignment.AudioAlignmentError as exc:
+            logger.warning("ffprobe audio stream probe failed for %s: %s", plan.path.name, exc)
+            return None
+
+    if not pending:
+        return stream_infos
+    workers = audio_alignment.resolve_audio_workers(max_workers, len(pending))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="audio-probe") as pool:
+        for plan, infos in zip(pending, pool.map(_probe, pending)):
+            stream_infos[plan.path] = infos or []
+            probe = audio_alignment.cached_media_probe(plan.path) if infos is not None else None
+            snapshot = plan.probe_snapshot
+            if probe is None or snapshot is None or not snapshot.cache_key:
+                continue
+            try:
+                record_audio_probe(root, snapshot, audio_alignment.media_probe_payload(probe))
+            except Exception as exc:  # pragma: no cover - cache writes are best effort
+                logger.debug("Failed to persist audio probe for %s: %s", plan.path.name, exc)
+    return stream_infos
+
+
+def _cached_luma_signature(
+    plans: Sequence[ClipPlan],
+    cfg: AppConfig,
+    analyze_path: Path,
+    root: Path,
+) -> Optional[tuple[Path, alignment_signature.LumaSignature]]:
+    """Return the analysed clip's cached brightness series for video-signature alignment."""
+    from src.frame_compare.cache import build_cache_info
+
+    paths = [plan.path for plan in plans]
+    if analyze_path not in paths:
+        return None
+    info = build_cache_info(root, plans, cfg, paths.index(analyze_path))
+    if info is None:
+        return None
+    signature = alignment_signature.cached_luma_signature(info, cfg.analysis)
+    if signature is None:
+        return None
+    logger.debug("Reusing %d cached brightness samples for %s", len(signature.frames), analyze_path.name)
+    return analyze_path, signature
+
+
+def _coarse_sample_rate(audio_cfg: "AudioAlignmentConfig") -> Optional[int]:
+    """Return the coarse-stage rate when the two-stage search is enabled."""
+    return int(audio_cfg.coarse_sample_rate) if audio_cfg.coarse_to_fine else None
+
+
+def _correlation_threshold(audio_cfg: "AudioAlignmentConfig") -> float:
+    """
+    Return the minimum accepted correlation for the configured signal.
+
+    Video signatures score a Pearson r in ``[-1, 1]``, so they use their own
+    threshold instead of the audio onset correlation cut-off.
+    """
+    if audio_cfg.signal == "video":
+        return float(audio_cfg.video_correlation_threshold)
+    return float(audio_cfg.correlation_threshold)
+
+
+def warm_audio_envelopes(
+    plans: Sequence[ClipPlan],
+    cfg: AppConfig,
+    analyze_path: Path,
+    root: Path,
+    *,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Precompute onset envelopes that :func:`apply_audio_alignment` would request.
+
+    Streams are chosen with the same default/scoring rules as a live run (CLI
+    ``--audio-align-track`` overrides are unknown here, so forced picks are computed
+    on demand later). Returns ``{file name: error or None}``.
+    """
+    audio_cfg = cfg.audio_alignment
+    reference_plan = _resolve_alignment_reference(plans, analyze_path, audio_cfg.reference)
+    stream_infos = _probe_stream_infos(plans, root, max_workers=max_workers or audio_cfg.workers or None)
+    reference_streams = stream_infos.get(reference_plan.path, [])
+    reference_index = _default_stream_index(reference_streams)
+    reference_info = next((info for info in reference_streams if info.index == reference_index), None)
+    jobs: List[tuple[Path, int]] = [(reference_plan.path, reference_index)]
+    for plan in plans:
+        if plan is reference_plan:
+            continue
+        infos = stream_infos.get(plan.path, [])
+        best = max(infos, key=lambda info: _score_stream_candidate(info, reference_info)) if infos else None
+        jobs.append((plan.path, best.index if best is not None else 0))
+    start, duration, hop_length = _alignment_window(audio_cfg)
+    outcomes = audio_alignment.compute_envelopes(
+        jobs,
+        sample_rate=audio_cfg.sample_rate,
+        hop_length=hop_length,
+        start_seconds=start,
+        duration_seconds=duration,
+        cache=audio_alignment.EnvelopeCache(root),
+        max_workers=max_workers or audio_cfg.workers or None,
+        coarse_sample_rate=_coarse_sample_rate(audio_cfg),
+    )
+    return {path.name: error for path, error in outcomes.items()}
+
+
 def apply_audio_alignment(
     plans: Sequence[ClipPlan],
     cfg: AppConfig,
@@ -225,6 +436,7 @@ def apply_audio_alignment(
         audio_cfg.offsets_filename,
         purpose="audio_alignment.offsets_filename",
     )
+    correlation_threshold = _correlation_threshold(audio_cfg)
     display_data = _AudioAlignmentDisplayData(
         stream_lines=[],
         estimation_line=None,
@@ -236,13 +448,14 @@ def apply_audio_alignment(
         json_offsets_frames={},
         warnings=[],
         correlations={},
-        threshold=float(audio_cfg.correlation_threshold),
+        threshold=correlation_threshold,
     )
 
     def _warn(message: str) -> None:
         display_data.warnings.append(f"[AUDIO] {message}")
 
     vspreview_enabled = _coerce_config_flag(audio_cfg.use_vspreview)
+    video_signal = audio_cfg.signal == "video"
 
     reference_plan: ClipPlan | None = None
     if plans:
@@ -669,9 +882,9 @@ def apply_audio_alignment(
                 reasons.append(
                     f"offset {measurement.offset_seconds:.3f}s exceeds limit {audio_cfg.max_offset_seconds:.3f}s"
                 )
-            if measurement.correlation < audio_cfg.correlation_threshold:
+            if measurement.correlation < correlation_threshold:
                 reasons.append(
-                    f"correlation {measurement.correlation:.2f} below threshold {audio_cfg.correlation_threshold:.2f}"
+                    f"correlation {measurement.correlation:.2f} below threshold {correlation_threshold:.2f}"
                 )
             if measurement.frames is None:
                 reasons.append("unable to derive frame offset (missing fps)")
@@ -824,14 +1037,9 @@ def apply_audio_alignment(
         )
         return summary
 
-    stream_infos: Dict[Path, List["AudioStreamInfo"]] = {}
-    for plan in plans:
-        try:
-            infos = audio_alignment.probe_audio_streams(plan.path)
-        except audio_alignment.AudioAlignmentError as exc:
-            logger.warning("ffprobe audio stream probe failed for %s: %s", plan.path.name, exc)
-            infos = []
-        stream_infos[plan.path] = infos
+    stream_infos: Dict[Path, List["AudioStreamInfo"]] = (
+        {} if video_signal else _probe_stream_infos(plans, root, max_workers=audio_cfg.workers or None)
+    )
 
     forced_streams: set[Path] = set()
 
@@ -845,19 +1053,10 @@ def apply_audio_alignment(
         except (TypeError, ValueError):
             return None
 
-    def _pick_default(streams: Sequence["AudioStreamInfo"]) -> int:
-        """Return default stream index, falling back to the first entry or zero."""
-        if not streams:
-            return 0
-        for stream in streams:
-            if stream.is_default:
-                return stream.index
-        return streams[0].index
-
     ref_override = _match_audio_override(reference_plan)
     if ref_override is not None:
         forced_streams.add(reference_plan.path)
-    reference_stream_index = ref_override if ref_override is not None else _pick_default(
+    reference_stream_index = ref_override if ref_override is not None else _default_stream_index(
         stream_infos.get(reference_plan.path, [])
     )
 
@@ -867,42 +1066,6 @@ def apply_audio_alignment(
             reference_stream_info = candidate
             break
 
-    def _score_candidate(candidate: "AudioStreamInfo") -> float:
-        """
-        Compute a heuristic quality score for an audio stream candidate relative to the (closure) reference stream.
-
-        Parameters:
-            candidate (audio_alignment.AudioStreamInfo): Audio stream metadata to evaluate.
-
-        Returns:
-            score (float): Higher values indicate a better match to the reference stream based on language, codec, channels, sample rate, bitrate, and flags (`is_default`, `is_forced`); used for ranking candidate streams.
-        """
-        base = 0.0
-        if reference_stream_info is not None:
-            if reference_stream_info.language and candidate.language == reference_stream_info.language:
-                base += 100.0
-            elif reference_stream_info.language and not candidate.language:
-                base += 10.0
-            if candidate.codec_name == reference_stream_info.codec_name:
-                base += 30.0
-            elif candidate.codec_name.split(".")[0] == reference_stream_info.codec_name.split(".")[0]:
-                base += 20.0
-            if candidate.channels == reference_stream_info.channels:
-                base += 10.0
-            if reference_stream_info.channel_layout and candidate.channel_layout == reference_stream_info.channel_layout:
-                base += 5.0
-            if reference_stream_info.sample_rate and candidate.sample_rate == reference_stream_info.sample_rate:
-                base += 10.0
-            elif reference_stream_info.sample_rate and candidate.sample_rate:
-                base -= abs(candidate.sample_rate - reference_stream_info.sample_rate) / 1000.0
-            if reference_stream_info.bitrate and candidate.bitrate:
-                base -= abs(candidate.bitrate - reference_stream_info.bitrate) / 10000.0
-        base += 3.0 if candidate.is_default else 0.0
-        base += 1.0 if candidate.is_forced else 0.0
-        if candidate.bitrate:
-            base += candidate.bitrate / 1e5
-        return base
-
     target_stream_indices: Dict[Path, int] = {}
     for target in targets:
         override_idx = _match_audio_override(target)
@@ -914,7 +1077,7 @@ def apply_audio_alignment(
         if not infos:
             target_stream_indices[target.path] = 0
             continue
-        best = max(infos, key=_score_candidate)
+        best = max(infos, key=lambda info: _score_stream_candidate(info, reference_stream_info))
         target_stream_indices[target.path] = best.index
 
     def _describe_stream(plan: ClipPlan, stream_idx: int) -> tuple[str, str]:
@@ -928,8 +1091,11 @@ def apply_audio_alignment(
         Returns:
             tuple[str, str]: A pair (display_label, descriptor) where `display_label` is formatted as
             "<clip_label>-><codec>/<language>/<layout>" with " (forced)" appended if the stream is marked forced,
-            and `descriptor` is the "<codec>/<language>/<layout>" string.
+            and `descriptor` is the "<codec>/<language>/<layout>" string. Video-signature
+            alignment describes every clip as ``luma``.
         """
+        if video_signal:
+            return f"{plan_labels[plan.path]}->luma", "luma"
         infos = stream_infos.get(plan.path, [])
         picked = next((info for info in infos if info.index == stream_idx), None)
         codec = (picked.codec_name if picked and picked.codec_name else "unknown").strip() or "unknown"
@@ -949,6 +1115,7 @@ def apply_audio_alignment(
     display_data.json_reference_stream = reference_stream_text
     stream_descriptors: Dict[str, str] = {reference_plan.path.name: reference_descriptor}
 
+    streams_heading = "Video signature" if video_signal else "Audio streams"
     for idx, target in enumerate(targets):
         stream_idx = target_stream_indices.get(target.path, 0)
         target_stream_text, target_descriptor = _describe_stream(target, stream_idx)
@@ -956,10 +1123,10 @@ def apply_audio_alignment(
         stream_descriptors[target.path.name] = target_descriptor
         if idx == 0:
             display_data.stream_lines.append(
-                f"Audio streams: ref={reference_stream_text}  target={target_stream_text}"
+                f"{streams_heading}: ref={reference_stream_text}  target={target_stream_text}"
             )
         else:
-            display_data.stream_lines.append(f"Audio streams: target={target_stream_text}")
+            display_data.stream_lines.append(f"{streams_heading}: target={target_stream_text}")
 
     def _format_measurement_line(detail: _AudioMeasurementDetail) -> str:
         stream_text = detail.stream or "?"
@@ -1094,6 +1261,9 @@ def apply_audio_alignment(
                     status_text = "error"
                 applied_flag = False
             note_value = " ".join(note_parts) if note_parts else None
+            offset_map_value: Optional[List[Dict[str, object]]] = None
+            if measurement.offset_map:
+                offset_map_value = [asdict(segment) for segment in measurement.offset_map]
             detail_map[clip_name] = _AudioMeasurementDetail(
                 label=label,
                 stream=descriptor,
@@ -1103,6 +1273,7 @@ def apply_audio_alignment(
                 status=status_text,
                 applied=applied_flag,
                 note=note_value,
+                offset_map=offset_map_value,
             )
 
         for clip_name, trim_frames in manual_trims.items():
@@ -1176,20 +1347,26 @@ def apply_audio_alignment(
     start_seconds = float(audio_cfg.start_seconds or 0.0)
     search_text = f"±{max_offset:.2f}s"
     window_text = f"{duration_seconds:.2f}s" if duration_seconds is not None else "auto"
+    if audio_cfg.drift_windows > 0:
+        window_text = f"full drift={audio_cfg.drift_windows}x{float(audio_cfg.drift_window_seconds):.0f}s"
+    if audio_cfg.coarse_to_fine:
+        window_text += (
+            f" coarse={audio_cfg.coarse_sample_rate}Hz refine={float(audio_cfg.refine_seconds):.0f}s"
+        )
     start_text = f"{start_seconds:.2f}s"
+    if video_signal:
+        window_text = f"{duration_seconds:.2f}s" if duration_seconds is not None else "full"
+        window_text += (
+            f" luma={audio_cfg.video_signature_height}p step={audio_cfg.video_signature_step}"
+        )
+    signal_text = "video-signature" if video_signal else "audio"
     display_data.estimation_line = (
-        f"Estimating audio offsets … fps={reference_fps:.3f} "
+        f"Estimating {signal_text} offsets … fps={reference_fps:.3f} "
         f"search={search_text} start={start_text} window={window_text}"
     )
 
     try:
-        base_start = float(audio_cfg.start_seconds or 0.0)
-        base_duration_param: Optional[float]
-        if audio_cfg.duration_seconds is None:
-            base_duration_param = None
-        else:
-            base_duration_param = float(audio_cfg.duration_seconds)
-        hop_length = max(1, min(audio_cfg.hop_length, max(1, audio_cfg.sample_rate // 100)))
+        base_start, base_duration_param, hop_length = _alignment_window(audio_cfg)
 
         measurements: List["AlignmentMeasurement"]
         negative_offsets: Dict[str, bool] = {}
@@ -1208,6 +1385,7 @@ def apply_audio_alignment(
         processed = 0
         start_time = time.perf_counter()
         total_targets = len(targets)
+        envelope_cache = audio_alignment.EnvelopeCache(root)
 
         with spinner_context as status:
             def _advance_audio(count: int) -> None:
@@ -1229,18 +1407,45 @@ def apply_audio_alignment(
                         f"[cyan]Estimating audio offsets… {processed}/{total_targets} ({rate_val:0.2f} pairs/s)[/cyan]"
                     )
 
-            measurements = audio_alignment.measure_offsets(
-                reference_plan.path,
-                [plan.path for plan in targets],
-                sample_rate=audio_cfg.sample_rate,
-                hop_length=hop_length,
-                start_seconds=base_start,
-                duration_seconds=base_duration_param,
-                reference_stream=reference_stream_index,
-                target_streams=target_stream_indices,
-                progress_callback=_advance_audio,
-                fps_hints=plan_fps_map,
-            )
+            if video_signal:
+                measurements = alignment_signature.measure_signature_offsets(
+                    reference_plan.path,
+                    [plan.path for plan in targets],
+                    fps_hints=plan_fps_map,
+                    analysis_cfg=cfg.analysis,
+                    color_cfg=cfg.color,
+                    start_seconds=start_seconds,
+                    duration_seconds=duration_seconds,
+                    max_offset_seconds=max_offset,
+                    height=audio_cfg.video_signature_height,
+                    step=audio_cfg.video_signature_step,
+                    cached=_cached_luma_signature(plans, cfg, analyze_path, root),
+                    cache_dir=root,
+                    max_workers=audio_cfg.workers or None,
+                    progress_callback=_advance_audio,
+                )
+            else:
+                measurements = audio_alignment.measure_offsets(
+                    reference_plan.path,
+                    [plan.path for plan in targets],
+                    sample_rate=audio_cfg.sample_rate,
+                    hop_length=hop_length,
+                    start_seconds=base_start,
+                    duration_seconds=base_duration_param,
+                    reference_stream=reference_stream_index,
+                    target_streams=target_stream_indices,
+                    progress_callback=_advance_audio,
+                    fps_hints=plan_fps_map,
+                    max_offset_seconds=max_offset,
+                    max_workers=audio_cfg.workers or None,
+                    envelope_cache=envelope_cache,
+                    drift_windows=audio_cfg.drift_windows,
+                    drift_window_seconds=float(audio_cfg.drift_window_seconds),
+                    coarse_sample_rate=_coarse_sample_rate(audio_cfg),
+                    refine_seconds=float(audio_cfg.refine_seconds),
+                )
+        if not video_signal:
+            _log_envelope_cache(envelope_cache, reporter)
 
         for measurement in measurements:
             if measurement.frames is None:
@@ -1284,9 +1489,9 @@ def apply_audio_alignment(
                 reasons.append(
                     f"offset {measurement.offset_seconds:.3f}s exceeds limit {audio_cfg.max_offset_seconds:.3f}s"
                 )
-            if measurement.correlation < audio_cfg.correlation_threshold:
+            if measurement.correlation < correlation_threshold:
                 reasons.append(
-                    f"correlation {measurement.correlation:.2f} below threshold {audio_cfg.correlation_threshold:.2f}"
+                    f"correlation {measurement.correlation:.2f} below threshold {correlation_threshold:.2f}"
                 )
             if measurement.frames is None:
                 reasons.append("unable to derive frame offset (missing fps)")
@@ -1547,6 +1752,11 @@ def format_alignment_output(
                 "note": detail.note,
             }
         audio_block["measurements"] = measurements_output
+        audio_block["offset_maps"] = {
+            label: list(detail.offset_map)
+            for label, detail in measurement_source.items()
+            if detail.offset_map
+        }
         if display.manual_trim_lines:
             audio_block["manual_trim_summary"] = list(display.manual_trim_lines)
         else:
@@ -1564,8 +1774,10 @@ def format_alignment_output(
         audio_block["offset_lines"] = []
         audio_block["offset_lines_text"] = ""
         audio_block["measurements"] = {}
+        audio_block["offset_maps"] = {}
 
     audio_block["enabled"] = bool(cfg.audio_alignment.enable)
+    audio_block["signal"] = cfg.audio_alignment.signal
     audio_block["suggestion_mode"] = bool(summary.suggestion_mode if summary else False)
     audio_block["suggested_frames"] = dict(summary.suggested_frames) if summary else {}
     audio_block["manual_trim_starts"] = dict(summary.manual_trim_starts) if summary else {}
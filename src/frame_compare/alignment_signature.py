@@ -0,0 +1,318 @@
+"""Video-signature alignment: frame offsets from per-frame luma series."""
+
+from __future__ import annotations
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Mapping, Optional, Sequence
+
+from src import audio_alignment
+from src.frame_compare import vs as vs_core
+from src.frame_compare.analysis import (
+    _collect_metrics_vapoursynth,  # pyright: ignore[reportPrivateUsage]
+    probe_cached_metrics,
+)
+
+if TYPE_CHECKING:
+    from src.audio_alignment import AlignmentMeasurement
+    from src.datatypes import AnalysisConfig, ColorConfig
+    from src.frame_compare.analysis import FrameMetricsCacheInfo
+
+__all__ = [
+    "LumaSignature",
+    "cached_luma_signature",
+    "collect_luma_signature",
+    "measure_signature_offsets",
+    "signature_offset",
+]
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SOURCE_CACHE = "metrics-cache"
+SIGNATURE_SOURCE_VAPOURSYNTH = "vapoursynth"
+
+# Lags are only scored where the clips share at least this many samples and at
+# least half of the best-covered lag's overlap, so edge lags with a handful of
+# samples cannot produce spurious perfect correlations.
+_MIN_OVERLAP_SAMPLES = 48
+_MIN_OVERLAP_FRACTION = 0.5
+# Window maths only; used (with a warning) when the reference has no FPS hint.
+_FALLBACK_FPS = 24000 / 1001
+
+
+@dataclass(frozen=True)
+class LumaSignature:
+    """Mean luma per frame for one clip, keyed by untrimmed source frame number."""
+
+    frames: List[int]
+    values: List[float]
+    source: str
+
+    def within(self, first: int, last: Optional[int]) -> "LumaSignature":
+        """Return the samples whose frame lies in ``[first, last)`` (``last=None`` is open)."""
+
+        pairs = [
+            (frame, value)
+            for frame, value in zip(self.frames, self.values)
+            if frame >= first and (last is None or frame < last)
+        ]
+        return LumaSignature([frame for frame, _ in pairs], [value for _, value in pairs], self.source)
+
+
+def cached_luma_signature(info: "FrameMetricsCacheInfo", cfg: "AnalysisConfig") -> Optional[LumaSignature]:
+    """
+    Return the analysed clip's brightness series from the frame-metrics cache.
+
+    Trims are ignored when validating the cache (alignment runs before the trims it
+    suggests are applied); indices are re-based onto source frames with the trim the
+    metrics were captured under. Returns ``None`` when no usable payload exists.
+    """
+
+    result = probe_cached_metrics(info, cfg, ignore_trims=True)
+    if result.metrics is None or not result.metrics.brightness:
+        return None
+    offset = int(result.metrics.trim_start)
+    series = sorted(result.metrics.brightness)
+    return LumaSignature(
+        [int(idx) + offset for idx, _ in series],
+        [float(value) for _, value in series],
+        SIGNATURE_SOURCE_CACHE,
+    )
+
+
+def collect_luma_signature(
+    path: Path,
+    *,
+    first_frame: int,
+    last_frame: Optional[int],
+    step: int,
+    analysis_cfg: "AnalysisConfig",
+    color_cfg: "ColorConfig",
+    height: int,
+    cache_dir: Optional[Path] = None,
+) -> LumaSignature:
+    """
+    Measure mean luma for every *step*-th frame of *path* in ``[first_frame, last_frame)``.
+
+    The untrimmed source is opened and measured through the analysis metrics pipeline
+    at *height* lines with motion disabled, so the series shares the colour handling
+    of cached brightness metrics at a fraction of the cost.
+    """
+
+    try:
+        clip = vs_core.init_clip(str(path), cache_dir=cache_dir)
+        total = int(clip.num_frames)
+        stop = total if last_frame is None else min(total, int(last_frame))
+        indices = list(range(max(0, int(first_frame)), stop, max(1, int(step))))
+        signature_cfg = replace(analysis_cfg, downscale_height=int(height), frame_count_motion=0)
+        brightness, _ = _collect_metrics_vapoursynth(
+            clip,
+            signature_cfg,
+            indices,
+            color_cfg=color_cfg,
+            file_name=path.name,
+        )
+    except (RuntimeError, TypeError) as exc:
+        raise audio_alignment.AudioAlignmentError(
+            f"Failed to measure luma signature for {path.name}: {exc}"
+        ) from exc
+    if not brightness:
+        raise audio_alignment.AudioAlignmentError(f"No frames available for luma signature of {path.name}")
+    return LumaSignature(
+        [int(idx) for idx, _ in brightness],
+        [float(value) for _, value in brightness],
+        SIGNATURE_SOURCE_VAPOURSYNTH,
+    )
+
+
+def _dense(np: Any, signature: LumaSignature, origin: int, length: int) -> tuple[Any, Any]:
+    """Scatter *signature* onto a ``length`` frame grid starting at *origin* with a sample mask."""
+
+    values = np.zeros(length, dtype=np.float64)
+    mask = np.zeros(length, dtype=np.float64)
+    positions = np.asarray(signature.frames, dtype=np.int64) - origin
+    values[positions] = np.asarray(signature.values, dtype=np.float64)
+    mask[positions] = 1.0
+    return values * mask, mask
+
+
+def signature_offset(reference: LumaSignature, target: LumaSignature, *, max_lag: int) -> tuple[int, float]:
+    """
+    Return ``(lag, correlation)`` for the best match of *target* against *reference*.
+
+    Both series are laid on a shared frame grid with sample masks, and the Pearson
+    correlation over the overlapping samples is evaluated for every lag in
+    ``[-max_lag, max_lag]`` from six FFT cross-correlations (masked normalised
+    cross-correlation), so sparse series such as cached metrics sampled every
+    ``analysis.step`` frames still give frame-accurate lags against a dense one.
+    A positive lag means the target shows the reference's frame ``n`` at ``n + lag``.
+    """
+
+    if not reference.frames or not target.frames:
+        raise audio_alignment.AudioAlignmentError("Empty luma signature encountered during correlation")
+
+    import numpy as np
+
+    origin = min(min(reference.frames), min(target.frames))
+    length = max(max(reference.frames), max(target.frames)) - origin + 1
+    ref_values, ref_mask = _dense(np, reference, origin, length)
+    tgt_values, tgt_mask = _dense(np, target, origin, length)
+
+    nfft = 1 << (2 * length - 1).bit_length()
+
+    def _spectrum(values: Any) -> Any:
+        return np.fft.rfft(values, n=nfft)
+
+    bound = min(max(0, int(max_lag)), length - 1)
+    lags = np.arange(-bound, bound + 1)
+
+    def _xcorr(ref_spectrum: Any, tgt_spectrum: Any) -> Any:
+        # irfft(conj(A) * B)[k] == sum_n a[n] * b[n + k]
+        return np.fft.irfft(np.conj(ref_spectrum) * tgt_spectrum, n=nfft)[lags % nfft]
+
+    ref_m, ref_x, ref_xx = (_spectrum(arr) for arr in (ref_mask, ref_values, ref_values * ref_values))
+    tgt_m, tgt_y, tgt_yy = (_spectrum(arr) for arr in (tgt_mask, tgt_values, tgt_values * tgt_values))
+    overlap = np.rint(_xcorr(ref_m, tgt_m))
+    sum_x = _xcorr(ref_x, tgt_m)
+    sum_y = _xcorr(ref_m, tgt_y)
+    sum_xx = _xcorr(ref_xx, tgt_m)
+    sum_yy = _xcorr(ref_m, tgt_yy)
+    sum_xy = _xcorr(ref_x, tgt_y)
+
+    required = max(float(_MIN_OVERLAP_SAMPLES), _MIN_OVERLAP_FRACTION * float(overlap.max(initial=0.0)))
+    valid = overlap >= required
+    if not bool(valid.any()):
+        raise audio_alignment.AudioAlignmentError(
+            f"Luma signatures share fewer than {_MIN_OVERLAP_SAMPLES} frames within ±{bound} frames"
+        )
+    safe_n = np.where(valid, overlap, 1.0)
+    var_x = sum_xx - sum_x * sum_x / safe_n
+    var_y = sum_yy - sum_y * sum_y / safe_n
+    cov = sum_xy - sum_x * sum_y / safe_n
+    floor = 1e-12 * safe_n
+    valid &= (var_x > floor) & (var_y > floor)
+    if not bool(valid.any()):
+        raise audio_alignment.AudioAlignmentError("Luma signatures are flat; no usable picture changes")
+    denom = np.sqrt(np.where(valid, var_x * var_y, 1.0))
+    scores = np.where(valid, np.clip(cov / denom, -1.0, 1.0), -np.inf)
+    best = int(np.argmax(scores))
+    return int(lags[best]), float(scores[best])
+
+
+def measure_signature_offsets(
+    reference: Path,
+    targets: Sequence[Path],
+    *,
+    fps_hints: Mapping[Path, tuple[int, int]],
+    analysis_cfg: "AnalysisConfig",
+    color_cfg: "ColorConfig",
+    start_seconds: float = 0.0,
+    duration_seconds: Optional[float] = None,
+    max_offset_seconds: float = 12.0,
+    height: int = 64,
+    step: int = 1,
+    cached: Optional[tuple[Path, LumaSignature]] = None,
+    cache_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Callable[[int], None] | None = None,
+) -> List["AlignmentMeasurement"]:
+    """
+    Estimate frame offsets for *targets* against *reference* from luma signatures.
+
+    The reference covers ``[start, start + duration)``; targets are measured over the
+    same span widened by ``max_offset_seconds`` on both sides. ``cached`` supplies the
+    analysed clip's series from the metrics cache so only the other clips are decoded
+    (low-res, on a bounded thread pool). Results keep target order; per-target
+    failures are reported through ``AlignmentMeasurement.error``.
+    """
+
+    reference_fps_tuple = fps_hints.get(reference)
+    if reference_fps_tuple and reference_fps_tuple[0] > 0 and reference_fps_tuple[1] > 0:
+        reference_fps = reference_fps_tuple[0] / reference_fps_tuple[1]
+    else:
+        reference_fps = _FALLBACK_FPS
+        logger.warning(
+            "No FPS known for %s; assuming %.3f fps for the luma signature window",
+            reference.name,
+            reference_fps,
+        )
+    first_frame = max(0, int(round(float(start_seconds) * reference_fps)))
+    last_frame = (
+        first_frame + max(1, int(round(float(duration_seconds) * reference_fps)))
+        if duration_seconds is not None
+        else None
+    )
+    max_lag = max(1, int(math.ceil(float(max_offset_seconds) * reference_fps)))
+    target_first = max(0, first_frame - max_lag)
+    target_last = last_frame + max_lag if last_frame is not None else None
+
+    def _signature(path: Path, first: int, last: Optional[int]) -> LumaSignature:
+        if cached is not None and cached[0] == path:
+            subset = cached[1].within(first, last)
+            if subset.frames:
+                return subset
+        return collect_luma_signature(
+            path,
+            first_frame=first,
+            last_frame=last,
+            step=step,
+            analysis_cfg=analysis_cfg,
+            color_cfg=color_cfg,
+            height=height,
+            cache_dir=cache_dir,
+        )
+
+    workers = audio_alignment.resolve_audio_workers(max_workers, len(targets) + 1)
+    results: List["AlignmentMeasurement"] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="luma-signature") as pool:
+        reference_future = pool.submit(_signature, reference, first_frame, last_frame)
+        target_futures = [pool.submit(_signature, target, target_first, target_last) for target in targets]
+        reference_signature = reference_future.result()
+        logger.debug(
+            "Luma signature for %s: %d frames (%s)",
+            reference.name,
+            len(reference_signature.frames),
+            reference_signature.source,
+        )
+        for target, future in zip(targets, target_futures):
+            target_fps_tuple = fps_hints.get(target)
+            target_fps = (
+                target_fps_tuple[0] / target_fps_tuple[1]
+                if target_fps_tuple and target_fps_tuple[1]
+                else None
+            )
+            try:
+                target_signature = future.result()
+                lag, correlation = signature_offset(reference_signature, target_signature, max_lag=max_lag)
+                # ``lag`` counts reference frames; trims apply to the target, so convert
+                # through seconds at its rate (left unset, the runner derives it).
+                offset_seconds = lag / reference_fps
+                frames = int(round(offset_seconds * target_fps)) if target_fps else None
+                results.append(
+                    audio_alignment.AlignmentMeasurement(
+                        file=target,
+                        offset_seconds=offset_seconds,
+                        frames=frames,
+                        correlation=correlation,
+                        reference_fps=reference_fps,
+                        target_fps=target_fps,
+                    )
+                )
+            except audio_alignment.AudioAlignmentError as exc:
+                results.append(
+                    audio_alignment.AlignmentMeasurement(
+                        file=target,
+                        offset_seconds=0.0,
+                        frames=None,
+                        correlation=0.0,
+                        reference_fps=reference_fps,
+                        target_fps=target_fps,
+                        error=str(exc),
+                    )
+                )
+            if progress_callback is not None:
+                progress_callback(1)
+    return results
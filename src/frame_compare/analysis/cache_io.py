@@ -7,7 +7,9 @@ import hashlib
 import json
 import math
 import os
+import sys
 import tempfile
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
 from typing import (
@@ -26,6 +28,7 @@ from typing import (
 )
 
 from src.datatypes import AnalysisConfig, AnalysisThresholds
+from src.frame_compare.artifact_index import open_artifact_index, stat_token
 
 if TYPE_CHECKING:
     from .selection import SelectionDetail
@@ -37,6 +40,8 @@ _TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 _CACHE_HASH_ENV_FLAG = "FRAME_COMPARE_CACHE_HASH"
 _CACHE_HASH_ENV_FALSEY = {"", "0", "false", "no", "off"}
 _METRICS_PAYLOAD_VERSION = 2
+_METRICS_ARTIFACT_KIND = "metrics"
+_SELECTION_ARTIFACT_KIND = "selection"
 
 
 def _now_utc_iso() -> str:
@@ -112,6 +117,8 @@ class CachedMetrics:
         selection_frames (Optional[List[int]]): Frame indices selected during the cached run.
         selection_hash (Optional[str]): Hash of the selection inputs that produced ``selection_frames``.
         selection_categories (Optional[Dict[int, str]]): Optional per-frame category labels.
+        trim_start (int): Lead trim of the analysed clip when the metrics were captured;
+            metric indices plus this value give source frame numbers.
     """
     brightness: List[tuple[int, float]]
     motion: List[tuple[int, float]]
@@ -119,6 +126,7 @@ class CachedMetrics:
     selection_hash: Optional[str]
     selection_categories: Optional[Dict[int, str]]
     selection_details: Optional[Dict[int, "SelectionDetail"]]
+    trim_start: int = 0
 
 
 @dataclass(frozen=True)
@@ -338,26 +346,37 @@ def _config_fingerprint(cfg: AnalysisConfig) -> str:
     return hashlib.sha1(payload).hexdigest()
 
 
-def probe_cached_metrics(info: FrameMetricsCacheInfo, cfg: AnalysisConfig) -> CacheLoadResult:
-    """Validate and, when possible, load cached frame metrics for reuse."""
+def probe_cached_metrics(
+    info: FrameMetricsCacheInfo,
+    cfg: AnalysisConfig,
+    *,
+    ignore_trims: bool = False,
+) -> CacheLoadResult:
+    """Validate and, when possible, load cached frame metrics for reuse.
+
+    ``ignore_trims`` accepts payloads captured with different analysed-clip trims
+    (callers re-base indices with :attr:`CachedMetrics.trim_start`).
+    """
 
     path = info.path
     selection_module = _selection_module()
-    try:
-        raw = path.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return CacheLoadResult(metrics=None, status="missing", reason="not_found")
-    except OSError as exc:
-        return CacheLoadResult(metrics=None, status="error", reason=f"read_error:{exc.errno}")
+    data = _load_indexed_metrics_payload(path)
+    if data is None:
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return CacheLoadResult(metrics=None, status="missing", reason="not_found")
+        except OSError as exc:
+            return CacheLoadResult(metrics=None, status="error", reason=f"read_error:{exc.errno}")
 
-    try:
-        data_raw = json.loads(raw)
-    except json.JSONDecodeError:
-        return CacheLoadResult(metrics=None, status="error", reason="invalid_json")
+        try:
+            data_raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return CacheLoadResult(metrics=None, status="error", reason="invalid_json")
 
-    data = _coerce_str_dict(data_raw)
-    if data is None:
-        return CacheLoadResult(metrics=None, status="error", reason="invalid_payload")
+        data = _coerce_str_dict(data_raw)
+        if data is None:
+            return CacheLoadResult(metrics=None, status="error", reason="invalid_payload")
 
     if data.get("version") != _METRICS_PAYLOAD_VERSION:
         return CacheLoadResult(metrics=None, status="stale", reason="version_mismatch")
@@ -394,10 +413,12 @@ def probe_cached_metrics(info: FrameMetricsCacheInfo, cfg: AnalysisConfig) -> Ca
     if cached_group != (info.release_group or "").lower():
         return CacheLoadResult(metrics=None, status="stale", reason="release_group_mismatch")
 
-    if data.get("trim_start") != info.trim_start:
-        return CacheLoadResult(metrics=None, status="stale", reason="trim_start_mismatch")
-    if data.get("trim_end") != info.trim_end:
-        return CacheLoadResult(metrics=None, status="stale", reason="trim_end_mismatch")
+    if not ignore_trims:
+        if data.get("trim_start") != info.trim_start:
+            return CacheLoadResult(metrics=None, status="stale", reason="trim_start_mismatch")
+        if data.get("trim_end") != info.trim_end:
+            return CacheLoadResult(metrics=None, status="stale", reason="trim_end_mismatch")
+    cached_trim_start = _coerce_optional_int(data.get("trim_start"))
 
     fps_obj = data.get("fps")
     fps_values: List[int] = []
@@ -494,11 +515,88 @@ def probe_cached_metrics(info: FrameMetricsCacheInfo, cfg: AnalysisConfig) -> Ca
             selection_hash,
             selection_categories,
             selection_details,
+            trim_start=cached_trim_start or 0,
         ),
         status="reused",
     )
 
 
+def _pack_metric_series(*series: Sequence[tuple[int, float]]) -> bytes:
+    """Pack metric series into little-endian int64 indices followed by float64 values."""
+
+    indices = array("q")
+    values = array("d")
+    for entries in series:
+        for idx, val in entries:
+            indices.append(int(idx))
+            values.append(float(val))
+    if sys.byteorder != "little":
+        indices.byteswap()
+        values.byteswap()
+    return indices.tobytes() + values.tobytes()
+
+
+def _unpack_metric_series(blob: bytes, counts: Sequence[int]) -> Optional[List[List[tuple[int, float]]]]:
+    total = sum(counts)
+    if len(blob) != total * 16:
+        return None
+    indices = array("q")
+    values = array("d")
+    indices.frombytes(blob[: total * 8])
+    values.frombytes(blob[total * 8 :])
+    if sys.byteorder != "little":
+        indices.byteswap()
+        values.byteswap()
+    result: List[List[tuple[int, float]]] = []
+    offset = 0
+    for count in counts:
+        result.append(list(zip(indices[offset : offset + count], values[offset : offset + count])))
+        offset += count
+    return result
+
+
+def _index_metrics_payload(path: Path, payload: Mapping[str, object]) -> None:
+    """Mirror a freshly written metrics payload into the artifact index."""
+
+    brightness = cast(Sequence[tuple[int, float]], payload.get("brightness") or [])
+    motion = cast(Sequence[tuple[int, float]], payload.get("motion") or [])
+    header = {key: value for key, value in payload.items() if key not in {"brightness", "motion"}}
+    header["series_counts"] = [len(brightness), len(motion)]
+    open_artifact_index(path.parent).put(
+        _METRICS_ARTIFACT_KIND,
+        str(path),
+        fingerprint=str(payload.get("config_hash") or ""),
+        payload=json.dumps(header, sort_keys=True),
+        blob=_pack_metric_series(brightness, motion),
+        source_stat=stat_token(path),
+    )
+
+
+def _load_indexed_metrics_payload(path: Path) -> Optional[Dict[str, object]]:
+    """Return the metrics payload from the artifact index when it mirrors *path* exactly."""
+
+    token = stat_token(path)
+    if token is None:
+        return None
+    record = open_artifact_index(path.parent).get(_METRICS_ARTIFACT_KIND, str(path))
+    if record is None or record.source_stat != token or record.blob is None:
+        return None
+    try:
+        header = _coerce_str_dict(json.loads(record.payload))
+    except json.JSONDecodeError:
+        return None
+    if header is None:
+        return None
+    counts = _coerce_int_list(header.pop("series_counts", None))
+    if counts is None or len(counts) != 2:
+        return None
+    series = _unpack_metric_series(record.blob, counts)
+    if series is None:
+        return None
+    header["brightness"], header["motion"] = series
+    return header
+
+
 def _load_cached_metrics(
     info: FrameMetricsCacheInfo, cfg: AnalysisConfig
 ) -> Optional[CachedMetrics]:
@@ -753,6 +851,13 @@ def _save_selection_sidecar(
         _atomic_write_json(target, payload)
     except OSError:
         return
+    open_artifact_index(target.parent).put(
+        _SELECTION_ARTIFACT_KIND,
+        str(target),
+        fingerprint=str(payload.get("cache_key") or ""),
+        payload=json.dumps(payload, sort_keys=True),
+        source_stat=stat_token(target),
+    )
 
 
 def build_clip_inputs_from_paths(
@@ -879,12 +984,17 @@ def _load_selection_sidecar(
 
     selection_module = _selection_module()
     path = _selection_sidecar_path(info)
-    try:
-        raw = path.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return None
-    except OSError:
+    token = stat_token(path)
+    if token is None:
         return None
+    record = open_artifact_index(path.parent).get(_SELECTION_ARTIFACT_KIND, str(path))
+    if record is not None and record.source_stat == token:
+        raw = record.payload
+    else:
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
 
     try:
         data_raw = json.loads(raw)
@@ -1035,6 +1145,7 @@ def _save_cached_metrics(
     except OSError:
         # Failing to persist cache data should not abort the pipeline.
         return
+    _index_metrics_payload(path, payload)
 
     _save_selection_sidecar(info, cfg, selection_hash, selection_frames, selection_details or {})
 
@@ -511,22 +511,25 @@ def select_frames(
     skip_head_cutoff = window_start
     skip_tail_limit = window_end
 
-    analysis_clip = clip
-    if cfg.analyze_in_sdr:
-        if metrics.is_hdr_source(clip):
-            if color_cfg is None:
-                raise ValueError("color_cfg must be provided when analyze_in_sdr is enabled")
-            result = vs_core.process_clip_for_screenshot(
-                clip,
-                file_under_analysis,
-                color_cfg,
-                enable_overlay=False,
-                enable_verification=False,
-                logger_override=logger,
-            )
-            analysis_clip = result.clip
-        else:
+    def _build_analysis_clip() -> object:
+        # Built on demand so cached selections never open a deferred source clip.
+        source_clip = vs_core.resolve_clip(clip)
+        if not cfg.analyze_in_sdr:
+            return source_clip
+        if not metrics.is_hdr_source(source_clip):
             logger.info("[ANALYSIS] Source detected as SDR; skipping SDR tonemap path")
+            return source_clip
+        if color_cfg is None:
+            raise ValueError("color_cfg must be provided when analyze_in_sdr is enabled")
+        result = vs_core.process_clip_for_screenshot(
+            source_clip,
+            file_under_analysis,
+            color_cfg,
+            enable_overlay=False,
+            enable_verification=False,
+            logger_override=logger,
+        )
+        return result.clip
 
     step = max(1, int(cfg.step))
     indices = list(range(window_start, window_end, step))
@@ -696,6 +699,7 @@ def select_frames(
                 step,
                 cfg.analyze_in_sdr,
             )
+            analysis_clip = _build_analysis_clip()
             start_metrics = time.perf_counter()
             try:
                 brightness, motion = collect_metrics_fn(
@@ -0,0 +1,259 @@
+"""SQLite-backed index for cache artifacts shared across runs and processes.
+
+The index lives next to the other generated cache files in the media root and
+stores one row per ``(kind, key)`` pair: a fingerprint used for fast validity
+checks, a small JSON payload, and an optional binary blob for large numeric
+series. The database runs in WAL mode so concurrent runners (for example a
+``cache warm`` job and an interactive run) can read while another writes.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ARTIFACT_INDEX_FILENAME",
+    "ArtifactIndex",
+    "ArtifactRecord",
+    "open_artifact_index",
+    "stat_token",
+]
+
+ARTIFACT_INDEX_FILENAME = "generated.cache.sqlite3"
+
+_SCHEMA_VERSION = 1
+_BUSY_TIMEOUT_MS = 5000
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    blob BLOB,
+    source_stat TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID
+"""
+_UPSERT = """
+INSERT INTO artifacts (kind, key, fingerprint, payload, blob, source_stat, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (kind, key) DO UPDATE SET
+    fingerprint = excluded.fingerprint,
+    payload = excluded.payload,
+    blob = excluded.blob,
+    source_stat = excluded.source_stat,
+    updated_at = excluded.updated_at
+WHERE artifacts.fingerprint IS NOT excluded.fingerprint
+    OR artifacts.payload IS NOT excluded.payload
+    OR artifacts.blob IS NOT excluded.blob
+    OR artifacts.source_stat IS NOT excluded.source_stat
+"""
+
+
+@dataclass(frozen=True)
+class ArtifactRecord:
+    """Single row fetched from the artifact index."""
+
+    kind: str
+    key: str
+    fingerprint: str
+    payload: str
+    blob: Optional[bytes]
+    source_stat: Optional[str]
+    updated_at: str
+
+
+def stat_token(path: Path) -> Optional[str]:
+    """Return a ``size:mtime_ns`` token for *path*, or ``None`` when it cannot be stat'ed."""
+
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    mtime_ns = getattr(stat_result, "st_mtime_ns", int(stat_result.st_mtime * 1_000_000_000))
+    return f"{int(stat_result.st_size)}:{int(mtime_ns)}"
+
+
+class ArtifactIndex:
+    """Thread-safe handle to a WAL-mode SQLite artifact index.
+
+    Each thread gets its own connection; SQLite's file locking (with a busy
+    timeout) serialises writers across threads and processes. Any database
+    error disables the index for the rest of the process; callers check
+    :attr:`available` and fall back to their file-based caches (probe
+    snapshots go back to ``probe/<key>.json``) or recompute, instead of
+    failing the run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._disabled = False
+        self._initialised = False
+
+    @property
+    def available(self) -> bool:
+        """Return ``True`` while the index has not been disabled by an error."""
+
+        return not self._disabled
+
+    def _disable(self, exc: BaseException) -> None:
+        if not self._disabled:
+            logger.warning("Artifact index %s disabled: %s", self.path, exc)
+        self._disabled = True
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._disabled:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=_BUSY_TIMEOUT_MS / 1000.0,
+                isolation_level=None,
+            )
+            conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+            with self._lock:
+                if not self._initialised:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(_SCHEMA)
+                    version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+                    if version != _SCHEMA_VERSION:
+                        if version:
+                            conn.execute("DELETE FROM artifacts")
+                        conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+                    self._initialised = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except (sqlite3.Error, OSError) as exc:
+            self._disable(exc)
+            return None
+        self._local.conn = conn
+        return conn
+
+    def get(self, kind: str, key: str) -> Optional[ArtifactRecord]:
+        """Return the stored record for ``(kind, key)`` or ``None`` when absent."""
+
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT fingerprint, payload, blob, source_stat, updated_at FROM artifacts "
+                "WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            self._disable(exc)
+            return None
+        if row is None:
+            return None
+        fingerprint, payload, blob, source_stat, updated_at = row
+        return ArtifactRecord(
+            kind=kind,
+            key=key,
+            fingerprint=str(fingerprint),
+            payload=str(payload),
+            blob=bytes(blob) if blob is not None else None,
+            source_stat=str(source_stat) if source_stat is not None else None,
+            updated_at=str(updated_at),
+        )
+
+    def put(
+        self,
+        kind: str,
+        key: str,
+        *,
+        fingerprint: str,
+        payload: str,
+        blob: Optional[bytes] = None,
+        source_stat: Optional[str] = None,
+    ) -> bool:
+        """
+        Insert or replace ``(kind, key)`` in a single transaction.
+
+        Returns ``True`` when a row was written and ``False`` when the stored
+        row already matched (or the index is unavailable).
+        """
+
+        conn = self._connect()
+        if conn is None:
+            return False
+        updated_at = _dt.datetime.now(tz=_dt.timezone.utc).isoformat()
+        try:
+            cursor = conn.execute(
+                _UPSERT,
+                (kind, key, fingerprint, payload, blob, source_stat, updated_at),
+            )
+        except sqlite3.Error as exc:
+            self._disable(exc)
+            return False
+        return cursor.rowcount > 0
+
+    def delete(self, kind: str, key: str) -> None:
+        """Remove ``(kind, key)`` when present."""
+
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM artifacts WHERE kind = ? AND key = ?", (kind, key))
+        except sqlite3.Error as exc:
+            self._disable(exc)
+
+    def prune(self, kind: str, *, keep: int) -> int:
+        """Delete all but the *keep* most recently written rows of *kind*; return rows removed."""
+
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            cursor = conn.execute(
+                "DELETE FROM artifacts WHERE kind = ? AND key NOT IN ("
+                "SELECT key FROM artifacts WHERE kind = ? ORDER BY updated_at DESC LIMIT ?)",
+                (kind, kind, max(0, int(keep))),
+            )
+        except sqlite3.Error as exc:
+            self._disable(exc)
+            return 0
+        return max(0, cursor.rowcount)
+
+    def close(self) -> None:
+        """Close the calling thread's connection, if any."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            self._local.conn = None
+
+
+_INDEXES: Dict[Path, ArtifactIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def open_artifact_index(cache_root: Path) -> ArtifactIndex:
+    """Return the process-wide :class:`ArtifactIndex` stored under *cache_root*."""
+
+    db_path = Path(os.path.realpath(cache_root)) / ARTIFACT_INDEX_FILENAME
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(db_path)
+        if index is None:
+            index = ArtifactIndex(db_path)
+            _INDEXES[db_path] = index
+        return index
@@ -5,6 +5,9 @@ from __future__ import annotations
 import datetime as _dt
 import hashlib
 import json
+import logging
+import os
+import threading
 from pathlib import Path
 from typing import Any, List, Mapping, Optional, Sequence, cast
 
@@ -18,18 +21,24 @@ from src.frame_compare.analysis.cache_io import (
 )
 from src.frame_compare.cli_runtime import ClipPlan, ClipProbeSnapshot
 
+from .artifact_index import open_artifact_index
 from .preflight import resolve_subdir
 
+logger = logging.getLogger(__name__)
+
 __all__ = [
     "build_cache_info",
     "_build_cache_info",
     "compute_probe_cache_key",
     "load_probe_snapshot",
     "persist_probe_snapshot",
+    "probe_snapshot_location",
+    "record_audio_probe",
 ]
 
 _PROBE_CACHE_SCHEMA_VERSION = 1
 _PROBE_CACHE_SUBDIR = "probe"
+_PROBE_ARTIFACT_KIND = "probe"
 
 
 def _build_cache_info(
@@ -143,21 +152,36 @@ def compute_probe_cache_key(plan: ClipPlan) -> str:
     return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
 
 
+def probe_snapshot_location(cache_root: Path) -> Path:
+    """Return the artifact index path that stores probe snapshots under *cache_root*."""
+
+    return open_artifact_index(cache_root).path
+
+
 def load_probe_snapshot(cache_root: Path, cache_key: str) -> Optional[ClipProbeSnapshot]:
-    """Return the cached probe snapshot for *cache_key*, or ``None`` when missing."""
+    """
+    Return the cached probe snapshot for *cache_key*, or ``None`` when missing.
 
-    cache_path = _resolve_probe_cache_path(cache_root, cache_key)
-    try:
-        raw = cache_path.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return None
-    except OSError:
-        return None
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        return None
-    if data.get("schema_version") != _PROBE_CACHE_SCHEMA_VERSION:
+    Snapshots are read from the artifact index with a single keyed lookup. Legacy
+    ``probe/<key>.json`` files written by earlier releases are honoured once and
+    migrated into the index.
+    """
+
+    index = open_artifact_index(cache_root)
+    record = index.get(_PROBE_ARTIFACT_KIND, cache_key)
+    data: Optional[Mapping[str, Any]] = None
+    if record is not None:
+        data = _decode_snapshot_payload(record.payload)
+    if data is None:
+        data = _load_legacy_probe_payload(cache_root, cache_key)
+        if data is not None:
+            index.put(
+                _PROBE_ARTIFACT_KIND,
+                cache_key,
+                fingerprint=str(data.get("metadata_digest") or ""),
+                payload=json.dumps(data, sort_keys=True, ensure_ascii=False, default=_json_default),
+            )
+    if data is None:
         return None
     try:
         snapshot = ClipProbeSnapshot(
@@ -174,8 +198,11 @@ def load_probe_snapshot(cache_root: Path, cache_key: str) -> Optional[ClipProbeS
             tonemap_prop_keys=tuple(data.get("tonemap_prop_keys") or ()),
             metadata_digest=str(data.get("metadata_digest") or ""),
             cache_key=cache_key,
-            cache_path=cache_path,
+            cache_path=index.path,
             cached_at=str(data.get("cached_at") or ""),
+            probe_backend=str(data.get("probe_backend") or "vapoursynth"),
+            source_plugin=str(data["source_plugin"]) if data.get("source_plugin") else None,
+            audio_probe=dict(data["audio_probe"]) if isinstance(data.get("audio_probe"), dict) else None,
         )
     except Exception:
         return None
@@ -184,32 +211,109 @@ def load_probe_snapshot(cache_root: Path, cache_key: str) -> Optional[ClipProbeS
 
 def persist_probe_snapshot(cache_root: Path, snapshot: ClipProbeSnapshot) -> tuple[Path, bool]:
     """
-    Persist *snapshot* to cache_root/probe/<key>.json.
-
-    Returns ``(path, True)`` when a write occurred or ``(path, False)`` when the on-disk payload
-    already matched the in-memory snapshot.
+    Persist *snapshot* into the artifact index under cache_root.
+
+    Returns ``(index_path, True)`` when a write occurred or ``(index_path, False)`` when the stored
+    payload already matched the in-memory snapshot. Snapshots whose frame count was estimated
+    from the container duration are never stored; the source plugin's count replaces them once
+    the clip is opened. While the artifact index is disabled the payload is written to
+    ``probe/<key>.json`` instead (migrated into the index by the next successful load), and the
+    returned path is that file.
     """
 
     if snapshot.cache_key is None:
         raise ValueError("Snapshot cache_key must be set before persisting")
-    cache_path = _resolve_probe_cache_path(cache_root, snapshot.cache_key)
+    index = open_artifact_index(cache_root)
+    if not snapshot.num_frames_exact:
+        return index.path, False
+    if not snapshot.metadata_digest:
+        snapshot.metadata_digest = _metadata_digest(snapshot)
+    existing = index.get(_PROBE_ARTIFACT_KIND, snapshot.cache_key)
+    if existing is not None and existing.fingerprint == snapshot.metadata_digest:
+        existing_data = _decode_snapshot_payload(existing.payload)
+        if existing_data is not None and _snapshot_inputs_match(existing_data, snapshot):
+            if not snapshot.cached_at:
+                snapshot.cached_at = str(existing_data.get("cached_at") or "")
+            return index.path, False
     payload = _build_snapshot_payload(snapshot)
     serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_json_default)
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    wrote = index.put(
+        _PROBE_ARTIFACT_KIND,
+        snapshot.cache_key,
+        fingerprint=snapshot.metadata_digest,
+        payload=serialized,
+    )
+    if not index.available:
+        return _write_legacy_probe_payload(cache_root, snapshot.cache_key, serialized)
+    return index.path, wrote
+
+
+def record_audio_probe(
+    cache_root: Path,
+    snapshot: ClipProbeSnapshot,
+    audio_probe: Mapping[str, Any],
+) -> tuple[Path, bool]:
+    """
+    Attach an audio-alignment ffprobe payload to *snapshot* and persist it.
+
+    The metadata digest is recomputed so the stored row is rewritten even though the
+    video metadata it was first persisted with has not changed.
+    """
+
+    snapshot.audio_probe = dict(audio_probe)
+    snapshot.metadata_digest = _metadata_digest(snapshot)
+    return persist_probe_snapshot(cache_root, snapshot)
+
+
+def _decode_snapshot_payload(raw: str) -> Optional[Mapping[str, Any]]:
     try:
-        existing = cache_path.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        existing = None
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    typed = cast(dict[str, Any], data)
+    if typed.get("schema_version") != _PROBE_CACHE_SCHEMA_VERSION:
+        return None
+    return typed
+
+
+def _load_legacy_probe_payload(cache_root: Path, cache_key: str) -> Optional[Mapping[str, Any]]:
+    legacy_path = cache_root / _PROBE_CACHE_SUBDIR / f"{cache_key}.json"
+    try:
+        raw = legacy_path.read_text(encoding="utf-8")
     except OSError:
-        existing = None
-    if existing == serialized:
-        return cache_path, False
-    cache_path.write_text(serialized, encoding="utf-8")
-    return cache_path, True
+        return None
+    return _decode_snapshot_payload(raw)
 
 
-def _resolve_probe_cache_path(cache_root: Path, cache_key: str) -> Path:
-    return cache_root / _PROBE_CACHE_SUBDIR / f"{cache_key}.json"
+def _write_legacy_probe_payload(cache_root: Path, cache_key: str, serialized: str) -> tuple[Path, bool]:
+    legacy_path = cache_root / _PROBE_CACHE_SUBDIR / f"{cache_key}.json"
+    try:
+        if legacy_path.read_text(encoding="utf-8") == serialized:
+            return legacy_path, False
+    except OSError:
+        pass
+    staging = legacy_path.with_name(f"{legacy_path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        legacy_path.parent.mkdir(parents=True, exist_ok=True)
+        staging.write_text(serialized, encoding="utf-8")
+        staging.replace(legacy_path)
+    except OSError as exc:
+        staging.unlink(missing_ok=True)
+        logger.warning("Failed to write probe snapshot %s: %s", legacy_path, exc)
+        return legacy_path, False
+    return legacy_path, True
+
+
+def _snapshot_inputs_match(data: Mapping[str, Any], snapshot: ClipProbeSnapshot) -> bool:
+    return (
+        data.get("trim_start") == int(snapshot.trim_start)
+        and data.get("trim_end") == (int(snapshot.trim_end) if snapshot.trim_end is not None else None)
+        and data.get("fps_override") == _tuple_to_list(snapshot.fps_override)
+        and (data.get("probe_backend") or "vapoursynth") == snapshot.probe_backend
+        and data.get("source_plugin") == snapshot.source_plugin
+    )
 
 
 def _tuple_to_list(value: Optional[tuple[int, int]]) -> Optional[list[int]]:
@@ -229,7 +333,7 @@ def _list_to_tuple(value: Any) -> Optional[tuple[int, int]]:
 
 
 def _metadata_digest(snapshot: ClipProbeSnapshot) -> str:
-    payload = {
+    payload: dict[str, Any] = {
         "applied_fps": _tuple_to_list(snapshot.applied_fps),
         "effective_fps": _tuple_to_list(snapshot.effective_fps),
         "source_fps": _tuple_to_list(snapshot.source_fps),
@@ -239,6 +343,8 @@ def _metadata_digest(snapshot: ClipProbeSnapshot) -> str:
         "source_frame_props": snapshot.source_frame_props,
         "tonemap_prop_keys": list(snapshot.tonemap_prop_keys),
     }
+    if snapshot.audio_probe is not None:
+        payload["audio_probe"] = snapshot.audio_probe
     serialized = json.dumps(payload, sort_keys=True, default=_json_default)
     return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
 
@@ -264,6 +370,9 @@ def _build_snapshot_payload(snapshot: ClipProbeSnapshot) -> Mapping[str, Any]:
         "metadata_digest": snapshot.metadata_digest,
         "cache_key": snapshot.cache_key,
         "cached_at": snapshot.cached_at,
+        "probe_backend": snapshot.probe_backend,
+        "source_plugin": snapshot.source_plugin,
+        "audio_probe": snapshot.audio_probe,
     }
 
 
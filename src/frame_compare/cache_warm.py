@@ -0,0 +1,345 @@
+"""Workspace cache warm-up used by ``frame-compare cache warm``."""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Literal
+
+import src.frame_compare.cache as cache_utils
+import src.frame_compare.media as media_utils
+import src.frame_compare.metadata as metadata_utils
+import src.frame_compare.planner as planner_utils
+import src.frame_compare.preflight as preflight_utils
+import src.frame_compare.selection as selection_utils
+from src import audio_alignment
+from src.datatypes import AppConfig, RuntimeConfig
+from src.frame_compare import subproc as _subproc
+from src.frame_compare import vs as vs_core
+from src.frame_compare.analysis import probe_cached_metrics, select_frames
+from src.frame_compare.analyze_target import pick_analyze_file
+from src.frame_compare.cli_runtime import CLIAppError, ClipPlan
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CacheWarmRequest",
+    "CacheWarmResult",
+    "lower_process_priority",
+    "warm_cache",
+]
+
+MetricsWarmStatus = Literal["reused", "computed", "disabled", "skipped", "error"]
+AudioWarmStatus = Literal["computed", "disabled", "skipped", "error"]
+
+_LOW_PRIORITY_NICE = 10
+_DEFAULT_MAX_WORKERS = 4
+
+
+def _new_str_list() -> list[str]:
+    return []
+
+
+@dataclass(slots=True)
+class CacheWarmRequest:
+    """Inputs for a cache warm-up pass over a workspace."""
+
+    root_override: str | None = None
+    config_path: str | None = None
+    input_dir: str | None = None
+    workers: int | None = None
+    low_priority: bool = True
+    include_metrics: bool = True
+    include_audio: bool = True
+
+
+@dataclass(slots=True)
+class CacheWarmResult:
+    """Summary of the caches populated by :func:`warm_cache`."""
+
+    root: Path
+    files: list[Path]
+    probed: list[str] = field(default_factory=_new_str_list)
+    failed: list[str] = field(default_factory=_new_str_list)
+    analyze_file: str | None = None
+    metrics_status: MetricsWarmStatus = "skipped"
+    metrics_reason: str | None = None
+    audio_status: AudioWarmStatus = "skipped"
+    audio_reason: str | None = None
+    audio_envelopes: list[str] = field(default_factory=_new_str_list)
+    low_priority: bool = False
+    workers: int = 1
+    elapsed_seconds: float = 0.0
+
+
+def lower_process_priority() -> bool:
+    """
+    Drop the CPU and I/O scheduling priority of the current process.
+
+    On Linux the CFQ/BFQ schedulers derive best-effort I/O priority from the
+    nice value, so raising niceness alone already de-prioritises reads; when
+    ``ionice`` is available the process is moved to the lowest best-effort
+    level explicitly. Returns ``True`` when any adjustment was applied.
+    """
+
+    applied = False
+    try:
+        os.nice(_LOW_PRIORITY_NICE)
+        applied = True
+    except (AttributeError, OSError) as exc:
+        logger.debug("Unable to lower CPU priority: %s", exc)
+    if sys.platform.startswith("linux"):
+        ionice = shutil.which("ionice")
+        if ionice:
+            try:
+                completed = _subproc.run_checked(
+                    [ionice, "-c", "2", "-n", "7", "-p", str(os.getpid())],
+                    timeout=5,
+                )
+            except (OSError, ValueError) as exc:
+                logger.debug("ionice failed: %s", exc)
+            else:
+                if completed.returncode == 0:
+                    applied = True
+                else:
+                    logger.debug("ionice exited with %s: %s", completed.returncode, completed.stderr.strip())
+    return applied
+
+
+def _resolve_workers(requested: int | None, plan_count: int) -> int:
+    if requested is not None:
+        return max(1, min(int(requested), plan_count))
+    cpu_total = os.cpu_count() or 2
+    return max(1, min(_DEFAULT_MAX_WORKERS, cpu_total, plan_count))
+
+
+def _warm_probe(
+    plan: ClipPlan,
+    runtime_cfg: RuntimeConfig,
+    root: Path,
+    reference_fps: tuple[int, int] | None = None,
+) -> str | None:
+    """Probe (and index) a single plan, returning an error message on failure."""
+
+    try:
+        selection_utils.probe_clip_metadata([plan], runtime_cfg, root, reference_fps=reference_fps)
+    except vs_core.ClipInitError as exc:
+        return str(exc)
+    except CLIAppError as exc:
+        return str(exc)
+    return None
+
+
+def _warm_metrics(
+    plans: list[ClipPlan],
+    cfg: AppConfig,
+    root: Path,
+    analyze_path: Path,
+) -> tuple[MetricsWarmStatus, str | None]:
+    """Populate the frame-metrics cache for the current (configured) trims."""
+
+    if not cfg.analysis.save_frames_data:
+        return "disabled", "save_frames_data=false"
+    if len(plans) < 2:
+        return "skipped", "need at least two clips"
+    selection_utils.init_clips(plans, cfg.runtime, root)
+    analyze_index = [plan.path for plan in plans].index(analyze_path)
+    analyze_clip = plans[analyze_index].clip
+    if analyze_clip is None:
+        return "error", "analysis clip unavailable"
+    _specs, frame_window, _collapsed = selection_utils.resolve_selection_windows(plans, cfg.analysis)
+    cache_info = cache_utils.build_cache_info(root, plans, cfg, analyze_index)
+    if cache_info is None:
+        return "disabled", "no_cache_info"
+    if cache_info.path.exists():
+        probe = probe_cached_metrics(cache_info, cfg.analysis)
+        if probe.status == "reused":
+            return "reused", None
+    select_frames(
+        analyze_clip,
+        cfg.analysis,
+        [plan.path.name for plan in plans],
+        analyze_path.name,
+        cache_info=cache_info,
+        frame_window=frame_window,
+        color_cfg=cfg.color,
+    )
+    return "computed", None
+
+
+def _warm_audio(
+    plans: list[ClipPlan],
+    cfg: AppConfig,
+    root: Path,
+    analyze_path: Path,
+    workers: int,
+    result: CacheWarmResult,
+    emit: Callable[[str], None],
+) -> tuple[AudioWarmStatus, str | None]:
+    """Populate the onset-envelope cache used by audio alignment."""
+
+    # Deferred: alignment_runner is loaded through cli_runtime, which a module-level
+    # import here would enter half-initialised when ``frame_compare`` is imported first.
+    from src.frame_compare import alignment_runner
+
+    if not cfg.audio_alignment.enable:
+        return "disabled", "audio_alignment.enable=false"
+    if cfg.audio_alignment.signal == "video":
+        return "skipped", "audio_alignment.signal=video"
+    if len(plans) < 2:
+        return "skipped", "need at least two clips"
+    try:
+        outcomes = alignment_runner.warm_audio_envelopes(
+            plans,
+            cfg,
+            analyze_path,
+            root,
+            max_workers=workers,
+        )
+    except audio_alignment.AudioAlignmentError as exc:
+        return "error", str(exc)
+    failures = 0
+    for name, error in outcomes.items():
+        if error is None:
+            result.audio_envelopes.append(name)
+        else:
+            failures += 1
+            emit(f"[CACHE] Failed to compute audio envelope for {name}: {error}")
+    if failures:
+        return "error", f"{failures} file(s) failed"
+    return "computed", None
+
+
+def warm_cache(
+    request: CacheWarmRequest,
+    *,
+    notify: Callable[[str], None] | None = None,
+) -> CacheWarmResult:
+    """
+    Pre-populate probe snapshots, source indexes, frame metrics, and audio onset
+    envelopes for a workspace.
+
+    Parameters:
+        request (CacheWarmRequest): Workspace overrides and worker settings.
+        notify (Callable[[str], None] | None): Optional sink for progress lines.
+
+    Returns:
+        CacheWarmResult: Per-stage outcome so callers can render a summary.
+
+    Raises:
+        CLIAppError: When the workspace cannot be resolved or holds no media.
+    """
+
+    started = time.perf_counter()
+    def _log_note(message: str) -> None:
+        logger.info("%s", message)
+
+    emit: Callable[[str], None] = notify or _log_note
+
+    preflight = preflight_utils.prepare_preflight(
+        cli_root=request.root_override,
+        config_override=request.config_path,
+        input_override=request.input_dir,
+        ensure_config=False,
+        create_dirs=False,
+        create_media_dir=False,
+    )
+    cfg = preflight.config
+    root = preflight.media_root
+    if not root.exists():
+        raise CLIAppError(
+            f"Input directory not found: {root}",
+            rich_message=f"[red]Input directory not found:[/red] {root}",
+        )
+
+    low_priority = lower_process_priority() if request.low_priority else False
+
+    vs_core.configure(
+        search_paths=cfg.runtime.vapoursynth_python_paths,
+        source_preference=cfg.source.preferred,
+    )
+    try:
+        files = media_utils.discover_media(root)
+    except OSError as exc:
+        raise CLIAppError(
+            f"Failed to list input directory: {exc}",
+            rich_message=f"[red]Failed to list input directory:[/red] {exc}",
+        ) from exc
+    if not files:
+        raise CLIAppError(
+            f"No video files found under {root}",
+            rich_message=f"[red]No video files found under[/red] {root}",
+        )
+
+    metadata = list(metadata_utils.parse_metadata(files, cfg.naming))
+    plans = list(planner_utils.build_plans(files, metadata, cfg))
+    workers = _resolve_workers(request.workers, len(plans))
+    result = CacheWarmResult(root=root, files=list(files), low_priority=low_priority, workers=workers)
+
+    emit(f"[CACHE] Warming {len(plans)} clip(s) with {workers} worker(s)…")
+    # Targets are snapshotted with the reference FPS as their override, exactly
+    # as a full probe pass applies it, so the reference goes first.
+    reference = next((plan for plan in plans if plan.use_as_reference), None)
+    errors: dict[Path, str | None] = {}
+    reference_fps: tuple[int, int] | None = None
+    if reference is not None:
+        errors[reference.path] = _warm_probe(reference, cfg.runtime, root)
+        snapshot = reference.probe_snapshot
+        if snapshot is not None:
+            reference_fps = snapshot.effective_fps or snapshot.source_fps
+    targets = [plan for plan in plans if plan is not reference]
+    warm_target = partial(_warm_probe, runtime_cfg=cfg.runtime, root=root, reference_fps=reference_fps)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cache-warm") as pool:
+        errors.update(zip((plan.path for plan in targets), pool.map(warm_target, targets)))
+    for plan in plans:
+        error = errors[plan.path]
+        if error is None:
+            result.probed.append(plan.path.name)
+        else:
+            result.failed.append(plan.path.name)
+            emit(f"[CACHE] Failed to probe {plan.path.name}: {error}")
+    # Header-only probes defer source indexing to background workers; warming
+    # exists to build those indexes, so wait for them before moving on.
+    selection_utils.wait_for_background_indexing()
+
+    analyze_path: Path | None = None
+    if result.failed:
+        result.metrics_status = "skipped"
+        result.metrics_reason = "probe failures"
+    else:
+        analyze_path = pick_analyze_file(files, metadata, cfg.analysis.analyze_clip, cache_dir=root)
+        result.analyze_file = analyze_path.name
+        if not request.include_metrics:
+            result.metrics_status = "skipped"
+            result.metrics_reason = "disabled by request"
+        else:
+            emit(f"[CACHE] Collecting frame metrics for {analyze_path.name}…")
+            try:
+                status, reason = _warm_metrics(plans, cfg, root, analyze_path)
+            except (CLIAppError, vs_core.ClipInitError, RuntimeError) as exc:
+                status, reason = "error", str(exc)
+            result.metrics_status = status
+            result.metrics_reason = reason
+
+    if analyze_path is None:
+        result.audio_status = "skipped"
+        result.audio_reason = "probe failures"
+    elif not request.include_audio:
+        result.audio_status = "skipped"
+        result.audio_reason = "disabled by request"
+    else:
+        if cfg.audio_alignment.enable:
+            emit("[CACHE] Computing audio onset envelopes…")
+        audio_status, audio_reason = _warm_audio(plans, cfg, root, analyze_path, workers, result, emit)
+        result.audio_status = audio_status
+        result.audio_reason = audio_reason
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
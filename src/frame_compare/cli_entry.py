@@ -11,18 +11,20 @@ import shutil
 import sys
 import webbrowser
 from collections.abc import Mapping
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from pathlib import Path
 from typing import Any, Dict, MutableMapping, Optional, cast
 
 import click
 from rich import print
 
+import src.frame_compare.cache_warm as cache_warm_module
 import src.frame_compare.config_writer as config_writer
 import src.frame_compare.doctor as doctor_module
 import src.frame_compare.preflight as _preflight
 import src.frame_compare.presets as presets_lib
 import src.frame_compare.wizard as _wizard
+import src.tmdb_index as tmdb_index_module
 from src.config_loader import ConfigError, load_config
 from src.frame_compare.cli_runtime import (  # pyright: ignore[reportPrivateUsage]
     JsonTail,
@@ -45,7 +47,54 @@ from src.frame_compare.preflight import (
     resolve_workspace_root,
 )  # pyright: ignore[reportPrivateUsage]
 from src.frame_compare.runner import RunResult
-from src.frame_compare.slowpics import build_shortcut_filename
+from src.frame_compare.slowpics import (
+    SlowpicsAPIError,
+    UploadJournal,
+    build_shortcut_filename,
+    upload_comparison,
+)
+
+
+def _resume_slowpics_upload(*, root_path: str | None, config_path: str | None, input_dir: str | None) -> None:
+    """Upload the images an interrupted slow.pics run left unsent, reusing its collection."""
+
+    try:
+        preflight = prepare_preflight(
+            cli_root=root_path,
+            config_override=config_path,
+            input_override=input_dir,
+            ensure_config=False,
+            create_dirs=False,
+            create_media_dir=False,
+        )
+        screen_dir = resolve_subdir(
+            preflight.media_root,
+            preflight.config.screenshots.directory_name,
+            purpose="screenshots.directory_name",
+        )
+    except CLIAppError as exc:
+        print(exc.rich_message)
+        raise click.exceptions.Exit(exc.code) from exc
+
+    journal = UploadJournal.load(screen_dir)
+    if journal is None:
+        raise click.ClickException(f"No interrupted slow.pics upload found in {screen_dir}")
+    slowpics_cfg = replace(
+        preflight.config.slowpics,
+        collection_name=journal.collection_name or preflight.config.slowpics.collection_name,
+    )
+    remaining = len(journal.images) - len(journal.completed)
+    print(f"Resuming slow.pics upload: {remaining} of {len(journal.images)} images left")
+    try:
+        slowpics_url = upload_comparison(
+            [str(screen_dir / name) for name in sorted(journal.images)],
+            screen_dir,
+            slowpics_cfg,
+            resume=True,
+        )
+    except SlowpicsAPIError as exc:
+        raise click.ClickException(f"slow.pics upload failed: {exc}") from exc
+    print(f"slow.pics URL: {slowpics_url}")
 
 
 def _run_cli_entry(
@@ -64,6 +113,7 @@ def _run_cli_entry(
     show_partial: bool,
     show_missing: bool,
     diagnose_paths: bool,
+    resume_upload: bool = False,
     write_config: bool,
     skip_wizard: bool,
     html_report_enable: bool,
@@ -185,6 +235,10 @@ def _run_cli_entry(
         print(json.dumps(diagnostics, separators=(",", ":")))
         return
 
+    if resume_upload:
+        _resume_slowpics_upload(root_path=root_path, config_path=config_path, input_dir=input_dir)
+        return
+
     from frame_compare import run_cli
 
     try:
@@ -509,6 +563,11 @@ def _execute_wizard_session(
     is_flag=True,
     help="Print the resolved config/input/output paths as JSON and exit.",
 )
+@click.option(
+    "--resume-upload",
+    is_flag=True,
+    help="Finish an interrupted slow.pics upload from the journal in the screenshots directory and exit.",
+)
 @click.option(
     "--write-config",
     is_flag=True,
@@ -647,6 +706,7 @@ def main(
     show_partial: bool,
     show_missing: bool,
     diagnose_paths: bool,
+    resume_upload: bool,
     write_config: bool,
     no_wizard: bool,
     html_report_enable: bool,
@@ -692,6 +752,7 @@ def main(
     show_partial = _cli_flag_value(ctx, "show_partial", show_partial, default=False)
     show_missing = _cli_flag_value(ctx, "show_missing", show_missing, default=True)
     diagnose_paths = _cli_flag_value(ctx, "diagnose_paths", diagnose_paths, default=False)
+    resume_upload = _cli_flag_value(ctx, "resume_upload", resume_upload, default=False)
     write_config = _cli_flag_value(ctx, "write_config", write_config, default=False)
     skip_wizard_flag = _cli_flag_value(ctx, "no_wizard", no_wizard, default=False)
     html_report_enable = _cli_flag_value(ctx, "html_report_enable", html_report_enable, default=False)
@@ -738,6 +799,7 @@ def main(
         "show_partial": show_partial,
         "show_missing": show_missing,
         "diagnose_paths": diagnose_paths,
+        "resume_upload": resume_upload,
         "write_config": write_config,
         "skip_wizard": skip_wizard_flag,
         "html_report_enable": html_report_enable,
@@ -792,6 +854,7 @@ def run_command(ctx: click.Context) -> None:
         show_partial=bool(params.get("show_partial", False)),
         show_missing=bool(params.get("show_missing", True)),
         diagnose_paths=bool(params.get("diagnose_paths", False)),
+        resume_upload=bool(params.get("resume_upload", False)),
         write_config=bool(params.get("write_config", False)),
         skip_wizard=bool(params.get("skip_wizard", False)),
         html_report_enable=bool(params.get("html_report_enable", False)),
@@ -969,6 +1032,122 @@ def preset_apply(ctx: click.Context, name: str) -> None:
     click.echo(f"Wrote config to {config_path}")
 
 
+@main.group("cache")
+@click.pass_context
+def cache_group(ctx: click.Context) -> None:
+    """Cache maintenance helpers."""
+
+    if ctx.parent is not None:
+        ctx.obj = ctx.parent.ensure_object(dict)
+    else:
+        ctx.obj = ctx.ensure_object(dict)
+
+
+@cache_group.command("warm")
+@click.option(
+    "--root",
+    "warm_root",
+    default=None,
+    help="Workspace root to warm. Defaults to the top-level --root or sentinel discovery.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of clips probed concurrently (default: min(4, CPU count)).",
+)
+@click.option("--skip-metrics", is_flag=True, help="Only probe/index clips; skip frame-metrics collection.")
+@click.option("--skip-audio", is_flag=True, help="Skip the audio onset-envelope stage.")
+@click.option(
+    "--normal-priority",
+    is_flag=True,
+    help="Keep the default CPU/I/O priority instead of running as a low-priority background job.",
+)
+@click.option("--json", "json_mode", is_flag=True, help="Emit a machine-readable summary.")
+@click.pass_context
+def cache_warm(
+    ctx: click.Context,
+    warm_root: str | None,
+    workers: int | None,
+    skip_metrics: bool,
+    skip_audio: bool,
+    normal_priority: bool,
+    json_mode: bool,
+) -> None:
+    """Pre-index and probe every clip so the next run starts from a warm cache."""
+
+    params = cast(Dict[str, Any], ctx.ensure_object(dict))
+    request = cache_warm_module.CacheWarmRequest(
+        root_override=warm_root or params.get("root_path"),
+        config_path=params.get("config_path"),
+        input_dir=params.get("input_dir"),
+        workers=workers,
+        low_priority=not normal_priority,
+        include_metrics=not skip_metrics,
+        include_audio=not skip_audio,
+    )
+    notify = None if json_mode else click.echo
+    try:
+        result = cache_warm_module.warm_cache(request, notify=notify)
+    except CLIAppError as exc:
+        print(exc.rich_message)
+        raise click.exceptions.Exit(exc.code) from exc
+
+    if json_mode:
+        payload = {
+            "root": str(result.root),
+            "files": [path.name for path in result.files],
+            "probed": result.probed,
+            "failed": result.failed,
+            "analyze_file": result.analyze_file,
+            "metrics": {"status": result.metrics_status, "reason": result.metrics_reason},
+            "audio": {
+                "status": result.audio_status,
+                "reason": result.audio_reason,
+                "envelopes": result.audio_envelopes,
+            },
+            "workers": result.workers,
+            "low_priority": result.low_priority,
+            "elapsed_s": round(result.elapsed_seconds, 3),
+        }
+        click.echo(json.dumps(payload, separators=(",", ":")))
+    else:
+        metrics_note = result.metrics_status
+        if result.metrics_reason:
+            metrics_note = f"{metrics_note} ({result.metrics_reason})"
+        audio_note = result.audio_status
+        if result.audio_reason:
+            audio_note = f"{audio_note} ({result.audio_reason})"
+        click.echo(
+            f"[CACHE] Warm summary: probed={len(result.probed)} failed={len(result.failed)} "
+            f"metrics={metrics_note} audio={audio_note} elapsed={result.elapsed_seconds:.1f}s"
+        )
+    if result.failed:
+        raise click.exceptions.Exit(1)
+
+
+@main.group("tmdb")
+def tmdb_group() -> None:
+    """TMDB lookup helpers."""
+
+
+@tmdb_group.command("build-index")
+@click.argument("dumps", nargs=-1, required=True)
+@click.option("--out", "out_path", required=True, help="Index file to write; point [tmdb].title_index at it.")
+def tmdb_build_index(dumps: tuple[str, ...], out_path: str) -> None:
+    """Build an offline title index from TMDB daily ID export dumps (.json or .json.gz)."""
+
+    destination = Path(out_path).expanduser()
+    try:
+        stats = tmdb_index_module.build_title_index([Path(dump).expanduser() for dump in dumps], destination)
+    except tmdb_index_module.TitleIndexError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(
+        f"[TMDB] Indexed movies={stats.movies} tv={stats.tv} skipped={stats.skipped} "
+        f"grams={stats.grams} -> {destination}"
+    )
+
+
 cli = main
 
 __all__ = ["cli", "main"]
@@ -69,8 +69,12 @@ class ClipProbeSnapshot:
         tonemap_prop_keys (Tuple[str, ...]): Sorted list of tonemapping-critical prop keys.
         metadata_digest (str): Hash of the recorded metadata payload for quick change checks.
         cache_key (Optional[str]): Stable cache key derived from file stats + trim/FPS inputs.
-        cache_path (Optional[Path]): Path to the persisted JSON payload, when available.
+        cache_path (Optional[Path]): Artifact index holding the persisted payload, when available.
         cached_at (Optional[str]): ISO8601 timestamp describing when the snapshot hit disk.
+        probe_backend (str): ``"vapoursynth"`` when the clip was opened, ``"ffprobe"`` for header-only probes.
+        num_frames_exact (bool): ``False`` when ``source_num_frames`` was estimated from the container duration.
+        source_plugin (Optional[str]): Source plugin picked by the ``auto`` seek benchmark, when it ran.
+        audio_probe (Optional[Dict[str, Any]]): Audio streams + FPS from the audio-alignment ffprobe, when recorded.
         clip (Optional[object]): Live VapourSynth clip handle (never serialized) for reuse.
     """
 
@@ -89,6 +93,10 @@ class ClipProbeSnapshot:
     cache_key: Optional[str] = None
     cache_path: Optional[Path] = None
     cached_at: Optional[str] = None
+    probe_backend: str = "vapoursynth"
+    num_frames_exact: bool = True
+    source_plugin: Optional[str] = None
+    audio_probe: Optional[Dict[str, Any]] = None
     clip: Optional[object] = None
 
 
@@ -160,6 +168,16 @@ class SlowpicsTitleBlock(TypedDict):
     final: Optional[str]
 
 
+class SlowpicsUploadJSON(TypedDict):
+    adaptive: bool
+    concurrency: int
+    peak_concurrency: int
+    backoffs: int
+    bytes: int
+    seconds: float
+    mb_per_s: float
+
+
 class SlowpicsJSON(TypedDict):
     enabled: bool
     title: SlowpicsTitleBlock
@@ -171,15 +189,18 @@ class SlowpicsJSON(TypedDict):
     is_public: bool
     is_hentai: bool
     remove_after_days: int
+    upload: Optional[SlowpicsUploadJSON]
 
 
 class AudioAlignmentJSON(TypedDict, total=False):
     enabled: bool
+    signal: str
     reference_stream: Optional[str]
     target_stream: dict[str, object]
     offsets_sec: dict[str, object]
     offsets_frames: dict[str, object]
     measurements: dict[str, dict[str, object]]
+    offset_maps: dict[str, list[dict[str, object]]]
     stream_lines: list[str]
     stream_lines_text: str
     offset_lines: list[str]
@@ -321,6 +342,7 @@ def _ensure_slowpics_block(json_tail: JsonTail, cfg: "AppConfig") -> SlowpicsJSO
             is_public=bool(cfg.slowpics.is_public),
             is_hentai=bool(cfg.slowpics.is_hentai),
             remove_after_days=int(cfg.slowpics.remove_after_days),
+            upload=None,
         )
         json_tail["slowpics"] = block
         return block
@@ -336,6 +358,8 @@ def _ensure_slowpics_block(json_tail: JsonTail, cfg: "AppConfig") -> SlowpicsJSO
         existing_block["shortcut_error"] = None
     if "deleted_screens_dir" not in existing_block:
         existing_block["deleted_screens_dir"] = False
+    if "upload" not in existing_block:
+        existing_block["upload"] = None
     return existing_block
 
 ensure_slowpics_block = _ensure_slowpics_block
@@ -576,6 +600,7 @@ __all__ = [
     "SlowpicsJSON",
     "SlowpicsTitleBlock",
     "SlowpicsTitleInputs",
+    "SlowpicsUploadJSON",
     "ViewerJSON",
     "_AudioAlignmentDisplayData",
     "_AudioAlignmentSummary",
@@ -139,7 +139,7 @@ def collect_checks(
         "message": ffmpeg_message,
     })
 
-    audio_modules = {"librosa": importlib.util.find_spec("librosa"), "soundfile": importlib.util.find_spec("soundfile")}
+    audio_modules = {"numpy": importlib.util.find_spec("numpy")}
     missing_audio = [name for name, spec in audio_modules.items() if spec is None]
     if not missing_audio:
         audio_status: DoctorStatus = "pass"
@@ -0,0 +1,385 @@
+"""Lightweight ffprobe-backed clip probe used before VapourSynth indexing.
+
+Opening a clip through lsmas/ffms2 forces a full index on first contact, which
+can take minutes for large remuxes. The helpers here read only the container
+headers plus the first video frame's side data so FPS, geometry, frame count and
+HDR/DoVi metadata are known immediately. Values are mapped onto the frame prop
+names and integer codes VapourSynth source plugins report so downstream
+tonemapping sees the same shape regardless of which probe produced them.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from fractions import Fraction
+from pathlib import Path
+from shutil import which
+from typing import Any, Dict, Final, Mapping, Optional, Sequence, Tuple, cast
+
+from src.frame_compare import subproc as _subproc
+
+logger = logging.getLogger(__name__)
+
+__all__: Final = [
+    "FastProbeResult",
+    "fast_probe_available",
+    "fast_probe_clip",
+    "parse_ffprobe_payload",
+    "trimmed_frame_count",
+]
+
+_FFPROBE_TIMEOUT_SECONDS = 30.0
+# Average and nominal rates that disagree by more than this are treated as VFR;
+# the source plugins normalise those differently, so the caller must open the clip.
+_VFR_TOLERANCE = 0.01
+
+_MATRIX_CODES: Final[Mapping[str, int]] = {
+    "gbr": 0,
+    "rgb": 0,
+    "bt709": 1,
+    "fcc": 4,
+    "bt470bg": 5,
+    "smpte170m": 6,
+    "smpte240m": 7,
+    "ycgco": 8,
+    "bt2020nc": 9,
+    "bt2020c": 10,
+    "chroma-derived-nc": 12,
+    "chroma-derived-c": 13,
+    "ictcp": 14,
+}
+_TRANSFER_CODES: Final[Mapping[str, int]] = {
+    "bt709": 1,
+    "gamma22": 4,
+    "gamma28": 5,
+    "smpte170m": 6,
+    "smpte240m": 7,
+    "linear": 8,
+    "log100": 9,
+    "log316": 10,
+    "iec61966-2-4": 11,
+    "bt1361e": 12,
+    "iec61966-2-1": 13,
+    "bt2020-10": 14,
+    "bt2020-12": 15,
+    "smpte2084": 16,
+    "smpte428": 17,
+    "arib-std-b67": 18,
+}
+_PRIMARIES_CODES: Final[Mapping[str, int]] = {
+    "bt709": 1,
+    "bt470m": 4,
+    "bt470bg": 5,
+    "smpte170m": 6,
+    "smpte240m": 7,
+    "film": 8,
+    "bt2020": 9,
+    "smpte428": 10,
+    "smpte431": 11,
+    "smpte432": 12,
+    "jedec-p22": 22,
+}
+_RANGE_CODES: Final[Mapping[str, int]] = {"pc": 0, "jpeg": 0, "tv": 1, "mpeg": 1}
+_CHROMA_LOCATION_CODES: Final[Mapping[str, int]] = {
+    "left": 0,
+    "center": 1,
+    "topleft": 2,
+    "top": 3,
+    "bottomleft": 4,
+    "bottom": 5,
+}
+_FIELD_ORDER_CODES: Final[Mapping[str, int]] = {"progressive": 0, "bb": 1, "bt": 1, "tt": 2, "tb": 2}
+_FRAME_COUNT_TAGS = ("NUMBER_OF_FRAMES", "NUMBER_OF_FRAMES-eng")
+
+
+@dataclass(slots=True)
+class FastProbeResult:
+    """Container-level metadata for the first video stream of a clip.
+
+    Attributes:
+        width (int): Coded width of the stream.
+        height (int): Coded height of the stream.
+        fps (Tuple[int, int]): Nominal frame rate as ``(num, den)``.
+        num_frames (int): Untrimmed frame count.
+        num_frames_exact (bool): ``False`` when the count was derived from duration × FPS.
+        frame_props (Dict[str, Any]): VapourSynth-style frame props (colour, HDR, DoVi).
+    """
+
+    width: int
+    height: int
+    fps: Tuple[int, int]
+    num_frames: int
+    num_frames_exact: bool
+    frame_props: Dict[str, Any] = field(default_factory=lambda: cast(Dict[str, Any], {}))
+
+
+def fast_probe_available() -> bool:
+    """Return ``True`` when ffprobe is discoverable on PATH."""
+
+    return which("ffprobe") is not None
+
+
+def fast_probe_clip(path: Path, *, timeout: float = _FFPROBE_TIMEOUT_SECONDS) -> Optional[FastProbeResult]:
+    """
+    Probe *path* with ffprobe and return header metadata, or ``None`` on any failure.
+
+    Only the stream headers and the first decoded frame's side data are read, so
+    the call costs milliseconds regardless of file size.
+    """
+
+    if not fast_probe_available():
+        return None
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_streams",
+        "-show_format",
+        "-show_frames",
+        "-read_intervals",
+        "%+#1",
+        "-of",
+        "json",
+        str(path),
+    ]
+    try:
+        completed = _subproc.run_checked(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.debug("ffprobe fast probe failed for %s: %s", path.name, exc)
+        return None
+    if completed.returncode != 0:
+        logger.debug("ffprobe fast probe exited %s for %s", completed.returncode, path.name)
+        return None
+    try:
+        payload = json.loads(completed.stdout or "{}")
+    except json.JSONDecodeError:
+        logger.debug("ffprobe fast probe returned invalid JSON for %s", path.name)
+        return None
+    if not isinstance(payload, dict):
+        return None
+    return parse_ffprobe_payload(cast(Dict[str, Any], payload))
+
+
+def parse_ffprobe_payload(payload: Mapping[str, Any]) -> Optional[FastProbeResult]:
+    """
+    Convert an ffprobe JSON document into a :class:`FastProbeResult`.
+
+    Returns ``None`` when the payload lacks a usable video stream or describes
+    variable frame rate content that must be resolved by the source plugin.
+    """
+
+    stream = _first_mapping(payload.get("streams"))
+    if stream is None:
+        return None
+    width = _as_int(stream.get("width"))
+    height = _as_int(stream.get("height"))
+    fps = _parse_rate(stream.get("r_frame_rate"))
+    if not width or not height or fps is None:
+        return None
+    avg_fps = _parse_rate(stream.get("avg_frame_rate"))
+    if avg_fps is not None:
+        nominal = Fraction(*fps)
+        if abs(Fraction(*avg_fps) - nominal) / nominal > _VFR_TOLERANCE:
+            return None
+
+    num_frames, exact = _frame_count(stream, _as_mapping(payload.get("format")), fps)
+    if num_frames is None:
+        return None
+
+    frame = _first_mapping(payload.get("frames")) or {}
+    props: Dict[str, Any] = {}
+    _map_color_props(props, stream, frame)
+    for side_data in _side_data(stream) + _side_data(frame):
+        _map_side_data(props, side_data)
+    return FastProbeResult(
+        width=width,
+        height=height,
+        fps=fps,
+        num_frames=num_frames,
+        num_frames_exact=exact,
+        frame_props=props,
+    )
+
+
+def trimmed_frame_count(total: int, trim_start: int, trim_end: Optional[int]) -> int:
+    """Return the frame count ``init_clip`` produces for *total* frames after trims."""
+
+    count = max(int(total), 0)
+    if trim_start < 0:
+        count += abs(int(trim_start))
+    elif trim_start > 0:
+        count = max(count - int(trim_start), 0)
+    if trim_end is not None and trim_end != 0:
+        count = len(range(count)[: int(trim_end)])
+    return count
+
+
+def _first_mapping(value: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(value, list):
+        for entry in cast(Sequence[Any], value):
+            if isinstance(entry, dict):
+                return cast(Dict[str, Any], entry)
+    return None
+
+
+def _as_mapping(value: Any) -> Dict[str, Any]:
+    if isinstance(value, dict):
+        return cast(Dict[str, Any], value)
+    return {}
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        if "/" in text:
+            return float(Fraction(text))
+        return float(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _parse_rate(value: Any) -> Optional[Tuple[int, int]]:
+    if not isinstance(value, str) or "/" not in value:
+        return None
+    num_text, _, den_text = value.partition("/")
+    num = _as_int(num_text)
+    den = _as_int(den_text)
+    if not num or not den or num <= 0 or den <= 0:
+        return None
+    return num, den
+
+
+def _parse_duration(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    if ":" in text:
+        try:
+            hours, minutes, seconds = text.split(":")
+            return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        except ValueError:
+            return None
+    return _as_float(text)
+
+
+def _frame_count(
+    stream: Mapping[str, Any],
+    fmt: Mapping[str, Any],
+    fps: Tuple[int, int],
+) -> Tuple[Optional[int], bool]:
+    nb_frames = _as_int(stream.get("nb_frames"))
+    if nb_frames:
+        return nb_frames, True
+    tags = _as_mapping(stream.get("tags"))
+    for tag in _FRAME_COUNT_TAGS:
+        tagged = _as_int(tags.get(tag))
+        if tagged:
+            return tagged, True
+    for candidate in (stream.get("duration"), tags.get("DURATION"), tags.get("DURATION-eng"), fmt.get("duration")):
+        seconds = _parse_duration(candidate)
+        if seconds and seconds > 0:
+            return int(round(seconds * fps[0] / fps[1])), False
+    return None, False
+
+
+def _side_data(entry: Mapping[str, Any]) -> list[Dict[str, Any]]:
+    raw = entry.get("side_data_list")
+    if not isinstance(raw, list):
+        return []
+    return [cast(Dict[str, Any], item) for item in cast(Sequence[Any], raw) if isinstance(item, dict)]
+
+
+def _lookup_code(codes: Mapping[str, int], *values: Any) -> Optional[int]:
+    for value in values:
+        if isinstance(value, str):
+            code = codes.get(value.strip().lower())
+            if code is not None:
+                return code
+    return None
+
+
+def _map_color_props(props: Dict[str, Any], stream: Mapping[str, Any], frame: Mapping[str, Any]) -> None:
+    mapping = (
+        ("_Matrix", _MATRIX_CODES, "color_space"),
+        ("_Transfer", _TRANSFER_CODES, "color_transfer"),
+        ("_Primaries", _PRIMARIES_CODES, "color_primaries"),
+        ("_ColorRange", _RANGE_CODES, "color_range"),
+        ("_ChromaLocation", _CHROMA_LOCATION_CODES, "chroma_location"),
+        ("_FieldBased", _FIELD_ORDER_CODES, "field_order"),
+    )
+    for prop, codes, key in mapping:
+        code = _lookup_code(codes, frame.get(key), stream.get(key))
+        if code is not None:
+            props[prop] = code
+    sar = stream.get("sample_aspect_ratio")
+    if isinstance(sar, str) and ":" in sar:
+        num_text, _, den_text = sar.partition(":")
+        num = _as_int(num_text)
+        den = _as_int(den_text)
+        if num and den:
+            props["_SARNum"] = num
+            props["_SARDen"] = den
+
+
+def _map_side_data(props: Dict[str, Any], side_data: Mapping[str, Any]) -> None:
+    kind = str(side_data.get("side_data_type") or "").strip().lower()
+    if kind == "mastering display metadata":
+        primaries_x = [_as_float(side_data.get(f"{colour}_x")) for colour in ("red", "green", "blue")]
+        primaries_y = [_as_float(side_data.get(f"{colour}_y")) for colour in ("red", "green", "blue")]
+        if all(value is not None for value in primaries_x + primaries_y):
+            props.setdefault("MasteringDisplayPrimariesX", primaries_x)
+            props.setdefault("MasteringDisplayPrimariesY", primaries_y)
+        white_x = _as_float(side_data.get("white_point_x"))
+        white_y = _as_float(side_data.get("white_point_y"))
+        if white_x is not None and white_y is not None:
+            props.setdefault("MasteringDisplayWhitePointX", white_x)
+            props.setdefault("MasteringDisplayWhitePointY", white_y)
+        min_lum = _as_float(side_data.get("min_luminance"))
+        max_lum = _as_float(side_data.get("max_luminance"))
+        if min_lum is not None:
+            props.setdefault("MasteringDisplayMinLuminance", min_lum)
+        if max_lum is not None:
+            props.setdefault("MasteringDisplayMaxLuminance", max_lum)
+    elif kind == "content light level metadata":
+        max_content = _as_int(side_data.get("max_content"))
+        max_average = _as_int(side_data.get("max_average"))
+        if max_content is not None:
+            props.setdefault("ContentLightLevelMax", max_content)
+        if max_average is not None:
+            props.setdefault("ContentLightLevelAverage", max_average)
+    elif kind == "dovi configuration record":
+        profile = _as_int(side_data.get("dv_profile"))
+        level = _as_int(side_data.get("dv_level"))
+        if profile is not None:
+            props.setdefault("DolbyVisionProfile", profile)
+        if level is not None:
+            props.setdefault("DolbyVisionLevel", level)
+        for source_key, prop in (
+            ("rpu_present_flag", "DolbyVisionRPUPresent"),
+            ("el_present_flag", "DolbyVisionELPresent"),
+            ("bl_present_flag", "DolbyVisionBLPresent"),
+            ("dv_bl_signal_compatibility_id", "DolbyVisionBLCompatibilityID"),
+        ):
+            value = _as_int(side_data.get(source_key))
+            if value is not None:
+                props.setdefault(prop, value)
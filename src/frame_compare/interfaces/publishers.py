@@ -8,6 +8,7 @@ from typing import Callable, Protocol
 
 from src.datatypes import ReportConfig, SlowpicsConfig
 from src.frame_compare.analysis import SelectionDetail
+from src.frame_compare.slowpics import UploadStats
 
 
 class PublisherIO(Protocol):
@@ -36,6 +37,9 @@ class SlowpicsClientProtocol(Protocol):
         cfg: SlowpicsConfig,
         *,
         progress_callback: Callable[[int], None] | None = None,
+        byte_progress_callback: Callable[[int], None] | None = None,
+        stats_callback: Callable[[UploadStats], None] | None = None,
+        prepare_image: Callable[[Path], None] | None = None,
     ) -> str:
         """Upload *image_paths* and return the canonical collection URL."""
         ...
@@ -59,3 +63,7 @@ class ReportRendererProtocol(Protocol):
     ) -> Path:
         """Generate the HTML report and return the index path."""
         ...
+
+    def set_slowpics_url(self, report_index: Path, slowpics_url: str | None) -> None:
+        """Rewrite an already generated report so it links to *slowpics_url*."""
+        ...
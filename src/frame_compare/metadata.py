@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, Iterable, Mapping, MutableSequence, Optional, Sequence, TypeVar
 
 from src.datatypes import NamingConfig
-from src.utils import parse_filename_metadata
+from src.utils import parse_filename_metadata, prime_filename_parses
 
 OverrideValue = TypeVar("OverrideValue")
 
@@ -24,6 +24,12 @@ def parse_metadata(files: Sequence[Path], naming_cfg: NamingConfig) -> list[dict
     ``src.frame_compare.core``.
     """
 
+    # Parse every name up front (in a process pool for large batches) so the
+    # per-file loop below, TMDB matching and later runs hit the parse cache.
+    prime_filename_parses(
+        [file.name for file in files],
+        parsers=("guessit",) if naming_cfg.prefer_guessit else ("anitopy",),
+    )
     metadata: list[dict[str, str]] = []
     for file in files:
         info = parse_filename_metadata(
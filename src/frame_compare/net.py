@@ -5,28 +5,49 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import logging
-from collections.abc import Awaitable, Callable, Mapping
-from typing import Iterable
+import threading
+import time
+from collections.abc import Awaitable, Callable, Coroutine, Mapping
+from typing import Any, Dict, Hashable, Iterable, Optional, TypeVar, cast
 from urllib.parse import urlsplit
 
 import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
 from urllib3.util import Retry
 
 __all__ = [
     "BackoffError",
+    "HostRateLimiter",
+    "SharedHTTPAdapter",
     "ALLOWED_METHODS",
     "DEFAULT_CONNECT_TIMEOUT",
     "DEFAULT_HTTP_TIMEOUT",
     "DEFAULT_READ_TIMEOUT",
     "RETRY_STATUS",
     "build_urllib3_retry",
+    "close_shared_pools",
+    "configure_host_rate",
     "default_requests_timeouts",
+    "host_limiter",
     "httpx_get_json_with_backoff",
     "log_backoff_attempt",
+    "pause_host",
     "redact_url_for_logs",
+    "reset_host_limits",
+    "retry_pause",
+    "run_on_shared_loop",
+    "shared_async_transport",
+    "shared_http_adapter",
+    "throttle",
+    "throttle_async",
 ]
 
+_T = TypeVar("_T")
+_AdapterT = TypeVar("_AdapterT", bound=HTTPAdapter)
+
 logger = logging.getLogger(__name__)
 
 RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
@@ -53,17 +74,348 @@ class BackoffError(RuntimeError):
     """Raised when network retries are exhausted."""
 
 
+class HostRateLimiter:
+    """
+    Token bucket plus shared pause window for one remote host.
+
+    ``reserve`` hands out request slots GCRA-style: each call claims a token
+    (letting the bucket go negative) and returns how long the caller must wait
+    before sending, so every caller sleeps exactly once and callers are served in
+    arrival order. ``pause`` blocks every caller until the deadline passes, which
+    is how a 429/``Retry-After`` seen by one request throttles all the others.
+    Thread-safe; shared by the async TMDB client and the threaded slow.pics
+    uploader.
+    """
+
+    def __init__(self, host: str, rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        self.host = host
+        self._lock = threading.Lock()
+        self._rate: Optional[float] = None
+        self._burst = 1.0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.configure(rate, burst)
+
+    def configure(self, rate: Optional[float], burst: Optional[int] = None) -> None:
+        """Set the sustained *rate* (requests/second, ``None`` for unlimited) and *burst* size."""
+
+        with self._lock:
+            self._rate = float(rate) if rate is not None and rate > 0 else None
+            self._burst = float(max(1, int(burst))) if burst else max(1.0, self._rate or 1.0)
+            self._tokens = self._burst
+            self._updated = time.monotonic()
+
+    @property
+    def paused_until(self) -> float:
+        """Monotonic deadline of the current pause (``0`` when none was set)."""
+
+        with self._lock:
+            return self._paused_until
+
+    def pause(self, seconds: float) -> float:
+        """Hold every caller for at least *seconds*; return the resulting pause deadline."""
+
+        with self._lock:
+            deadline = time.monotonic() + max(0.0, float(seconds))
+            if deadline > self._paused_until:
+                self._paused_until = deadline
+                logger.info("Pausing requests to %s for %.2f s", self.host, seconds)
+            return self._paused_until
+
+    def reserve(self, *, after: float = 0.0) -> float:
+        """
+        Claim a request slot and return the seconds to wait before using it.
+
+        Pauses that end at or before *after* are ignored, so the request that set a
+        pause (and already slept through it) does not wait for it twice.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            wait = self._paused_until - now if self._paused_until > after else 0.0
+            if self._rate is not None:
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                self._tokens -= 1.0
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self._rate)
+            return max(0.0, wait)
+
+
+_LIMITERS: Dict[str, HostRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def host_limiter(host: str) -> HostRateLimiter:
+    """Return the process-wide limiter for *host* (unlimited until configured)."""
+
+    key = (host or "").lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = HostRateLimiter(key)
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def configure_host_rate(host: str, rate: Optional[float], *, burst: Optional[int] = None) -> None:
+    """Limit requests to *host* to *rate* per second with bursts of up to *burst*."""
+
+    host_limiter(host).configure(rate, burst)
+
+
+def pause_host(host: str, seconds: float) -> float:
+    """Pause every caller of *host* for *seconds*; return the pause deadline."""
+
+    return host_limiter(host).pause(seconds)
+
+
+def reset_host_limits() -> None:
+    """Forget every limiter's tokens and pauses (configured rates are kept)."""
+
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    for limiter in limiters:
+        limiter.configure(limiter._rate, int(limiter._burst))  # pyright: ignore[reportPrivateUsage]
+        with limiter._lock:  # pyright: ignore[reportPrivateUsage]
+            limiter._paused_until = 0.0  # pyright: ignore[reportPrivateUsage]
+
+
+def throttle(host: str, *, after: float = 0.0) -> float:
+    """Block the calling thread until a request to *host* may be sent; return the wait."""
+
+    wait = host_limiter(host).reserve(after=after)
+    if wait > 0:
+        time.sleep(wait)
+    return wait
+
+
+async def throttle_async(
+    host: str,
+    *,
+    after: float = 0.0,
+    sleep: Callable[[float], Awaitable[None]] | None = None,
+) -> float:
+    """Await until a request to *host* may be sent; return the wait."""
+
+    wait = host_limiter(host).reserve(after=after)
+    if wait > 0:
+        await (sleep or asyncio.sleep)(wait)
+    return wait
+
+
+def retry_pause(
+    host: str,
+    *,
+    status: Optional[int],
+    retry_after: Optional[str],
+    attempt: int,
+    backoff_factor: float,
+) -> float:
+    """
+    Return the wait before retry *attempt* (1-based) and pause *host* when throttled.
+
+    This is urllib3's own schedule, shared by the threaded and async upload engines
+    so both wait alike: a ``Retry-After`` header on a 413/429/503 wins, otherwise the
+    first retry is immediate and later ones wait ``backoff_factor * 2 ** (attempt - 1)``
+    seconds (capped at ``Retry.DEFAULT_BACKOFF_MAX``). A 429 or ``Retry-After``
+    response holds every caller of *host* for that same delay.
+    """
+
+    delay: Optional[float] = None
+    if retry_after and status in Retry.RETRY_AFTER_STATUS_CODES:
+        try:
+            delay = Retry().parse_retry_after(retry_after)
+        except InvalidHeader:
+            delay = None
+    if delay is None:
+        delay = 0.0 if attempt <= 1 else min(Retry.DEFAULT_BACKOFF_MAX, backoff_factor * (2 ** (attempt - 1)))
+    if status == 429 or retry_after:
+        pause_host(host, delay)
+    return delay
+
+
+class _HostPausingRetry(Retry):
+    """urllib3 ``Retry`` that applies :func:`retry_pause` to every retried response."""
+
+    def increment(self, *args: Any, **kwargs: Any) -> "_HostPausingRetry":
+        response = kwargs.get("response", args[2] if len(args) > 2 else None)
+        pool = kwargs.get("_pool", args[4] if len(args) > 4 else None)
+        host = getattr(pool, "host", None)
+        if response is not None and host:
+            retry_pause(
+                str(host),
+                status=getattr(response, "status", None),
+                retry_after=response.headers.get("Retry-After"),
+                attempt=len(self.history) + 1,
+                backoff_factor=self.backoff_factor,
+            )
+        return super().increment(*args, **kwargs)
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """
+    Requests adapter meant to be shared by every session talking to one service.
+
+    Each send waits on the destination host's limiter, and ``close()`` is a no-op
+    so sessions can be closed freely without dropping the keep-alive pool; the pool
+    is released by :func:`close_shared_pools`.
+    """
+
+    def send(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        host = urlsplit(str(request.url or "")).hostname
+        if host:
+            throttle(host)
+        return super().send(request, *args, **kwargs)
+
+    def close(self) -> None:
+        return None
+
+    def release(self) -> None:
+        """Close the underlying connection pools."""
+
+        super().close()
+
+
+class _SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that ignores ``aclose`` so clients can share one keep-alive pool."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        return None
+
+
+_ADAPTERS: Dict[Hashable, HTTPAdapter] = {}
+_ASYNC_TRANSPORTS: Dict[Hashable, _SharedAsyncTransport] = {}
+_POOLS_LOCK = threading.Lock()
+_SHARED_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def shared_http_adapter(key: Hashable, factory: Callable[[], _AdapterT]) -> _AdapterT:
+    """Return the process-wide adapter stored under *key*, building it with *factory* once."""
+
+    with _POOLS_LOCK:
+        adapter = _ADAPTERS.get(key)
+        if adapter is None:
+            adapter = factory()
+            _ADAPTERS[key] = adapter
+        return cast(_AdapterT, adapter)
+
+
+def _shared_loop() -> asyncio.AbstractEventLoop:
+    global _SHARED_LOOP
+    with _POOLS_LOCK:
+        if _SHARED_LOOP is None or _SHARED_LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="frame-compare-http", daemon=True).start()
+            _SHARED_LOOP = loop
+        return _SHARED_LOOP
+
+
+def run_on_shared_loop(coro: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Run *coro* on the process-wide HTTP event loop and block until it finishes.
+
+    Async clients created there can reuse :func:`shared_async_transport` pools across
+    calls, which ``asyncio.run`` (one loop per call) cannot. Safe to call from a
+    thread that already runs its own loop; must not be called from the shared loop.
+    """
+
+    loop = _shared_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_on_shared_loop() cannot block the shared HTTP loop itself")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def shared_async_transport(
+    key: Hashable,
+    factory: Callable[[], httpx.AsyncBaseTransport],
+) -> httpx.AsyncBaseTransport:
+    """
+    Return a keep-alive transport shared by every client created under *key*.
+
+    Sharing only happens on the loop behind :func:`run_on_shared_loop`, since httpx
+    connections are bound to the loop that opened them; elsewhere a fresh transport
+    is returned and the client owning it closes it as usual.
+    """
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    with _POOLS_LOCK:
+        if running is None or running is not _SHARED_LOOP:
+            return factory()
+        transport = _ASYNC_TRANSPORTS.get(key)
+        if transport is None:
+            transport = _SharedAsyncTransport(factory())
+            _ASYNC_TRANSPORTS[key] = transport
+        return transport
+
+
+def close_shared_pools() -> None:
+    """Close every shared adapter and async transport and stop the shared loop."""
+
+    global _SHARED_LOOP
+    with _POOLS_LOCK:
+        adapters = list(_ADAPTERS.values())
+        transports = list(_ASYNC_TRANSPORTS.values())
+        loop = _SHARED_LOOP
+        _ADAPTERS.clear()
+        _ASYNC_TRANSPORTS.clear()
+        _SHARED_LOOP = None
+    for adapter in adapters:
+        release = getattr(adapter, "release", adapter.close)
+        release()
+    if loop is None or loop.is_closed():
+        return
+    if transports:
+
+        async def _close_all() -> None:
+            for transport in transports:
+                await transport.inner.aclose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close_all(), loop).result(timeout=5.0)
+        except Exception:  # pragma: no cover - best effort during shutdown
+            logger.debug("Failed to close shared HTTP transports", exc_info=True)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(close_shared_pools)
+
+
 def build_urllib3_retry(
     total: int = 3,
     backoff_factor: float = 0.5,
     status_forcelist: Iterable[int] | None = None,
     allowed_methods: Iterable[str] | None = None,
 ) -> Retry:
-    """Return a configured urllib3 Retry object with project defaults."""
+    """Return a configured urllib3 Retry object with project defaults.
+
+    Throttled responses (429 or ``Retry-After``) also pause every other caller of
+    the same host through :func:`pause_host`.
+    """
 
     statuses = frozenset(status_forcelist) if status_forcelist else RETRY_STATUS
     methods = frozenset(allowed_methods) if allowed_methods else ALLOWED_METHODS
-    return Retry(
+    return _HostPausingRetry(
         total=total,
         backoff_factor=backoff_factor,
         status_forcelist=statuses,
@@ -101,8 +453,10 @@ async def httpx_get_json_with_backoff(
 ) -> httpx.Response:
     """Perform a GET request with exponential backoff for transient status codes.
 
-    Timeouts default to :data:`DEFAULT_HTTP_TIMEOUT` so requests cannot hang
-    indefinitely (see HTTPX's timeout guidance:
+    Each attempt first waits on the host's limiter (see :func:`configure_host_rate`),
+    and a 429 or ``Retry-After`` response pauses every caller of that host rather
+    than only this request. Timeouts default to :data:`DEFAULT_HTTP_TIMEOUT` so
+    requests cannot hang indefinitely (see HTTPX's timeout guidance:
     https://github.com/encode/httpx/blob/master/docs/advanced/timeouts.md).
     """
 
@@ -117,7 +471,10 @@ async def httpx_get_json_with_backoff(
     host_label = redact_url_for_logs(str(base_url) or path)
     effective_timeout = timeout if timeout is not None else DEFAULT_HTTP_TIMEOUT
 
+    resumed_after = 0.0
+
     for attempt_index in range(max_attempts):
+        await throttle_async(host_label, after=resumed_after, sleep=sleep_impl)
         try:
             response = await client.get(path, params=params, timeout=effective_timeout)
         except httpx.RequestError as exc:
@@ -129,6 +486,10 @@ async def httpx_get_json_with_backoff(
             if status in retry_codes:
                 last_response = response
                 delay = _retry_delay_from_response(response, backoff, upper_backoff)
+                if status == 429 or "Retry-After" in response.headers:
+                    # Hold every other caller of this host too; this request sleeps
+                    # through the pause below and must not wait for it again.
+                    resumed_after = pause_host(host_label, delay)
             else:
                 logger.info(
                     "GET %s completed after %d attempt%s",
@@ -0,0 +1,318 @@
+"""Lossless PNG recompression for rendered screenshots.
+
+fpng favours encode speed over size. :func:`recompress_png` inflates the IDAT stream,
+reconstructs the pixels, picks each scanline's filter again (None, Sub or Up, by the
+minimum-sum-of-absolute-differences heuristic) and deflates at zlib level 9. Every
+other chunk is copied through untouched, the new stream is decoded and compared with
+the original pixels before the file is replaced, and the file is only rewritten when
+it shrinks. :class:`PngRecompressor` runs a batch in a process pool so uploads can
+pick up each screenshot as soon as it is ready.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = [
+    "PngRecompressor",
+    "RecompressResult",
+    "RecompressSummary",
+    "recompress_png",
+]
+
+logger = logging.getLogger(__name__)
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# Scanlines filtered per numpy pass; bounds the candidate arrays for 4K/16-bit frames.
+_FILTER_BLOCK_ROWS = 256
+_DEFAULT_MAX_WORKERS = 4
+
+_Chunk = Tuple[bytes, bytes]
+
+
+@dataclass(frozen=True)
+class RecompressResult:
+    """Outcome for one screenshot; ``skipped`` names why it was left as is."""
+
+    path: str
+    original_bytes: int
+    final_bytes: int
+    skipped: Optional[str] = None
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.final_bytes
+
+
+@dataclass(frozen=True)
+class RecompressSummary:
+    """Totals for a recompressed batch."""
+
+    files: int
+    rewritten: int
+    original_bytes: int
+    final_bytes: int
+    seconds: float
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.final_bytes
+
+
+def _read_chunks(data: bytes) -> List[_Chunk]:
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("not a PNG file")
+    chunks: List[_Chunk] = []
+    offset = len(_PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[offset : offset + 8])
+        body = data[offset + 8 : offset + 8 + length]
+        if len(body) != length:
+            raise ValueError("truncated chunk")
+        chunks.append((kind, body))
+        offset += 12 + length
+        if kind == b"IEND":
+            return chunks
+    raise ValueError("missing IEND chunk")
+
+
+def _chunk_bytes(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+
+def _unfilter(filtered: npt.NDArray[np.uint8], bpp: int) -> npt.NDArray[np.uint8]:
+    """Reconstruct raw scanlines from ``(rows, 1 + row_bytes)`` filtered data."""
+
+    types = filtered[:, 0]
+    if np.any(types > 4):
+        raise ValueError("invalid filter type")
+    if np.any(types > 2):
+        return _unfilter_wavefront(filtered, bpp)
+    raw = np.empty((filtered.shape[0], filtered.shape[1] - 1), dtype=np.uint8)
+    previous = np.zeros(raw.shape[1], dtype=np.uint8)
+    for row, kind in enumerate(types):
+        line = filtered[row, 1:]
+        if kind == 1:
+            raw[row] = np.cumsum(line.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+        elif kind == 2:
+            raw[row] = line + previous
+        else:
+            raw[row] = line
+        previous = raw[row]
+    return raw
+
+
+def _unfilter_wavefront(filtered: npt.NDArray[np.uint8], bpp: int) -> npt.NDArray[np.uint8]:
+    """
+    Decode scanlines that use the Average or Paeth filters.
+
+    Pixel ``(y, x)`` only depends on its left, upper and upper-left neighbours, so
+    each anti-diagonal of the pixel grid is decoded in one vectorised step.
+    """
+
+    rows, width = filtered.shape[0], (filtered.shape[1] - 1) // bpp
+    types = filtered[:, 0]
+    data = filtered[:, 1:].reshape(rows, width, bpp).astype(np.int32)
+    # Zero row/column padding stands in for the bytes before the image edges.
+    raw = np.zeros((rows + 1, width + 1, bpp), dtype=np.int32)
+    for diagonal in range(rows + width - 1):
+        ys: npt.NDArray[np.intp] = np.arange(max(0, diagonal - width + 1), min(rows, diagonal + 1), dtype=np.intp)
+        xs: npt.NDArray[np.intp] = diagonal - ys
+        left = raw[ys + 1, xs]
+        up = raw[ys, xs + 1]
+        upper_left = raw[ys, xs]
+        estimate = left + up - upper_left
+        pa = np.abs(estimate - left)
+        pb = np.abs(estimate - up)
+        pc = np.abs(estimate - upper_left)
+        paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upper_left))
+        kind = types[ys][:, None]
+        predictor = np.select(
+            [kind == 1, kind == 2, kind == 3, kind == 4],
+            [left, up, (left + up) >> 1, paeth],
+            default=0,
+        )
+        raw[ys + 1, xs + 1] = (data[ys, xs] + predictor) & 0xFF
+    return raw[1:, 1:].reshape(rows, width * bpp).astype(np.uint8)
+
+
+def _filter_rows(raw: npt.NDArray[np.uint8], bpp: int) -> npt.NDArray[np.uint8]:
+    """
+    Filter every scanline with whichever of None, Sub or Up minimises its signed byte sum.
+
+    Average and Paeth rarely pay off on rendered frames and can only be decoded one
+    pixel at a time, which would make verifying the output the slowest step.
+    """
+
+    rows, row_bytes = raw.shape
+    out = np.empty((rows, row_bytes + 1), dtype=np.uint8)
+    for start in range(0, rows, _FILTER_BLOCK_ROWS):
+        stop = min(rows, start + _FILTER_BLOCK_ROWS)
+        block = raw[start:stop].astype(np.int16)
+        up = np.zeros_like(block)
+        if start:
+            up[0] = raw[start - 1]
+        up[1:] = block[:-1]
+        left = np.zeros_like(block)
+        left[:, bpp:] = block[:, :-bpp]
+        candidates = (np.stack([block, block - left, block - up]) & 0xFF).astype(np.uint8)
+        scores = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+        choice = scores.argmin(axis=0)
+        out[start:stop, 0] = choice
+        out[start:stop, 1:] = candidates[choice, np.arange(stop - start)]
+    return out
+
+
+def _deflate(payload: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, zlib.Z_FILTERED)
+    return compressor.compress(payload) + compressor.flush()
+
+
+def recompress_png(path: str | Path) -> RecompressResult:
+    """
+    Losslessly recompress the PNG at *path* in place when that makes it smaller.
+
+    Interlaced images are left untouched. The rewritten file goes through a temporary
+    sibling and :func:`os.replace`, so readers never see a partial PNG.
+    """
+
+    target = Path(path)
+    data = target.read_bytes()
+    original = len(data)
+
+    def _skip(reason: str) -> RecompressResult:
+        return RecompressResult(str(target), original, original, skipped=reason)
+
+    try:
+        chunks = _read_chunks(data)
+        header = chunks[0][1] if chunks and chunks[0][0] == b"IHDR" else b""
+        width, height, depth, colour, _, _, interlace = struct.unpack(">IIBBBBB", header)
+        if interlace:
+            return _skip("interlaced")
+        channels = _CHANNELS[colour]
+        bpp = max(1, channels * depth // 8)
+        row_bytes = (width * channels * depth + 7) // 8
+        filtered = np.frombuffer(
+            zlib.decompress(b"".join(body for kind, body in chunks if kind == b"IDAT")), dtype=np.uint8
+        )
+        if filtered.size != height * (row_bytes + 1):
+            return _skip("unexpected image data length")
+        raw = _unfilter(filtered.reshape(height, row_bytes + 1), bpp)
+    except (ValueError, KeyError, struct.error, zlib.error) as exc:
+        return _skip(f"unreadable: {exc}")
+
+    refiltered = _filter_rows(raw, bpp)
+    idat = _deflate(refiltered.tobytes())
+    verify = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(refiltered.shape)
+    if not np.array_equal(_unfilter(verify, bpp), raw):
+        return _skip("verification failed")
+
+    parts = [_PNG_SIGNATURE]
+    idat_written = False
+    for kind, body in chunks:
+        if kind == b"IDAT":
+            if not idat_written:
+                parts.append(_chunk_bytes(b"IDAT", idat))
+                idat_written = True
+            continue
+        parts.append(_chunk_bytes(kind, body))
+    encoded = b"".join(parts)
+    if len(encoded) >= original:
+        return _skip("no gain")
+
+    temp = target.with_name(f".{target.name}.recompress")
+    temp.write_bytes(encoded)
+    os.replace(temp, target)
+    return RecompressResult(str(target), original, len(encoded))
+
+
+class PngRecompressor:
+    """
+    Recompress a batch of screenshots in a spawn-context process pool.
+
+    Files are submitted in the order given, so a consumer walking the same order
+    (the slow.pics uploaders) waits on at most the pool's current work. :meth:`wait`
+    never raises: failures are logged and the file is used as rendered.
+    """
+
+    def __init__(self, paths: Sequence[str | Path], *, max_workers: Optional[int] = None) -> None:
+        self._paths = [Path(path) for path in paths]
+        workers = max_workers if max_workers else min(_DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self._workers = max(1, min(int(workers), len(self._paths) or 1))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[Path, Future[RecompressResult]] = {}
+        self._results: Dict[Path, Optional[RecompressResult]] = {}
+        self._started = 0.0
+
+    def start(self) -> "PngRecompressor":
+        """Submit every file; on platforms without a process pool files are recompressed on demand."""
+
+        self._started = time.perf_counter()
+        if not self._paths:
+            return self
+        try:
+            self._pool = ProcessPoolExecutor(max_workers=self._workers, mp_context=get_context("spawn"))
+            for path in self._paths:
+                self._futures[path] = self._pool.submit(recompress_png, str(path))
+        except Exception as exc:  # pragma: no cover - platform dependent
+            logger.debug("PNG recompression pool unavailable (%s); recompressing in-process", exc)
+            self.close()
+        return self
+
+    def wait(self, path: str | Path) -> Optional[RecompressResult]:
+        """Block until *path* has been recompressed and return its result."""
+
+        key = Path(path)
+        if key in self._results:
+            return self._results[key]
+        future = self._futures.get(key)
+        result: Optional[RecompressResult] = None
+        try:
+            if future is not None:
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    logger.debug("PNG recompression pool died; recompressing %s in-process", key.name)
+                    result = recompress_png(key)
+            elif key in self._paths:
+                result = recompress_png(key)
+        except Exception as exc:
+            logger.warning("PNG recompression failed for %s: %s", key.name, exc)
+        self._results[key] = result
+        return result
+
+    def finish(self) -> RecompressSummary:
+        """Wait for the whole batch, shut the pool down and return the totals."""
+
+        results = [self.wait(path) for path in self._paths]
+        self.close()
+        done = [result for result in results if result is not None]
+        return RecompressSummary(
+            files=len(self._paths),
+            rewritten=sum(1 for result in done if result.skipped is None),
+            original_bytes=sum(result.original_bytes for result in done),
+            final_bytes=sum(result.final_bytes for result in done),
+            seconds=time.perf_counter() - self._started if self._started else 0.0,
+        )
+
+    def close(self) -> None:
+        """Cancel outstanding work and release the pool."""
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._futures = {path: future for path, future in self._futures.items() if future.done() and not future.cancelled()}
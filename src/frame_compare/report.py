@@ -276,6 +276,25 @@ def generate_html_report(
         "categories": list(category_stats.values()),
     }
 
+    return _write_report_payload(report_dir, data, document_title)
+
+
+def update_report_slowpics_url(report_index: Path, slowpics_url: Optional[str]) -> None:
+    """
+    Point an already generated report at *slowpics_url*.
+
+    Lets the report be written before the slow.pics upload finishes: ``data.json`` and
+    the payload embedded in ``index.html`` are rewritten with the new URL, everything
+    else in the report is left as generated.
+    """
+
+    report_dir = report_index.parent
+    data = json.loads((report_dir / "data.json").read_text(encoding="utf-8"))
+    data["slowpics_url"] = slowpics_url
+    _write_report_payload(report_dir, data, str(data.get("title") or "Frame Compare Report"))
+
+
+def _write_report_payload(report_dir: Path, data: Mapping[str, object], document_title: str) -> Path:
     data_path = report_dir / "data.json"
     json_text = json.dumps(data, indent=2, ensure_ascii=False)
     data_path.write_text(json_text, encoding="utf-8")
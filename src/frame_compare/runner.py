@@ -13,6 +13,7 @@ import time
 import traceback
 from collections import Counter
 from collections.abc import Mapping as MappingABC
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import ExitStack
 from dataclasses import dataclass
 from enum import Enum
@@ -51,6 +52,7 @@ from src.frame_compare.diagnostics import (
     extract_hdr_metadata,
 )
 from src.frame_compare.env_flags import env_flag_enabled
+from src.frame_compare.render.png_recompress import PngRecompressor
 from src.frame_compare.result_snapshot import (
     RenderOptions,
     ResultSource,
@@ -75,6 +77,7 @@ from src.frame_compare.services.metadata import MetadataResolver, MetadataResolv
 from src.frame_compare.services.publishers import (
     ReportPublisher,
     ReportPublisherRequest,
+    ReportPublisherResult,
     SlowpicsPublisher,
     SlowpicsPublisherRequest,
 )
@@ -691,10 +694,12 @@ def run(request: RunRequest, *, dependencies: RunDependencies | None = None) ->
         "alignment": {"manual_start_s": 0.0, "manual_end_s": "unchanged"},
         "audio_alignment": {
             "enabled": bool(cfg.audio_alignment.enable),
+            "signal": cfg.audio_alignment.signal,
             "reference_stream": None,
             "target_stream": {},
             "offsets_sec": {},
             "offsets_frames": {},
+            "offset_maps": {},
             "preview_paths": [],
             "confirmed": None,
             "offsets_filename": str(offsets_path),
@@ -751,6 +756,7 @@ def run(request: RunRequest, *, dependencies: RunDependencies | None = None) ->
             "is_public": bool(cfg.slowpics.is_public),
             "is_hentai": bool(cfg.slowpics.is_hentai),
             "remove_after_days": int(cfg.slowpics.remove_after_days),
+            "upload": None,
         },
         "report": {
             "enabled": bool(getattr(cfg.report, "enable", False)),
@@ -1924,6 +1930,7 @@ def run(request: RunRequest, *, dependencies: RunDependencies | None = None) ->
             f"Screenshot generation failed: {exc}",
             rich_message=f"[red]Screenshot generation failed:[/red] {exc}",
         ) from exc
+    selection_utils.log_deferred_clip_summary(plans, reporter)
 
     verify_threshold = float(cfg.color.verify_luma_threshold)
     if verification_records:
@@ -2155,7 +2162,55 @@ def _publish_results(
     report_publisher: ReportPublisher,
     slowpics_publisher: SlowpicsPublisher,
 ) -> tuple[Optional[str], Optional[Path]]:
-    """Publish run artifacts via service-mode publishers."""
+    """
+    Publish run artifacts via service-mode publishers.
+
+    When both an upload and a report are due, the report is generated on a worker
+    thread while the upload runs and is linked to the collection once it exists.
+    That thread gets its own reporter, JSON tail, layout mapping and warning list;
+    they are merged into the run's after the upload returns, so nothing the upload
+    mutates on this thread is shared.
+    """
+
+    overlap_report = report_enabled and cfg.slowpics.auto_upload
+    report_reporter: CliOutputManagerProtocol = reporter
+    report_tail: JsonTail = json_tail
+    report_layout: MutableMapping[str, Any] = layout_data
+    report_warnings: List[str] = collected_warnings
+    if overlap_report:
+        report_reporter = NullCliOutputManager(quiet=True, verbose=False, no_color=True)
+        report_tail = cast(JsonTail, {"report": dict(json_tail["report"])})
+        report_layout = {}
+        report_warnings = []
+    report_request = ReportPublisherRequest(
+        reporter=report_reporter,
+        json_tail=report_tail,
+        layout_data=report_layout,
+        report_enabled=report_enabled,
+        root=root,
+        plans=plans,
+        frames=list(frames),
+        selection_details=selection_details,
+        image_paths=list(image_paths),
+        metadata_title=context.metadata_title,
+        slowpics_url=None,
+        config=cfg.report,
+        collected_warnings=report_warnings,
+    )
+    report_pool: Optional[ThreadPoolExecutor] = None
+    report_future: Optional[Future[ReportPublisherResult]] = None
+    if overlap_report:
+        report_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-publish")
+        report_future = report_pool.submit(report_publisher.publish, report_request)
+
+    recompressor: Optional[PngRecompressor] = None
+    if cfg.screenshots.recompress_png and image_paths:
+        # Recompression runs in a process pool; each upload waits for its own file only.
+        recompressor = PngRecompressor(image_paths, max_workers=cfg.screenshots.recompress_workers or None).start()
+
+    def _await_recompressed(path: Path) -> None:
+        if recompressor is not None:
+            recompressor.wait(path)
 
     slowpics_request = SlowpicsPublisherRequest(
         reporter=reporter,
@@ -2169,25 +2224,45 @@ def _publish_results(
         image_paths=list(image_paths),
         out_dir=out_dir,
         config=cfg.slowpics,
+        prepare_image=_await_recompressed if recompressor is not None else None,
     )
-    slowpics_result = slowpics_publisher.publish(slowpics_request)
+    try:
+        slowpics_result = slowpics_publisher.publish(slowpics_request)
+    except BaseException:
+        if recompressor is not None:
+            recompressor.close()
+        raise
+    finally:
+        # A failed upload still leaves the locally generated report behind.
+        if report_pool is not None:
+            report_pool.shutdown(wait=True)
     slowpics_url = slowpics_result.url
-    report_request = ReportPublisherRequest(
-        reporter=reporter,
-        json_tail=json_tail,
-        layout_data=layout_data,
-        report_enabled=report_enabled,
-        root=root,
-        plans=plans,
-        frames=list(frames),
-        selection_details=selection_details,
-        image_paths=list(image_paths),
-        metadata_title=context.metadata_title,
-        slowpics_url=slowpics_url,
-        config=cfg.report,
-        collected_warnings=collected_warnings,
-    )
-    report_result = report_publisher.publish(report_request)
+    if recompressor is not None:
+        summary = recompressor.finish()
+        json_tail["render"]["png_recompress"] = {
+            "files": summary.files,
+            "rewritten": summary.rewritten,
+            "original_bytes": summary.original_bytes,
+            "final_bytes": summary.final_bytes,
+            "saved_bytes": summary.saved_bytes,
+            "seconds": round(summary.seconds, 3),
+        }
+        if summary.original_bytes:
+            reporter.verbose_line(
+                f"PNG recompression: saved {summary.saved_bytes / (1024 * 1024):.1f} MiB "
+                f"({summary.saved_bytes / summary.original_bytes:.1%}) across {summary.rewritten}/{summary.files} files"
+            )
+    if report_future is not None:
+        report_result = report_future.result()
+        report_publisher.attach_slowpics_url(report_request, report_result, slowpics_url)
+        json_tail["report"].update(report_tail["report"])
+        layout_data["report"] = json_tail["report"]
+        for message in report_reporter.get_warnings():
+            reporter.warn(message)
+        collected_warnings.extend(report_warnings)
+    else:
+        report_request.slowpics_url = slowpics_url
+        report_result = report_publisher.publish(report_request)
     return slowpics_url, report_result.report_path
 
 
@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, Final, List, Mapping, Optional, Sequence, Tuple
 
@@ -15,8 +19,10 @@ from src.frame_compare.cache import (
     compute_probe_cache_key,
     load_probe_snapshot,
     persist_probe_snapshot,
+    probe_snapshot_location,
 )
 from src.frame_compare.cli_runtime import CLIAppError, ClipProbeSnapshot
+from src.frame_compare.fast_probe import fast_probe_available, fast_probe_clip, trimmed_frame_count
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,8 @@ __all__: Final = [
     "probe_clip_metadata",
     "resolve_selection_windows",
     "log_selection_windows",
+    "wait_for_background_indexing",
+    "log_deferred_clip_summary",
 ]
 
 if TYPE_CHECKING:
@@ -153,9 +161,151 @@ def _build_snapshot_from_plan(plan: ClipPlan, applied_fps: tuple[int, int] | Non
         cache_key=plan.probe_cache_key,
         cache_path=plan.probe_cache_path,
     )
+    previous = plan.probe_snapshot
+    if previous is not None and previous.cache_key == plan.probe_cache_key:
+        snapshot.audio_probe = previous.audio_probe
     return snapshot
 
 
+@dataclass(slots=True)
+class _IndexJob:
+    path: Path
+    cache_dir: str | None
+    started: bool = False
+    cancelled: bool = False
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+_INDEX_WORKER_LIMIT = 2
+_INDEX_LOCK = threading.Lock()
+_INDEX_JOBS: Dict[str, _IndexJob] = {}
+_INDEX_PENDING: deque[_IndexJob] = deque()
+_index_workers_active = 0
+
+
+def _index_worker() -> None:
+    global _index_workers_active
+    while True:
+        with _INDEX_LOCK:
+            if not _INDEX_PENDING:
+                _index_workers_active -= 1
+                return
+            job = _INDEX_PENDING.popleft()
+            if job.cancelled:
+                job.done.set()
+                continue
+            job.started = True
+        try:
+            if vs_core.get_source_preference() == "auto":
+                # The benchmark opens (and indexes) the file with every plugin.
+                _benchmark_source(job.path, job.cache_dir)
+            else:
+                vs_core.index_clip(str(job.path), cache_dir=job.cache_dir)
+            logger.info("[CACHE] Background index ready for %s", job.path.name)
+        except Exception as exc:
+            logger.debug("Background indexing failed for %s: %s", job.path.name, exc)
+        finally:
+            job.done.set()
+
+
+_AUTO_SOURCE_CHOICES: Dict[str, str] = {}
+
+
+def _benchmark_source(
+    path: Path,
+    cache_dir_str: str | None,
+    indexing_notifier: Callable[[str], None] | None = None,
+) -> str | None:
+    """Run the ``auto`` seek benchmark for *path* and remember the winning plugin."""
+
+    key = os.path.realpath(path)
+    with _INDEX_LOCK:
+        cached = _AUTO_SOURCE_CHOICES.get(key)
+    if cached is not None:
+        return cached
+    result = vs_core.benchmark_source_plugins(
+        str(path),
+        cache_dir=cache_dir_str,
+        indexing_notifier=indexing_notifier,
+    )
+    if result.winner is not None:
+        with _INDEX_LOCK:
+            _AUTO_SOURCE_CHOICES[key] = result.winner
+    return result.winner
+
+
+def _resolve_source_plugin(
+    plan: ClipPlan,
+    *,
+    cache_dir_str: str | None,
+    indexing_notifier: Callable[[str], None],
+    reporter: "CliOutputManagerProtocol | None",
+) -> str | None:
+    """Return the per-file source plugin for ``source.preferred = "auto"``, or ``None`` otherwise."""
+
+    if vs_core.get_source_preference() != "auto":
+        return None
+    snapshot = plan.probe_snapshot
+    if snapshot is not None and snapshot.source_plugin:
+        return snapshot.source_plugin
+    winner = _benchmark_source(plan.path, cache_dir_str, indexing_notifier)
+    if winner is not None:
+        _log_cache_note(f"[CACHE] Auto source for {plan.path.name}: {winner}", reporter)
+    return winner
+
+
+def _schedule_background_index(path: Path, cache_dir_str: str | None) -> bool:
+    """Queue *path* for background source indexing; returns ``False`` when already queued."""
+
+    global _index_workers_active
+    key = os.path.realpath(path)
+    with _INDEX_LOCK:
+        if key in _INDEX_JOBS:
+            return False
+        job = _IndexJob(path=path, cache_dir=cache_dir_str)
+        _INDEX_JOBS[key] = job
+        _INDEX_PENDING.append(job)
+        spawn = _index_workers_active < _INDEX_WORKER_LIMIT
+        if spawn:
+            _index_workers_active += 1
+    if spawn:
+        # Daemon threads keep an aborted run from blocking on interpreter exit;
+        # the source plugins rebuild any index file left incomplete.
+        threading.Thread(target=_index_worker, name="frame-compare-index", daemon=True).start()
+    return True
+
+
+def _await_background_index(path: Path, reporter: "CliOutputManagerProtocol | None") -> None:
+    """Block until a running background index for *path* finishes, or cancel it if still queued."""
+
+    key = os.path.realpath(path)
+    with _INDEX_LOCK:
+        job = _INDEX_JOBS.pop(key, None)
+        if job is None:
+            return
+        if not job.started:
+            job.cancelled = True
+            return
+    if not job.done.is_set():
+        _log_cache_note(f"[CACHE] Waiting for background index of {path.name}", reporter)
+        job.done.wait()
+
+
+def wait_for_background_indexing(timeout: float | None = None) -> bool:
+    """
+    Wait for every queued background index to finish.
+
+    Returns ``True`` when all jobs completed within *timeout* seconds.
+    """
+
+    with _INDEX_LOCK:
+        jobs = list(_INDEX_JOBS.values())
+    for job in jobs:
+        if not job.done.wait(timeout):
+            return False
+    return True
+
+
 def _initialise_clip_and_snapshot(
     plan: ClipPlan,
     *,
@@ -164,9 +314,23 @@ def _initialise_clip_and_snapshot(
     cache_root: Path | None,
     indexing_notifier: Callable[[str], None],
     persist_snapshot: bool,
+    reporter: "CliOutputManagerProtocol | None" = None,
 ) -> tuple[ClipProbeSnapshot, bool]:
+    _await_background_index(plan.path, reporter)
+    if plan.probe_snapshot is not None and plan.probe_snapshot.probe_backend == "ffprobe":
+        # Header-derived props are provisional; let the source plugin's frame props win.
+        plan.source_frame_props = None
+    source_plugin = _resolve_source_plugin(
+        plan,
+        cache_dir_str=cache_dir_str,
+        indexing_notifier=indexing_notifier,
+        reporter=reporter,
+    )
     source_props_hint = plan.source_frame_props if plan.source_frame_props else None
     frame_props_sink = _capture_source_props_for_probe(plan)
+    init_kwargs: Dict[str, Any] = {}
+    if source_plugin is not None:
+        init_kwargs["source_plugin"] = source_plugin
     clip = vs_core.init_clip(
         str(plan.path),
         trim_start=plan.trim_start,
@@ -176,6 +340,7 @@ def _initialise_clip_and_snapshot(
         indexing_notifier=indexing_notifier,
         frame_props_sink=frame_props_sink,
         source_frame_props_hint=source_props_hint,
+        **init_kwargs,
     )
     plan.clip = clip
     plan.applied_fps = fps_override if fps_override is not None else plan.applied_fps
@@ -188,6 +353,7 @@ def _initialise_clip_and_snapshot(
     if plan.source_frame_props is None:
         plan.source_frame_props = {}
     snapshot = _build_snapshot_from_plan(plan, fps_override)
+    snapshot.source_plugin = source_plugin
     snapshot.clip = clip
     plan.probe_snapshot = snapshot
     wrote = False
@@ -199,6 +365,82 @@ def _initialise_clip_and_snapshot(
     return snapshot, wrote
 
 
+def _fast_probe_snapshot(
+    plan: ClipPlan,
+    *,
+    fps_override: tuple[int, int] | None,
+    cache_root: Path | None,
+) -> tuple[ClipProbeSnapshot, bool] | None:
+    result = fast_probe_clip(plan.path)
+    if result is None:
+        return None
+    plan.clip = None
+    plan.applied_fps = fps_override if fps_override is not None else plan.applied_fps
+    plan.effective_fps = fps_override if fps_override is not None else result.fps
+    plan.source_fps = result.fps
+    plan.source_num_frames = trimmed_frame_count(result.num_frames, plan.trim_start, plan.trim_end)
+    plan.source_width = result.width
+    plan.source_height = result.height
+    plan.source_frame_props = dict(result.frame_props)
+    snapshot = _build_snapshot_from_plan(plan, fps_override)
+    snapshot.probe_backend = "ffprobe"
+    snapshot.num_frames_exact = result.num_frames_exact
+    plan.probe_snapshot = snapshot
+    wrote = False
+    if cache_root is not None and snapshot.cache_key and snapshot.num_frames_exact:
+        cache_path, wrote = persist_probe_snapshot(cache_root, snapshot)
+        snapshot.cache_path = cache_path
+    return snapshot, wrote
+
+
+def _install_lazy_clip(
+    plan: ClipPlan,
+    *,
+    fps_override: tuple[int, int] | None,
+    cache_dir_str: str | None,
+    cache_root: Path | None,
+    indexing_notifier: Callable[[str], None],
+    reporter: "CliOutputManagerProtocol | None",
+) -> None:
+    """Attach a :class:`vs_core.LazyClip` that opens *plan* through the source plugin on first use."""
+
+    snapshot = plan.probe_snapshot
+    known: Dict[str, int] = {}
+    if snapshot is not None:
+        # Header probes record the trimmed length, coded geometry and applied rate
+        # the source plugin reports, so either backend can answer for the clip.
+        # Duration-derived counts are left out so reading ``num_frames`` opens the
+        # clip (after its background index) and the indexed count replaces them.
+        for key, value in (
+            ("num_frames", snapshot.source_num_frames if snapshot.num_frames_exact else None),
+            ("width", snapshot.source_width),
+            ("height", snapshot.source_height),
+        ):
+            if value:
+                known[key] = int(value)
+        if snapshot.effective_fps is not None:
+            known["fps_num"], known["fps_den"] = snapshot.effective_fps
+
+    def _open() -> object:
+        _log_cache_note(f"[CACHE] Opening deferred clip {plan.path.name}", reporter)
+        opened, _ = _initialise_clip_and_snapshot(
+            plan,
+            fps_override=fps_override,
+            cache_dir_str=cache_dir_str,
+            cache_root=cache_root,
+            indexing_notifier=indexing_notifier,
+            persist_snapshot=True,
+            reporter=reporter,
+        )
+        # Keep the handle on the plan so callers holding either reference agree.
+        plan.clip = handle
+        return opened.clip
+
+    plan.applied_fps = fps_override if fps_override is not None else plan.applied_fps
+    handle = vs_core.LazyClip(_open, label=plan.path.name, known_metadata=known)
+    plan.clip = handle
+
+
 def _plan_needs_refresh(plan: ClipPlan, fps_override: tuple[int, int] | None) -> bool:
     snapshot = plan.probe_snapshot
     if snapshot is None:
@@ -221,6 +463,7 @@ def _ensure_probe_snapshot(
     indexing_notifier: Callable[[str], None],
     stats: Dict[str, int],
     force_reprobe: bool,
+    fast_probe: bool,
     reporter: "CliOutputManagerProtocol | None",
 ) -> ClipProbeSnapshot:
     snapshot = plan.probe_snapshot if plan.probe_snapshot is not None else None
@@ -228,12 +471,28 @@ def _ensure_probe_snapshot(
         origin = "memory" if snapshot.clip is not None else "disk"
         stats["memory_hits" if origin == "memory" else "disk_hits"] += 1
         _apply_snapshot_to_plan(plan, snapshot, attach_clip=bool(snapshot.clip))
+        if fast_probe and plan.clip is None and _schedule_background_index(plan.path, cache_dir_str):
+            stats["background_index"] += 1
         tonemap_desc = ", ".join(snapshot.tonemap_prop_keys) or "none"
         _log_cache_note(
             f"[CACHE] Reused {origin} probe snapshot for {plan.path.name} (tonemap={tonemap_desc})",
             reporter,
         )
         return snapshot
+    if fast_probe:
+        fast = _fast_probe_snapshot(plan, fps_override=fps_override, cache_root=cache_root)
+        if fast is not None:
+            snapshot, wrote = fast
+            stats["ffprobe"] += 1
+            stats["writes" if wrote else "unchanged"] += 1
+            if _schedule_background_index(plan.path, cache_dir_str):
+                stats["background_index"] += 1
+            tonemap_desc = ", ".join(snapshot.tonemap_prop_keys) or "none"
+            _log_cache_note(
+                f"[CACHE] Probed {plan.path.name} via ffprobe headers (tonemap={tonemap_desc})",
+                reporter,
+            )
+            return snapshot
     snapshot, wrote = _initialise_clip_and_snapshot(
         plan,
         fps_override=fps_override,
@@ -241,6 +500,7 @@ def _ensure_probe_snapshot(
         cache_root=cache_root,
         indexing_notifier=indexing_notifier,
         persist_snapshot=True,
+        reporter=reporter,
     )
     stats["opened"] += 1
     if wrote:
@@ -261,13 +521,20 @@ def probe_clip_metadata(
     cache_dir: Path | None,
     *,
     reporter: CliOutputManagerProtocol | None = None,
+    reference_fps: Optional[Tuple[int, int]] = None,
 ) -> None:
     """Populate FPS, geometry, and HDR snapshot metadata for each clip plan.
 
     Cached probe snapshots from memory or disk are reused whenever possible so
-    clip files are only opened when a snapshot is missing or stale. Any plans
-    whose `plan.clip` objects remain uninitialized after this pass will be
-    populated by `init_clips` before downstream processing.
+    clip files are only opened when a snapshot is missing or stale. With
+    ``runtime.fast_probe`` enabled and ffprobe on PATH, missing snapshots are
+    filled from container headers instead and source indexing is started in the
+    background. Any plans whose `plan.clip` objects remain uninitialized after
+    this pass will be populated by `init_clips` before downstream processing.
+
+    ``reference_fps`` supplies the reference clip's FPS when *plans* holds only
+    targets (for example when the reference was probed in an earlier call), so
+    their snapshots carry the same FPS override a full pass would apply.
     """
 
     if not plans:
@@ -280,13 +547,26 @@ def probe_clip_metadata(
     force_reprobe = bool(getattr(runtime_cfg, "force_reprobe", False))
     if force_reprobe:
         _log_cache_note("[CACHE] force_reprobe enabled; bypassing cached probe metadata.", reporter)
-
-    stats: Dict[str, int] = {key: 0 for key in ("opened", "memory_hits", "disk_hits", "writes", "unchanged")}
+    fast_probe = bool(getattr(runtime_cfg, "fast_probe", False)) and fast_probe_available()
+
+    stats: Dict[str, int] = {
+        key: 0
+        for key in (
+            "opened",
+            "ffprobe",
+            "memory_hits",
+            "disk_hits",
+            "writes",
+            "unchanged",
+            "background_index",
+            "deferred",
+        )
+    }
 
     for plan in plans:
         plan.probe_cache_key = compute_probe_cache_key(plan)
         if cache_root is not None and plan.probe_cache_key:
-            plan.probe_cache_path = cache_root / "probe" / f"{plan.probe_cache_key}.json"
+            plan.probe_cache_path = probe_snapshot_location(cache_root)
         else:
             plan.probe_cache_path = None
         if force_reprobe or cache_root is None or not plan.probe_cache_key:
@@ -296,7 +576,6 @@ def probe_clip_metadata(
             plan.probe_snapshot = cached
 
     reference_index = next((idx for idx, plan in enumerate(plans) if plan.use_as_reference), None)
-    reference_fps: Optional[Tuple[int, int]] = None
 
     if reference_index is not None:
         reference_snapshot = _ensure_probe_snapshot(
@@ -307,6 +586,7 @@ def probe_clip_metadata(
             indexing_notifier=indexing_notifier,
             stats=stats,
             force_reprobe=force_reprobe,
+            fast_probe=fast_probe,
             reporter=reporter,
         )
         reference_fps = reference_snapshot.effective_fps or reference_snapshot.source_fps
@@ -326,12 +606,15 @@ def probe_clip_metadata(
             indexing_notifier=indexing_notifier,
             stats=stats,
             force_reprobe=force_reprobe,
+            fast_probe=fast_probe,
             reporter=reporter,
         )
         plan.applied_fps = fps_override if fps_override is not None else snapshot.applied_fps
 
+    stats["deferred"] = sum(1 for plan in plans if plan.clip is None)
     _log_cache_note(
-        "[CACHE] Probe summary: opened={opened} memory_hits={memory_hits} disk_hits={disk_hits} writes={writes} unchanged={unchanged}".format(
+        "[CACHE] Probe summary: opened={opened} ffprobe={ffprobe} memory_hits={memory_hits} disk_hits={disk_hits} "
+        "writes={writes} unchanged={unchanged} background_index={background_index} deferred={deferred}".format(
             **stats
         ),
         reporter,
@@ -345,7 +628,14 @@ def init_clips(
     *,
     reporter: CliOutputManagerProtocol | None = None,
 ) -> None:
-    """Initialise VapourSynth clips and reuse previously probed metadata when possible."""
+    """Initialise VapourSynth clips and reuse previously probed metadata when possible.
+
+    Plans whose probe snapshot still matches their trims and FPS mapping receive a
+    :class:`vs_core.LazyClip` instead of an opened clip, so the source plugin (and
+    any index build) only runs once the clip's frames are actually requested.
+    Stale or missing snapshots are refreshed eagerly because their metadata feeds
+    the run summary before any frame is rendered.
+    """
 
     vs_core.set_ram_limit(runtime_cfg.ram_limit_mb)
     cache_root = cache_dir
@@ -358,17 +648,31 @@ def init_clips(
 
     reuse_hits = 0
     reopened = 0
+    deferred = 0
 
     for plan in plans:
         if not getattr(plan, "probe_cache_key", None):
             plan.probe_cache_key = compute_probe_cache_key(plan)
             if cache_root is not None and plan.probe_cache_key:
-                plan.probe_cache_path = cache_root / "probe" / f"{plan.probe_cache_key}.json"
+                plan.probe_cache_path = probe_snapshot_location(cache_root)
+
+    def _can_defer(plan: ClipPlan, fps_override: tuple[int, int] | None) -> bool:
+        return not force_reprobe and plan.clip is None and not _plan_needs_refresh(plan, fps_override)
 
     if reference_index is not None:
         plan = plans[reference_index]
-        needs_refresh = force_reprobe or plan.clip is None or _plan_needs_refresh(plan, None)
-        if needs_refresh:
+        if _can_defer(plan, None):
+            _install_lazy_clip(
+                plan,
+                fps_override=None,
+                cache_dir_str=cache_dir_str,
+                cache_root=cache_root,
+                indexing_notifier=indexing_notifier,
+                reporter=reporter,
+            )
+            reference_fps = plan.effective_fps or plan.source_fps
+            deferred += 1
+        elif force_reprobe or plan.clip is None or _plan_needs_refresh(plan, None):
             snapshot, _ = _initialise_clip_and_snapshot(
                 plan,
                 fps_override=None,
@@ -376,6 +680,7 @@ def init_clips(
                 cache_root=cache_root,
                 indexing_notifier=indexing_notifier,
                 persist_snapshot=True,
+                reporter=reporter,
             )
             reference_fps = snapshot.effective_fps or snapshot.source_fps
             reopened += 1
@@ -390,6 +695,18 @@ def init_clips(
         if fps_override is None and reference_fps is not None:
             fps_override = reference_fps
 
+        if _can_defer(plan, fps_override):
+            _install_lazy_clip(
+                plan,
+                fps_override=fps_override,
+                cache_dir_str=cache_dir_str,
+                cache_root=cache_root,
+                indexing_notifier=indexing_notifier,
+                reporter=reporter,
+            )
+            deferred += 1
+            continue
+
         needs_refresh = force_reprobe or plan.clip is None or _plan_needs_refresh(plan, fps_override)
         if not needs_refresh:
             if fps_override is not None:
@@ -404,12 +721,30 @@ def init_clips(
             cache_root=cache_root,
             indexing_notifier=indexing_notifier,
             persist_snapshot=True,
+            reporter=reporter,
         )
         plan.applied_fps = fps_override if fps_override is not None else snapshot.applied_fps
         reopened += 1
 
     _log_cache_note(
-        f"[CACHE] init_clips summary: reused={reuse_hits} reopened={reopened} force_reprobe={force_reprobe}",
+        f"[CACHE] init_clips summary: reused={reuse_hits} reopened={reopened} deferred={deferred} "
+        f"force_reprobe={force_reprobe}",
+        reporter,
+    )
+
+
+def log_deferred_clip_summary(
+    plans: Sequence[ClipPlan],
+    reporter: CliOutputManagerProtocol | None = None,
+) -> None:
+    """Report how many deferred clip handles were opened versus never touched."""
+
+    lazy = [plan.clip for plan in plans if isinstance(plan.clip, vs_core.LazyClip)]
+    if not lazy:
+        return
+    skipped = sum(1 for clip in lazy if not clip.is_open)
+    _log_cache_note(
+        f"[CACHE] Deferred clip summary: opened={len(lazy) - skipped} skipped={skipped}",
         reporter,
     )
 
@@ -21,7 +21,7 @@ from src.frame_compare.interfaces import (
     ReportRendererProtocol,
     SlowpicsClientProtocol,
 )
-from src.frame_compare.slowpics import upload_comparison
+from src.frame_compare.slowpics import UploadStats, upload_comparison
 from src.frame_compare.tmdb_workflow import TMDBLookupResult
 
 from .alignment import AlignmentWorkflow
@@ -112,12 +112,18 @@ class _SlowpicsClient(SlowpicsClientProtocol):
         cfg: SlowpicsConfig,
         *,
         progress_callback: Callable[[int], None] | None = None,
+        byte_progress_callback: Callable[[int], None] | None = None,
+        stats_callback: Callable[[UploadStats], None] | None = None,
+        prepare_image: Callable[[Path], None] | None = None,
     ) -> str:
         return upload_comparison(
             list(image_paths),
             out_dir,
             cfg,
             progress_callback=progress_callback,
+            byte_progress_callback=byte_progress_callback,
+            stats_callback=stats_callback,
+            prepare_image=prepare_image,
         )
 
 
@@ -149,6 +155,9 @@ class _ReportRenderer(ReportRendererProtocol):
             slowpics_url=slowpics_url,
         )
 
+    def set_slowpics_url(self, report_index: Path, slowpics_url: str | None) -> None:
+        html_report.update_report_slowpics_url(report_index, slowpics_url)
+
 
 class _PublisherIO(PublisherIO):
     """Filesystem helper backing publisher services."""
@@ -7,7 +7,7 @@ import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Sequence, cast
+from typing import Any, Callable, Mapping, MutableMapping, Sequence, cast
 
 from rich.markup import escape
 
@@ -22,6 +22,7 @@ from src.frame_compare.cli_runtime import (
     SlowpicsJSON,
     SlowpicsTitleBlock,
     SlowpicsTitleInputs,
+    SlowpicsUploadJSON,
 )
 from src.frame_compare.interfaces import (
     PublisherIO,
@@ -31,7 +32,7 @@ from src.frame_compare.interfaces import (
 from src.frame_compare.layout_utils import color_text as _color_text
 from src.frame_compare.layout_utils import format_kv as _format_kv
 from src.frame_compare.layout_utils import plan_label as _plan_label
-from src.frame_compare.slowpics import SlowpicsAPIError, build_shortcut_filename
+from src.frame_compare.slowpics import SlowpicsAPIError, UploadStats, build_shortcut_filename
 
 
 @dataclass(slots=True)
@@ -49,6 +50,7 @@ class SlowpicsPublisherRequest:
     image_paths: Sequence[str]
     out_dir: Path
     config: SlowpicsConfig
+    prepare_image: Callable[[Path], None] | None = None
 
 
 @dataclass(slots=True)
@@ -107,6 +109,7 @@ def _ensure_slowpics_block(json_tail: JsonTail, cfg: SlowpicsConfig) -> Slowpics
                 "is_public": bool(cfg.is_public),
                 "is_hentai": bool(cfg.is_hentai),
                 "remove_after_days": int(cfg.remove_after_days),
+                "upload": None,
             },
         )
         json_tail["slowpics"] = block
@@ -122,9 +125,23 @@ def _ensure_slowpics_block(json_tail: JsonTail, cfg: SlowpicsConfig) -> Slowpics
         block["shortcut_error"] = None
     if "deleted_screens_dir" not in block:
         block["deleted_screens_dir"] = False
+    if "upload" not in block:
+        block["upload"] = None
     return block
 
 
+def _upload_stats_block(stats: UploadStats) -> SlowpicsUploadJSON:
+    return SlowpicsUploadJSON(
+        adaptive=stats.adaptive,
+        concurrency=stats.concurrency,
+        peak_concurrency=stats.peak_concurrency,
+        backoffs=stats.backoffs,
+        bytes=stats.bytes_sent,
+        seconds=round(stats.seconds, 3),
+        mb_per_s=round(stats.mb_per_s, 3),
+    )
+
+
 class SlowpicsPublisher:
     """Service that encapsulates slow.pics logging and uploads."""
 
@@ -138,6 +155,7 @@ class SlowpicsPublisher:
         json_tail = request.json_tail
         slowpics_cfg = request.config
         slowpics_url: str | None = None
+        upload_stats: list[UploadStats] = []
 
         reporter.line(_color_text("slow.pics collection (preview):", "blue"))
         inputs_parts = [
@@ -224,12 +242,24 @@ class SlowpicsPublisher:
                     stats=_format_stats(files_done, bytes_done, elapsed),
                 )
 
+            def _advance_upload_bytes(nbytes: int) -> None:
+                files_done, bytes_done, elapsed = progress_tracker.advance_bytes(nbytes)
+                reporter.update_progress_state(
+                    "upload_bar",
+                    current=min(files_done, upload_total),
+                    total=upload_total,
+                    stats=_format_stats(files_done, bytes_done, elapsed),
+                )
+
             try:
                 slowpics_url = self._client.upload(
                     list(request.image_paths),
                     request.out_dir,
                     slowpics_cfg,
                     progress_callback=_advance_upload,
+                    byte_progress_callback=_advance_upload_bytes,
+                    stats_callback=upload_stats.append,
+                    prepare_image=request.prepare_image,
                 )
             except SlowpicsAPIError as exc:
                 layout_data.setdefault("slowpics", {})["status"] = "failed"
@@ -243,9 +273,16 @@ class SlowpicsPublisher:
                 reporter.update_values(layout_data)
                 reporter.line(_color_text(f"[✓] slow.pics: uploading {upload_total} images", "green"))
                 reporter.line(_color_text("[✓] slow.pics: assembling collection", "green"))
+                for stats in upload_stats:
+                    reporter.verbose_line(
+                        f"  slow.pics throughput: {stats.mb_per_s:.2f} MB/s at concurrency "
+                        f"{stats.concurrency} (peak {stats.peak_concurrency}, {stats.backoffs} backoffs)"
+                    )
 
         slowpics_block = _ensure_slowpics_block(json_tail, slowpics_cfg)
         slowpics_block["url"] = slowpics_url
+        if upload_stats:
+            slowpics_block["upload"] = _upload_stats_block(upload_stats[-1])
         shortcut_path_obj: Path | None = None
         shortcut_error: str | None = None
         if slowpics_cfg.create_url_shortcut and slowpics_url:
@@ -337,6 +374,30 @@ class ReportPublisher:
             report_block["path"] = None
 
         return ReportPublisherResult(report_path=report_index_path)
+
+    def attach_slowpics_url(
+        self,
+        request: ReportPublisherRequest,
+        result: ReportPublisherResult,
+        slowpics_url: str | None,
+    ) -> None:
+        """
+        Link a report generated ahead of the upload to the finished slow.pics collection.
+
+        A failed rewrite only costs the link, so it is reported as a warning.
+        """
+
+        request.slowpics_url = slowpics_url
+        if result.report_path is None or not slowpics_url:
+            return
+        try:
+            self._renderer.set_slowpics_url(result.report_path, slowpics_url)
+        except Exception as exc:
+            message = f"HTML report slow.pics link update failed: {exc}"
+            request.reporter.warn(message)
+            request.collected_warnings.append(message)
+
+
 class UploadProgressTracker:
     """Track uploaded file/byte counts in a thread-safe manner."""
 
@@ -346,6 +407,7 @@ class UploadProgressTracker:
         self.total_bytes = sum(self._file_sizes)
         self._uploaded_files = 0
         self._uploaded_bytes = 0
+        self._streamed_bytes = 0
         self._start_time = time.perf_counter()
         self._lock = threading.Lock()
 
@@ -358,5 +420,15 @@ class UploadProgressTracker:
                 size = self._file_sizes[index] if index < self.total_files else 0
                 self._uploaded_bytes = min(self._uploaded_bytes + size, self.total_bytes)
                 self._uploaded_files += 1
-            elapsed = max(time.perf_counter() - self._start_time, 1e-6)
-            return self._uploaded_files, self._uploaded_bytes, elapsed
+            return self._snapshot()
+
+    def advance_bytes(self, nbytes: int) -> tuple[int, int, float]:
+        """Record streamed file bytes; negative values rewind a retried upload."""
+
+        with self._lock:
+            self._streamed_bytes = min(max(self._streamed_bytes + nbytes, 0), self.total_bytes)
+            return self._snapshot()
+
+    def _snapshot(self) -> tuple[int, int, float]:
+        elapsed = max(time.perf_counter() - self._start_time, 1e-6)
+        return self._uploaded_files, max(self._uploaded_bytes, self._streamed_bytes), elapsed
@@ -2,30 +2,36 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import queue
 import re
+import threading
 import time
 import uuid
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, cast
 from urllib.parse import unquote, urlsplit
 
 import requests
-from requests.adapters import HTTPAdapter
 
 from src.datatypes import SlowpicsConfig
 from src.frame_compare.net import (
     ALLOWED_METHODS,
     DEFAULT_CONNECT_TIMEOUT,
     RETRY_STATUS,
+    SharedHTTPAdapter,
     build_urllib3_retry,
+    configure_host_rate,
+    shared_http_adapter,
 )
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
+    import httpx
     from requests_toolbelt import MultipartEncoder as _MultipartEncoderType
 else:  # pragma: no cover - optional dependency in tests
     _MultipartEncoderType = Any
@@ -49,6 +55,17 @@ _CONNECT_TIMEOUT_SECONDS = DEFAULT_CONNECT_TIMEOUT
 _DEFAULT_UPLOAD_CONCURRENCY = 3
 _MIN_UPLOAD_THROUGHPUT_BYTES_PER_SEC = 256 * 1024  # 256 KiB/s baseline assumption
 _UPLOAD_TIMEOUT_MARGIN_SECONDS = 15.0
+# A finished window must beat the best one by 5% before concurrency grows, and growth
+# stops once throughput is within 10% of a configured byte-rate ceiling.
+_ADAPTIVE_GAIN_RATIO = 1.05
+_CEILING_HEADROOM_RATIO = 0.9
+_SLOWPICS_HOST = "slow.pics"
+_SLOWPICS_BASE_URL = "https://slow.pics"
+# Requests per second (and burst) shared by every slow.pics session in the process.
+_SLOWPICS_RATE_PER_SECOND = 10.0
+_SLOWPICS_BURST = 10
+
+configure_host_rate(_SLOWPICS_HOST, _SLOWPICS_RATE_PER_SECOND, burst=_SLOWPICS_BURST)
 
 
 class _SessionPool:
@@ -88,7 +105,355 @@ class _SessionPool:
                 logger.debug("Failed to close slow.pics session cleanly", exc_info=True)
 
 
-def _raise_for_status(response: requests.Response, context: str) -> None:
+@dataclass(frozen=True)
+class UploadStats:
+    """Concurrency and throughput summary of one finished upload run."""
+
+    adaptive: bool
+    concurrency: int
+    peak_concurrency: int
+    bytes_sent: int
+    seconds: float
+    backoffs: int
+
+    @property
+    def mb_per_s(self) -> float:
+        """Average upload rate in decimal megabytes per second."""
+
+        return self.bytes_sent / self.seconds / 1_000_000 if self.seconds > 0 else 0.0
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight image uploads shared by both upload engines.
+
+    Every ``limit`` finished uploads close a window. While a window moves more bytes
+    per second than the best one so far the limit grows by one (up to ``maximum``);
+    an upload that hit a timeout, 429 or 5xx halves it and restarts the probe. With
+    ``max_bytes_per_second`` set, upload starts are paced to keep the aggregate rate
+    under the ceiling and the limit stops growing once the ceiling is in reach.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        *,
+        maximum: int,
+        adaptive: bool = True,
+        max_bytes_per_second: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maximum = max(1, maximum)
+        self.adaptive = adaptive
+        self._limit = max(1, min(initial, self.maximum))
+        self._peak = self._limit
+        self._ceiling = max(0.0, float(max_bytes_per_second))
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._paced_until = 0.0
+        self._bytes = 0
+        self._backoffs = 0
+        self._best_rate = 0.0
+        self._window_start = 0.0
+        self._window_bytes = 0
+        self._window_count = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of uploads allowed in flight."""
+
+        return self._limit
+
+    def try_acquire(self, nbytes: int) -> Optional[float]:
+        """Claim a slot for an upload of *nbytes*; return its pacing delay, or ``None`` when full."""
+
+        with self._cond:
+            if self._in_flight >= self._limit:
+                return None
+            self._in_flight += 1
+            now = self._clock()
+            if self._started is None:
+                self._started = now
+                self._window_start = now
+            if not self._ceiling:
+                return 0.0
+            start = max(now, self._paced_until)
+            self._paced_until = start + nbytes / self._ceiling
+            return start - now
+
+    def acquire(self, nbytes: int) -> None:
+        """Block the calling thread until a slot is free, then sleep out the pacing delay."""
+
+        with self._cond:
+            delay = self.try_acquire(nbytes)
+            while delay is None:
+                self._cond.wait()
+                delay = self.try_acquire(nbytes)
+        if delay > 0:
+            time.sleep(delay)
+
+    def release(self, nbytes: int, *, throttled: bool = False) -> None:
+        """Return a slot after an upload that sent *nbytes* (0 when it failed outright)."""
+
+        with self._cond:
+            self._in_flight -= 1
+            now = self._clock()
+            self._finished = now
+            self._bytes += nbytes
+            if throttled:
+                self._backoffs += 1
+                if self.adaptive:
+                    self._limit = max(1, self._limit // 2)
+                self._best_rate = 0.0
+                self._reset_window(now)
+            elif nbytes:
+                self._window_bytes += nbytes
+                self._window_count += 1
+                if self._window_count >= self._limit:
+                    self._close_window(now)
+            self._cond.notify_all()
+
+    def stats(self) -> UploadStats:
+        """Return the run summary recorded so far."""
+
+        with self._cond:
+            elapsed = 0.0
+            if self._started is not None and self._finished is not None:
+                elapsed = max(0.0, self._finished - self._started)
+            return UploadStats(
+                adaptive=self.adaptive,
+                concurrency=self._limit,
+                peak_concurrency=self._peak,
+                bytes_sent=self._bytes,
+                seconds=elapsed,
+                backoffs=self._backoffs,
+            )
+
+    def _close_window(self, now: float) -> None:
+        elapsed = now - self._window_start
+        rate = self._window_bytes / elapsed if elapsed > 0 else 0.0
+        if self.adaptive and rate > self._best_rate * _ADAPTIVE_GAIN_RATIO and self._limit < self.maximum:
+            if not self._ceiling or rate < self._ceiling * _CEILING_HEADROOM_RATIO:
+                self._limit += 1
+                self._peak = max(self._peak, self._limit)
+                logger.debug("slow.pics upload concurrency -> %d (%.0f B/s)", self._limit, rate)
+        self._best_rate = max(self._best_rate, rate)
+        self._reset_window(now)
+
+    def _reset_window(self, now: float) -> None:
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_count = 0
+
+
+def _upload_concurrency(
+    cfg: SlowpicsConfig,
+    max_workers: Optional[int],
+    *,
+    default: int,
+    jobs: int,
+) -> AdaptiveConcurrency:
+    """Build the concurrency controller; an explicit ``max_workers`` pins the limit."""
+
+    if max_workers is not None and max_workers > 0:
+        initial = maximum = max_workers
+        adaptive = False
+    else:
+        initial = default
+        adaptive = bool(cfg.adaptive_concurrency)
+        maximum = int(cfg.max_upload_concurrency) if adaptive else initial
+    maximum = max(1, min(maximum, jobs or 1))
+    return AdaptiveConcurrency(
+        initial,
+        maximum=maximum,
+        adaptive=adaptive and maximum > 1,
+        max_bytes_per_second=float(cfg.max_upload_bytes_per_second),
+    )
+
+
+UPLOAD_JOURNAL_NAME = ".slowpics-upload.jsonl"
+_JOURNAL_VERSION = 1
+
+
+@dataclass
+class UploadJournal:
+    """
+    Append-only record of an in-progress slow.pics upload, kept in the screens directory.
+
+    The first line holds the collection (UUID, canonical URL, browser ID, name) and the
+    screenshot → image-UUID mapping with file sizes; every later line marks one image
+    as uploaded together with the size it was sent at (lossless recompression may
+    shrink a screenshot after the collection exists). A torn final line from a crash
+    is ignored on load, so the journal is never worse than one image behind. Removed
+    once the collection is complete.
+    """
+
+    path: Path
+    collection_uuid: str
+    canonical_url: str
+    browser_id: str
+    collection_name: str
+    images: Dict[str, str]
+    sizes: Dict[str, int]
+    completed: Set[str] = field(default_factory=lambda: set[str]())
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def create(
+        cls,
+        screen_dir: Path,
+        *,
+        collection_uuid: str,
+        canonical_url: str,
+        browser_id: str,
+        collection_name: str,
+        jobs: Sequence[tuple[Path, str]],
+    ) -> "UploadJournal":
+        """Start a journal for a freshly created collection, replacing any previous one."""
+
+        journal = cls(
+            path=screen_dir / UPLOAD_JOURNAL_NAME,
+            collection_uuid=collection_uuid,
+            canonical_url=canonical_url,
+            browser_id=browser_id,
+            collection_name=collection_name,
+            images={path.name: image_uuid for path, image_uuid in jobs},
+            sizes={path.name: path.stat().st_size for path, _ in jobs},
+        )
+        header = {
+            "version": _JOURNAL_VERSION,
+            "collection_uuid": collection_uuid,
+            "canonical_url": canonical_url,
+            "browser_id": browser_id,
+            "collection_name": collection_name,
+            "images": journal.images,
+            "sizes": journal.sizes,
+        }
+        try:
+            journal.path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+        except OSError as exc:
+            logger.warning("Unable to write slow.pics upload journal %s: %s", journal.path, exc)
+        return journal
+
+    @classmethod
+    def load(cls, screen_dir: Path) -> Optional["UploadJournal"]:
+        """Return the journal stored in *screen_dir*, or ``None`` when absent or unreadable."""
+
+        path = screen_dir / UPLOAD_JOURNAL_NAME
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return None
+        try:
+            header = cast(Dict[str, Any], json.loads(lines[0]))
+            if header.get("version") != _JOURNAL_VERSION:
+                return None
+            journal = cls(
+                path=path,
+                collection_uuid=str(header["collection_uuid"]),
+                canonical_url=str(header["canonical_url"]),
+                browser_id=str(header["browser_id"]),
+                collection_name=str(header.get("collection_name") or ""),
+                images={str(k): str(v) for k, v in cast(Dict[str, Any], header["images"]).items()},
+                sizes={str(k): int(v) for k, v in cast(Dict[str, Any], header["sizes"]).items()},
+            )
+        except (IndexError, KeyError, TypeError, ValueError, AttributeError):
+            logger.warning("Ignoring malformed slow.pics upload journal %s", path)
+            return None
+        for line in lines[1:]:
+            try:
+                entry = cast(Dict[str, Any], json.loads(line))
+            except ValueError:
+                continue
+            name = entry.get("done")
+            if isinstance(name, str) and name in journal.images:
+                journal.completed.add(name)
+                size = entry.get("size")
+                if isinstance(size, int):
+                    journal.sizes[name] = size
+        return journal
+
+    def matches(self, image_files: Sequence[str]) -> bool:
+        """
+        Return whether *image_files* are the screenshots this journal was written for.
+
+        Names must match exactly, and uploaded screenshots must still have the size they
+        were sent at; pending ones are sent as they are now.
+        """
+
+        current: Dict[str, int] = {}
+        for file_path in image_files:
+            path = Path(file_path)
+            try:
+                current[path.name] = path.stat().st_size
+            except OSError:
+                return False
+        if current.keys() != self.images.keys():
+            return False
+        return all(current[name] == self.sizes.get(name) for name in self.completed)
+
+    def pending(self) -> List[tuple[Path, str]]:
+        """Return ``(path, image_uuid)`` for every image not yet uploaded."""
+
+        root = self.path.parent
+        return [
+            (root / name, image_uuid)
+            for name, image_uuid in sorted(self.images.items())
+            if name not in self.completed
+        ]
+
+    def mark_done(self, path: Path) -> None:
+        """Record *path* as uploaded at its current size (thread-safe)."""
+
+        with self._lock:
+            self.completed.add(path.name)
+            try:
+                size = path.stat().st_size
+            except OSError:
+                size = self.sizes.get(path.name, 0)
+            self.sizes[path.name] = size
+            try:
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps({"done": path.name, "size": size}) + "\n")
+            except OSError as exc:
+                logger.debug("Unable to update slow.pics upload journal: %s", exc)
+
+    def discard(self) -> None:
+        """Delete the journal once the collection is complete."""
+
+        self.path.unlink(missing_ok=True)
+
+
+def _resumable_journal(screen_dir: Path, image_files: Sequence[str]) -> Optional[UploadJournal]:
+    journal = UploadJournal.load(screen_dir)
+    if journal is None:
+        logger.warning("No slow.pics upload journal in %s; starting a new collection", screen_dir)
+        return None
+    if not journal.matches(image_files):
+        logger.warning("Screenshots changed since the interrupted upload; starting a new collection")
+        return None
+    logger.info(
+        "Resuming slow.pics upload %s: %d of %d images already uploaded",
+        journal.canonical_url,
+        len(journal.completed),
+        len(journal.images),
+    )
+    return journal
+
+
+def _log_interrupted_upload(journal: UploadJournal) -> None:
+    logger.warning(
+        "slow.pics upload interrupted after %d of %d images; rerun with --resume-upload to finish %s",
+        len(journal.completed),
+        len(journal.images),
+        journal.canonical_url,
+    )
+
+
+def _raise_for_status(response: "requests.Response | httpx.Response", context: str) -> None:
     if response.status_code >= 400:
         try:
             detail = response.json()
@@ -134,8 +499,54 @@ def _post_direct_webhook(session: requests.Session, webhook_url: str, canonical_
     logger.error("Giving up on webhook delivery to %s after %s attempts", redacted, 3)
 
 
+class _RewindableMultipart:
+    """
+    Multipart request body that urllib3 can rewind when it retries a POST.
+
+    ``MultipartEncoder`` streams once and has no ``tell``/``seek``, so a status retry
+    used to resend an exhausted body that never matched its ``Content-Length``.
+    Seeking to the start rebuilds the encoder through *build*, which must reset any
+    file handles it reads from.
+    """
+
+    def __init__(self, build: Callable[[], Any]) -> None:
+        self._build = build
+        self._encoder = build()
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return self._encoder.content_type
+
+    @property
+    def len(self) -> int:
+        return int(getattr(self._encoder, "len", 0))
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._encoder.read(size)
+        self._position += len(chunk)
+        return chunk
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if offset or whence:
+            raise OSError("multipart bodies can only be rewound to the start")
+        if self._position:
+            self._encoder = self._build()
+            self._position = 0
+        return 0
+
+
 def _build_legacy_headers(session: requests.Session, encoder: Any) -> Dict[str, str]:
     xsrf = session.cookies.get_dict().get("XSRF-TOKEN")
+    return _legacy_headers(xsrf, encoder.content_type, int(getattr(encoder, "len", 0)))
+
+
+def _legacy_headers(xsrf: Optional[str], content_type: str, content_length: int) -> Dict[str, str]:
+    """Return the browser-like headers slow.pics expects on legacy upload endpoints."""
+
     if not xsrf:
         raise SlowpicsAPIError("Missing XSRF token; cannot complete slow.pics upload")
     return {
@@ -143,8 +554,8 @@ def _build_legacy_headers(session: requests.Session, encoder: Any) -> Dict[str,
         "Accept-Encoding": "gzip, deflate",
         "Accept-Language": "en-US,en;q=0.9",
         "Access-Control-Allow-Origin": "*",
-        "Content-Length": str(getattr(encoder, "len", 0)),
-        "Content-Type": encoder.content_type,
+        "Content-Length": str(content_length),
+        "Content-Type": content_type,
         "Origin": "https://slow.pics/",
         "Referer": "https://slow.pics/comparison",
         "User-Agent": (
@@ -266,7 +677,11 @@ def _upload_comparison_legacy(
     cfg: SlowpicsConfig,
     *,
     progress_callback: Optional[Callable[[int], None]] = None,
+    stats_callback: Optional[Callable[[UploadStats], None]] = None,
+    prepare_image: Optional[Callable[[Path], None]] = None,
     max_workers: Optional[int] = None,
+    base_url: str = _SLOWPICS_BASE_URL,
+    resume: bool = False,
 ) -> str:
     if MultipartEncoder is None:
         raise SlowpicsAPIError(
@@ -275,9 +690,135 @@ def _upload_comparison_legacy(
     encoder_cls = MultipartEncoder
 
     frame_order, grouped = _prepare_legacy_plan(image_files)
-    browser_id = str(uuid.uuid4())
+    journal = _resumable_journal(screen_dir, image_files) if resume else None
 
-    fields: dict[str, str] = {
+    session = session_factory()
+    assert encoder_cls is not None
+    if journal is None:
+        browser_id = str(uuid.uuid4())
+        fields, upload_plan = _legacy_collection_fields(cfg, frame_order, grouped, browser_id)
+        boundary = str(uuid.uuid4())
+        encoder = _RewindableMultipart(lambda: encoder_cls(fields, boundary))
+        headers = _build_legacy_headers(session, encoder)
+        response = session.post(
+            f"{base_url}/upload/comparison",
+            data=encoder,
+            headers=headers,
+            timeout=(_CONNECT_TIMEOUT_SECONDS, 30.0),
+        )
+        _raise_for_status(response, "Legacy collection creation")
+        collection_uuid, canonical_url, jobs = _parse_collection_response(response, upload_plan)
+        journal = UploadJournal.create(
+            screen_dir,
+            collection_uuid=str(collection_uuid),
+            canonical_url=canonical_url,
+            browser_id=browser_id,
+            collection_name=cfg.collection_name,
+            jobs=jobs,
+        )
+    else:
+        collection_uuid = journal.collection_uuid
+        canonical_url = journal.canonical_url
+        browser_id = journal.browser_id
+        jobs = journal.pending()
+
+    controller = _upload_concurrency(cfg, max_workers, default=_DEFAULT_UPLOAD_CONCURRENCY, jobs=len(jobs))
+    worker_count = controller.maximum
+
+    session_pool = _SessionPool(session_factory, worker_count)
+    try:
+        def _post_image(path: Path, image_uuid: str, timeout: tuple[float, float]) -> requests.Response:
+            with ExitStack() as stack:
+                file_handle = stack.enter_context(path.open("rb"))
+                boundary = str(uuid.uuid4())
+
+                def _encode() -> Any:
+                    file_handle.seek(0)
+                    upload_fields = {
+                        "collectionUuid": collection_uuid,
+                        "imageUuid": image_uuid,
+                        "file": (path.name, file_handle, "image/png"),
+                        "browserId": browser_id,
+                    }
+                    return encoder_cls(upload_fields, boundary)
+
+                upload_encoder = _RewindableMultipart(_encode)
+                with session_pool.acquire() as local_session:
+                    upload_headers = _build_legacy_headers(local_session, upload_encoder)
+                    return local_session.post(
+                        f"{base_url}/upload/image",
+                        data=upload_encoder,
+                        headers=upload_headers,
+                        timeout=timeout,
+                    )
+
+        def _upload_single(path: Path, image_uuid: str) -> None:
+            if prepare_image is not None:
+                prepare_image(path)
+            file_size = path.stat().st_size
+            timeout = _compute_image_upload_timeout(cfg, file_size)
+            controller.acquire(file_size)
+            sent = 0
+            throttled = False
+            try:
+                upload_resp = _post_image(path, image_uuid, timeout)
+                throttled = _was_throttled(upload_resp)
+                _raise_for_status(upload_resp, f"Upload frame {path.name}")
+                _check_image_response(upload_resp)
+                sent = file_size
+            except requests.Timeout:
+                throttled = True
+                raise
+            finally:
+                controller.release(sent, throttled=throttled)
+            journal.mark_done(path)
+            if progress_callback is not None:
+                progress_callback(1)
+
+        if worker_count == 1:
+            for path, image_uuid in jobs:
+                _upload_single(path, image_uuid)
+        else:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                futures = [executor.submit(_upload_single, path, image_uuid) for path, image_uuid in jobs]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+    except Exception:
+        _log_interrupted_upload(journal)
+        raise
+    finally:
+        session_pool.close()
+
+    journal.discard()
+    stats = controller.stats()
+    logger.info(
+        "slow.pics upload throughput: %.2f MB/s, concurrency=%d (peak %d, %d backoffs)",
+        stats.mb_per_s,
+        stats.concurrency,
+        stats.peak_concurrency,
+        stats.backoffs,
+    )
+    if stats_callback is not None:
+        stats_callback(stats)
+    _finish_upload(session, cfg, screen_dir, canonical_url)
+    session.close()
+    return canonical_url
+
+
+def _legacy_collection_fields(
+    cfg: SlowpicsConfig,
+    frame_order: List[int],
+    grouped: List[List[tuple[str, Path]]],
+    browser_id: str,
+) -> tuple[Dict[str, str], List[List[Path]]]:
+    """Return the collection form fields and the per-comparison upload plan."""
+
+    fields: Dict[str, str] = {
         "collectionName": cfg.collection_name or "Frame Comparison",
         "hentai": str(bool(cfg.is_hentai)).lower(),
         "optimize-images": "true",
@@ -298,18 +839,15 @@ def _upload_comparison_legacy(
             fields[f"comparisons[{comp_index}].imageNames[{image_index}]"] = label
             per_frame_paths.append(path)
         upload_plan.append(per_frame_paths)
+    return fields, upload_plan
+
+
+def _parse_collection_response(
+    response: Any,
+    upload_plan: List[List[Path]],
+) -> tuple[Any, str, List[tuple[Path, str]]]:
+    """Return ``(collection_uuid, canonical_url, jobs)`` from a collection creation response."""
 
-    session = session_factory()
-    assert encoder_cls is not None
-    encoder = encoder_cls(fields, str(uuid.uuid4()))
-    headers = _build_legacy_headers(session, encoder)
-    response = session.post(
-        "https://slow.pics/upload/comparison",
-        data=encoder,
-        headers=headers,
-        timeout=(_CONNECT_TIMEOUT_SECONDS, 30.0),
-    )
-    _raise_for_status(response, "Legacy collection creation")
     try:
         comp_json = response.json()
     except ValueError as exc:
@@ -343,55 +881,29 @@ def _upload_comparison_legacy(
         if len(image_ids) != len(per_frame_paths):
             raise SlowpicsAPIError("Slow.pics returned mismatched image identifiers")
         jobs.extend(zip(per_frame_paths, image_ids))
+    return collection_uuid, canonical_url, jobs
 
-    worker_count = max_workers if max_workers is not None else _DEFAULT_UPLOAD_CONCURRENCY
-    worker_count = max(1, min(worker_count, len(jobs) or 1))
 
-    session_pool = _SessionPool(session_factory, worker_count)
-    try:
-        def _upload_single(path: Path, image_uuid: str) -> None:
-            file_size = path.stat().st_size
-            timeout = _compute_image_upload_timeout(cfg, file_size)
-            with ExitStack() as stack:
-                file_handle = stack.enter_context(path.open("rb"))
-                upload_fields = {
-                    "collectionUuid": collection_uuid,
-                    "imageUuid": image_uuid,
-                    "file": (path.name, file_handle, "image/png"),
-                    "browserId": browser_id,
-                }
-                upload_encoder = encoder_cls(upload_fields, str(uuid.uuid4()))
-                with session_pool.acquire() as local_session:
-                    upload_headers = _build_legacy_headers(local_session, upload_encoder)
-                    upload_resp = local_session.post(
-                        "https://slow.pics/upload/image",
-                        data=upload_encoder,
-                        headers=upload_headers,
-                        timeout=timeout,
-                    )
-            _raise_for_status(upload_resp, f"Upload frame {path.name}")
-            if getattr(upload_resp, "content", b""):
-                text = upload_resp.content.decode("utf-8", "ignore").strip()
-                if text and text.upper() != "OK":
-                    raise SlowpicsAPIError(f"Unexpected slow.pics response: {text}")
-            if progress_callback is not None:
-                progress_callback(1)
+def _was_throttled(response: Any) -> bool:
+    """Return ``True`` when urllib3 retried *response* after a 429, 5xx or timeout."""
+
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    for attempt in getattr(retries, "history", ()) or ():
+        status = getattr(attempt, "status", None)
+        if getattr(attempt, "error", None) is not None or (status is not None and status in RETRY_STATUS):
+            return True
+    return getattr(response, "status_code", 200) in RETRY_STATUS
+
+
+def _check_image_response(response: Any) -> None:
+    if getattr(response, "content", b""):
+        text = response.content.decode("utf-8", "ignore").strip()
+        if text and text.upper() != "OK":
+            raise SlowpicsAPIError(f"Unexpected slow.pics response: {text}")
 
-        if worker_count == 1:
-            for path, image_uuid in jobs:
-                _upload_single(path, image_uuid)
-        else:
-            with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                futures = [executor.submit(_upload_single, path, image_uuid) for path, image_uuid in jobs]
-                try:
-                    for future in as_completed(futures):
-                        future.result()
-                except Exception:
-                    for future in futures:
-                        future.cancel()
-                    raise
-    finally:
-        session_pool.close()
+
+def _finish_upload(session: requests.Session, cfg: SlowpicsConfig, screen_dir: Path, canonical_url: str) -> None:
+    """Deliver the webhook and write the ``.url`` shortcut once every image is uploaded."""
 
     if cfg.webhook_url:
         _post_direct_webhook(session, cfg.webhook_url, canonical_url)
@@ -407,13 +919,16 @@ def _upload_comparison_legacy(
                 shortcut_path,
                 exc,
             )
-    session.close()
-    return canonical_url
 
 
 def _configure_slowpics_session(session: requests.Session, *, workers: Optional[int] = None) -> None:
     """
-    Configure the provided session with retry-capable HTTP adapters sized for concurrent uploads.
+    Mount the process-wide slow.pics adapter, sized for concurrent uploads, on *session*.
+
+    Every session (bootstrap and per-worker) shares one keep-alive pool per pool size,
+    so connections survive ``Session.close()`` and later uploads in the same process
+    skip the TLS handshake. Sends wait on the slow.pics host limiter, and throttled
+    responses pause all sessions at once.
 
     Parameters:
         session: The Requests session that will perform slow.pics HTTP calls.
@@ -427,11 +942,15 @@ def _configure_slowpics_session(session: requests.Session, *, workers: Optional[
         status_forcelist=RETRY_STATUS,
         allowed_methods=ALLOWED_METHODS,
     )
-    adapter = HTTPAdapter(
-        max_retries=retries,
-        pool_connections=pool_size,
-        pool_maxsize=pool_size,
-    )
+
+    def _build_adapter() -> SharedHTTPAdapter:
+        return SharedHTTPAdapter(
+            max_retries=retries,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+        )
+
+    adapter = shared_http_adapter((_SLOWPICS_HOST, pool_size), _build_adapter)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     logger.info(
@@ -448,10 +967,36 @@ def upload_comparison(
     cfg: SlowpicsConfig,
     *,
     progress_callback: Optional[Callable[[int], None]] = None,
+    byte_progress_callback: Optional[Callable[[int], None]] = None,
+    stats_callback: Optional[Callable[[UploadStats], None]] = None,
+    prepare_image: Optional[Callable[[Path], None]] = None,
     max_workers: Optional[int] = None,
+    base_url: str = _SLOWPICS_BASE_URL,
+    resume: bool = False,
 ) -> str:
     """Upload screenshots to slow.pics and return the collection URL.
 
+    Progress is journaled to :data:`UPLOAD_JOURNAL_NAME` in *screen_dir*. With
+    ``resume=True`` a journal written for the same screenshots is picked up: the
+    existing collection is reused and only images not yet uploaded are sent.
+
+    ``cfg.upload_engine`` selects the threaded Requests engine (``"threads"``) or
+    the asyncio/httpx engine in :mod:`src.frame_compare.slowpics_async`
+    (``"async"``). Only the async engine streams image bodies and reports bytes
+    through ``byte_progress_callback``.
+
+    Unless ``max_workers`` pins it, both engines tune the number of parallel image
+    uploads with :class:`AdaptiveConcurrency` (see ``cfg.adaptive_concurrency``,
+    ``cfg.max_upload_concurrency`` and ``cfg.max_upload_bytes_per_second``) and
+    report the outcome once to ``stats_callback``.
+
+    ``prepare_image`` is called with each screenshot right before it is read for
+    upload (from a worker thread), letting callers finish rewriting the file first;
+    the runner uses it to overlap lossless PNG recompression with the upload.
+
+    ``base_url`` points both engines at another slow.pics-compatible server, such
+    as the local stand-in in ``tools/slowpics_stub.py``.
+
     Notes:
         When ``max_workers`` is greater than 1 (or left as ``None`` and defaults to
         parallel uploads), ``progress_callback`` may be invoked concurrently from
@@ -466,12 +1011,30 @@ def upload_comparison(
     if not image_files:
         raise SlowpicsAPIError("No image files provided for upload")
 
-    expected_workers = min(max_workers or _DEFAULT_UPLOAD_CONCURRENCY, len(image_files) or 1)
+    if cfg.upload_engine == "async":
+        from src.frame_compare.slowpics_async import upload_comparison_async
+
+        return upload_comparison_async(
+            image_files,
+            screen_dir,
+            cfg,
+            progress_callback=progress_callback,
+            byte_progress_callback=byte_progress_callback,
+            stats_callback=stats_callback,
+            prepare_image=prepare_image,
+            max_workers=max_workers,
+            base_url=base_url,
+            resume=resume,
+        )
+
+    expected_workers = _upload_concurrency(
+        cfg, max_workers, default=_DEFAULT_UPLOAD_CONCURRENCY, jobs=len(image_files)
+    ).maximum
     bootstrap_session = requests.Session()
     try:
         _configure_slowpics_session(bootstrap_session, workers=expected_workers)
         try:
-            bootstrap_session.get("https://slow.pics/comparison", timeout=_CONNECT_TIMEOUT_SECONDS)
+            bootstrap_session.get(f"{base_url}/comparison", timeout=_CONNECT_TIMEOUT_SECONDS)
         except requests.RequestException as exc:
             raise SlowpicsAPIError(f"Failed to establish slow.pics session: {exc}") from exc
 
@@ -493,7 +1056,11 @@ def upload_comparison(
             screen_dir,
             cfg,
             progress_callback=progress_callback,
+            stats_callback=stats_callback,
+            prepare_image=prepare_image,
             max_workers=max_workers,
+            base_url=base_url,
+            resume=resume,
         )
         logger.info("Slow.pics: %s", url)
         logger.info(
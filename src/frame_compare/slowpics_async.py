@@ -0,0 +1,368 @@
+"""Asyncio/httpx slow.pics upload engine.
+
+Drives the same legacy endpoints as :func:`src.frame_compare.slowpics.upload_comparison`
+but keeps every in-flight upload on one event loop: image bodies are streamed from
+disk as multipart chunks (reporting bytes as they are handed to the socket), and all
+uploads share one keep-alive connection pool instead of a thread and session each.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+from src.datatypes import SlowpicsConfig
+from src.frame_compare import net
+from src.frame_compare.slowpics import (
+    _CONNECT_TIMEOUT_SECONDS,  # pyright: ignore[reportPrivateUsage]
+    _SLOWPICS_BASE_URL,  # pyright: ignore[reportPrivateUsage]
+    AdaptiveConcurrency,
+    SlowpicsAPIError,
+    UploadJournal,
+    UploadStats,
+    _check_image_response,  # pyright: ignore[reportPrivateUsage]
+    _compute_image_upload_timeout,  # pyright: ignore[reportPrivateUsage]
+    _finish_upload,  # pyright: ignore[reportPrivateUsage]
+    _legacy_collection_fields,  # pyright: ignore[reportPrivateUsage]
+    _legacy_headers,  # pyright: ignore[reportPrivateUsage]
+    _log_interrupted_upload,  # pyright: ignore[reportPrivateUsage]
+    _parse_collection_response,  # pyright: ignore[reportPrivateUsage]
+    _prepare_legacy_plan,  # pyright: ignore[reportPrivateUsage]
+    _raise_for_status,  # pyright: ignore[reportPrivateUsage]
+    _resumable_journal,  # pyright: ignore[reportPrivateUsage]
+    _upload_concurrency,  # pyright: ignore[reportPrivateUsage]
+)
+
+__all__ = ["MultipartBody", "upload_comparison_async"]
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_ASYNC_UPLOAD_CONCURRENCY = 8
+_CHUNK_SIZE = 64 * 1024
+# Mirrors the urllib3 policy mounted on the threaded engine's sessions.
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF_FACTOR = 0.1
+
+
+class MultipartBody:
+    """
+    ``multipart/form-data`` body whose file part is read from disk chunk by chunk.
+
+    The total length is known up front (so the request carries ``Content-Length``
+    like the requests-toolbelt encoder), and ``on_bytes`` is told about every file
+    chunk as the transport consumes it.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple[str, str]],
+        file_field: Optional[Tuple[str, Path, str]] = None,
+        *,
+        trailing_fields: Sequence[Tuple[str, str]] = (),
+        on_bytes: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._file = file_field
+        self._on_bytes = on_bytes
+        self._head = b"".join(self._field_part(name, value) for name, value in fields)
+        self._tail = b"".join(self._field_part(name, value) for name, value in trailing_fields)
+        self._tail += f"--{self.boundary}--\r\n".encode("ascii")
+        self._file_head = b""
+        self.file_size = 0
+        if file_field is not None:
+            name, path, mime = file_field
+            self.file_size = path.stat().st_size
+            self._file_head = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"; filename="{path.name}"\r\n'
+                f"Content-Type: {mime}\r\n\r\n"
+            ).encode("utf-8")
+        self.length = len(self._head) + len(self._tail)
+        if file_field is not None:
+            self.length += len(self._file_head) + self.file_size + 2
+
+    def _field_part(self, name: str, value: str) -> bytes:
+        return (
+            f"--{self.boundary}\r\n" f'Content-Disposition: form-data; name="{name}"\r\n\r\n' f"{value}\r\n"
+        ).encode("utf-8")
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._head
+        if self._file is not None:
+            yield self._file_head
+            with self._file[1].open("rb") as handle:
+                while True:
+                    chunk = handle.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+                    if self._on_bytes is not None:
+                        self._on_bytes(len(chunk))
+            yield b"\r\n"
+        yield self._tail
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    context: str,
+    timeout: httpx.Timeout,
+    body: Optional[Callable[[], MultipartBody]] = None,
+    on_retry: Optional[Callable[[], None]] = None,
+) -> httpx.Response:
+    """
+    Send one request with the threaded engine's retry semantics.
+
+    Up to ``_RETRY_TOTAL`` retries follow transport errors and ``RETRY_STATUS``
+    responses, waiting and pausing the host exactly like the threaded engine's
+    urllib3 retries (:func:`net.retry_pause`); a fresh body is built per attempt
+    since streamed bodies cannot rewind.
+    """
+
+    host = urlsplit(url).hostname or ""
+    attempt = 0
+    while True:
+        await net.throttle_async(host)
+        headers: Dict[str, str] = {}
+        content: Optional[MultipartBody] = None
+        if body is not None:
+            content = body()
+            cookie = client.cookies.get("XSRF-TOKEN")
+            headers = _legacy_headers(cookie, content.content_type, content.length)
+        try:
+            response = await client.request(method, url, content=content, headers=headers, timeout=timeout)
+        except httpx.TransportError as exc:
+            if attempt >= _RETRY_TOTAL:
+                raise SlowpicsAPIError(f"{context} failed: {exc}") from exc
+            response = None
+        else:
+            if response.status_code not in net.RETRY_STATUS or attempt >= _RETRY_TOTAL:
+                return response
+        attempt += 1
+        delay = net.retry_pause(
+            host,
+            status=response.status_code if response is not None else None,
+            retry_after=response.headers.get("Retry-After") if response is not None else None,
+            attempt=attempt,
+            backoff_factor=_RETRY_BACKOFF_FACTOR,
+        )
+        if on_retry is not None:
+            on_retry()
+        logger.debug("Retrying %s (attempt %d) in %.2f s", context, attempt + 1, delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _upload_async(
+    image_files: List[str],
+    screen_dir: Path,
+    cfg: SlowpicsConfig,
+    *,
+    base_url: str,
+    controller: AdaptiveConcurrency,
+    prepare_image: Optional[Callable[[Path], None]],
+    progress_callback: Optional[Callable[[int], None]],
+    byte_progress_callback: Optional[Callable[[int], None]],
+    resume: bool,
+) -> str:
+    frame_order, grouped = _prepare_legacy_plan(image_files)
+    journal = _resumable_journal(screen_dir, image_files) if resume else None
+
+    concurrency = controller.maximum
+
+    def _build_transport() -> httpx.AsyncBaseTransport:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        return httpx.AsyncHTTPTransport(limits=limits, retries=0)
+
+    transport = net.shared_async_transport(("slowpics", base_url, concurrency), _build_transport)
+    async with httpx.AsyncClient(transport=transport) as client:
+        short_timeout = httpx.Timeout(30.0, connect=_CONNECT_TIMEOUT_SECONDS)
+        landing = await _send(
+            client,
+            "GET",
+            f"{base_url}/comparison",
+            context="slow.pics session bootstrap",
+            timeout=httpx.Timeout(_CONNECT_TIMEOUT_SECONDS),
+        )
+        if not client.cookies.get("XSRF-TOKEN"):
+            raise SlowpicsAPIError(
+                f"Missing XSRF token from slow.pics response (HTTP {landing.status_code})"
+            )
+        logger.info(
+            "Using slow.pics legacy upload endpoints (async engine, concurrency=%d, max %d)",
+            controller.limit,
+            concurrency,
+        )
+
+        if journal is None:
+            browser_id = str(uuid.uuid4())
+            fields, upload_plan = _legacy_collection_fields(cfg, frame_order, grouped, browser_id)
+            response = await _send(
+                client,
+                "POST",
+                f"{base_url}/upload/comparison",
+                context="Legacy collection creation",
+                timeout=short_timeout,
+                body=lambda: MultipartBody(list(fields.items())),
+            )
+            _raise_for_status(response, "Legacy collection creation")
+            collection_uuid, canonical_url, jobs = _parse_collection_response(response, upload_plan)
+            journal = UploadJournal.create(
+                screen_dir,
+                collection_uuid=str(collection_uuid),
+                canonical_url=canonical_url,
+                browser_id=browser_id,
+                collection_name=cfg.collection_name,
+                jobs=jobs,
+            )
+        else:
+            collection_uuid = journal.collection_uuid
+            canonical_url = journal.canonical_url
+            browser_id = journal.browser_id
+            jobs = journal.pending()
+        active_journal = journal
+
+        slot_freed = asyncio.Event()
+
+        async def _acquire_slot(nbytes: int) -> None:
+            delay = controller.try_acquire(nbytes)
+            while delay is None:
+                slot_freed.clear()
+                await slot_freed.wait()
+                delay = controller.try_acquire(nbytes)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        async def _upload_single(path: Path, image_uuid: str) -> None:
+            if prepare_image is not None:
+                await asyncio.to_thread(prepare_image, path)
+            file_size = path.stat().st_size
+            connect, read = _compute_image_upload_timeout(cfg, file_size)
+            sent = [0]
+            throttled = [False]
+
+            def _on_bytes(count: int) -> None:
+                sent[0] += count
+                if byte_progress_callback is not None:
+                    byte_progress_callback(count)
+
+            def _rewind() -> None:
+                throttled[0] = True
+                if sent[0] and byte_progress_callback is not None:
+                    byte_progress_callback(-sent[0])
+                sent[0] = 0
+
+            def _body() -> MultipartBody:
+                return MultipartBody(
+                    [("collectionUuid", str(collection_uuid)), ("imageUuid", image_uuid)],
+                    ("file", path, "image/png"),
+                    trailing_fields=[("browserId", browser_id)],
+                    on_bytes=_on_bytes,
+                )
+
+            await _acquire_slot(file_size)
+            delivered = 0
+            try:
+                upload_resp = await _send(
+                    client,
+                    "POST",
+                    f"{base_url}/upload/image",
+                    context=f"Upload frame {path.name}",
+                    timeout=httpx.Timeout(read, connect=connect, write=read, pool=None),
+                    body=_body,
+                    on_retry=_rewind,
+                )
+                _raise_for_status(upload_resp, f"Upload frame {path.name}")
+                _check_image_response(upload_resp)
+                delivered = file_size
+            finally:
+                controller.release(delivered, throttled=throttled[0])
+                slot_freed.set()
+            active_journal.mark_done(path)
+            if progress_callback is not None:
+                progress_callback(1)
+
+        tasks = [asyncio.create_task(_upload_single(path, image_uuid)) for path, image_uuid in jobs]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            _log_interrupted_upload(active_journal)
+            raise
+    active_journal.discard()
+    return canonical_url
+
+
+def upload_comparison_async(
+    image_files: List[str],
+    screen_dir: Path,
+    cfg: SlowpicsConfig,
+    *,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    byte_progress_callback: Optional[Callable[[int], None]] = None,
+    stats_callback: Optional[Callable[[UploadStats], None]] = None,
+    prepare_image: Optional[Callable[[Path], None]] = None,
+    max_workers: Optional[int] = None,
+    base_url: str = _SLOWPICS_BASE_URL,
+    resume: bool = False,
+) -> str:
+    """
+    Upload screenshots through the async engine and return the collection URL.
+
+    Blocks the caller while the upload runs on the shared HTTP loop. ``max_workers``
+    pins the number of concurrent image uploads; otherwise it starts at
+    ``_DEFAULT_ASYNC_UPLOAD_CONCURRENCY`` and adapts as in the threaded engine.
+    Both callbacks run on the loop thread: ``progress_callback`` receives completed
+    file counts and ``byte_progress_callback`` streamed file bytes, negative when a
+    retried upload rewinds what it had already reported. ``prepare_image`` runs in a
+    worker thread before each screenshot is read. ``resume`` continues an interrupted
+    upload from its journal, as in the threaded engine.
+    """
+
+    if not image_files:
+        raise SlowpicsAPIError("No image files provided for upload")
+    controller = _upload_concurrency(
+        cfg, max_workers, default=_DEFAULT_ASYNC_UPLOAD_CONCURRENCY, jobs=len(image_files)
+    )
+    canonical_url = net.run_on_shared_loop(
+        _upload_async(
+            image_files,
+            screen_dir,
+            cfg,
+            base_url=base_url.rstrip("/"),
+            controller=controller,
+            prepare_image=prepare_image,
+            progress_callback=progress_callback,
+            byte_progress_callback=byte_progress_callback,
+            resume=resume,
+        )
+    )
+    stats = controller.stats()
+    if stats_callback is not None:
+        stats_callback(stats)
+    session = requests.Session()
+    try:
+        _finish_upload(session, cfg, screen_dir, canonical_url)
+    finally:
+        session.close()
+    logger.info(
+        "slow.pics upload complete: frames=%d concurrency=%d (peak %d) %.2f MB/s url=%s",
+        len(image_files),
+        stats.concurrency,
+        stats.peak_concurrency,
+        stats.mb_per_s,
+        canonical_url,
+    )
+    return canonical_url
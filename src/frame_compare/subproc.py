@@ -4,6 +4,8 @@ Helper utilities for invoking subprocesses with consistent safeguards.
 `run_checked` wraps `subprocess.run` so callers get predictable defaults:
 argv lists only, `shell=False`, text mode enabled unless explicitly
 overridden, and optional `check` semantics without repeating boilerplate.
+`open_process` applies the same argv guards to streaming `subprocess.Popen`
+children whose output is consumed incrementally.
 """
 
 from __future__ import annotations
@@ -100,4 +102,39 @@ def run_checked(
     return completed
 
 
-__all__ = ["run_checked"]
+def open_process(
+    argv: Argv,
+    *,
+    cwd: str | PathLikeStr | None = None,
+    env: EnvMapping | None = None,
+    stdin: StdIO = subprocess.DEVNULL,
+    stdout: StdIO = subprocess.PIPE,
+    stderr: StdIO = subprocess.PIPE,
+) -> subprocess.Popen[bytes]:
+    """
+    Start *argv* via `subprocess.Popen` in binary mode for streamed output.
+
+    Callers own the returned process and should use it as a context manager so pipes
+    are closed and the child is reaped.
+
+    Raises:
+        ValueError: if *argv* is empty.
+    """
+
+    if not argv:
+        raise ValueError("open_process requires at least one argv entry.")
+    if isinstance(argv, (str, bytes)):
+        raise TypeError("open_process expects a sequence of arguments, not a string.")
+
+    return subprocess.Popen(
+        list(argv),
+        stdin=stdin,
+        stdout=stdout,
+        stderr=stderr,
+        cwd=cwd,
+        env=dict(env) if env is not None else None,
+        shell=False,
+    )
+
+
+__all__ = ["open_process", "run_checked"]
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
-import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,6 +12,7 @@ import click
 import httpx
 
 from src.datatypes import TMDBConfig
+from src.frame_compare import net
 from src.frame_compare.layout_utils import sanitize_console_text
 from src.frame_compare.metadata import first_non_empty, parse_year_hint
 from src.tmdb import (
@@ -88,13 +87,20 @@ def resolve_blocking(
 
     max_attempts = max(1, attempts)
     backoff = 0.75
+    transport_cls = getattr(httpx, "AsyncHTTPTransport", None)
+    if transport_cls is None:
+        raise RuntimeError("httpx.AsyncHTTPTransport is unavailable in this environment")
+    retries = max(0, transport_retries)
+
+    def _build_transport() -> httpx.AsyncBaseTransport:
+        return transport_cls(retries=retries)
+
     for attempt in range(max_attempts):
-        transport_cls = getattr(httpx, "AsyncHTTPTransport", None)
-        if transport_cls is None:
-            raise RuntimeError("httpx.AsyncHTTPTransport is unavailable in this environment")
-        transport = transport_cls(retries=max(0, transport_retries))
 
         async def _make_coro() -> TMDBResolution | None:
+            # Runs on the shared HTTP loop so the keep-alive pool survives across
+            # resolves instead of being rebuilt (and re-handshaken) per file.
+            transport = net.shared_async_transport(("tmdb", retries), _build_transport)
             return await resolve_tmdb(
                 file_name,
                 config=tmdb_cfg,
@@ -107,36 +113,13 @@ def resolve_blocking(
             )
 
         try:
-            try:
-                asyncio.get_running_loop()
-            except RuntimeError:
-                return asyncio.run(_make_coro())
-
-            result_holder: list[TMDBResolution | None] = []
-            error_holder: list[BaseException] = []
-
-            def _worker() -> None:
-                try:
-                    result_holder.append(asyncio.run(_make_coro()))
-                except BaseException as exc:  # pragma: no cover - bubbled up when joined
-                    error_holder.append(exc)
-
-            thread = threading.Thread(target=_worker, daemon=True)
-            thread.start()
-            thread.join()
-            if error_holder:
-                raise error_holder[0]
-            return result_holder[0] if result_holder else None
+            return net.run_on_shared_loop(_make_coro())
         except TMDBResolutionError as exc:
             message = str(exc)
             if attempt + 1 >= max_attempts or not _should_retry_tmdb_error(message):
                 raise
             time.sleep(backoff)
             backoff = min(backoff * 2, 4.0)
-        finally:
-            close_fn = getattr(transport, "close", None)
-            if callable(close_fn):
-                close_fn()
     return None
 
 
@@ -149,7 +132,7 @@ def resolve_workflow(
 ) -> TMDBLookupResult:
     """Resolve TMDB metadata for the current comparison set, prompting when needed."""
 
-    if not files or not tmdb_cfg.api_key.strip():
+    if not files or not (tmdb_cfg.api_key.strip() or tmdb_cfg.offline or tmdb_cfg.title_index.strip()):
         return TMDBLookupResult(
             resolution=None,
             manual_override=None,
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 from . import color as _color
 from . import env as _env
+from . import lazy as _lazy
 from . import props as _props
 from . import source as _source
 from . import tonemap as _tonemap
 from .color import *  # noqa: F401,F403
 from .env import *  # noqa: F401,F403
+from .lazy import *  # noqa: F401,F403
 from .props import *  # noqa: F401,F403
 from .source import *  # noqa: F401,F403
 from .tonemap import *  # noqa: F401,F403
@@ -18,4 +20,5 @@ __all__ = tuple(  # pyright: ignore[reportUnsupportedDunderAll]
     + _props.__all__
     + _color.__all__
     + _tonemap.__all__
+    + _lazy.__all__
 )
@@ -22,7 +22,7 @@ _vs_module: Any | None = None
 _SOURCE_PREFERENCE = "lsmas"
 
 
-_VALID_SOURCE_PLUGINS = {"lsmas", "ffms2"}
+_VALID_SOURCE_PLUGINS = {"lsmas", "ffms2", "auto"}
 
 
 class ClipInitError(RuntimeError):
@@ -71,6 +71,12 @@ def _set_source_preference(preference: str) -> None:
     _SOURCE_PREFERENCE = normalized  # pyright: ignore[reportConstantRedefinition]
 
 
+def get_source_preference() -> str:
+    """Return the configured source preference (``"lsmas"``, ``"ffms2"``, or ``"auto"``)."""
+
+    return _SOURCE_PREFERENCE
+
+
 def _load_env_paths_from_env() -> None:
     raw = os.environ.get(_ENV_VAR)
     if not raw:
@@ -138,6 +144,7 @@ __all__ = [
     "_normalise_search_path",
     "_add_search_paths",
     "_set_source_preference",
+    "get_source_preference",
     "_load_env_paths_from_env",
     "configure",
     "_build_missing_vs_message",
@@ -0,0 +1,90 @@
+"""Deferred clip handles that open their VapourSynth source on first use."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional
+
+__all__ = [
+    "LazyClip",
+    "resolve_clip",
+]
+
+_METADATA_ATTRS = ("num_frames", "width", "height", "fps_num", "fps_den")
+
+
+class LazyClip:
+    """
+    Stand-in for a VapourSynth clip whose source has not been opened yet.
+
+    ``opener`` runs at most once, on the first frame access (slicing, ``get_frame``,
+    filter namespaces) or on a metadata lookup that ``known_metadata`` cannot
+    answer. Attribute access is forwarded to the opened clip afterwards. Code that
+    hands clips to VapourSynth filters must call :func:`resolve_clip` first because
+    filters only accept real ``VideoNode`` objects.
+    """
+
+    __slots__ = ("_opener", "_clip", "_lock", "_known", "label")
+
+    def __init__(
+        self,
+        opener: Callable[[], Any],
+        *,
+        label: str,
+        known_metadata: Mapping[str, Optional[int]] | None = None,
+    ) -> None:
+        self._opener = opener
+        self._clip: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._known: Dict[str, int] = {
+            key: int(value)
+            for key, value in (known_metadata or {}).items()
+            if key in _METADATA_ATTRS and value is not None
+        }
+        self.label = label
+
+    @property
+    def is_open(self) -> bool:
+        """Return ``True`` once the underlying source has been opened."""
+
+        return self._clip is not None
+
+    def resolve(self) -> Any:
+        """Open the source if needed and return the real clip."""
+
+        clip = self._clip
+        if clip is not None:
+            return clip
+        with self._lock:
+            if self._clip is None:
+                self._clip = self._opener()
+            return self._clip
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        known = self._known.get(name)
+        if known is not None and self._clip is None:
+            return known
+        return getattr(self.resolve(), name)
+
+    def __len__(self) -> int:
+        return int(self.num_frames)
+
+    def __getitem__(self, item: Any) -> Any:
+        return self.resolve()[item]
+
+    def __add__(self, other: Any) -> Any:
+        return self.resolve() + resolve_clip(other)
+
+    def __repr__(self) -> str:
+        state = "open" if self._clip is not None else "deferred"
+        return f"<LazyClip {self.label!r} ({state})>"
+
+
+def resolve_clip(clip: Any) -> Any:
+    """Return the real clip behind *clip*, opening a :class:`LazyClip` when necessary."""
+
+    if isinstance(clip, LazyClip):
+        return clip.resolve()
+    return clip
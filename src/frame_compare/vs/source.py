@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import logging
+import random
 import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
 
-from .env import _SOURCE_PREFERENCE, ClipInitError, _get_vapoursynth_module  # pyright: ignore[reportPrivateUsage]
+from .env import ClipInitError, _get_vapoursynth_module, get_source_preference  # pyright: ignore[reportPrivateUsage]
 from .props import (  # pyright: ignore[reportPrivateUsage]
     _apply_frame_props_dict,  # pyright: ignore[reportPrivateUsage]
     _ensure_std_namespace,  # pyright: ignore[reportPrivateUsage]
@@ -84,10 +87,11 @@ def _resolve_core(core: Optional[Any]) -> Any:
     return fallback_core
 
 
-def _build_source_order() -> list[str]:
-    """Return the ordered list of source plugins to try."""
+def _build_source_order(preferred: Optional[str] = None) -> list[str]:
+    """Return the ordered list of source plugins to try, honouring an explicit per-file *preferred* plugin."""
 
-    if _SOURCE_PREFERENCE == "ffms2":
+    choice = preferred or get_source_preference()
+    if choice == "ffms2":
         return ["ffms2", "lsmas"]
     return ["lsmas", "ffms2"]
 
@@ -223,8 +227,9 @@ def _open_clip_with_sources(
     cache_root: Path,
     *,
     indexing_notifier: Optional[Callable[[str], None]] = None,
+    order: Optional[Sequence[str]] = None,
 ) -> Any:
-    order = _build_source_order()
+    order = list(order) if order is not None else _build_source_order()
     errors: dict[str, VSPluginError] = {}
     base_name = Path(path).name
     for plugin in order:
@@ -326,6 +331,7 @@ def init_clip(
     indexing_notifier: Optional[Callable[[str], None]] = None,
     frame_props_sink: Optional[Callable[[Mapping[str, Any]], None]] = None,
     source_frame_props_hint: Mapping[str, Any] | None = None,
+    source_plugin: Optional[str] = None,
 ) -> Any:
     """
     Initialise a VapourSynth clip for subsequent processing and optionally snapshot source frame props.
@@ -333,7 +339,8 @@ def init_clip(
     When ``frame_props_sink`` is provided it will be invoked exactly once with a dictionary of frame
     properties captured before any trims or padding are applied so callers can persist HDR metadata.
     ``source_frame_props_hint`` allows callers to reuse previously captured props (for example from an
-    earlier metadata probe) to avoid repeated frame snapshots.
+    earlier metadata probe) to avoid repeated frame snapshots. ``source_plugin`` tries that plugin
+    first regardless of the configured preference (used by ``source.preferred = "auto"``).
     """
 
     resolved_core = _resolve_core(core)
@@ -351,6 +358,7 @@ def init_clip(
             str(path_obj),
             cache_root,
             indexing_notifier=indexing_notifier,
+            order=_build_source_order(source_plugin) if source_plugin else None,
         )
     except ClipInitError:
         raise
@@ -388,6 +396,121 @@ def init_clip(
     return clip
 
 
+def index_clip(
+    path: str,
+    *,
+    cache_dir: Optional[str | Path] = None,
+    core: Optional[Any] = None,
+    source_plugin: Optional[str] = None,
+) -> None:
+    """
+    Build the source plugin index for *path* without applying trims or capturing props.
+
+    Used to warm lsmas/ffms2 index files ahead of the first frame request so a
+    later :func:`init_clip` call opens the clip from an existing cache file.
+    """
+
+    resolved_core = _resolve_core(core)
+    path_obj = Path(path)
+    cache_root = Path(cache_dir) if cache_dir is not None else path_obj.parent
+    try:
+        cache_root.mkdir(parents=True, exist_ok=True)
+    except Exception as exc:  # pragma: no cover - defensive
+        raise ClipInitError(f"Failed to prepare cache directory '{cache_root}': {exc}") from exc
+    try:
+        _open_clip_with_sources(
+            resolved_core,
+            str(path_obj),
+            cache_root,
+            order=_build_source_order(source_plugin) if source_plugin else None,
+        )
+    except ClipInitError:
+        raise
+    except Exception as exc:  # pragma: no cover - defensive
+        raise ClipInitError(f"Failed to index clip '{path}': {exc}") from exc
+
+
+@dataclass(frozen=True)
+class SourceBenchmark:
+    """Outcome of :func:`benchmark_source_plugins` for a single file.
+
+    Attributes:
+        winner (Optional[str]): Plugin with the lowest total seek time, or ``None`` when none opened.
+        timings (Dict[str, float]): Seconds spent decoding the sampled frames, per plugin.
+        errors (Dict[str, str]): Plugins that failed to open the file, with the reason.
+    """
+
+    winner: Optional[str]
+    timings: Dict[str, float] = field(default_factory=lambda: dict[str, float]())
+    errors: Dict[str, str] = field(default_factory=lambda: dict[str, str]())
+
+
+_BENCHMARK_SEEKS = 6
+_benchmark_clock: Callable[[], float] = time.perf_counter
+
+
+def _benchmark_frames(path: str, num_frames: int, samples: int) -> list[int]:
+    if num_frames <= 0:
+        return []
+    # Seeded by file name so both plugins (and later runs) seek to the same frames.
+    rng = random.Random(f"{Path(path).name}:{num_frames}")
+    count = min(samples, num_frames)
+    return rng.sample(range(num_frames), count)
+
+
+def benchmark_source_plugins(
+    path: str,
+    *,
+    cache_dir: Optional[str | Path] = None,
+    core: Optional[Any] = None,
+    indexing_notifier: Optional[Callable[[str], None]] = None,
+    samples: int = _BENCHMARK_SEEKS,
+) -> SourceBenchmark:
+    """
+    Time a short random-seek pass through *path* with every available source plugin.
+
+    Each plugin opens (and indexes) the file once, then decodes the same seeded
+    random frames; index time is excluded so only seek/decode speed is compared.
+    Both index files stay in the cache directory, so the winner reopens instantly.
+    """
+
+    resolved_core = _resolve_core(core)
+    path_obj = Path(path)
+    cache_root = Path(cache_dir) if cache_dir is not None else path_obj.parent
+    try:
+        cache_root.mkdir(parents=True, exist_ok=True)
+    except Exception as exc:  # pragma: no cover - defensive
+        raise ClipInitError(f"Failed to prepare cache directory '{cache_root}': {exc}") from exc
+
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    for plugin in sorted(_SOURCE_PLUGIN_FUNCS):
+        try:
+            clip = _open_clip_with_sources(
+                resolved_core,
+                str(path_obj),
+                cache_root,
+                indexing_notifier=indexing_notifier,
+                order=[plugin],
+            )
+            frames = _benchmark_frames(str(path_obj), int(getattr(clip, "num_frames", 0) or 0), samples)
+            started = _benchmark_clock()
+            for frame in frames:
+                clip.get_frame(frame)
+            timings[plugin] = _benchmark_clock() - started
+        except Exception as exc:
+            errors[plugin] = str(exc)
+            continue
+    winner = min(sorted(timings), key=lambda name: timings[name]) if timings else None
+    logger.info(
+        "[SOURCE] auto benchmark for %s: %s -> %s",
+        path_obj.name,
+        ", ".join(f"{name}={seconds:.3f}s" for name, seconds in sorted(timings.items())) or "no plugins",
+        winner or "fallback order",
+    )
+    return SourceBenchmark(winner=winner, timings=timings, errors=errors)
+
+
 def _collect_blank_extension_props(frame_props: Mapping[str, Any]) -> Dict[str, Any]:
     extracted: Dict[str, Any] = {}
     for key, value in frame_props.items():
@@ -428,4 +551,7 @@ __all__ = [
     "_apply_fps_map",
     "_resolve_core",
     "init_clip",
+    "index_clip",
+    "SourceBenchmark",
+    "benchmark_source_plugins",
 ]
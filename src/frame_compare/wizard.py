@@ -114,7 +114,7 @@ def prompt_slowpics_options(config: Dict[str, Any]) -> None:
 def prompt_audio_alignment_option(config: Dict[str, Any]) -> None:
     """Prompt for enabling or disabling audio alignment."""
 
-    message = "Enable audio alignment (requires numpy, librosa, soundfile, and FFmpeg)?"
+    message = "Enable audio alignment (requires numpy and FFmpeg)?"
     default = bool(config.get("enable", False))
     config["enable"] = click.confirm(message, default=default)
 
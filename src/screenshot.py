@@ -2419,7 +2419,7 @@ def generate_screenshots(
         if source_frame_props is not None and index < len(source_frame_props):
             stored_props = source_frame_props[index]
         result = vs_core.process_clip_for_screenshot(
-            clip,
+            vs_core.resolve_clip(clip),
             file_path,
             color_cfg,
             enable_overlay=True,
@@ -3,25 +3,33 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import re
 import time
 import unicodedata
 from collections import OrderedDict
 from dataclasses import dataclass
-from importlib import import_module
+from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, cast
 
 import httpx
 
 from .datatypes import TMDBConfig
 from .frame_compare import net
+from .frame_compare.artifact_index import open_artifact_index
+from .utils import cached_filename_parse, user_cache_dir
 
 logger = logging.getLogger(__name__)
 
 MOVIE = "MOVIE"
 TV = "TV"
 _BASE_URL = "https://api.themoviedb.org/3"
+_API_HOST = "api.themoviedb.org"
+# TMDB allows roughly 50 requests per second per IP; every caller in the process
+# shares this budget through the host limiter.
+_API_RATE_PER_SECOND = 40.0
+_API_BURST = 40
 _SIMILARITY_THRESHOLD = 0.45
 _STRONG_MATCH_THRESHOLD = 0.92
 _AMBIGUITY_MARGIN = 0.08
@@ -31,12 +39,23 @@ _WHITESPACE_RE = re.compile(r"\s+")
 _ROMAN_RE = re.compile(r"\b([IVXLCDM]+)\b", re.IGNORECASE)
 _YEAR_RE = re.compile(r"(19|20)\d{2}")
 _IMDB_RE = re.compile(r"tt\d{7,9}", re.IGNORECASE)
+_PERSISTENT_KIND = "tmdb-response"
+# Search plans in flight at once (started in priority order) and parallel alias fetches.
+_PLAN_CONCURRENCY = 4
+_ALIAS_CONCURRENCY = 5
+
+
+net.configure_host_rate(_API_HOST, _API_RATE_PER_SECOND, burst=_API_BURST)
 
 
 class TMDBResolutionError(RuntimeError):
     """Raised when TMDB matching cannot complete."""
 
 
+class TMDBCacheMissError(TMDBResolutionError):
+    """Raised in offline mode when a TMDB response is not available from the cache."""
+
+
 class TMDBAmbiguityError(TMDBResolutionError):
     """Raised when multiple TMDB results look equally plausible."""
 
@@ -107,12 +126,89 @@ class TMDBResolution:
         return self.candidate.original_language
 
 
+def default_cache_dir() -> Path:
+    """Return the per-user directory that holds the persistent TMDB response cache."""
+
+    return user_cache_dir() / "tmdb"
+
+
+class _PersistentStore:
+    """
+    Wall-clock TTL store for TMDB responses backed by the shared artifact index.
+
+    Rows record when they were written and the TTL they were written under, so any
+    process sharing the directory can validate them. Expired rows are kept until
+    evicted by ``max_entries`` so offline runs can still answer from them.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._index = open_artifact_index(root)
+
+    @staticmethod
+    def _row_key(key: Tuple[Any, ...]) -> str:
+        return json.dumps(key, separators=(",", ":"), default=str)
+
+    def load(
+        self,
+        key: Tuple[Any, ...],
+        ttl_seconds: int,
+        *,
+        allow_stale: bool = False,
+    ) -> Tuple[float, int, Dict[str, Any]] | None:
+        """Return ``(age_seconds, stored_ttl, payload)`` for *key* when still valid."""
+
+        row_key = self._row_key(key)
+        record = self._index.get(_PERSISTENT_KIND, row_key)
+        if record is None:
+            return None
+        try:
+            stored_at_text, stored_ttl_text = record.fingerprint.split(":", 1)
+            stored_at = float(stored_at_text)
+            stored_ttl = int(stored_ttl_text)
+            payload = json.loads(record.payload)
+        except ValueError:
+            self._index.delete(_PERSISTENT_KIND, row_key)
+            return None
+        if not isinstance(payload, dict):
+            self._index.delete(_PERSISTENT_KIND, row_key)
+            return None
+        age = max(0.0, time.time() - stored_at)
+        if not allow_stale:
+            ttl = min(stored_ttl, ttl_seconds)
+            if ttl <= 0 or age > ttl:
+                return None
+        return age, stored_ttl, cast(Dict[str, Any], payload)
+
+    def save(self, key: Tuple[Any, ...], value: Any, *, ttl_seconds: int, max_entries: int) -> None:
+        """Persist *value* under *key* and evict the oldest rows beyond *max_entries*."""
+
+        try:
+            payload = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return
+        self._index.put(
+            _PERSISTENT_KIND,
+            self._row_key(key),
+            fingerprint=f"{time.time():.3f}:{int(ttl_seconds)}",
+            payload=payload,
+        )
+        self._index.prune(_PERSISTENT_KIND, keep=max_entries)
+
+
 class _TTLCache:
-    """Bounded TTL cache shared across TMDB requests."""
+    """
+    Bounded TTL cache shared across TMDB requests, optionally backed by disk.
+
+    Requests run on the shared HTTP event loop, so they use :meth:`get_async` and
+    :meth:`set_async`, which keep memory hits inline but move SQLite reads and writes
+    to a worker thread instead of stalling every other request on the loop.
+    """
 
     def __init__(self, max_entries: int = 256) -> None:
         self._max_entries = max(0, int(max_entries))
         self._data: "OrderedDict[Tuple[Any, ...], Tuple[float, int, Any]]" = OrderedDict()
+        self._store: Optional[_PersistentStore] = None
 
     def configure(self, *, max_entries: int | None = None) -> None:
         if max_entries is not None:
@@ -123,33 +219,78 @@ class _TTLCache:
                 while len(self._data) > self._max_entries:
                     self._data.popitem(last=False)
 
+    def attach(self, store: Optional[_PersistentStore]) -> None:
+        """Use *store* as the second-level cache (``None`` keeps entries in memory only)."""
+
+        self._store = store
+
     def clear(self) -> None:
         self._data.clear()
 
-    def get(self, key: Tuple[Any, ...], ttl_seconds: int) -> Any | None:
-        if ttl_seconds <= 0:
-            self._data.pop(key, None)
-            return None
+    def get(self, key: Tuple[Any, ...], ttl_seconds: int, *, allow_stale: bool = False) -> Any | None:
+        """
+        Return the cached value for *key*, consulting the persistent store on a miss.
+
+        ``allow_stale`` ignores expiry so offline lookups can reuse old responses.
+        """
+
+        value = self._lookup(key, ttl_seconds, allow_stale=allow_stale)
+        if value is not None or self._store is None:
+            return value
+        return self._adopt(key, self._store.load(key, ttl_seconds, allow_stale=allow_stale))
+
+    async def get_async(self, key: Tuple[Any, ...], ttl_seconds: int, *, allow_stale: bool = False) -> Any | None:
+        """:meth:`get` for the event loop: persistent-store reads run in a worker thread."""
+
+        value = self._lookup(key, ttl_seconds, allow_stale=allow_stale)
+        if value is not None or self._store is None:
+            return value
+        loaded = await asyncio.to_thread(self._store.load, key, ttl_seconds, allow_stale=allow_stale)
+        return self._adopt(key, loaded)
+
+    def set(self, key: Tuple[Any, ...], value: Any, ttl_seconds: int) -> None:
+        if self._store_in_memory(key, value, ttl_seconds) and self._store is not None:
+            self._store.save(key, value, ttl_seconds=int(ttl_seconds), max_entries=self._max_entries)
+
+    async def set_async(self, key: Tuple[Any, ...], value: Any, ttl_seconds: int) -> None:
+        """:meth:`set` for the event loop: the persistent-store write runs in a worker thread."""
+
+        if self._store_in_memory(key, value, ttl_seconds) and self._store is not None:
+            await asyncio.to_thread(
+                self._store.save, key, value, ttl_seconds=int(ttl_seconds), max_entries=self._max_entries
+            )
+
+    def _lookup(self, key: Tuple[Any, ...], ttl_seconds: int, *, allow_stale: bool) -> Any | None:
         entry = self._data.get(key)
-        if not entry:
-            return None
-        timestamp, stored_ttl, value = entry
-        ttl = min(stored_ttl, ttl_seconds)
-        if ttl <= 0:
-            self._data.pop(key, None)
-            return None
-        if time.monotonic() - timestamp > ttl:
+        if entry is not None:
+            timestamp, stored_ttl, value = entry
+            ttl = min(stored_ttl, ttl_seconds)
+            if allow_stale or (ttl > 0 and time.monotonic() - timestamp <= ttl):
+                self._data.move_to_end(key)
+                return value
             self._data.pop(key, None)
+        return None
+
+    def _adopt(self, key: Tuple[Any, ...], loaded: Tuple[float, int, Dict[str, Any]] | None) -> Any | None:
+        if loaded is None:
             return None
-        self._data.move_to_end(key)
+        age, stored_ttl, value = loaded
+        self._remember(key, value, stored_ttl, time.monotonic() - age)
         return value
 
-    def set(self, key: Tuple[Any, ...], value: Any, ttl_seconds: int) -> None:
+    def _store_in_memory(self, key: Tuple[Any, ...], value: Any, ttl_seconds: int) -> bool:
+        """Remember *value* in memory; return whether it should also be persisted."""
+
         if ttl_seconds <= 0 or self._max_entries == 0:
             self._data.pop(key, None)
+            return False
+        self._remember(key, value, int(ttl_seconds), time.monotonic())
+        return True
+
+    def _remember(self, key: Tuple[Any, ...], value: Any, ttl_seconds: int, timestamp: float) -> None:
+        if self._max_entries == 0:
             return
-        now = time.monotonic()
-        self._data[key] = (now, int(ttl_seconds), value)
+        self._data[key] = (timestamp, ttl_seconds, value)
         self._data.move_to_end(key)
         while len(self._data) > self._max_entries:
             self._data.popitem(last=False)
@@ -158,6 +299,14 @@ class _TTLCache:
 _CACHE = _TTLCache()
 
 
+def _persistent_store(config: TMDBConfig) -> Optional[_PersistentStore]:
+    if not config.persistent_cache or config.cache_max_entries <= 0:
+        return None
+    cache_dir = (config.cache_dir or "").strip()
+    root = Path(cache_dir).expanduser() if cache_dir else default_cache_dir()
+    return _PersistentStore(root)
+
+
 def parse_manual_id(value: str) -> Tuple[str, str]:
     """Validate a manual TMDB identifier (movie/12345 or tv/67890)."""
 
@@ -305,37 +454,11 @@ def _extract_year_from_result(payload: Dict[str, Any], category: str) -> Optiona
 
 
 def _call_guessit(filename: str) -> Dict[str, Any]:
-    try:
-        module = import_module("guessit")
-    except Exception:
-        return {}
-    parser = getattr(module, "guessit", None)
-    if not callable(parser):
-        return {}
-    try:
-        result = parser(filename)
-    except Exception:
-        return {}
-    if isinstance(result, dict):
-        return dict(result)
-    return {}
+    return dict(cached_filename_parse("guessit", filename) or {})
 
 
 def _call_anitopy(filename: str) -> Dict[str, Any]:
-    try:
-        module = import_module("anitopy")
-    except Exception:
-        return {}
-    parser = getattr(module, "parse", None)
-    if not callable(parser):
-        return {}
-    try:
-        result = parser(filename)
-    except Exception:
-        return {}
-    if isinstance(result, dict):
-        return dict(result)
-    return {}
+    return dict(cached_filename_parse("anitopy", filename) or {})
 
 
 @dataclass(frozen=True)
@@ -455,6 +578,10 @@ def _build_query_plans(
     return queries
 
 
+def _cache_key(path: str, params: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (path, tuple(sorted(params.items())))
+
+
 async def _http_request(
     client: httpx.AsyncClient,
     *,
@@ -462,11 +589,14 @@ async def _http_request(
     path: str,
     params: Dict[str, Any],
     timeout: float | httpx.Timeout | None = None,
+    offline: bool = False,
 ) -> Dict[str, Any]:
-    key = (path, tuple(sorted(params.items())))
-    cached = _CACHE.get(key, cache_ttl)
+    key = _cache_key(path, params)
+    cached = await _CACHE.get_async(key, cache_ttl, allow_stale=offline)
     if cached is not None:
         return cached
+    if offline:
+        raise TMDBCacheMissError(f"TMDB offline mode has no cached response for {path}")
 
     redacted_host = net.redact_url_for_logs(str(getattr(client, "base_url", "")) or path)
 
@@ -502,7 +632,7 @@ async def _http_request(
     except ValueError as exc:  # pragma: no cover - unexpected
         raise TMDBResolutionError("TMDB returned invalid JSON") from exc
     payload = _ensure_dict(payload_obj, context=f"{path} response")
-    _CACHE.set(key, payload, ttl_seconds=cache_ttl)
+    await _CACHE.set_async(key, payload, ttl_seconds=cache_ttl)
     return payload
 
 
@@ -594,6 +724,7 @@ async def _fetch_alias_titles(
     tmdb_id: str,
     cache_ttl: int,
     timeout: float | httpx.Timeout | None = None,
+    offline: bool = False,
 ) -> List[str]:
     """Return alternative titles for a TMDB movie or TV entry."""
 
@@ -613,6 +744,7 @@ async def _fetch_alias_titles(
         path=path,
         params={},
         timeout=timeout,
+        offline=offline,
     )
     titles: List[str] = []
     for entry in _dict_entries(payload.get(key)):
@@ -708,13 +840,7 @@ def _best_external_candidate(
     return candidates[0]
 
 
-async def _perform_search(
-    client: httpx.AsyncClient,
-    *,
-    plan: _QueryPlan,
-    cache_ttl: int,
-    timeout: float | httpx.Timeout | None = None,
-) -> List[Dict[str, Any]]:
+def _search_request(plan: _QueryPlan) -> Tuple[str, Dict[str, Any]]:
     params: Dict[str, Any] = {
         "query": plan.query,
         "include_adult": "false",
@@ -724,12 +850,35 @@ async def _perform_search(
             params["year"] = plan.year
         else:
             params["first_air_date_year"] = plan.year
+    return ("search/movie" if plan.category == MOVIE else "search/tv"), params
+
+
+async def _cached_search(plan: _QueryPlan, *, cache_ttl: int, offline: bool) -> Optional[List[Dict[str, Any]]]:
+    """Return *plan*'s search results from the cache without touching the network."""
+
+    path, params = _search_request(plan)
+    payload = await _CACHE.get_async(_cache_key(path, params), cache_ttl, allow_stale=offline)
+    if payload is None:
+        return None
+    return _dict_entries(payload.get("results"))
+
+
+async def _perform_search(
+    client: httpx.AsyncClient,
+    *,
+    plan: _QueryPlan,
+    cache_ttl: int,
+    timeout: float | httpx.Timeout | None = None,
+    offline: bool = False,
+) -> List[Dict[str, Any]]:
+    path, params = _search_request(plan)
     payload = await _http_request(
         client,
         cache_ttl=cache_ttl,
-        path="search/movie" if plan.category == MOVIE else "search/tv",
+        path=path,
         params=params,
         timeout=timeout,
+        offline=offline,
     )
     return _dict_entries(payload.get("results"))
 
@@ -768,6 +917,121 @@ def _extract_best_candidate(
     return candidates
 
 
+async def _search_plans(
+    client: httpx.AsyncClient,
+    plans: Sequence[_QueryPlan],
+    *,
+    cache_ttl: int,
+    timeout: float | httpx.Timeout | None,
+    offline: bool,
+    query_norms: Sequence[str],
+    tolerance: int,
+    year: Optional[int],
+) -> Tuple[List[TMDBCandidate], int]:
+    """
+    Run *plans* with bounded concurrency and return ``(candidates, offline_misses)``.
+
+    Leading plans already in the cache are consumed first without any request.
+    The rest start in plan order, at most ``_PLAN_CONCURRENCY`` at a time, but
+    their results are consumed strictly in plan order: the first plan with a strong
+    match ends the search and cancels everything still queued or in flight, so the
+    candidates (and any error raised) match a sequential walk over the plans.
+    """
+
+    all_candidates: List[TMDBCandidate] = []
+    offline_misses = 0
+
+    def _consume(plan: _QueryPlan, results: List[Dict[str, Any]]) -> bool:
+        candidates = _extract_best_candidate(
+            results=results,
+            plan=plan,
+            query_norms=query_norms,
+            tolerance=tolerance,
+            year=year,
+        )
+        for candidate in candidates:
+            candidate.reason = plan.reason
+            all_candidates.append(candidate)
+        return any(cand.score >= _STRONG_MATCH_THRESHOLD for cand in candidates)
+
+    start = 0
+    for plan in plans:
+        cached = await _cached_search(plan, cache_ttl=cache_ttl, offline=offline)
+        if cached is None:
+            break
+        start += 1
+        if _consume(plan, cached):
+            return all_candidates, offline_misses
+    pending_plans = list(plans[start:])
+    if not pending_plans:
+        return all_candidates, offline_misses
+
+    semaphore = asyncio.Semaphore(_PLAN_CONCURRENCY)
+
+    async def _search(plan: _QueryPlan) -> List[Dict[str, Any]] | Exception:
+        async with semaphore:
+            try:
+                return await _perform_search(
+                    client,
+                    plan=plan,
+                    cache_ttl=cache_ttl,
+                    timeout=timeout,
+                    offline=offline,
+                )
+            except Exception as exc:  # re-raised in plan order below
+                return exc
+
+    failure: Exception | None = None
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(_search(plan)) for plan in pending_plans]
+        for position, (plan, task) in enumerate(zip(pending_plans, tasks)):
+            outcome = await task
+            if isinstance(outcome, TMDBCacheMissError):
+                offline_misses += 1
+                continue
+            if isinstance(outcome, Exception):
+                failure = outcome
+            elif not _consume(plan, outcome):
+                continue
+            for pending in tasks[position + 1 :]:
+                pending.cancel()
+            break
+    if failure is not None:
+        raise failure
+    return all_candidates, offline_misses
+
+
+async def _fetch_alias_lists(
+    client: httpx.AsyncClient,
+    candidates: Sequence[TMDBCandidate],
+    *,
+    cache_ttl: int,
+    timeout: float | httpx.Timeout | None,
+    offline: bool,
+) -> List[Optional[List[str]]]:
+    """Fetch alternative titles for *candidates* in parallel; ``None`` marks a failed lookup."""
+
+    semaphore = asyncio.Semaphore(_ALIAS_CONCURRENCY)
+
+    async def _fetch(candidate: TMDBCandidate) -> Optional[List[str]]:
+        async with semaphore:
+            try:
+                return await _fetch_alias_titles(
+                    client,
+                    category=candidate.category,
+                    tmdb_id=candidate.tmdb_id,
+                    cache_ttl=cache_ttl,
+                    timeout=timeout,
+                    offline=offline,
+                )
+            except TMDBResolutionError:
+                return None
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(_fetch(candidate)) for candidate in candidates]
+    return [task.result() for task in tasks]
+
+
 def _extract_title_year(
     filename: str,
     *,
@@ -814,6 +1078,87 @@ def _detect_external_ids(filename: str) -> Tuple[Optional[str], Optional[str]]:
     return imdb, None
 
 
+def _resolve_from_index(
+    index_path: str,
+    *,
+    cleaned_title: str,
+    query_norms: Sequence[str],
+    year: Optional[int],
+    tolerance: int,
+    category_preference: Optional[str],
+    category_hint: Optional[str],
+) -> Optional[TMDBResolution]:
+    """
+    Resolve *cleaned_title* from the offline title index without any request.
+
+    Hits are scored exactly like API search results; the best one is returned only
+    when it is a strong match that clears the ambiguity margin over the runner-up,
+    otherwise ``None`` hands the lookup to the API.
+    """
+
+    from .tmdb_index import TitleIndexError, open_title_index
+
+    try:
+        hits = open_title_index(Path(index_path).expanduser()).search(query_norms)
+    except TitleIndexError as exc:
+        logger.warning("TMDB title index unavailable: %s", exc)
+        return None
+
+    def _preferred(category: str) -> int:
+        if category_preference == category:
+            return 0
+        if category_hint == category:
+            return 1
+        return 2
+
+    candidates: List[TMDBCandidate] = []
+    for hit in hits:
+        payload = hit.as_payload()
+        candidates.append(
+            TMDBCandidate(
+                category=hit.category,
+                tmdb_id=hit.tmdb_id,
+                title=hit.title,
+                original_title=hit.title,
+                year=hit.year,
+                score=_score_payload(
+                    payload,
+                    category=hit.category,
+                    query_norms=query_norms,
+                    year=year,
+                    tolerance=tolerance,
+                    index=1,
+                ),
+                original_language=None,
+                reason="title-index",
+                used_filename_search=True,
+                payload=payload,
+            )
+        )
+    if not candidates:
+        return None
+    candidates.sort(key=lambda cand: (-cand.score, _preferred(cand.category), cand.category, cand.tmdb_id))
+    best = candidates[0]
+    runner_up = candidates[1] if len(candidates) > 1 else None
+    margin = best.score - (runner_up.score if runner_up else 0.0)
+    if best.score < _STRONG_MATCH_THRESHOLD or (runner_up is not None and margin < _AMBIGUITY_MARGIN):
+        logger.debug(
+            "TMDB title index inconclusive for %s (best=%.3f margin=%.3f); querying the API",
+            cleaned_title,
+            best.score,
+            margin,
+        )
+        return None
+    logger.info(
+        "TMDB match via title-index -> %s/%s (%s) score=%.3f",
+        best.category,
+        best.tmdb_id,
+        best.title,
+        best.score,
+    )
+    return TMDBResolution(candidate=best, margin=margin, source_query=cleaned_title)
+
+
 async def resolve_tmdb(
     filename: str,
     *,
@@ -825,13 +1170,23 @@ async def resolve_tmdb(
     category_preference: Optional[str] = None,
     http_transport: httpx.BaseTransport | None = None,
 ) -> Optional[TMDBResolution]:
-    """Resolve TMDB metadata for *filename* using the provided *config*."""
-
-    if not config.api_key:
+    """
+    Resolve TMDB metadata for *filename* using the provided *config*.
+
+    When ``config.title_index`` points at an index built by
+    :func:`src.tmdb_index.build_title_index`, filename lookups are first answered
+    from it with no network access; only inconclusive matches reach the API.
+    Responses are cached in memory and, unless ``config.persistent_cache`` is off,
+    in a SQLite store under ``config.cache_dir`` shared by every run. With
+    ``config.offline`` the lookup is answered from that cache only (expired entries
+    included) and no HTTP request is made.
+    """
+
+    offline = bool(config.offline)
+    index_path = (config.title_index or "").strip()
+    if not config.api_key and not offline and not index_path:
         raise TMDBResolutionError("tmdb.api_key must be set to resolve TMDB metadata")
 
-    _CACHE.configure(max_entries=config.cache_max_entries)
-
     unattended_mode = config.unattended if unattended is None else unattended
     category_pref = (category_preference or config.category_preference or "").upper() or None
     year_tolerance = max(0, int(config.year_tolerance))
@@ -849,6 +1204,28 @@ async def resolve_tmdb(
 
     query_norms = _normalized_variants(cleaned_title)
 
+    if index_path and not (imdb_lookup or tvdb_lookup):
+        # The index is a SQLite file; keep its I/O off the shared HTTP loop.
+        indexed = await asyncio.to_thread(
+            _resolve_from_index,
+            index_path,
+            cleaned_title=cleaned_title,
+            query_norms=query_norms,
+            year=year,
+            tolerance=year_tolerance,
+            category_preference=category_pref,
+            category_hint=category_hint,
+        )
+        if indexed is not None:
+            return indexed
+    if not config.api_key and not offline:
+        raise TMDBResolutionError(
+            "TMDB title index could not settle the match and tmdb.api_key is not set"
+        )
+
+    _CACHE.configure(max_entries=config.cache_max_entries)
+    _CACHE.attach(_persistent_store(config))
+
     timeout = httpx.Timeout(
         net.DEFAULT_READ_TIMEOUT,
         connect=net.DEFAULT_CONNECT_TIMEOUT,
@@ -863,13 +1240,17 @@ async def resolve_tmdb(
         transport=http_transport,
     ) as client:
         if imdb_lookup:
-            payload = await _http_request(
-                client,
-                cache_ttl=config.cache_ttl_seconds,
-                path=f"find/{imdb_lookup}",
-                params={"external_source": "imdb_id"},
-                timeout=timeout,
-            )
+            try:
+                payload = await _http_request(
+                    client,
+                    cache_ttl=config.cache_ttl_seconds,
+                    path=f"find/{imdb_lookup}",
+                    params={"external_source": "imdb_id"},
+                    timeout=timeout,
+                    offline=offline,
+                )
+            except TMDBCacheMissError:
+                payload = {}
             candidate = _best_external_candidate(
                 payload,
                 category_preference=category_pref,
@@ -889,13 +1270,17 @@ async def resolve_tmdb(
                 return TMDBResolution(candidate=candidate, margin=1.0, source_query=cleaned_title)
 
         if tvdb_lookup:
-            payload = await _http_request(
-                client,
-                cache_ttl=config.cache_ttl_seconds,
-                path=f"find/{tvdb_lookup}",
-                params={"external_source": "tvdb_id"},
-                timeout=timeout,
-            )
+            try:
+                payload = await _http_request(
+                    client,
+                    cache_ttl=config.cache_ttl_seconds,
+                    path=f"find/{tvdb_lookup}",
+                    params={"external_source": "tvdb_id"},
+                    timeout=timeout,
+                    offline=offline,
+                )
+            except TMDBCacheMissError:
+                payload = {}
             candidate = _best_external_candidate(
                 payload,
                 category_preference=category_pref,
@@ -923,31 +1308,22 @@ async def resolve_tmdb(
             year_tolerance=year_tolerance,
         )
 
-        all_candidates: List[TMDBCandidate] = []
-
-        for plan in plans:
-            results = await _perform_search(
-                client,
-                plan=plan,
-                cache_ttl=config.cache_ttl_seconds,
-                timeout=timeout,
-            )
-            candidates = _extract_best_candidate(
-                results=results,
-                plan=plan,
-                query_norms=query_norms,
-                tolerance=year_tolerance,
-                year=year,
-            )
-            if not candidates:
-                continue
-            for candidate in candidates:
-                candidate.reason = plan.reason
-                all_candidates.append(candidate)
-            if any(cand.score >= _STRONG_MATCH_THRESHOLD for cand in candidates):
-                break
+        all_candidates, offline_misses = await _search_plans(
+            client,
+            plans,
+            cache_ttl=config.cache_ttl_seconds,
+            timeout=timeout,
+            offline=offline,
+            query_norms=query_norms,
+            tolerance=year_tolerance,
+            year=year,
+        )
 
         if not all_candidates:
+            if plans and offline_misses == len(plans):
+                raise TMDBCacheMissError(
+                    f"TMDB offline mode has no cached search results for {filename}"
+                )
             logger.warning("TMDB search returned no viable candidates for %s", filename)
             return None
 
@@ -982,16 +1358,15 @@ async def resolve_tmdb(
             alias_targets and alias_targets[0].score < _STRONG_MATCH_THRESHOLD
         )
         if needs_alias_lookup:
-            for candidate in alias_targets:
-                try:
-                    aliases = await _fetch_alias_titles(
-                        client,
-                        category=candidate.category,
-                        tmdb_id=candidate.tmdb_id,
-                        cache_ttl=config.cache_ttl_seconds,
-                        timeout=timeout,
-                    )
-                except TMDBResolutionError:
+            alias_lists = await _fetch_alias_lists(
+                client,
+                alias_targets,
+                cache_ttl=config.cache_ttl_seconds,
+                timeout=timeout,
+                offline=offline,
+            )
+            for candidate, aliases in zip(alias_targets, alias_lists):
+                if aliases is None:
                     continue
                 candidate_norms: set[str] = set()
                 candidate_norms.update(_normalized_variants(candidate.title))
@@ -1079,7 +1454,9 @@ __all__ = [
     "TMDBResolution",
     "TMDBResolutionError",
     "TMDBAmbiguityError",
+    "TMDBCacheMissError",
     "TMDBCandidate",
+    "default_cache_dir",
     "resolve_tmdb",
     "parse_manual_id",
 ]
@@ -0,0 +1,330 @@
+"""Offline TMDB title index built from the daily ID export dumps.
+
+TMDB publishes daily JSON-lines exports (``movie_ids_MM_DD_YYYY.json.gz`` and
+``tv_series_ids_MM_DD_YYYY.json.gz``) listing every entry's ID, original title and
+popularity. :func:`build_title_index` folds those dumps into a small SQLite file
+holding each title, its normalised form and (when the dump carries one) its year,
+plus an inverted index from trigrams and word tokens to titles. :class:`TitleIndex`
+answers fuzzy title lookups from that file without any network access.
+"""
+
+from __future__ import annotations
+
+import gzip
+import heapq
+import json
+import logging
+import sqlite3
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .tmdb import MOVIE, TV, _normalize_title  # pyright: ignore[reportPrivateUsage]
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "IndexedTitle",
+    "TitleIndex",
+    "TitleIndexError",
+    "TitleIndexStats",
+    "build_title_index",
+    "open_title_index",
+    "title_grams",
+]
+
+_SCHEMA_VERSION = 1
+_SCHEMA = (
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE titles ("
+    "id INTEGER PRIMARY KEY, category TEXT NOT NULL, tmdb_id TEXT NOT NULL, title TEXT NOT NULL, "
+    "norm TEXT NOT NULL, year INTEGER, popularity REAL NOT NULL, grams INTEGER NOT NULL)",
+    "CREATE TABLE postings (gram TEXT PRIMARY KEY, ids BLOB NOT NULL) WITHOUT ROWID",
+)
+# Grams shared by more titles than this (" th", "the ", ...) carry no signal and
+# would dominate query time on a full dump, so they are dropped from the index.
+_MAX_POSTINGS = 200_000
+_DATE_KEYS = {MOVIE: ("release_date", "year"), TV: ("first_air_date", "year")}
+
+
+class TitleIndexError(RuntimeError):
+    """Raised when a title index cannot be built or opened."""
+
+
+@dataclass(frozen=True)
+class IndexedTitle:
+    """Single title stored in the index."""
+
+    category: str
+    tmdb_id: str
+    title: str
+    year: Optional[int]
+    popularity: float
+
+    def as_payload(self) -> Dict[str, Any]:
+        """Return the entry shaped like a TMDB search result for scoring."""
+
+        payload: Dict[str, Any] = {"id": self.tmdb_id, "popularity": self.popularity}
+        if self.category == MOVIE:
+            payload["original_title"] = self.title
+            if self.year is not None:
+                payload["release_date"] = f"{self.year:04d}-01-01"
+        else:
+            payload["original_name"] = self.title
+            if self.year is not None:
+                payload["first_air_date"] = f"{self.year:04d}-01-01"
+        return payload
+
+
+@dataclass(frozen=True)
+class TitleIndexStats:
+    """Counts reported by :func:`build_title_index`."""
+
+    movies: int
+    tv: int
+    skipped: int
+    grams: int
+
+
+def title_grams(norm: str) -> set[str]:
+    """Return the trigram and word-token keys indexed for a normalised title."""
+
+    if not norm:
+        return set()
+    padded = f" {norm} "
+    grams = {padded[idx : idx + 3] for idx in range(len(padded) - 2)}
+    grams.update(f"w:{token}" for token in norm.split())
+    return grams
+
+
+def _open_dump(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def _dump_records(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        handle = _open_dump(path)
+    except OSError as exc:
+        raise TitleIndexError(f"Unable to read TMDB export {path}: {exc}") from exc
+    with handle:
+        for line_number, line in enumerate(handle, start=1):
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError:
+                logger.debug("Skipping malformed line %d in %s", line_number, path.name)
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def _record_category(record: Dict[str, Any]) -> Optional[str]:
+    if "original_title" in record:
+        return MOVIE
+    if "original_name" in record:
+        return TV
+    return None
+
+
+def _record_year(record: Dict[str, Any], category: str) -> Optional[int]:
+    for key in _DATE_KEYS[category]:
+        value = record.get(key)
+        if isinstance(value, int) and 1800 <= value <= 2999:
+            return value
+        if isinstance(value, str) and len(value) >= 4 and value[:4].isdigit():
+            return int(value[:4])
+    return None
+
+
+def build_title_index(dumps: Sequence[Path], destination: Path) -> TitleIndexStats:
+    """
+    Build a title index at *destination* from TMDB ID export *dumps*.
+
+    Dumps may be plain or gzipped JSON lines; the category of each record follows
+    from its ``original_title`` (movie) or ``original_name`` (TV) key. Adult entries
+    and records without an ID or title are skipped. The index is written to a
+    temporary file and moved into place, so readers never see a partial build.
+    """
+
+    titles: List[tuple[str, str, str, str, Optional[int], float, int]] = []
+    postings: Dict[str, array[int]] = {}
+    skipped = 0
+    counts = {MOVIE: 0, TV: 0}
+    seen: set[tuple[str, str]] = set()
+    for dump in dumps:
+        for record in _dump_records(Path(dump)):
+            category = _record_category(record)
+            raw_id = record.get("id")
+            title_value = record.get("original_title" if category == MOVIE else "original_name")
+            if (
+                category is None
+                or record.get("adult") is True
+                or raw_id is None
+                or not isinstance(title_value, str)
+            ):
+                skipped += 1
+                continue
+            tmdb_id = str(raw_id)
+            norm = _normalize_title(title_value)
+            if not norm or (category, tmdb_id) in seen:
+                skipped += 1
+                continue
+            seen.add((category, tmdb_id))
+            try:
+                popularity = float(record.get("popularity") or 0.0)
+            except (TypeError, ValueError):
+                popularity = 0.0
+            grams = title_grams(norm)
+            title_id = len(titles) + 1
+            titles.append(
+                (category, tmdb_id, title_value.strip(), norm, _record_year(record, category), popularity, len(grams))
+            )
+            for gram in grams:
+                postings.setdefault(gram, array("I")).append(title_id)
+            counts[category] += 1
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    staging = destination.with_name(f"{destination.name}.tmp")
+    staging.unlink(missing_ok=True)
+    kept = {gram: ids for gram, ids in postings.items() if len(ids) <= _MAX_POSTINGS}
+    try:
+        conn = sqlite3.connect(str(staging))
+        try:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.executemany(
+                "INSERT INTO titles (id, category, tmdb_id, title, norm, year, popularity, grams) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((idx, *row) for idx, row in enumerate(titles, start=1)),
+            )
+            conn.executemany(
+                "INSERT INTO postings (gram, ids) VALUES (?, ?)",
+                ((gram, ids.tobytes()) for gram, ids in sorted(kept.items())),
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (str(_SCHEMA_VERSION),))
+            conn.commit()
+        finally:
+            conn.close()
+        staging.replace(destination)
+    except (sqlite3.Error, OSError) as exc:
+        staging.unlink(missing_ok=True)
+        raise TitleIndexError(f"Failed to write title index {destination}: {exc}") from exc
+    with _INDEXES_LOCK:
+        _INDEXES.pop(_index_key(destination), None)
+    return TitleIndexStats(movies=counts[MOVIE], tv=counts[TV], skipped=skipped, grams=len(kept))
+
+
+def _overlap_order(item: tuple[int, int]) -> tuple[int, int]:
+    return (-item[1], item[0])
+
+
+class TitleIndex:
+    """Read-only handle to a built title index (safe to share across threads)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except (sqlite3.Error, ValueError) as exc:
+            raise TitleIndexError(f"Unable to open title index {path}: {exc}") from exc
+        if row is None or str(row[0]) != str(_SCHEMA_VERSION):
+            raise TitleIndexError(f"Title index {path} uses an unsupported schema; rebuild it")
+
+    def search(self, query_norms: Iterable[str], *, limit: int = 20) -> List[IndexedTitle]:
+        """
+        Return up to *limit* titles sharing the most grams with any of *query_norms*.
+
+        Ranking uses the Dice coefficient between gram sets, best over the query
+        variants, with ties broken by popularity and then TMDB ID for stable output.
+        """
+
+        query_grams = [grams for grams in (title_grams(norm) for norm in query_norms) if grams]
+        if not query_grams:
+            return []
+        wanted = sorted(set().union(*query_grams))
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    f"SELECT gram, ids FROM postings WHERE gram IN ({', '.join('?' * len(wanted))})",
+                    wanted,
+                ).fetchall()
+            except sqlite3.Error as exc:
+                raise TitleIndexError(f"Title index query failed: {exc}") from exc
+        lists: Dict[str, array[int]] = {}
+        for gram, blob in rows:
+            ids = array("I")
+            ids.frombytes(blob)
+            lists[str(gram)] = ids
+        overlaps: List[Counter[int]] = []
+        for grams in query_grams:
+            counter: Counter[int] = Counter()
+            for gram in grams:
+                ids = lists.get(gram)
+                if ids is not None:
+                    counter.update(ids)
+            overlaps.append(counter)
+        shortlist = sorted(
+            {
+                title_id
+                for counter in overlaps
+                for title_id, _ in heapq.nsmallest(limit * 4, counter.items(), key=_overlap_order)
+            }
+        )
+        if not shortlist:
+            return []
+        with self._lock:
+            try:
+                details = self._conn.execute(
+                    "SELECT id, category, tmdb_id, title, year, popularity, grams FROM titles "
+                    f"WHERE id IN ({', '.join('?' * len(shortlist))})",
+                    shortlist,
+                ).fetchall()
+            except sqlite3.Error as exc:
+                raise TitleIndexError(f"Title index query failed: {exc}") from exc
+        ranked: List[tuple[float, float, str, IndexedTitle]] = []
+        for title_id, category, tmdb_id, title, year, popularity, gram_count in details:
+            dice = max(
+                2.0 * counter.get(int(title_id), 0) / (len(grams) + int(gram_count))
+                for counter, grams in zip(overlaps, query_grams)
+            )
+            entry = IndexedTitle(
+                category=str(category),
+                tmdb_id=str(tmdb_id),
+                title=str(title),
+                year=int(year) if year is not None else None,
+                popularity=float(popularity),
+            )
+            ranked.append((dice, entry.popularity, f"{entry.category}/{entry.tmdb_id}", entry))
+        ranked.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [item[3] for item in ranked[:limit]]
+
+
+_INDEXES: Dict[str, TitleIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index_key(path: Path) -> str:
+    return str(Path(path).expanduser().resolve())
+
+
+def open_title_index(path: Path) -> TitleIndex:
+    """Return the process-wide :class:`TitleIndex` for *path*."""
+
+    key = _index_key(path)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            if not Path(key).is_file():
+                raise TitleIndexError(f"Title index not found: {path}")
+            index = TitleIndex(Path(key))
+            _INDEXES[key] = index
+        return index
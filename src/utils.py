@@ -2,14 +2,38 @@
 
 from __future__ import annotations
 
+import json
+import logging
+import math
+import os
 import re
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from importlib import import_module
-from typing import Any, Dict, List, Mapping, Optional
+from importlib import metadata as importlib_metadata
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, cast
+
+from .frame_compare.artifact_index import open_artifact_index
+
+logger = logging.getLogger(__name__)
 
 _YEAR_RE = re.compile(r"(19|20)\d{2}")
 _IMDB_ID_RE = re.compile(r"(tt\d{7,9})", re.IGNORECASE)
 _TVDB_ID_RE = re.compile(r"tvdb\s*(\d+)", re.IGNORECASE)
 
+_PARSERS: Dict[str, Tuple[str, str]] = {"guessit": ("guessit", "guessit"), "anitopy": ("anitopy", "parse")}
+_PARSE_ARTIFACT_KIND = "filename_parse"
+_PARSE_CACHE_VERSION = 1
+_PARSE_CACHE_MAX_ENTRIES = 50_000
+_PARSE_PRUNE_INTERVAL = 512
+# Below this many uncached names a worker pool costs more to start than it saves.
+_PARSE_POOL_MIN_FILES = 16
+_PARSE_POOL_MAX_WORKERS = 4
+
 
 def _extract_release_group_brackets(file_name: str) -> Optional[str]:
     """Return the leading release-group tag (e.g. "[Group]") without brackets."""
@@ -62,33 +86,216 @@ def _coerce_mapping(value: Any) -> Mapping[str, Any] | None:
     return None
 
 
-def _call_guessit(file_name: str) -> Mapping[str, Any] | None:
-    """
-    Invoke GuessIt for ``file_name`` and normalise the result mapping.
+def user_cache_dir() -> Path:
+    """Return the per-user cache directory (``$XDG_CACHE_HOME``/``%LOCALAPPDATA%``/``~/.cache``)."""
 
-    Parameters:
-        file_name (str): File name or path to analyse.
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    root = Path(base).expanduser() if base else Path.home() / ".cache"
+    return root / "frame-compare"
 
-    Returns:
-        Mapping[str, Any] | None: Normalised GuessIt result when parsing succeeds; otherwise ``None``.
+
+def _jsonable(value: Any) -> Any:
+    """Reduce parser output to JSON types so cached and fresh results are identical."""
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(value, Mapping):
+        return {str(key): _jsonable(item) for key, item in value.items()}  # pyright: ignore[reportUnknownVariableType]
+    return str(value)
+
+
+@lru_cache(maxsize=None)
+def _distribution_version(name: str) -> Optional[str]:
+    try:
+        return importlib_metadata.version(name)
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+
+def _load_parser(name: str) -> Tuple[Optional[Callable[[str], Any]], Optional[str]]:
     """
+    Return ``(parser, version)`` for the filename parser *name*.
+
+    ``version`` is ``None`` for anything that is not an installed module (for
+    example a test double), which keeps such results out of the parse cache.
+    """
+
+    module_name, attr = _PARSERS[name]
     try:
-        module = import_module("guessit")
+        module = import_module(module_name)
     except Exception:
-        return None
-    parser = getattr(module, "guessit", None)
+        return None, None
+    parser = getattr(module, attr, None)
     if not callable(parser):
-        return None
+        return None, None
+    version: Optional[str] = None
+    if isinstance(module, types.ModuleType):
+        raw_version = getattr(module, "__version__", None) or _distribution_version(module_name)
+        version = str(raw_version) if raw_version else None
+    return parser, version
+
+
+def _invoke_parser(parser: Callable[[str], Any], file_name: str) -> Optional[Dict[str, Any]]:
     try:
         result = parser(file_name)
     except Exception:
         return None
-    return _coerce_mapping(result)
+    mapped = _coerce_mapping(result)
+    return _jsonable(mapped) if mapped is not None else None
+
+
+class _ParseCache:
+    """
+    Memoised GuessIt/Anitopy results keyed by parser, parser version and file name.
+
+    Results live in memory for the process and in the artifact index under the
+    per-user cache directory, so repeated runs skip the parsers entirely.
+    """
+
+    def __init__(self) -> None:
+        self._memory: Dict[Tuple[str, str, str], Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def _row_key(key: Tuple[str, str, str]) -> str:
+        return json.dumps(list(key), separators=(",", ":"))
+
+    def get(self, key: Tuple[str, str, str]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        with self._lock:
+            if key in self._memory:
+                return True, self._memory[key]
+        record = open_artifact_index(user_cache_dir() / "parse").get(_PARSE_ARTIFACT_KIND, self._row_key(key))
+        if record is None or record.fingerprint != f"v{_PARSE_CACHE_VERSION}":
+            return False, None
+        try:
+            payload: Any = json.loads(record.payload)
+        except ValueError:
+            return False, None
+        if not isinstance(payload, dict):
+            return False, None
+        result = cast(Dict[str, Any], payload).get("result")
+        value = cast(Dict[str, Any], result) if isinstance(result, dict) else None
+        with self._lock:
+            self._memory[key] = value
+        return True, value
+
+    def put(self, key: Tuple[str, str, str], value: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._writes += 1
+            prune = self._writes % _PARSE_PRUNE_INTERVAL == 0
+        index = open_artifact_index(user_cache_dir() / "parse")
+        index.put(
+            _PARSE_ARTIFACT_KIND,
+            self._row_key(key),
+            fingerprint=f"v{_PARSE_CACHE_VERSION}",
+            payload=json.dumps({"result": value}, separators=(",", ":")),
+        )
+        if prune:
+            index.prune(_PARSE_ARTIFACT_KIND, keep=_PARSE_CACHE_MAX_ENTRIES)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+_PARSE_CACHE = _ParseCache()
+
+
+def cached_filename_parse(parser_name: str, file_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the ``guessit`` or ``anitopy`` result for *file_name*, parsing at most once.
+
+    Results are reduced to JSON types and shared across calls, modules and runs;
+    ``None`` means the parser is unavailable or could not parse the name.
+    """
+
+    parser, version = _load_parser(parser_name)
+    if parser is None:
+        return None
+    if version is None:
+        return _invoke_parser(parser, file_name)
+    key = (parser_name, version, file_name)
+    found, value = _PARSE_CACHE.get(key)
+    if found:
+        return value
+    value = _invoke_parser(parser, file_name)
+    _PARSE_CACHE.put(key, value)
+    return value
+
+
+def _parse_chunk(parser_name: str, file_names: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+    """Process-pool worker: parse *file_names* with *parser_name*."""
+
+    parser, _ = _load_parser(parser_name)
+    if parser is None:
+        return [None for _ in file_names]
+    return [_invoke_parser(parser, name) for name in file_names]
+
+
+def prime_filename_parses(
+    file_names: Iterable[str],
+    *,
+    parsers: Sequence[str] = ("guessit",),
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Parse *file_names* ahead of time so later lookups are cache hits.
+
+    Large batches of uncached names are split across a process pool (GuessIt is
+    CPU-bound and holds the GIL); small batches, or any pool failure, parse in
+    this process. Returns the number of names that had to be parsed.
+    """
+
+    names = list(dict.fromkeys(file_names))
+    parsed = 0
+    for parser_name in parsers:
+        parser, version = _load_parser(parser_name)
+        if parser is None or version is None:
+            continue
+        pending = [name for name in names if not _PARSE_CACHE.get((parser_name, version, name))[0]]
+        if not pending:
+            continue
+        parsed += len(pending)
+        workers = max_workers if max_workers is not None else min(_PARSE_POOL_MAX_WORKERS, os.cpu_count() or 1)
+        workers = max(1, min(int(workers), len(pending)))
+        if workers > 1 and len(pending) >= _PARSE_POOL_MIN_FILES:
+            chunk = math.ceil(len(pending) / workers)
+            chunks = [pending[idx : idx + chunk] for idx in range(0, len(pending), chunk)]
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+                    results = list(pool.map(_parse_chunk, [parser_name] * len(chunks), chunks))
+            except Exception as exc:  # pragma: no cover - platform dependent
+                logger.debug("Filename parse pool unavailable (%s); parsing in-process", exc)
+            else:
+                for chunk_names, chunk_results in zip(chunks, results):
+                    for name, value in zip(chunk_names, chunk_results):
+                        _PARSE_CACHE.put((parser_name, version, name), value)
+                continue
+        for name in pending:
+            cached_filename_parse(parser_name, name)
+    return parsed
+
+
+def _call_guessit(file_name: str) -> Mapping[str, Any] | None:
+    """
+    Return the (cached) GuessIt result mapping for ``file_name``.
+
+    Parameters:
+        file_name (str): File name or path to analyse.
+
+    Returns:
+        Mapping[str, Any] | None: Normalised GuessIt result when parsing succeeds; otherwise ``None``.
+    """
+    return cached_filename_parse("guessit", file_name)
 
 
 def _call_anitopy(file_name: str) -> Mapping[str, Any]:
     """
-    Invoke Anitopy for ``file_name`` and return a mapping of metadata.
+    Return the (cached) Anitopy result mapping for ``file_name``.
 
     Parameters:
         file_name (str): File name or path to analyse.
@@ -96,19 +303,7 @@ def _call_anitopy(file_name: str) -> Mapping[str, Any]:
     Returns:
         Mapping[str, Any]: Normalised Anitopy metadata mapping (empty when parsing fails).
     """
-    try:
-        module = import_module("anitopy")
-    except Exception:
-        return {}
-    parser = getattr(module, "parse", None)
-    if not callable(parser):
-        return {}
-    try:
-        result = parser(file_name)
-    except Exception:
-        return {}
-    mapped = _coerce_mapping(result)
-    return dict(mapped) if mapped else {}
+    return cached_filename_parse("anitopy", file_name) or {}
 
 
 def _episode_designator_for_label(
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import threading
+import types
+from pathlib import Path
+from typing import Any
+
+import pytest
+from click.testing import CliRunner
+
+import frame_compare
+import src.frame_compare.cache_warm as cache_warm
+import src.frame_compare.media as media_utils
+import src.frame_compare.metadata as metadata_utils
+import src.frame_compare.planner as planner_utils
+import src.frame_compare.preflight as preflight_utils
+import src.frame_compare.selection as selection_module
+from src.frame_compare import alignment_runner
+from src.frame_compare import vs as vs_core
+
+
+def _make_workspace(tmp_path: Path, names: tuple[str, ...]) -> Path:
+    media_dir = tmp_path / "comparison_videos"
+    media_dir.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (media_dir / name).write_bytes(b"\x00")
+    return media_dir
+
+
+@pytest.fixture
+def _no_priority_change(monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    calls: list[bool] = []
+
+    def _fake_lower() -> bool:
+        calls.append(True)
+        return True
+
+    monkeypatch.setattr(cache_warm, "lower_process_priority", _fake_lower)
+    return calls
+
+
+def test_cache_warm_probes_clips_concurrently(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    _no_priority_change: list[bool],
+) -> None:
+    _make_workspace(tmp_path, ("A.mkv", "B.mkv", "C.mkv"))
+    barrier = threading.Barrier(3, timeout=5)
+    probed: list[str] = []
+
+    def _fake_probe(plans: Any, runtime_cfg: Any, cache_dir: Path, **_: Any) -> None:
+        barrier.wait()
+        probed.extend(plan.path.name for plan in plans)
+
+    monkeypatch.setattr(cache_warm.selection_utils, "probe_clip_metadata", _fake_probe)
+    monkeypatch.setattr(
+        cache_warm,
+        "pick_analyze_file",
+        lambda files, metadata, target, *, cache_dir=None: files[0],
+    )
+
+    result = CliRunner().invoke(
+        frame_compare.main,
+        ["cache", "warm", "--root", str(tmp_path), "--workers", "3", "--skip-metrics", "--json"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output.strip().splitlines()[-1])
+    assert sorted(probed) == ["A.mkv", "B.mkv", "C.mkv"]
+    assert payload["probed"] == ["A.mkv", "B.mkv", "C.mkv"]
+    assert payload["failed"] == []
+    assert payload["workers"] == 3
+    assert payload["analyze_file"] == "A.mkv"
+    assert payload["metrics"]["status"] == "skipped"
+    assert payload["low_priority"] is True
+    assert _no_priority_change == [True]
+
+
+def test_cache_warm_rejects_non_positive_workers(tmp_path: Path) -> None:
+    _make_workspace(tmp_path, ("A.mkv",))
+
+    result = CliRunner().invoke(frame_compare.main, ["cache", "warm", "--root", str(tmp_path), "--workers", "0"])
+
+    assert result.exit_code == 2
+    assert "--workers" in result.output
+
+
+def test_cache_warm_snapshots_are_reused_by_a_full_probe_pass(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    _no_priority_change: list[bool],
+) -> None:
+    _make_workspace(tmp_path, ("A.mkv", "B.mkv", "C.mkv"))
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "config.toml").write_text(
+        '[runtime]\nfast_probe = false\n\n[overrides]\nchange_fps = { "B.mkv" = "set" }\n',
+        encoding="utf-8",
+    )
+    fps_by_name = {"A.mkv": (60000, 1001), "B.mkv": (24000, 1001), "C.mkv": (25, 1)}
+    init_calls: list[tuple[str, tuple[int, int] | None]] = []
+
+    def _fake_init_clip(path: str, **kwargs: Any) -> types.SimpleNamespace:
+        name = Path(path).name
+        init_calls.append((name, kwargs.get("fps_map")))
+        sink = kwargs.get("frame_props_sink")
+        if callable(sink):
+            sink({"_Matrix": 1})
+        fps_num, fps_den = kwargs.get("fps_map") or fps_by_name[name]
+        return types.SimpleNamespace(width=1920, height=1080, fps_num=fps_num, fps_den=fps_den, num_frames=240)
+
+    monkeypatch.setattr(selection_module.vs_core, "set_ram_limit", lambda limit_mb, *, core=None: None)
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", _fake_init_clip)
+    monkeypatch.setattr(
+        cache_warm,
+        "pick_analyze_file",
+        lambda files, metadata, target, *, cache_dir=None: files[0],
+    )
+
+    result = CliRunner().invoke(
+        frame_compare.main,
+        ["cache", "warm", "--root", str(tmp_path), "--workers", "2", "--skip-metrics", "--skip-audio", "--json"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0, result.output
+    assert sorted(init_calls) == [("A.mkv", (24000, 1001)), ("B.mkv", None), ("C.mkv", (24000, 1001))]
+
+    preflight = preflight_utils.prepare_preflight(
+        cli_root=str(tmp_path),
+        config_override=None,
+        input_override=None,
+        ensure_config=False,
+        create_dirs=False,
+        create_media_dir=False,
+    )
+    files = media_utils.discover_media(preflight.media_root)
+    metadata = list(metadata_utils.parse_metadata(files, preflight.config.naming))
+    plans = list(planner_utils.build_plans(files, metadata, preflight.config))
+    selection_module.probe_clip_metadata(plans, preflight.config.runtime, preflight.media_root)
+
+    assert len(init_calls) == 3
+    assert all(plan.probe_snapshot is not None for plan in plans)
+    assert [plan.applied_fps for plan in plans if not plan.use_as_reference] == [(24000, 1001), (24000, 1001)]
+
+
+def test_cache_warm_collects_metrics_and_reports_failures(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    _no_priority_change: list[bool],
+) -> None:
+    _make_workspace(tmp_path, ("A.mkv", "B.mkv"))
+    metrics_calls: list[str] = []
+
+    def _fake_metrics(plans: Any, cfg: Any, root: Path, analyze_path: Path) -> tuple[str, None]:
+        metrics_calls.append(analyze_path.name)
+        return "computed", None
+
+    monkeypatch.setattr(cache_warm.selection_utils, "probe_clip_metadata", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        cache_warm,
+        "pick_analyze_file",
+        lambda files, metadata, target, *, cache_dir=None: files[1],
+    )
+    monkeypatch.setattr(cache_warm, "_warm_metrics", _fake_metrics)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        frame_compare.main,
+        ["--root", str(tmp_path), "cache", "warm", "--normal-priority"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+    assert metrics_calls == ["B.mkv"]
+    assert "[CACHE] Warm summary: probed=2 failed=0 metrics=computed" in result.output
+    assert _no_priority_change == []
+
+    def _failing_probe(plans: Any, *args: Any, **kwargs: Any) -> None:
+        if plans[0].path.name == "B.mkv":
+            raise vs_core.ClipInitError("boom")
+
+    monkeypatch.setattr(cache_warm.selection_utils, "probe_clip_metadata", _failing_probe)
+    metrics_calls.clear()
+    result = runner.invoke(
+        frame_compare.main,
+        ["cache", "warm", "--root", str(tmp_path), "--normal-priority"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 1
+    assert "Failed to probe B.mkv: boom" in result.output
+    assert "metrics=skipped (probe failures)" in result.output
+    assert metrics_calls == []
+
+
+def test_cache_warm_computes_audio_envelopes_when_enabled(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    _no_priority_change: list[bool],
+) -> None:
+    _make_workspace(tmp_path, ("A.mkv", "B.mkv"))
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "config.toml").write_text("[audio_alignment]\nenable = true\n", encoding="utf-8")
+    warmed: list[tuple[str, int]] = []
+
+    def _fake_warm_audio(plans: Any, cfg: Any, analyze_path: Path, root: Path, *, max_workers: int) -> dict[str, str | None]:
+        warmed.append((analyze_path.name, max_workers))
+        return {plan.path.name: None for plan in plans}
+
+    monkeypatch.setattr(cache_warm.selection_utils, "probe_clip_metadata", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        cache_warm,
+        "pick_analyze_file",
+        lambda files, metadata, target, *, cache_dir=None: files[0],
+    )
+    monkeypatch.setattr(alignment_runner, "warm_audio_envelopes", _fake_warm_audio)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        frame_compare.main,
+        ["--root", str(tmp_path), "cache", "warm", "--skip-metrics", "--workers", "2", "--json"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output.strip().splitlines()[-1])
+    assert warmed == [("A.mkv", 2)]
+    assert payload["audio"] == {"status": "computed", "reason": None, "envelopes": ["A.mkv", "B.mkv"]}
+
+    warmed.clear()
+    result = runner.invoke(
+        frame_compare.main,
+        ["--root", str(tmp_path), "cache", "warm", "--skip-metrics", "--skip-audio"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+    assert warmed == []
+    assert "audio=skipped (disabled by request)" in result.output
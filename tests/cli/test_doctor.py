@@ -39,7 +39,7 @@ auto_upload = true
     original_find_spec = importlib_util.find_spec
 
     def _patch_audio_deps(name: str, package: str | None = None):
-        if name in {"librosa", "pyperclip", "soundfile"}:
+        if name in {"numpy", "pyperclip"}:
             return None
         return original_find_spec(name, package)
 
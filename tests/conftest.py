@@ -6,6 +6,7 @@ from pathlib import Path
 import pytest
 from click.testing import CliRunner
 
+from src.frame_compare import net
 from src.frame_compare.cli_runtime import JsonTail
 from tests.helpers.runner_env import (
     DummyProgress,
@@ -19,6 +20,23 @@ from tests.helpers.runner_env import (
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_user_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Keep per-user caches (for example TMDB responses) out of the real home directory."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_host_limits() -> Iterator[None]:
+    """Stop host pauses and shared connection pools leaking from one test into the next."""
+
+    net.reset_host_limits()
+    yield
+    net.reset_host_limits()
+    net.close_shared_pools()
+
+
 @pytest.fixture
 def cli_runner_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> _CliRunnerEnv:
     """Install a deterministic CLI harness for CLI-heavy tests."""
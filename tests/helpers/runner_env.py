@@ -381,6 +381,7 @@ def _make_json_tail_stub() -> JsonTail:
             "is_public": False,
             "is_hentai": False,
             "remove_after_days": 0,
+            "upload": None,
         },
         "warnings": [],
         "workspace": {
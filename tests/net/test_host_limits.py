@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+from typing import cast
+
+import httpx
+import pytest
+import requests
+from urllib3 import HTTPConnectionPool, HTTPResponse
+
+from src.frame_compare import net
+
+
+class SleepRecorder:
+    def __init__(self) -> None:
+        self.calls: list[float] = []
+
+    async def __call__(self, duration: float) -> None:
+        self.calls.append(duration)
+
+
+class ScriptedClient:
+    base_url = "https://limited.example"
+
+    def __init__(self, responses: list[httpx.Response]) -> None:
+        self._responses = list(responses)
+
+    async def get(
+        self,
+        path: str,
+        params: dict[str, object],
+        timeout: float | httpx.Timeout | None = None,
+    ) -> httpx.Response:
+        return self._responses.pop(0)
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst() -> None:
+    net.configure_host_rate("bucket.example", 10.0, burst=2)
+    limiter = net.host_limiter("bucket.example")
+
+    waits = [limiter.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_retry_after_pauses_other_callers_of_the_host() -> None:
+    throttled = ScriptedClient([httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)])
+    bystander = ScriptedClient([httpx.Response(200)])
+    throttled_sleeps = SleepRecorder()
+    bystander_sleeps = SleepRecorder()
+
+    async def _scenario() -> None:
+        await net.httpx_get_json_with_backoff(
+            cast(httpx.AsyncClient, throttled), "/a", {}, max_backoff=5.0, sleep=throttled_sleeps
+        )
+        await net.httpx_get_json_with_backoff(cast(httpx.AsyncClient, bystander), "/b", {}, sleep=bystander_sleeps)
+
+    asyncio.run(_scenario())
+
+    # The throttled request sleeps through its own pause once; the other caller
+    # waits out what is left of it before sending.
+    assert throttled_sleeps.calls == [2.0]
+    assert len(bystander_sleeps.calls) == 1
+    assert 1.5 < bystander_sleeps.calls[0] <= 2.0
+
+
+def test_urllib3_retry_pauses_host_on_throttled_response() -> None:
+    retry = net.build_urllib3_retry(backoff_factor=0.1)
+    response = HTTPResponse(status=429, headers={"Retry-After": "3"})
+
+    retry.increment(method="POST", url="/upload/image", response=response, _pool=HTTPConnectionPool("slow.pics"))
+
+    assert net.host_limiter("slow.pics").reserve() == pytest.approx(3.0, abs=0.1)
+
+
+def test_unhinted_429_follows_the_urllib3_backoff_schedule() -> None:
+    retry = net.build_urllib3_retry(total=5, backoff_factor=0.1)
+    pool = HTTPConnectionPool("unhinted.example")
+
+    for attempt in range(1, 5):
+        retry = retry.increment(method="POST", url="/upload/image", response=HTTPResponse(status=429), _pool=pool)
+        pause = net.host_limiter("unhinted.example").reserve()
+        delay = net.retry_pause(
+            "schedule.example", status=429, retry_after=None, attempt=attempt, backoff_factor=0.1
+        )
+        assert delay == pytest.approx(retry.get_backoff_time())
+        assert pause == pytest.approx(delay, abs=0.05)
+
+
+def test_shared_async_transport_persists_only_on_shared_loop() -> None:
+    def _factory() -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport()
+
+    async def _grab() -> httpx.AsyncBaseTransport:
+        return net.shared_async_transport("probe", _factory)
+
+    first = net.run_on_shared_loop(_grab())
+    second = net.run_on_shared_loop(_grab())
+    local = asyncio.run(_grab())
+
+    assert first is second
+    assert local is not first
+
+
+def test_shared_http_adapter_survives_session_close() -> None:
+    adapter = net.shared_http_adapter("probe", net.SharedHTTPAdapter)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    adapter.poolmanager.connection_from_host("slow.pics", 443, scheme="https")
+    session.close()
+
+    assert net.shared_http_adapter("probe", net.SharedHTTPAdapter) is adapter
+    assert len(adapter.poolmanager.pools) == 1
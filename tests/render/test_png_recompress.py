@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import numpy.typing as npt
+
+from src.frame_compare.render import png_recompress
+
+
+def _paeth(left: int, up: int, upper_left: int) -> int:
+    estimate = left + up - upper_left
+    pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+    if pa <= pb and pa <= pc:
+        return left
+    return up if pb <= pc else upper_left
+
+
+def _filter_scanline(kind: int, row: List[int], prev: List[int], bpp: int) -> bytes:
+    out = bytearray()
+    for index, value in enumerate(row):
+        left = row[index - bpp] if index >= bpp else 0
+        up = prev[index]
+        upper_left = prev[index - bpp] if index >= bpp else 0
+        predictor = [0, left, up, (left + up) >> 1, _paeth(left, up, upper_left)][kind]
+        out.append((value - predictor) & 0xFF)
+    return bytes([kind]) + bytes(out)
+
+
+def _make_png(
+    raw: npt.NDArray[np.uint8],
+    bpp: int,
+    filters: List[int],
+    *,
+    extra: bytes = b"",
+    interlace: int = 0,
+) -> bytes:
+    height, row_bytes = raw.shape
+    prev = [0] * row_bytes
+    lines: List[bytes] = []
+    for y in range(height):
+        row = [int(value) for value in raw[y]]
+        lines.append(_filter_scanline(filters[y % len(filters)], row, prev, bpp))
+        prev = row
+    header = struct.pack(">IIBBBBB", row_bytes // bpp, height, 8, 2 if bpp == 3 else 6, 0, 0, interlace)
+    return (
+        png_recompress._PNG_SIGNATURE
+        + png_recompress._chunk_bytes(b"IHDR", header)
+        + extra
+        + png_recompress._chunk_bytes(b"IDAT", zlib.compress(b"".join(lines), 1))
+        + png_recompress._chunk_bytes(b"IEND", b"")
+    )
+
+
+def _decode(path: Path, bpp: int) -> npt.NDArray[np.uint8]:
+    chunks = png_recompress._read_chunks(path.read_bytes())
+    width, height = struct.unpack(">II", chunks[0][1][:8])
+    data = zlib.decompress(b"".join(body for kind, body in chunks if kind == b"IDAT"))
+    filtered = np.frombuffer(data, dtype=np.uint8).reshape(height, width * bpp + 1)
+    return png_recompress._unfilter(filtered, bpp)
+
+
+def _frame(height: int, width: int, channels: int = 3) -> npt.NDArray[np.uint8]:
+    yy, xx = np.mgrid[0:height, 0:width]
+    planes = [(xx // 3 + yy // 5) % 256, (xx * 7 + yy * 3) % 256, (xx + yy) // 2 % 256, np.full_like(xx, 255)]
+    return np.stack(planes[:channels], axis=-1).astype(np.uint8).reshape(height, width * channels)
+
+
+def test_recompress_png_is_lossless_and_keeps_ancillary_chunks(tmp_path: Path) -> None:
+    raw = _frame(48, 64)
+    text = png_recompress._chunk_bytes(b"tEXt", b"Comment\x00frame 120")
+    target = tmp_path / "120 - Clip.png"
+    target.write_bytes(_make_png(raw, 3, [0], extra=text))
+    original = target.stat().st_size
+
+    result = png_recompress.recompress_png(target)
+
+    assert result.skipped is None
+    assert result.original_bytes == original
+    assert result.final_bytes == target.stat().st_size < original
+    assert np.array_equal(_decode(target, 3), raw)
+    kinds = [kind for kind, _ in png_recompress._read_chunks(target.read_bytes())]
+    assert kinds == [b"IHDR", b"tEXt", b"IDAT", b"IEND"]
+    assert text in target.read_bytes()
+    assert not list(tmp_path.glob(".*.recompress"))
+
+
+def test_recompress_png_decodes_average_and_paeth_input(tmp_path: Path) -> None:
+    raw = _frame(9, 11, channels=4)
+    target = tmp_path / "0 - Clip.png"
+    target.write_bytes(_make_png(raw, 4, [0, 1, 2, 3, 4, 4, 3]))
+
+    png_recompress.recompress_png(target)
+
+    assert np.array_equal(_decode(target, 4), raw)
+
+
+def test_recompress_png_leaves_unsupported_files_untouched(tmp_path: Path) -> None:
+    interlaced = tmp_path / "interlaced.png"
+    interlaced.write_bytes(_make_png(_frame(8, 8), 3, [0], interlace=1))
+    bogus = tmp_path / "bogus.png"
+    bogus.write_bytes(b"not a png")
+    before = {path: path.read_bytes() for path in (interlaced, bogus)}
+
+    assert png_recompress.recompress_png(interlaced).skipped == "interlaced"
+    assert (png_recompress.recompress_png(bogus).skipped or "").startswith("unreadable")
+    assert {path: path.read_bytes() for path in before} == before
+
+
+def test_png_recompressor_waits_per_file_and_summarises(tmp_path: Path) -> None:
+    paths: List[Path] = []
+    for index in range(3):
+        path = tmp_path / f"{index} - Clip.png"
+        path.write_bytes(_make_png(_frame(32, 40 + index), 3, [0]))
+        paths.append(path)
+    original = sum(path.stat().st_size for path in paths)
+
+    recompressor = png_recompress.PngRecompressor(paths, max_workers=2).start()
+    first = recompressor.wait(paths[0])
+    summary = recompressor.finish()
+
+    assert first is not None and first.final_bytes == paths[0].stat().st_size
+    assert recompressor.wait(tmp_path / "unknown.png") is None
+    assert summary.files == 3
+    assert summary.rewritten == 3
+    assert summary.original_bytes == original
+    assert summary.final_bytes == sum(path.stat().st_size for path in paths)
+    assert summary.saved_bytes > 0
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Sequence, cast
@@ -75,6 +76,9 @@ class _RendererStub(ReportRendererProtocol):
     ) -> Path:
         return report_dir / self.output
 
+    def set_slowpics_url(self, report_index: Path, slowpics_url: str | None) -> None:
+        return None
+
 
 class _PublisherIOStub(PublisherIO):
     def file_size(self, path: str | Path) -> int:
@@ -97,6 +101,9 @@ class _SlowpicsClientStub(SlowpicsClientProtocol):
         cfg,  # noqa: ANN001
         *,
         progress_callback=None,
+        byte_progress_callback=None,
+        stats_callback=None,
+        prepare_image=None,
     ) -> str:
         if progress_callback is not None:
             progress_callback(len(list(image_paths)))
@@ -348,6 +355,147 @@ def test_publish_results_uses_services(tmp_path: Path) -> None:
     assert report_path is None
 
 
+def test_publish_results_records_png_recompression(tmp_path: Path) -> None:
+    context, json_tail, layout_data, cfg = _build_context(tmp_path)
+    cfg.screenshots.recompress_png = True
+    cfg.screenshots.recompress_workers = 1
+    image = tmp_path / "img-a.png"
+    image.write_bytes(b"not a png")
+    slowpics_publisher = _StubSlowpicsPublisher()
+
+    runner_module._publish_results(
+        context=context,
+        reporter=StubReporter(),
+        cfg=cfg,
+        layout_data=layout_data,
+        json_tail=json_tail,
+        image_paths=[str(image)],
+        out_dir=tmp_path,
+        collected_warnings=[],
+        report_enabled=True,
+        root=tmp_path,
+        plans=list(context.plans),
+        frames=[1],
+        selection_details={},
+        report_publisher=_StubReportPublisher(),
+        slowpics_publisher=slowpics_publisher,
+    )
+
+    assert slowpics_publisher.last_request is not None
+    assert slowpics_publisher.last_request.prepare_image is not None
+    recorded = cast(dict[str, Any], json_tail["render"]["png_recompress"])
+    assert recorded["files"] == 1
+    assert recorded["rewritten"] == 0
+    assert recorded["saved_bytes"] == 0
+    assert image.read_bytes() == b"not a png"
+
+
+def test_publish_results_generates_report_while_uploading(tmp_path: Path) -> None:
+    context, json_tail, layout_data, cfg = _build_context(tmp_path)
+    cfg.slowpics.auto_upload = True
+    report_written = threading.Event()
+    attached: list[str | None] = []
+
+    class _ConcurrentReportPublisher(_StubReportPublisher):
+        def publish(self, request: runner_module.ReportPublisherRequest) -> object:  # type: ignore[override]
+            super().publish(request)
+            report_written.set()
+            return SimpleNamespace(report_path=tmp_path / "report" / "index.html")
+
+        def attach_slowpics_url(self, request, result, slowpics_url) -> None:  # type: ignore[override]  # noqa: ANN001
+            attached.append(slowpics_url)
+
+    class _WaitingSlowpicsPublisher(_StubSlowpicsPublisher):
+        def publish(self, request: runner_module.SlowpicsPublisherRequest) -> object:  # type: ignore[override]
+            assert report_written.wait(timeout=5), "report was not generated during the upload"
+            return super().publish(request)
+
+    report_publisher = _ConcurrentReportPublisher()
+
+    slowpics_url, report_path = runner_module._publish_results(
+        context=context,
+        reporter=StubReporter(),
+        cfg=cfg,
+        layout_data=layout_data,
+        json_tail=json_tail,
+        image_paths=["img-a.png"],
+        out_dir=tmp_path,
+        collected_warnings=[],
+        report_enabled=True,
+        root=tmp_path,
+        plans=list(context.plans),
+        frames=[1],
+        selection_details={},
+        report_publisher=report_publisher,
+        slowpics_publisher=_WaitingSlowpicsPublisher(),
+    )
+
+    assert report_publisher.last_request is not None
+    assert report_publisher.last_request.slowpics_url is None
+    assert attached == ["https://slow.pics/c/test"]
+    assert slowpics_url == "https://slow.pics/c/test"
+    assert report_path == tmp_path / "report" / "index.html"
+
+
+def test_publish_results_isolates_report_thread_state(tmp_path: Path) -> None:
+    context, json_tail, layout_data, cfg = _build_context(tmp_path)
+    cfg.slowpics.auto_upload = True
+    report_path = tmp_path / "report" / "index.html"
+    report_written = threading.Event()
+
+    class _WarningReportPublisher(_StubReportPublisher):
+        def publish(self, request: runner_module.ReportPublisherRequest) -> object:  # type: ignore[override]
+            super().publish(request)
+            block = request.json_tail["report"]
+            block["path"] = str(report_path)
+            request.layout_data["report"] = block
+            request.reporter.warn("report warning")
+            request.collected_warnings.append("report warning")
+            report_written.set()
+            return SimpleNamespace(report_path=report_path)
+
+        def attach_slowpics_url(self, request, result, slowpics_url) -> None:  # type: ignore[override]  # noqa: ANN001
+            return None
+
+    class _ObservingSlowpicsPublisher(_StubSlowpicsPublisher):
+        def publish(self, request: runner_module.SlowpicsPublisherRequest) -> object:  # type: ignore[override]
+            assert report_written.wait(timeout=5)
+            assert "path" not in request.json_tail["report"]
+            assert request.layout_data["report"] is request.json_tail["report"]
+            assert reporter.warnings == [] and warnings == []
+            request.reporter.warn("upload warning")
+            return super().publish(request)
+
+    reporter = StubReporter()
+    warnings: list[str] = []
+    report_block = json_tail["report"]
+
+    runner_module._publish_results(
+        context=context,
+        reporter=reporter,
+        cfg=cfg,
+        layout_data=layout_data,
+        json_tail=json_tail,
+        image_paths=["img-a.png"],
+        out_dir=tmp_path,
+        collected_warnings=warnings,
+        report_enabled=True,
+        root=tmp_path,
+        plans=list(context.plans),
+        frames=[1],
+        selection_details={},
+        report_publisher=_WarningReportPublisher(),
+        slowpics_publisher=_ObservingSlowpicsPublisher(),
+    )
+
+    assert json_tail["report"] is report_block
+    assert report_block.get("path") == str(report_path)
+    assert report_block.get("enabled") is False
+    assert layout_data["report"] is report_block
+    assert reporter.warnings == ["upload warning", "report warning"]
+    assert warnings == ["report warning"]
+
+
 def test_reporter_flags_initialized_with_service_context(
     monkeypatch: pytest.MonkeyPatch,
     cli_runner_env: Any,
@@ -12,7 +12,9 @@ import pytest
 from click.testing import CliRunner, Result
 
 import frame_compare
+import src.frame_compare.cli_entry as cli_entry_module
 import src.frame_compare.core as core_module
+import src.frame_compare.slowpics as slowpics_module
 import src.frame_compare.tmdb_workflow as tmdb_utils
 from src.datatypes import (
     AnalysisConfig,
@@ -90,6 +92,9 @@ class _StubReportRenderer(ReportRendererProtocol):
     ) -> Path:
         return report_dir / self.report_name
 
+    def set_slowpics_url(self, report_index: Path, slowpics_url: str | None) -> None:
+        return None
+
 
 class _SlowpicsClientStub(SlowpicsClientProtocol):
     def __init__(self, upload_fn: Any) -> None:
@@ -103,6 +108,9 @@ class _SlowpicsClientStub(SlowpicsClientProtocol):
         cfg: SlowpicsConfig,
         *,
         progress_callback=None,
+        byte_progress_callback=None,
+        stats_callback=None,
+        prepare_image=None,
     ) -> str:
         paths_list = list(image_paths)
         self.calls.append((paths_list, out_dir, cfg))
@@ -1157,3 +1165,53 @@ def test_upload_progress_tracker_is_thread_safe() -> None:
 
     results = sorted((files, bytes_done) for files, bytes_done, _ in (future.result() for future in futures))
     assert results == [(1, 5), (2, 12), (3, 21), (4, 32)]
+
+
+def test_upload_progress_tracker_counts_streamed_bytes() -> None:
+    tracker = UploadProgressTracker([100, 200])
+
+    assert tracker.advance_bytes(150)[:2] == (0, 150)
+    assert tracker.advance_bytes(-50)[:2] == (0, 100)
+    assert tracker.advance(1)[:2] == (1, 100)
+    assert tracker.advance_bytes(1_000)[:2] == (1, 300)
+
+
+def test_cli_resume_upload_continues_journaled_collection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runner = CliRunner()
+    missing = runner.invoke(frame_compare.main, ["--root", str(tmp_path), "--resume-upload"])
+    assert missing.exit_code != 0
+    assert "No interrupted slow.pics upload" in missing.output
+
+    screen_dir = tmp_path / "comparison_videos" / "screens"
+    screen_dir.mkdir(parents=True)
+    images = [screen_dir / name for name in ("10 - A.png", "10 - B.png")]
+    for image in images:
+        image.write_bytes(b"png")
+    journal = slowpics_module.UploadJournal.create(
+        screen_dir,
+        collection_uuid="col",
+        canonical_url="https://slow.pics/c/resumed",
+        browser_id="browser",
+        collection_name="Journaled Name",
+        jobs=[(image, f"img-{index}") for index, image in enumerate(images)],
+    )
+    journal.mark_done(images[0])
+    captured: dict[str, Any] = {}
+
+    def fake_upload(image_files: list[str], target: Path, cfg: SlowpicsConfig, **kwargs: Any) -> str:
+        captured.update(kwargs, files=image_files, target=target, name=cfg.collection_name)
+        return "https://slow.pics/c/resumed"
+
+    monkeypatch.setattr(cli_entry_module, "upload_comparison", fake_upload)
+
+    result = runner.invoke(frame_compare.main, ["--root", str(tmp_path), "--resume-upload"])
+
+    assert result.exit_code == 0, result.output
+    assert "1 of 2 images left" in result.output
+    assert "https://slow.pics/c/resumed" in result.output
+    assert captured["resume"] is True
+    assert captured["target"] == screen_dir
+    assert captured["name"] == "Journaled Name"
+    assert captured["files"] == [str(image) for image in images]
@@ -13,7 +13,7 @@ from src.frame_compare.services.publishers import (
     SlowpicsPublisher,
     SlowpicsPublisherRequest,
 )
-from src.frame_compare.slowpics import SlowpicsAPIError
+from src.frame_compare.slowpics import SlowpicsAPIError, UploadStats
 from tests.services.conftest import StubReporter, build_base_json_tail, build_service_config
 
 
@@ -26,6 +26,9 @@ class _StubRenderer:
         self.calls.append(dict(kwargs))
         return self.index_path
 
+    def set_slowpics_url(self, report_index: Path, slowpics_url: str | None) -> None:
+        self.calls.append({"patched": report_index, "slowpics_url": slowpics_url})
+
 
 class _StubPublisherIO:
     def __init__(self) -> None:
@@ -48,6 +51,7 @@ class _StubSlowpicsClient:
     def __init__(self, result_url: str | None = "https://slow.pics/c/demo") -> None:
         self.result_url = result_url
         self.calls: list[tuple[Sequence[str], Path]] = []
+        self.stats: UploadStats | None = None
 
     def upload(
         self,
@@ -56,12 +60,17 @@ class _StubSlowpicsClient:
         cfg: SlowpicsConfig,
         *,
         progress_callback=None,
+        byte_progress_callback=None,
+        stats_callback=None,
+        prepare_image=None,
     ) -> str:
         self.calls.append((tuple(image_paths), out_dir))
         if self.result_url is None:
             raise SlowpicsAPIError("upload failed")
         if progress_callback is not None:
             progress_callback(len(image_paths))
+        if stats_callback is not None and self.stats is not None:
+            stats_callback(self.stats)
         return self.result_url
 
 
@@ -117,6 +126,48 @@ def test_report_publisher_updates_report_block(tmp_path: Path, service_cfg: AppC
     assert layout_data["report"].get("path") == str(renderer.index_path)
 
 
+def test_report_publisher_attaches_slowpics_url_after_generation(
+    tmp_path: Path, service_cfg: AppConfig, publisher_io: _StubPublisherIO
+) -> None:
+    reporter = StubReporter()
+    json_tail, layout_data = _make_context_payload(service_cfg)
+    renderer = _StubRenderer(tmp_path / "report" / "index.html")
+    publisher = ReportPublisher(renderer=renderer, io=publisher_io)
+    request = ReportPublisherRequest(
+        reporter=reporter,
+        json_tail=json_tail,
+        layout_data=layout_data,
+        report_enabled=True,
+        root=tmp_path,
+        plans=[],
+        frames=[1],
+        selection_details={},
+        image_paths=["img-a.png"],
+        metadata_title="Demo",
+        slowpics_url=None,
+        config=service_cfg.report,
+        collected_warnings=[],
+    )
+
+    result = publisher.publish(request)
+    publisher.attach_slowpics_url(request, result, "https://slow.pics/c/late")
+
+    assert renderer.calls[0]["slowpics_url"] is None
+    assert renderer.calls[1] == {"patched": renderer.index_path, "slowpics_url": "https://slow.pics/c/late"}
+    assert request.slowpics_url == "https://slow.pics/c/late"
+
+    class _ReadOnlyRenderer(_StubRenderer):
+        def set_slowpics_url(self, report_index: Path, slowpics_url: str | None) -> None:
+            raise OSError("read-only")
+
+    ReportPublisher(renderer=_ReadOnlyRenderer(renderer.index_path), io=publisher_io).attach_slowpics_url(
+        request, result, "https://slow.pics/c/late"
+    )
+
+    assert request.collected_warnings == ["HTML report slow.pics link update failed: read-only"]
+    assert reporter.warnings == request.collected_warnings
+
+
 def test_report_publisher_handles_generation_error(tmp_path: Path, service_cfg: AppConfig, publisher_io: _StubPublisherIO) -> None:
     reporter = StubReporter()
     json_tail, layout_data = _make_context_payload(service_cfg)
@@ -176,6 +227,43 @@ def test_slowpics_publisher_updates_block(tmp_path: Path, service_cfg: AppConfig
     assert slowpics_block["shortcut_written"] is False
 
 
+def test_slowpics_publisher_records_upload_stats(
+    tmp_path: Path, service_cfg: AppConfig, publisher_io: _StubPublisherIO
+) -> None:
+    json_tail, layout_data = _make_context_payload(service_cfg)
+    service_cfg.slowpics.auto_upload = True
+    client = _StubSlowpicsClient("https://slow.pics/c/foo")
+    client.stats = UploadStats(
+        adaptive=True, concurrency=5, peak_concurrency=6, bytes_sent=30_000_000, seconds=4.0, backoffs=1
+    )
+    publisher = SlowpicsPublisher(client=client, io=publisher_io)
+    request = SlowpicsPublisherRequest(
+        reporter=StubReporter(),
+        json_tail=json_tail,
+        layout_data=layout_data,
+        title_inputs=json_tail["slowpics"]["title"]["inputs"],
+        final_title="Demo",
+        resolved_base="Demo",
+        tmdb_disclosure_line=None,
+        verbose_tmdb_tag=None,
+        image_paths=["img-a.png"],
+        out_dir=tmp_path,
+        config=service_cfg.slowpics,
+    )
+
+    publisher.publish(request)
+
+    assert json_tail["slowpics"]["upload"] == {
+        "adaptive": True,
+        "concurrency": 5,
+        "peak_concurrency": 6,
+        "backoffs": 1,
+        "bytes": 30_000_000,
+        "seconds": 4.0,
+        "mb_per_s": 7.5,
+    }
+
+
 def test_slowpics_publisher_raises_on_failure(tmp_path: Path, service_cfg: AppConfig, publisher_io: _StubPublisherIO) -> None:
     reporter = StubReporter()
     json_tail, layout_data = _make_context_payload(service_cfg)
@@ -8,9 +8,11 @@ from typing import Any
 import pytest
 
 import frame_compare as _frame_compare  # noqa: F401  # Ensure CLI shim initialises alignment_runner.
-from src.audio_alignment import AlignmentMeasurement, AudioStreamInfo
+from src import audio_alignment
+from src.audio_alignment import AlignmentMeasurement, AudioStreamInfo, MediaProbe, OffsetSegment
 from src.frame_compare import alignment_runner as alignment_runner_module
-from src.frame_compare.cli_runtime import _ClipPlan
+from src.frame_compare.cache import compute_probe_cache_key, load_probe_snapshot
+from src.frame_compare.cli_runtime import ClipProbeSnapshot, _ClipPlan
 from tests.helpers.runner_env import _make_config, _RecordingOutputManager
 
 
@@ -104,6 +106,193 @@ def test_apply_audio_alignment_derives_frames_from_seconds(
     assert any(f"{expected_frames:+d}f" in line for line in display.offset_lines)
 
 
+def test_apply_audio_alignment_reports_drift_offset_map(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Drift mode keeps the configured window for the global offset and surfaces the offset map per clip."""
+
+    cfg = _make_config(tmp_path)
+    cfg.audio_alignment.enable = True
+    cfg.audio_alignment.use_vspreview = False
+    cfg.audio_alignment.duration_seconds = 120.0
+    cfg.audio_alignment.drift_windows = 6
+
+    reference = _ClipPlan(path=tmp_path / "Ref.mkv", metadata={"label": "Reference"})
+    target = _ClipPlan(path=tmp_path / "Target.mkv", metadata={"label": "Target"})
+    for plan in (reference, target):
+        plan.path.write_bytes(b"\x00")
+        plan.effective_fps = (24, 1)
+
+    stream = AudioStreamInfo(
+        index=0,
+        language="eng",
+        codec_name="aac",
+        channels=2,
+        channel_layout="stereo",
+        sample_rate=48000,
+        bitrate=128000,
+        is_default=True,
+        is_forced=False,
+    )
+    monkeypatch.setattr(alignment_runner_module.audio_alignment, "probe_audio_streams", lambda _path: [stream])
+
+    segments = [
+        OffsetSegment(0.0, 900.0, 0.5, windows=3),
+        OffsetSegment(900.0, 1800.0, 1.5, drift=0.0002, windows=3, model="linear"),
+    ]
+    captured: dict[str, Any] = {}
+
+    def _fake_measure(*_args: Any, **kwargs: Any) -> list[AlignmentMeasurement]:
+        captured.update(kwargs)
+        return [
+            AlignmentMeasurement(
+                file=target.path,
+                offset_seconds=0.5,
+                frames=12,
+                correlation=0.9,
+                reference_fps=24.0,
+                target_fps=24.0,
+                offset_map=segments,
+            )
+        ]
+
+    monkeypatch.setattr(alignment_runner_module.audio_alignment, "measure_offsets", _fake_measure)
+
+    _summary, display = alignment_runner_module.apply_audio_alignment(
+        [reference, target],
+        cfg,
+        reference.path,
+        tmp_path,
+        audio_track_overrides={},
+        reporter=_RecordingOutputManager(),
+    )
+
+    assert captured["duration_seconds"] == 120.0
+    assert captured["drift_windows"] == 6
+    assert display is not None
+    offset_map = display.measurements["Target"].offset_map
+    assert offset_map is not None
+    assert [entry["model"] for entry in offset_map] == ["constant", "linear"]
+    assert offset_map[1]["drift"] == pytest.approx(0.0002)
+
+
+def test_apply_audio_alignment_video_signal_skips_audio_probe(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Video-signature mode measures luma offsets without touching the audio stack."""
+
+    cfg = _make_config(tmp_path)
+    cfg.audio_alignment.enable = True
+    cfg.audio_alignment.use_vspreview = False
+    cfg.audio_alignment.signal = "video"
+
+    reference = _ClipPlan(path=tmp_path / "Ref.mkv", metadata={"label": "Reference"})
+    target = _ClipPlan(path=tmp_path / "Target.mkv", metadata={"label": "Target"})
+    for plan in (reference, target):
+        plan.path.write_bytes(b"\x00")
+        plan.effective_fps = (24, 1)
+
+    def _no_audio(*_args: Any, **_kwargs: Any) -> Any:
+        raise AssertionError("audio stack should not run in video-signature mode")
+
+    monkeypatch.setattr(alignment_runner_module.audio_alignment, "probe_audio_streams", _no_audio)
+    monkeypatch.setattr(alignment_runner_module.audio_alignment, "measure_offsets", _no_audio)
+    captured: dict[str, Any] = {}
+
+    def _fake_signature(*args: Any, **kwargs: Any) -> list[AlignmentMeasurement]:
+        captured["targets"] = args[1]
+        captured.update(kwargs)
+        return [
+            AlignmentMeasurement(
+                file=target.path,
+                offset_seconds=0.5,
+                frames=12,
+                correlation=0.97,
+                reference_fps=24.0,
+                target_fps=24.0,
+            )
+        ]
+
+    monkeypatch.setattr(
+        alignment_runner_module.alignment_signature, "measure_signature_offsets", _fake_signature
+    )
+
+    summary, display = alignment_runner_module.apply_audio_alignment(
+        [reference, target],
+        cfg,
+        reference.path,
+        tmp_path,
+        audio_track_overrides={},
+        reporter=_RecordingOutputManager(),
+    )
+
+    assert captured["targets"] == [target.path]
+    assert captured["height"] == cfg.audio_alignment.video_signature_height
+    assert captured["cached"] is None
+    assert summary is not None and display is not None
+    assert summary.applied_frames == {target.path.name: 12}
+    assert target.trim_start == 12
+    assert display.stream_lines == ["Video signature: ref=Reference->luma  target=Target->luma"]
+    assert display.estimation_line is not None
+    assert display.estimation_line.startswith("Estimating video-signature offsets")
+
+
+def test_apply_audio_alignment_video_signal_uses_video_threshold(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Video Pearson scores are vetted against video_correlation_threshold, not the audio cut-off."""
+
+    cfg = _make_config(tmp_path)
+    cfg.audio_alignment.enable = True
+    cfg.audio_alignment.use_vspreview = False
+    cfg.audio_alignment.signal = "video"
+    cfg.audio_alignment.correlation_threshold = 0.9
+    cfg.audio_alignment.video_correlation_threshold = 0.4
+
+    reference = _ClipPlan(path=tmp_path / "Ref.mkv", metadata={"label": "Reference"})
+    low_contrast = _ClipPlan(path=tmp_path / "Dim.mkv", metadata={"label": "Dim"})
+    unrelated = _ClipPlan(path=tmp_path / "Other.mkv", metadata={"label": "Other"})
+    for plan in (reference, low_contrast, unrelated):
+        plan.path.write_bytes(b"\x00")
+        plan.effective_fps = (24, 1)
+
+    def _fake_signature(*_args: Any, **_kwargs: Any) -> list[AlignmentMeasurement]:
+        return [
+            AlignmentMeasurement(
+                file=plan.path,
+                offset_seconds=0.5,
+                frames=12,
+                correlation=correlation,
+                reference_fps=24.0,
+                target_fps=24.0,
+            )
+            for plan, correlation in ((low_contrast, 0.62), (unrelated, 0.21))
+        ]
+
+    monkeypatch.setattr(
+        alignment_runner_module.alignment_signature, "measure_signature_offsets", _fake_signature
+    )
+
+    summary, display = alignment_runner_module.apply_audio_alignment(
+        [reference, low_contrast, unrelated],
+        cfg,
+        reference.path,
+        tmp_path,
+        audio_track_overrides={},
+        reporter=_RecordingOutputManager(),
+    )
+
+    assert summary is not None and display is not None
+    assert display.threshold == pytest.approx(0.4)
+    assert summary.applied_frames == {low_contrast.path.name: 12}
+    assert low_contrast.trim_start == 12
+    assert unrelated.trim_start == 0
+    assert any("correlation 0.21 below threshold 0.40" in warning for warning in display.warnings)
+
+
 def test_plan_fps_map_prioritizes_available_metadata(tmp_path: Path) -> None:
     """_plan_fps_map() should record the first viable FPS tuple per plan."""
 
@@ -131,3 +320,115 @@ def test_plan_fps_map_prioritizes_available_metadata(tmp_path: Path) -> None:
     assert fps_map[plan_d.path] == (27, 1)
     assert plan_e.path not in fps_map
     assert plan_f.path not in fps_map
+
+
+def test_warm_audio_envelopes_matches_live_stream_selection(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Warm jobs use the reference default stream and the best-scored target stream."""
+
+    cfg = _make_config(tmp_path)
+    cfg.audio_alignment.enable = True
+    cfg.audio_alignment.sample_rate = 16000
+    cfg.audio_alignment.hop_length = 512
+    reference = _ClipPlan(path=tmp_path / "Ref.mkv", metadata={"label": "Reference"})
+    target = _ClipPlan(path=tmp_path / "Target.mkv", metadata={"label": "Target"})
+
+    def _stream(index: int, language: str, *, default: bool) -> AudioStreamInfo:
+        return AudioStreamInfo(
+            index=index,
+            language=language,
+            codec_name="aac",
+            channels=2,
+            channel_layout="stereo",
+            sample_rate=48000,
+            bitrate=192000,
+            is_default=default,
+            is_forced=False,
+        )
+
+    streams = {
+        reference.path: [_stream(1, "jpn", default=True), _stream(2, "eng", default=False)],
+        target.path: [_stream(1, "eng", default=True), _stream(3, "jpn", default=False)],
+    }
+    monkeypatch.setattr(alignment_runner_module.audio_alignment, "probe_audio_streams", lambda path: streams[path])
+    captured: dict[str, Any] = {}
+
+    def _fake_compute(jobs: Any, **kwargs: Any) -> dict[Path, str | None]:
+        captured["jobs"] = list(jobs)
+        captured.update(kwargs)
+        return {path: None for path, _ in jobs}
+
+    monkeypatch.setattr(alignment_runner_module.audio_alignment, "compute_envelopes", _fake_compute)
+
+    outcomes = alignment_runner_module.warm_audio_envelopes([reference, target], cfg, reference.path, tmp_path)
+
+    assert outcomes == {"Ref.mkv": None, "Target.mkv": None}
+    assert captured["jobs"] == [(reference.path, 1), (target.path, 3)]
+    assert captured["hop_length"] == 160
+    assert captured["start_seconds"] == 0.0
+    assert captured["coarse_sample_rate"] is None
+
+    cfg.audio_alignment.coarse_to_fine = True
+    alignment_runner_module.warm_audio_envelopes([reference, target], cfg, reference.path, tmp_path)
+    assert captured["coarse_sample_rate"] == 4000
+
+
+def test_probe_stream_infos_reuses_and_persists_probe_snapshots(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Snapshots with an audio probe skip ffprobe; fresh probes are written back."""
+
+    cached_plan = _ClipPlan(path=tmp_path / "Cached.mkv", metadata={})
+    fresh_plan = _ClipPlan(path=tmp_path / "Fresh.mkv", metadata={})
+    stream = AudioStreamInfo(
+        index=1,
+        language="eng",
+        codec_name="aac",
+        channels=2,
+        channel_layout="stereo",
+        sample_rate=48000,
+        bitrate=0,
+        is_default=True,
+        is_forced=False,
+    )
+    snapshots: list[ClipProbeSnapshot] = []
+    for plan in (cached_plan, fresh_plan):
+        plan.path.write_bytes(plan.path.name.encode())
+        plan.probe_cache_key = compute_probe_cache_key(plan)
+        plan.probe_snapshot = ClipProbeSnapshot(
+            trim_start=0,
+            trim_end=None,
+            fps_override=None,
+            applied_fps=None,
+            effective_fps=(24, 1),
+            source_fps=(24, 1),
+            source_num_frames=100,
+            source_width=1920,
+            source_height=1080,
+            cache_key=plan.probe_cache_key,
+        )
+        snapshots.append(plan.probe_snapshot)
+    snapshots[0].audio_probe = audio_alignment.media_probe_payload(MediaProbe(audio_streams=[stream], fps=25.0))
+
+    probed: list[str] = []
+
+    def _fake_probe_media(path: Path) -> MediaProbe:
+        probed.append(path.name)
+        probe = MediaProbe(audio_streams=[stream], fps=23.976)
+        audio_alignment.remember_media_probe(path, probe)
+        return probe
+
+    monkeypatch.setattr(audio_alignment, "probe_media", _fake_probe_media)
+
+    infos = alignment_runner_module._probe_stream_infos([cached_plan, fresh_plan], tmp_path)
+
+    assert probed == ["Fresh.mkv"]
+    assert infos == {cached_plan.path: [stream], fresh_plan.path: [stream]}
+    seeded = audio_alignment.cached_media_probe(cached_plan.path)
+    assert seeded is not None and seeded.fps == 25.0
+    persisted = load_probe_snapshot(tmp_path, compute_probe_cache_key(fresh_plan))
+    assert persisted is not None and persisted.audio_probe is not None
+    assert persisted.audio_probe["fps"] == pytest.approx(23.976)
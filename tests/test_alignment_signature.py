@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+import src.frame_compare.analysis as analysis_mod
+from src.audio_alignment import AudioAlignmentError
+from src.datatypes import AnalysisConfig, ColorConfig
+from src.frame_compare import alignment_signature
+from src.frame_compare.alignment_signature import LumaSignature, signature_offset
+from src.frame_compare.analysis import FrameMetricsCacheInfo
+
+
+def _scene_luma(frame: int) -> float:
+    """Deterministic per-frame luma with hard cuts every few dozen frames."""
+
+    scene = frame // (23 + (frame // 97) % 17)
+    return 0.5 + 0.4 * math.sin(scene * 2.399) + 0.01 * math.sin(frame * 0.7)
+
+
+def _signature(frames: range, *, lag: int = 0, scale: float = 1.0, bias: float = 0.0) -> LumaSignature:
+    return LumaSignature(
+        list(frames),
+        [bias + scale * _scene_luma(frame - lag) for frame in frames],
+        "test",
+    )
+
+
+@pytest.mark.parametrize("lag", [0, 17, -42])
+def test_signature_offset_is_frame_accurate_against_sparse_reference(lag: int) -> None:
+    reference = _signature(range(400, 3000, 2), scale=0.8, bias=0.05)
+    target = _signature(range(200, 3200), lag=lag)
+
+    found, correlation = signature_offset(reference, target, max_lag=150)
+
+    assert found == lag
+    assert correlation == pytest.approx(1.0, abs=1e-6)
+
+
+def test_signature_offset_rejects_flat_or_disjoint_series() -> None:
+    flat = LumaSignature(list(range(500)), [0.25] * 500, "test")
+    with pytest.raises(AudioAlignmentError, match="flat"):
+        signature_offset(flat, _signature(range(500)), max_lag=20)
+    with pytest.raises(AudioAlignmentError, match="share fewer"):
+        signature_offset(_signature(range(0, 100)), _signature(range(1000, 1100)), max_lag=20)
+
+
+def _analysis_cfg() -> AnalysisConfig:
+    return AnalysisConfig(
+        frame_count_dark=1,
+        frame_count_bright=1,
+        frame_count_motion=1,
+        random_frames=0,
+        user_frames=[],
+        downscale_height=0,
+        step=2,
+        analyze_in_sdr=False,
+    )
+
+
+def test_cached_luma_signature_rebases_indices_by_cached_trim(tmp_path: Path) -> None:
+    cfg = _analysis_cfg()
+    info = FrameMetricsCacheInfo(
+        path=tmp_path / "metrics.json",
+        files=["ref.mkv", "tgt.mkv"],
+        analyzed_file="ref.mkv",
+        release_group="",
+        trim_start=24,
+        trim_end=None,
+        fps_num=24,
+        fps_den=1,
+    )
+    brightness = [(idx, _scene_luma(idx + 24)) for idx in range(0, 200, 2)]
+    analysis_mod._save_cached_metrics(info, cfg, brightness, [(idx, 0.0) for idx, _ in brightness])
+
+    untrimmed = replace(info, trim_start=0)
+    assert analysis_mod.probe_cached_metrics(untrimmed, cfg).status == "stale"
+
+    signature = alignment_signature.cached_luma_signature(untrimmed, cfg)
+
+    assert signature is not None
+    assert signature.source == "metrics-cache"
+    assert signature.frames[:3] == [24, 26, 28]
+    assert signature.values[0] == pytest.approx(_scene_luma(24))
+
+
+def test_measure_signature_offsets_decodes_only_uncached_clips(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    reference = tmp_path / "ref.mkv"
+    good = tmp_path / "good.mkv"
+    broken = tmp_path / "broken.mkv"
+    collected: dict[str, tuple[int, int | None, int, int]] = {}
+
+    def fake_collect(
+        path: Path,
+        *,
+        first_frame: int,
+        last_frame: int | None,
+        step: int,
+        height: int,
+        **_kwargs: object,
+    ) -> LumaSignature:
+        collected[path.name] = (first_frame, last_frame, step, height)
+        if path == broken:
+            raise AudioAlignmentError("decode failed")
+        return _signature(range(first_frame, last_frame or 4000, step), lag=30)
+
+    monkeypatch.setattr(alignment_signature, "collect_luma_signature", fake_collect)
+    cached = (reference, _signature(range(0, 5000, 2)))
+    progress: list[int] = []
+
+    measurements = alignment_signature.measure_signature_offsets(
+        reference,
+        [good, broken],
+        fps_hints={reference: (24, 1), good: (24, 1)},
+        analysis_cfg=_analysis_cfg(),
+        color_cfg=ColorConfig(),
+        start_seconds=10.0,
+        duration_seconds=60.0,
+        max_offset_seconds=5.0,
+        height=48,
+        cached=cached,
+        progress_callback=progress.append,
+    )
+
+    assert collected == {"good.mkv": (120, 1800, 1, 48), "broken.mkv": (120, 1800, 1, 48)}
+    assert [m.file for m in measurements] == [good, broken]
+    assert measurements[0].frames == 30
+    assert measurements[0].offset_seconds == pytest.approx(30 / 24)
+    assert measurements[0].correlation == pytest.approx(1.0, abs=1e-6)
+    assert measurements[1].frames is None
+    assert measurements[1].error == "decode failed"
+    assert progress == [1, 1]
+
+
+def test_measure_signature_offsets_converts_lag_at_target_fps(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    reference = tmp_path / "ref.mkv"
+    pal = tmp_path / "pal.mkv"
+    unknown = tmp_path / "unknown.mkv"
+
+    def fake_collect(path: Path, *, first_frame: int, last_frame: int | None, step: int, **_kwargs: object) -> LumaSignature:
+        return _signature(range(first_frame, last_frame or 4000, step), lag=0 if path == reference else 48)
+
+    monkeypatch.setattr(alignment_signature, "collect_luma_signature", fake_collect)
+
+    measurements = alignment_signature.measure_signature_offsets(
+        reference,
+        [pal, unknown],
+        fps_hints={reference: (24, 1), pal: (25, 1)},
+        analysis_cfg=_analysis_cfg(),
+        color_cfg=ColorConfig(),
+        duration_seconds=60.0,
+        max_offset_seconds=5.0,
+    )
+
+    assert [m.offset_seconds for m in measurements] == pytest.approx([2.0, 2.0])
+    assert measurements[0].frames == 50
+    assert measurements[1].frames is None
+    assert "No FPS known" not in caplog.text
+
+    with caplog.at_level("WARNING", logger=alignment_signature.__name__):
+        fallback = alignment_signature.measure_signature_offsets(
+            reference,
+            [pal],
+            fps_hints={pal: (25, 1)},
+            analysis_cfg=_analysis_cfg(),
+            color_cfg=ColorConfig(),
+            duration_seconds=60.0,
+            max_offset_seconds=5.0,
+        )
+
+    assert "No FPS known for ref.mkv" in caplog.text
+    assert fallback[0].reference_fps == pytest.approx(24000 / 1001)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+import src.frame_compare.analysis.cache_io as cache_io
+from src.datatypes import AnalysisConfig
+from src.frame_compare.analysis.cache_io import FrameMetricsCacheInfo, probe_cached_metrics
+from src.frame_compare.artifact_index import (
+    ARTIFACT_INDEX_FILENAME,
+    ArtifactIndex,
+    open_artifact_index,
+    stat_token,
+)
+from src.frame_compare.cache import load_probe_snapshot, persist_probe_snapshot
+from src.frame_compare.cli_runtime import ClipProbeSnapshot
+
+
+def _analysis_cfg() -> AnalysisConfig:
+    return AnalysisConfig(
+        frame_count_dark=1,
+        frame_count_bright=1,
+        frame_count_motion=1,
+        random_frames=0,
+        user_frames=[],
+        downscale_height=0,
+        step=1,
+        analyze_in_sdr=False,
+    )
+
+
+def test_index_uses_wal_and_reports_unchanged_writes(tmp_path: Path) -> None:
+    index = open_artifact_index(tmp_path)
+    assert index is open_artifact_index(tmp_path)
+    assert index.path == tmp_path.resolve() / ARTIFACT_INDEX_FILENAME
+
+    assert index.put("probe", "k1", fingerprint="a", payload="{}") is True
+    assert index.put("probe", "k1", fingerprint="a", payload="{}") is False
+    assert index.put("probe", "k1", fingerprint="b", payload="{}", blob=b"\x01") is True
+    record = index.get("probe", "k1")
+    assert record is not None
+    assert record.fingerprint == "b"
+    assert record.blob == b"\x01"
+
+    with sqlite3.connect(index.path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_index_is_shared_across_threads_and_handles(tmp_path: Path) -> None:
+    writers = [ArtifactIndex(tmp_path / ARTIFACT_INDEX_FILENAME) for _ in range(4)]
+
+    def _write(worker: int) -> None:
+        for item in range(20):
+            writers[worker].put("metrics", f"{worker}-{item}", fingerprint="f", payload=str(item))
+
+    threads = [threading.Thread(target=_write, args=(idx,)) for idx in range(len(writers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reader = ArtifactIndex(tmp_path / ARTIFACT_INDEX_FILENAME)
+    assert reader.get("metrics", "3-19") is not None
+    with sqlite3.connect(reader.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0] == 80
+
+
+def test_metrics_probe_reads_index_without_parsing_json(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clip = tmp_path / "clip.mkv"
+    clip.write_bytes(b"data")
+    info = FrameMetricsCacheInfo(
+        path=tmp_path / "generated.compframes",
+        files=["clip.mkv"],
+        analyzed_file="clip.mkv",
+        release_group="",
+        trim_start=0,
+        trim_end=None,
+        fps_num=24,
+        fps_den=1,
+    )
+    cfg = _analysis_cfg()
+    brightness = [(idx, idx / 10.0) for idx in range(5)]
+    motion = [(idx, idx / 4.0) for idx in range(5)]
+    cache_io.save_cached_metrics(info, cfg, brightness, motion)
+
+    original_loads = json.loads
+
+    def _tracking_loads(raw: str, *args: object, **kwargs: object) -> object:
+        if '"brightness"' in raw:
+            raise AssertionError("compframes JSON should not be parsed when the index is current")
+        return original_loads(raw, *args, **kwargs)
+
+    monkeypatch.setattr(cache_io.json, "loads", _tracking_loads)
+    result = probe_cached_metrics(info, cfg)
+    assert result.status == "reused"
+    assert result.metrics is not None
+    assert result.metrics.brightness == brightness
+    assert result.metrics.motion == motion
+    monkeypatch.setattr(cache_io.json, "loads", original_loads)
+
+    # Editing the exported JSON invalidates the indexed copy.
+    payload = original_loads(info.path.read_text(encoding="utf-8"))
+    payload["trim_start"] = 5
+    info.path.write_text(json.dumps(payload), encoding="utf-8")
+    stale = probe_cached_metrics(info, cfg)
+    assert stale.status == "stale"
+    assert stale.reason == "trim_start_mismatch"
+
+
+def test_probe_snapshot_migrates_legacy_json(tmp_path: Path) -> None:
+    legacy_dir = tmp_path / "probe"
+    legacy_dir.mkdir()
+    legacy_payload = {
+        "schema_version": 1,
+        "trim_start": 0,
+        "trim_end": None,
+        "fps_override": None,
+        "applied_fps": None,
+        "effective_fps": [24000, 1001],
+        "source_fps": [24000, 1001],
+        "source_num_frames": 100,
+        "source_width": 1920,
+        "source_height": 1080,
+        "source_frame_props": {"_Matrix": 1},
+        "tonemap_prop_keys": [],
+        "metadata_digest": "digest",
+        "cache_key": "legacy",
+        "cached_at": "2024-01-01T00:00:00+00:00",
+    }
+    (legacy_dir / "legacy.json").write_text(json.dumps(legacy_payload), encoding="utf-8")
+
+    snapshot = load_probe_snapshot(tmp_path, "legacy")
+    assert snapshot is not None
+    assert snapshot.source_num_frames == 100
+    assert snapshot.cache_path == tmp_path.resolve() / ARTIFACT_INDEX_FILENAME
+
+    (legacy_dir / "legacy.json").unlink()
+    migrated = load_probe_snapshot(tmp_path, "legacy")
+    assert migrated is not None
+    assert migrated.source_width == 1920
+
+
+def test_persist_probe_snapshot_skips_identical_metadata(tmp_path: Path) -> None:
+    def _snapshot() -> ClipProbeSnapshot:
+        return ClipProbeSnapshot(
+            trim_start=0,
+            trim_end=None,
+            fps_override=None,
+            applied_fps=None,
+            effective_fps=(24, 1),
+            source_fps=(24, 1),
+            source_num_frames=10,
+            source_width=640,
+            source_height=360,
+            source_frame_props={},
+            tonemap_prop_keys=(),
+            cache_key="key",
+        )
+
+    path, wrote = persist_probe_snapshot(tmp_path, _snapshot())
+    assert wrote is True
+    assert stat_token(path) is not None
+    _, wrote_again = persist_probe_snapshot(tmp_path, _snapshot())
+    assert wrote_again is False
+    changed = _snapshot()
+    changed.source_num_frames = 11
+    _, wrote_changed = persist_probe_snapshot(tmp_path, changed)
+    assert wrote_changed is True
+
+
+def test_probe_snapshots_fall_back_to_json_when_index_is_disabled(tmp_path: Path) -> None:
+    # A directory where the database belongs makes every connection attempt fail.
+    (tmp_path / ARTIFACT_INDEX_FILENAME).mkdir()
+    snapshot = ClipProbeSnapshot(
+        trim_start=0,
+        trim_end=None,
+        fps_override=None,
+        applied_fps=None,
+        effective_fps=(24, 1),
+        source_fps=(24, 1),
+        source_num_frames=10,
+        source_width=640,
+        source_height=360,
+        cache_key="fallback",
+    )
+
+    path, wrote = persist_probe_snapshot(tmp_path, snapshot)
+
+    assert not open_artifact_index(tmp_path).available
+    assert (path, wrote) == (tmp_path / "probe" / "fallback.json", True)
+    assert persist_probe_snapshot(tmp_path, snapshot) == (path, False)
+    loaded = load_probe_snapshot(tmp_path, "fallback")
+    assert loaded is not None
+    assert (loaded.source_num_frames, loaded.source_width) == (10, 640)
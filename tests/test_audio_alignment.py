@@ -3,15 +3,23 @@
 from __future__ import annotations
 
 import builtins
+import importlib
+import importlib.util
+import io
+import json
+import subprocess
+import threading
 import warnings
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Mapping, cast
+from typing import Mapping, Optional
 
+import numpy as np
 import pytest
 
 from src import audio_alignment as aa
 
+_librosa_available = importlib.util.find_spec("librosa") is not None
+
 
 def _emit_flush_warning() -> None:
     warnings.warn_explicit(
@@ -44,115 +52,46 @@ def test_warning_suppressed_within_context_manager() -> None:
     assert not caught, "Flush-to-zero warning leaked despite local suppression"
 
 
-@dataclass
-class FakeArray:
-    values: list[list[float]] | list[float]
-
-    @property
-    def size(self) -> int:
-        if self.ndim == 1:
-            return len(self.values)  # type: ignore[arg-type]
-        return sum(len(row) for row in self.values)  # type: ignore[arg-type]
-
-    @property
-    def ndim(self) -> int:
-        if not self.values:  # pragma: no cover - defensive
-            return 1
-        first = self.values[0]  # type: ignore[index]
-        return 2 if isinstance(first, list) else 1
-
-    def flatten(self) -> list[float]:
-        if self.ndim == 1:
-            return [float(v) for v in cast(list[float], self.values)]
-        flattened: list[float] = []
-        for row in cast(list[list[float]], self.values):
-            flattened.extend(float(v) for v in row)
-        return flattened
-
-    def __iter__(self):
-        return iter(self.flatten())
-
-    def __truediv__(self, other: float) -> "FakeArray":
-        if other == 0:  # pragma: no cover - defensive
-            raise ZeroDivisionError("division by zero in FakeArray")
-        if self.ndim == 1:
-            return FakeArray([float(v) / other for v in self.values])  # type: ignore[list-item]
-        return FakeArray([[float(v) / other for v in row] for row in self.values])  # type: ignore[list-item]
-
-    def astype(self, _dtype: object) -> "FakeArray":
-        return FakeArray(self.flatten())
-
-
-class FakeNpModule:
-    float32 = "float32"
-
-    @staticmethod
-    def array(values: list[list[float]] | list[float]) -> FakeArray:
-        return FakeArray(values)
-
-    @staticmethod
-    def abs(array: FakeArray) -> FakeArray:
-        return FakeArray([[abs(v) for v in row] for row in array.values] if array.ndim == 2 else [abs(v) for v in array.values])  # type: ignore[list-item]
-
-    @staticmethod
-    def max(array: FakeArray) -> float:
-        flattened = array.flatten()
-        return max(flattened) if flattened else 0.0
-
-    @staticmethod
-    def mean(array: FakeArray, *, axis: int) -> FakeArray:
-        if axis != 1:
-            raise NotImplementedError("FakeNpModule only supports axis=1")
-        assert array.ndim == 2
-        return FakeArray([sum(row) / len(row) for row in array.values])  # type: ignore[list-item]
-
-
-def test_onset_envelope_suppresses_dependency_warning(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_onset_envelope_suppresses_dependency_warning(monkeypatch: pytest.MonkeyPatch) -> None:
     """Audio onset extraction should silence dependency warnings without affecting callers."""
 
     calls: list[str] = []
 
-    def emit_and_record(marker: str) -> None:
-        calls.append(marker)
+    def fake_onset_strength(
+        np_module: object,
+        samples: "np.ndarray",
+        *,
+        sample_rate: int,
+        hop_length: int,
+        n_fft: int,
+    ) -> "np.ndarray":
+        calls.append("onset_strength")
         _emit_flush_warning()
+        assert sample_rate == 48000
+        return np.array([0.5, 0.4, 0.3], dtype=np.float64)
 
-    fake_np = FakeNpModule()
-
-    class FakeSoundFileModule:
-        @staticmethod
-        def read(path: str):  # type: ignore[override]
-            emit_and_record("sf.read")
-            return fake_np.array([[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]]), 24000
-
-    class FakeOnsetModule:
-        @staticmethod
-        def onset_strength(**_: object):  # type: ignore[override]
-            emit_and_record("librosa.onset_strength")
-            return fake_np.array([0.5, 0.4, 0.3])
-
-    class FakeLibrosaModule:
-        onset = FakeOnsetModule()
-
-        @staticmethod
-        def resample(data: FakeArray, *, orig_sr: int, target_sr: int) -> FakeArray:
-            emit_and_record("librosa.resample")
-            assert orig_sr == 24000
-            assert target_sr == 48000
-            return data
-
-    monkeypatch.setattr(aa, "_load_optional_modules", lambda: (fake_np, FakeLibrosaModule(), FakeSoundFileModule()))
-
-    wav_path = tmp_path / "dummy.wav"
-    wav_path.write_bytes(b"not-audio-but-ok")
+    monkeypatch.setattr(aa, "_onset_strength", fake_onset_strength)
 
     with warnings.catch_warnings(record=True) as caught:
         warnings.simplefilter("always")
-        onset_env, hop = aa._onset_envelope(wav_path, sample_rate=48000, hop_length=512)
+        onset_env, hop = aa._onset_envelope(np.array([0.1, 0.2, 0.3]), sample_rate=48000, hop_length=512)
 
     assert not caught, "Warnings from dependencies should be contained within onset envelope"
     assert hop == 512
-    assert isinstance(onset_env, FakeArray)
-    assert calls == ["sf.read", "librosa.resample", "librosa.onset_strength"]
+    assert onset_env.dtype == np.float32
+    assert calls == ["onset_strength"]
+
+
+def _fake_extract_audio(
+    _infile: Path,
+    *,
+    sample_rate: int,
+    start_seconds: float | None,
+    duration_seconds: float | None,
+    stream_index: int,
+) -> "np.ndarray":
+    _ = sample_rate, start_seconds, duration_seconds, stream_index
+    return np.array([0.2, 0.1, 0.0], dtype=np.float32)
 
 
 def test_measure_offsets_wraps_optional_dependency_errors(
@@ -169,27 +108,13 @@ def test_measure_offsets_wraps_optional_dependency_errors(
         fromlist: tuple[str, ...] = (),
         level: int = 0,
     ) -> object:  # type: ignore[override]
-        if name == "librosa":
+        if name == "numpy":
             raise RuntimeError("boom")
         return original_import(name, globals, locals, fromlist, level)
 
-    monkeypatch.setattr(builtins, "__import__", failing_import)
     monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
-
-    def fake_extract_audio(
-        _infile: Path,
-        *,
-        sample_rate: int,
-        start_seconds: float | None,
-        duration_seconds: float | None,
-        stream_index: int,
-    ) -> Path:
-        _ = sample_rate, start_seconds, duration_seconds, stream_index
-        wav_path = tmp_path / "extracted.wav"
-        wav_path.write_bytes(b"0")
-        return wav_path
-
-    monkeypatch.setattr(aa, "_extract_audio", fake_extract_audio)
+    monkeypatch.setattr(aa, "_extract_audio", _fake_extract_audio)
+    monkeypatch.setattr(builtins, "__import__", failing_import)
 
     reference = tmp_path / "ref.mp4"
     reference.write_bytes(b"dummy")
@@ -212,49 +137,13 @@ def test_measure_offsets_wraps_onset_strength_failure(
 ) -> None:
     """Runtime failures from onset strength propagate as alignment errors."""
 
-    fake_np = FakeNpModule()
-
-    class FakeSoundFileModule:
-        @staticmethod
-        def read(path: str):  # type: ignore[override]
-            assert path.endswith(".wav")
-            return fake_np.array([[0.2, 0.1, 0.0], [0.0, 0.1, 0.2]]), 24000
-
-    class FakeOnsetModule:
-        @staticmethod
-        def onset_strength(**_: object):  # type: ignore[override]
-            raise RuntimeError("dummy onset failure")
-
-    class FakeLibrosaModule:
-        onset = FakeOnsetModule()
-
-        @staticmethod
-        def resample(data: FakeArray, *, orig_sr: int, target_sr: int) -> FakeArray:
-            assert orig_sr == 24000
-            assert target_sr == 48000
-            return data
-
-    def fake_load_optional_modules():
-        return fake_np, FakeLibrosaModule(), FakeSoundFileModule()
+    def failing_onset_strength(*_args: object, **_kwargs: object) -> None:
+        raise RuntimeError("dummy onset failure")
 
-    monkeypatch.setattr(aa, "_load_optional_modules", fake_load_optional_modules)
+    monkeypatch.setattr(aa, "_onset_strength", failing_onset_strength)
     monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
     monkeypatch.setattr(aa, "_probe_fps", lambda _path: None)
-
-    def fake_extract_audio(
-        _infile: Path,
-        *,
-        sample_rate: int,
-        start_seconds: float | None,
-        duration_seconds: float | None,
-        stream_index: int,
-    ) -> Path:
-        _ = sample_rate, start_seconds, duration_seconds, stream_index
-        wav_path = tmp_path / "extracted.wav"
-        wav_path.write_bytes(b"0")
-        return wav_path
-
-    monkeypatch.setattr(aa, "_extract_audio", fake_extract_audio)
+    monkeypatch.setattr(aa, "_extract_audio", _fake_extract_audio)
 
     reference = tmp_path / "ref.mp4"
     reference.write_bytes(b"dummy")
@@ -270,10 +159,60 @@ def test_measure_offsets_wraps_onset_strength_failure(
         )
 
     message = str(excinfo.value)
-    assert "optional dependency" in message
+    assert "onset envelope calculation" in message
     assert "dummy onset failure" in message
 
 
+def _click_track(sample_rate: int, seconds: float, clicks: list[float]) -> "np.ndarray":
+    rng = np.random.default_rng(5)
+    signal = (rng.standard_normal(int(sample_rate * seconds)) * 0.01).astype(np.float32)
+    burst = int(sample_rate * 0.02)
+    for at in clicks:
+        start = int(at * sample_rate)
+        signal[start : start + burst] += rng.standard_normal(burst).astype(np.float32)
+    return signal / np.abs(signal).max()
+
+
+def test_numpy_onset_strength_peaks_at_transients() -> None:
+    sample_rate, hop = 16000, 160
+    clicks = [0.5, 1.25, 2.0]
+    envelope, _ = aa._onset_envelope(_click_track(sample_rate, 3.0, clicks), sample_rate=sample_rate, hop_length=hop)
+
+    assert envelope.shape == (1 + int(sample_rate * 3.0) // hop,)
+    assert envelope.dtype == np.float32
+    assert float(envelope.min()) >= 0.0
+    peaks = sorted(int(idx) for idx in np.argsort(envelope)[-3:])
+    expected = [round(at * sample_rate / hop) for at in clicks]
+    for peak, frame in zip(peaks, expected):
+        assert abs(peak - frame) <= 2
+
+
+def test_mel_filterbank_is_slaney_normalised() -> None:
+    weights = aa._mel_filterbank(16000, 2048, 128)
+    assert weights.shape == (128, 1025)
+    assert float(weights.min()) >= 0.0
+    # Slaney normalisation gives each triangle unit area in Hz.
+    bin_hz = 16000 / 2048
+    areas = weights.sum(axis=1) * bin_hz
+    assert np.median(areas) == pytest.approx(1.0, rel=0.05)
+
+
+@pytest.mark.skipif(  # type: ignore[attr-defined]
+    not _librosa_available,
+    reason="librosa not installed – numeric reference comparison skipped",
+)
+@pytest.mark.parametrize(("sample_rate", "hop"), [(16000, 160), (22050, 512), (48000, 480)])
+def test_numpy_onset_strength_matches_librosa(sample_rate: int, hop: int) -> None:
+    librosa = importlib.import_module("librosa")
+    signal = _click_track(sample_rate, 4.0, [0.4, 1.1, 2.6, 3.3])
+
+    ours, _ = aa._onset_envelope(signal, sample_rate=sample_rate, hop_length=hop)
+    reference = librosa.onset.onset_strength(y=signal, sr=sample_rate, hop_length=hop, center=True)
+
+    assert ours.shape == reference.shape
+    np.testing.assert_allclose(ours, reference, rtol=1e-4, atol=1e-4)
+
+
 def test_measure_offsets_prefers_cached_fps_hints(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     """FPS hints supplied by the caller should bypass ffprobe and populate frame counts."""
 
@@ -282,15 +221,8 @@ def test_measure_offsets_prefers_cached_fps_hints(monkeypatch: pytest.MonkeyPatc
     for path in (reference, target):
         path.write_bytes(b"0")
 
-    class _FakeAudioCtx:
-        def __enter__(self) -> Path:
-            return tmp_path / "dummy.wav"
-
-        def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[override]
-            return None
-
     monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
-    monkeypatch.setattr(aa, "_temporary_audio", lambda *args, **kwargs: _FakeAudioCtx())
+    monkeypatch.setattr(aa, "_extract_audio", lambda *args, **kwargs: np.zeros(3, dtype=np.float32))
     monkeypatch.setattr(aa, "_onset_envelope", lambda *args, **kwargs: ([0.1, 0.2, 0.3], 512))
     monkeypatch.setattr(aa, "_cross_correlation", lambda *_args, **_kwargs: (11, 0.82))
 
@@ -329,3 +261,568 @@ def test_measure_offsets_prefers_cached_fps_hints(monkeypatch: pytest.MonkeyPatc
     assert measurement.frames == int(round(expected_seconds * expected_target_fps))
     assert measurement.correlation == pytest.approx(0.82)
     assert probe_called is False
+
+
+def _direct_correlation(a: "np.ndarray", b: "np.ndarray", max_lag: int | None) -> tuple[int, float]:
+    a_norm = (a - np.mean(a)) / (np.std(a) + 1e-8)
+    b_norm = (b - np.mean(b)) / (np.std(b) + 1e-8)
+    corr = np.correlate(b_norm, a_norm, mode="full")
+    lags = np.arange(corr.size) - (a.size - 1)
+    if max_lag is not None:
+        mask = np.abs(lags) <= max_lag
+        corr, lags = corr[mask], lags[mask]
+    idx = int(np.argmax(corr))
+    return int(lags[idx]), float(corr[idx])
+
+
+def _ffprobe_streams_payload() -> str:
+    return json.dumps(
+        {
+            "streams": [
+                {"index": 0, "codec_type": "video", "codec_name": "mjpeg", "r_frame_rate": "90000/1",
+                 "disposition": {"attached_pic": 1}},
+                {"index": 1, "codec_type": "video", "codec_name": "hevc", "r_frame_rate": "24000/1001",
+                 "disposition": {"default": 1}},
+                {"index": 3, "codec_type": "audio", "codec_name": "AAC", "channels": 2, "channel_layout": "stereo",
+                 "sample_rate": "48000", "bit_rate": "192000", "disposition": {"default": 0},
+                 "tags": {"language": "JPN"}},
+                {"index": 2, "codec_type": "audio", "codec_name": "truehd", "channels": 8,
+                 "channel_layout": "7.1", "sample_rate": "48000", "disposition": {"default": 1, "forced": 0},
+                 "tags": {"language": "eng"}},
+                {"index": 4, "codec_type": "subtitle", "codec_name": "ass"},
+            ],
+            "format": {"duration": "1432.512000"},
+        }
+    )
+
+
+def test_probe_media_collects_streams_and_fps_in_one_call(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    clip = tmp_path / "clip.mkv"
+    clip.write_bytes(b"v1")
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **_kwargs: object) -> subprocess.CompletedProcess[str]:
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=_ffprobe_streams_payload(), stderr="")
+
+    monkeypatch.setattr(aa, "which", lambda _tool: "/usr/bin/ffprobe")
+    monkeypatch.setattr(aa._subproc, "run_checked", fake_run)
+
+    streams = aa.probe_audio_streams(clip)
+    fps = aa._probe_fps(clip)
+
+    assert len(calls) == 1
+    assert [info.index for info in streams] == [2, 3]
+    assert streams[0].is_default and streams[0].language == "eng"
+    assert streams[1].codec_name == "aac" and streams[1].bitrate == 192000
+    assert fps == pytest.approx(24000 / 1001)
+    assert aa._probe_duration(clip) == pytest.approx(1432.512)
+
+    restored = aa.media_probe_from_payload(json.loads(json.dumps(aa.media_probe_payload(aa.probe_media(clip)))))
+    assert restored == aa.probe_media(clip)
+    assert aa.media_probe_from_payload({"fps": 25.0, "audio_streams": []}) is None
+    assert len(calls) == 1
+
+    clip.write_bytes(b"remuxed")
+    aa.probe_media(clip)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("max_lag", [None, 0, 7, 40, 10_000])
+def test_fft_cross_correlation_matches_direct_correlation(max_lag: int | None) -> None:
+    rng = np.random.default_rng(1234)
+    reference = rng.standard_normal(257).astype(np.float32)
+    target = np.concatenate([rng.standard_normal(23), reference, rng.standard_normal(11)]).astype(np.float32)
+
+    lag, peak = aa._cross_correlation(reference, target, max_lag=max_lag)
+
+    expected_lag, expected_peak = _direct_correlation(reference, target, max_lag)
+    assert lag == expected_lag
+    assert peak == pytest.approx(expected_peak, rel=1e-4)
+
+
+def test_cross_correlation_reuses_reference_spectrum() -> None:
+    rng = np.random.default_rng(99)
+    base = rng.standard_normal(400).astype(np.float32)
+    reference = aa._ReferenceSpectrum(base[50:350])
+
+    early = aa._cross_correlation(reference, base[30:330], max_lag=40)
+    late = aa._cross_correlation(reference, base[70:370], max_lag=40)
+
+    assert early[0] == 20
+    assert late[0] == -20
+    assert min(early[1], late[1]) > 0.9 * 300
+    assert len(reference._spectra) == 1
+
+
+def _onset_track(seconds: float, seconds_per_onset: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.random(int(seconds / seconds_per_onset)) ** 4).astype(np.float32)
+
+
+def test_offset_map_fits_linear_drift() -> None:
+    spo = 512 / 16000
+    reference = _onset_track(1800.0, spo, seed=5)
+    frames = np.arange(reference.size)
+    # Target runs 0.1% slow and starts 0.5 s late.
+    target = np.interp((frames * spo - 0.5) / 1.001 / spo, frames, reference).astype(np.float32)
+    lag, _ = aa._cross_correlation(reference, target, max_lag=400)
+
+    segments = aa._offset_map(
+        np,
+        reference,
+        target,
+        lag=lag,
+        windows=12,
+        window_frames=int(30 / spo),
+        radius=int(15 / spo),
+        seconds_per_onset=spo,
+        start_seconds=0.0,
+    )
+
+    assert len(segments) == 1
+    (segment,) = segments
+    assert segment.model == "linear"
+    assert segment.windows == 12
+    assert segment.drift == pytest.approx(0.001, rel=0.05)
+    assert segment.offset_at(0.0) == pytest.approx(0.5, abs=spo)
+    assert segment.offset_at(1800.0) == pytest.approx(0.5 + 1.8, abs=spo)
+
+
+def test_offset_map_splits_at_padded_scene() -> None:
+    spo = 512 / 16000
+    reference = _onset_track(1800.0, spo, seed=6)
+    half = reference.size // 2
+    target = np.concatenate(
+        [np.zeros(40), reference[:half], np.zeros(60), reference[half:]]
+    )[: reference.size].astype(np.float32)
+    lag, _ = aa._cross_correlation(reference, target, max_lag=400)
+
+    segments = aa._offset_map(
+        np,
+        reference,
+        target,
+        lag=lag,
+        windows=12,
+        window_frames=int(30 / spo),
+        radius=int(15 / spo),
+        seconds_per_onset=spo,
+        start_seconds=10.0,
+    )
+
+    assert [segment.model for segment in segments] == ["constant", "constant"]
+    assert segments[0].offset_seconds == pytest.approx(40 * spo, abs=1e-3)
+    assert segments[1].offset_seconds == pytest.approx(100 * spo, abs=1e-3)
+    assert segments[0].start_seconds == 10.0
+    assert segments[0].end_seconds == segments[1].start_seconds
+    assert 10.0 + half * spo - 150 < segments[1].start_seconds < 10.0 + half * spo + 150
+
+
+def test_fit_offset_map_drops_isolated_outliers() -> None:
+    times = np.arange(8) * 100.0 + 50.0
+    offsets = np.array([1.0, 1.0, 1.0, 7.5, 1.0, 1.0, 1.0, 1.0])
+    scores = np.array([0.9, 0.9, 0.9, 0.9, 0.9, 0.1, 0.9, 0.9])
+
+    segments = aa._fit_offset_map(
+        np, times, offsets, scores, start_seconds=0.0, end_seconds=800.0, seconds_per_onset=0.032
+    )
+
+    assert len(segments) == 1
+    assert segments[0].windows == 6
+    assert segments[0].offset_seconds == pytest.approx(1.0)
+    assert (segments[0].start_seconds, segments[0].end_seconds) == (0.0, 800.0)
+
+
+def test_measure_offsets_attaches_drift_map(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    reference = tmp_path / "ref.mkv"
+    target = tmp_path / "tgt.mkv"
+    rng = np.random.default_rng(8)
+    base = (rng.random(20_000) ** 4).astype(np.float32)
+    envelopes = {
+        "ref.mkv": base,
+        "tgt.mkv": np.concatenate([np.zeros(25), base[:10_000], np.zeros(50), base[10_000:]])[:20_000],
+    }
+
+    def fake_extract(path: Path, **_kwargs: object) -> "np.ndarray":
+        return envelopes[path.name]
+
+    monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
+    monkeypatch.setattr(aa, "_extract_audio", fake_extract)
+    monkeypatch.setattr(aa, "_onset_envelope", lambda samples, **_kwargs: (samples, 1))
+
+    (measurement,) = aa.measure_offsets(
+        reference,
+        [target],
+        sample_rate=100,
+        hop_length=1,
+        start_seconds=None,
+        duration_seconds=None,
+        fps_hints={reference: 100.0, target: 100.0},
+        max_offset_seconds=5.0,
+        drift_windows=10,
+        drift_window_seconds=10.0,
+    )
+
+    assert measurement.error is None
+    assert measurement.drift_model == "piecewise"
+    assert measurement.offset_map is not None
+    assert [round(segment.offset_seconds, 2) for segment in measurement.offset_map] == [0.25, 0.75]
+    assert measurement.offset_map[-1].end_seconds == pytest.approx(200.0)
+
+
+def test_measure_offsets_decodes_only_drift_windows_for_bounded_window(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    reference = tmp_path / "ref.mkv"
+    target = tmp_path / "tgt.mkv"
+    rng = np.random.default_rng(9)
+    base = (rng.random(60_000) ** 4).astype(np.float32)
+    tracks = {
+        "ref.mkv": base,
+        "tgt.mkv": np.concatenate([np.zeros(25), base[:30_000], np.zeros(50), base[30_000:]])[:60_000],
+    }
+    requests: list[tuple[float, Optional[float]]] = []
+
+    def fake_extract(
+        path: Path, *, start_seconds: Optional[float], duration_seconds: Optional[float], **_kwargs: object
+    ) -> "np.ndarray":
+        requests.append((float(start_seconds or 0.0), duration_seconds))
+        first = int(round((start_seconds or 0.0) * 100))
+        last = None if duration_seconds is None else first + int(round(duration_seconds * 100))
+        return tracks[path.name][first:last]
+
+    monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
+    monkeypatch.setattr(aa, "_extract_audio", fake_extract)
+    monkeypatch.setattr(aa, "_onset_envelope", lambda samples, **_kwargs: (samples, 1))
+    monkeypatch.setattr(aa, "_probe_duration", lambda _path: 600.0)
+
+    (measurement,) = aa.measure_offsets(
+        reference,
+        [target],
+        sample_rate=100,
+        hop_length=1,
+        start_seconds=None,
+        duration_seconds=60.0,
+        fps_hints={reference: 100.0, target: 100.0},
+        max_offset_seconds=2.0,
+        drift_windows=10,
+        drift_window_seconds=10.0,
+    )
+
+    assert measurement.error is None
+    assert measurement.offset_seconds == pytest.approx(0.25)
+    assert measurement.offset_map is not None
+    assert [round(segment.offset_seconds, 2) for segment in measurement.offset_map] == [0.25, 0.75]
+    assert measurement.offset_map[-1].end_seconds == pytest.approx(600.0)
+    assert all(duration is not None for _start, duration in requests)
+    # Two 60 s analysis windows, ten 10 s reference windows, ten 14 s target windows
+    # (the first clipped by the 1.75 s it would reach before the target starts).
+    assert sum(duration or 0.0 for _start, duration in requests) == pytest.approx(358.25)
+    assert max(start for start, _duration in requests) > 500.0
+
+
+def _render_events(offset: float, sample_rate: int, start: float, duration: float | None) -> np.ndarray:
+    rng = np.random.default_rng(11)
+    events = np.sort(rng.uniform(0.0, 70.0, 200)) + offset
+    freqs = rng.uniform(300.0, 1500.0, 200)
+    span = 70.0 - start if duration is None else duration
+    times = start + np.arange(int(span * sample_rate)) / sample_rate
+    signal = np.zeros_like(times)
+    for event, freq in zip(events, freqs):
+        lo, hi = np.searchsorted(times, [event, event + 0.2])
+        elapsed = times[lo:hi] - event
+        signal[lo:hi] += np.exp(-elapsed / 0.03) * np.sin(2 * np.pi * freq * elapsed)
+    return signal.astype(np.float32)
+
+
+def test_measure_offsets_coarse_to_fine_refines_offset(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    reference = tmp_path / "ref.mkv"
+    target = tmp_path / "tgt.mkv"
+    shifts = {"ref.mkv": 0.0, "tgt.mkv": 1.2345}
+    calls: list[tuple[str, int, float | None, float | None]] = []
+
+    def fake_extract(
+        path: Path,
+        *,
+        sample_rate: int,
+        start_seconds: float | None,
+        duration_seconds: float | None,
+        stream_index: int,
+    ) -> "np.ndarray":
+        calls.append((path.name, sample_rate, start_seconds, duration_seconds))
+        return _render_events(shifts[path.name], sample_rate, start_seconds or 0.0, duration_seconds)
+
+    monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
+    monkeypatch.setattr(aa, "_extract_audio", fake_extract)
+
+    (measurement,) = aa.measure_offsets(
+        reference,
+        [target],
+        sample_rate=16000,
+        hop_length=40,
+        start_seconds=0.0,
+        duration_seconds=60.0,
+        fps_hints={reference: 24.0, target: 24.0},
+        max_offset_seconds=5.0,
+        coarse_sample_rate=4000,
+        refine_seconds=8.0,
+    )
+
+    assert measurement.error is None
+    assert measurement.offset_seconds == pytest.approx(1.2345, abs=1e-3)
+    assert measurement.frames == 30
+    coarse = [call for call in calls if call[1] == 4000]
+    fine = [call for call in calls if call[1] == 16000]
+    assert sorted(call[0] for call in coarse) == ["ref.mkv", "tgt.mkv"]
+    assert all(call[3] == 60.0 for call in coarse)
+    (ref_fine,) = [call for call in fine if call[0] == "ref.mkv"]
+    (tgt_fine,) = [call for call in fine if call[0] == "tgt.mkv"]
+    assert ref_fine[3] == 8.0
+    assert ref_fine[2] is not None and tgt_fine[2] is not None
+    assert tgt_fine[2] - ref_fine[2] == pytest.approx(1.2345 - 0.2, abs=0.06)
+
+
+def test_refined_lag_interpolates_between_frames() -> None:
+    times = np.arange(400, dtype=np.float64)
+    reference = np.exp(-0.5 * ((times - 200.0) / 3.0) ** 2)
+    target = np.exp(-0.5 * ((times - 207.3) / 3.0) ** 2)
+
+    lag, _peak = aa._refined_lag(reference, target, max_lag=20)
+
+    assert aa._cross_correlation(reference, target, max_lag=20)[0] == 7
+    assert lag == pytest.approx(7.3, abs=0.05)
+
+
+def test_update_offsets_file_records_offset_map(tmp_path: Path) -> None:
+    measurement = aa.AlignmentMeasurement(
+        file=tmp_path / "Target.mkv",
+        offset_seconds=1.25,
+        frames=30,
+        correlation=0.8,
+        reference_fps=24.0,
+        target_fps=24.0,
+        offset_map=[
+            aa.OffsetSegment(0.0, 600.0, 1.25, windows=4),
+            aa.OffsetSegment(600.0, 1200.0, 2.5, drift=0.0004, windows=5, model="linear"),
+        ],
+    )
+    offsets_path = tmp_path / "offsets.toml"
+
+    aa.update_offsets_file(offsets_path, "Ref.mkv", [measurement])
+
+    _reference, entries = aa.load_offsets(offsets_path)
+    entry = entries["Target.mkv"]
+    assert entry["drift_model"] == "piecewise"
+    assert entry["frames"] == 30
+    assert entry["offset_map"] == [
+        {
+            "start_seconds": 0.0,
+            "end_seconds": 600.0,
+            "offset_seconds": 1.25,
+            "drift": 0.0,
+            "windows": 4,
+            "model": "constant",
+        },
+        {
+            "start_seconds": 600.0,
+            "end_seconds": 1200.0,
+            "offset_seconds": 2.5,
+            "drift": pytest.approx(0.0004),
+            "windows": 5,
+            "model": "linear",
+        },
+    ]
+
+
+def test_measure_offsets_runs_targets_concurrently_in_order(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Targets decode on the worker pool while results keep the caller's ordering."""
+
+    reference = tmp_path / "ref.mkv"
+    targets = [tmp_path / f"tgt{idx}.mkv" for idx in range(3)]
+    shifts = {reference.name: 0, "tgt0.mkv": 5, "tgt1.mkv": -3, "tgt2.mkv": 8}
+    rng = np.random.default_rng(7)
+    base = rng.standard_normal(600).astype(np.float32)
+
+    both_started = threading.Barrier(2, timeout=5)
+    release_first = threading.Event()
+    lock = threading.Lock()
+    active = 0
+    peak_active = 0
+
+    def fake_envelope(path: Path, **_kwargs: object) -> "np.ndarray":
+        nonlocal active, peak_active
+        with lock:
+            active += 1
+            peak_active = max(peak_active, active)
+        try:
+            if path.name == "tgt0.mkv":
+                # Finish last so completion order differs from submission order.
+                release_first.wait(timeout=5)
+            elif path.name in {"tgt1.mkv", "tgt2.mkv"}:
+                both_started.wait()
+            shift = shifts[path.name]
+            return base[100 - shift : 500 - shift]
+        finally:
+            with lock:
+                active -= 1
+
+    progress: list[int] = []
+    progress_threads: set[str] = set()
+
+    def on_progress(count: int) -> None:
+        progress.append(count)
+        progress_threads.add(threading.current_thread().name)
+        if len(progress) == 2:
+            release_first.set()
+
+    monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
+    monkeypatch.setattr(aa, "_envelope_for", fake_envelope)
+
+    measurements = aa.measure_offsets(
+        reference,
+        targets,
+        sample_rate=100,
+        hop_length=1,
+        start_seconds=None,
+        duration_seconds=None,
+        progress_callback=on_progress,
+        fps_hints={path: 100.0 for path in [reference, *targets]},
+        max_offset_seconds=0.5,
+        max_workers=4,
+    )
+
+    assert [m.file for m in measurements] == targets
+    assert [m.frames for m in measurements] == [5, -3, 8]
+    assert progress == [1, 1, 1]
+    assert progress_threads == {threading.current_thread().name}
+    assert peak_active >= 2
+
+
+class _FakePcmProcess:
+    def __init__(self, payload: bytes, returncode: int = 0) -> None:
+        self.stdout = io.BufferedReader(io.BytesIO(payload), buffer_size=1024)  # type: ignore[arg-type]
+        self.returncode = returncode
+
+    def __enter__(self) -> "_FakePcmProcess":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stdout.close()
+
+    def wait(self) -> int:
+        return self.returncode
+
+
+def test_extract_audio_streams_pcm_without_temp_files(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """ffmpeg's f32le stdout is read straight into a NumPy buffer that grows as needed."""
+
+    samples = np.linspace(-1.0, 1.0, 3 * 100 + 17, dtype=np.float32)
+    captured: dict[str, list[str]] = {}
+
+    def fake_open_process(argv: list[str], **_kwargs: object) -> _FakePcmProcess:
+        captured["argv"] = list(argv)
+        return _FakePcmProcess(samples.tobytes() + b"\x00\x00")
+
+    monkeypatch.setattr(aa._subproc, "open_process", fake_open_process)
+    monkeypatch.setattr(aa.tempfile, "NamedTemporaryFile", None)
+
+    # duration=1s at 100 Hz preallocates 200 samples, forcing one regrow.
+    result = aa._extract_audio(
+        tmp_path / "clip.mkv",
+        sample_rate=100,
+        start_seconds=2.5,
+        duration_seconds=1.0,
+        stream_index=3,
+    )
+
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, samples)
+    argv = captured["argv"]
+    assert argv[-5:] == ["-f", "f32le", "-acodec", "pcm_f32le", "pipe:1"]
+    assert argv[argv.index("-map") + 1] == "0:3"
+    assert argv[argv.index("-ar") + 1] == "100"
+
+
+def test_extract_audio_rejects_empty_stream(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(aa._subproc, "open_process", lambda *_args, **_kwargs: _FakePcmProcess(b""))
+
+    with pytest.raises(aa.AudioAlignmentError, match="No audio samples"):
+        aa._extract_audio(
+            tmp_path / "silent.mkv",
+            sample_rate=16000,
+            start_seconds=None,
+            duration_seconds=None,
+            stream_index=0,
+        )
+
+
+def test_measure_offsets_reuses_cached_envelopes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Re-aligning after adding one encode only extracts the new file."""
+
+    reference = tmp_path / "ref.mkv"
+    first = tmp_path / "a.mkv"
+    second = tmp_path / "b.mkv"
+    for path in (reference, first, second):
+        path.write_bytes(path.name.encode())
+    rng = np.random.default_rng(3)
+    base = rng.standard_normal(500).astype(np.float32)
+    shifts = {"ref.mkv": 0, "a.mkv": 4, "b.mkv": -6}
+    extracted: list[str] = []
+
+    def fake_extract(path: Path, **_kwargs: object) -> "np.ndarray":
+        extracted.append(path.name)
+        shift = shifts[path.name]
+        return base[100 - shift : 400 - shift]
+
+    monkeypatch.setattr(aa, "ensure_external_tools", lambda: None)
+    monkeypatch.setattr(aa, "_extract_audio", fake_extract)
+    monkeypatch.setattr(aa, "_onset_envelope", lambda samples, **_kwargs: (samples, 1))
+
+    def run(targets: list[Path]) -> list[int | None]:
+        cache = aa.EnvelopeCache(tmp_path)
+        measurements = aa.measure_offsets(
+            reference,
+            targets,
+            sample_rate=100,
+            hop_length=1,
+            start_seconds=0.0,
+            duration_seconds=3.0,
+            fps_hints={path: 100.0 for path in (reference, first, second)},
+            envelope_cache=cache,
+        )
+        return [m.frames for m in measurements]
+
+    assert run([first]) == [4]
+    assert sorted(extracted) == ["a.mkv", "ref.mkv"]
+
+    extracted.clear()
+    assert run([first, second]) == [4, -6]
+    assert extracted == ["b.mkv"]
+
+    extracted.clear()
+    first.write_bytes(b"re-encoded with a different size")
+    assert run([first, second]) == [4, -6]
+    assert extracted == ["a.mkv"]
+
+
+def test_envelope_cache_key_tracks_window_and_stream(tmp_path: Path) -> None:
+    clip = tmp_path / "clip.mkv"
+    clip.write_bytes(b"data")
+    params = {"stream_index": 1, "sample_rate": 16000, "hop_length": 160, "start_seconds": 0.0, "duration_seconds": None}
+    key = aa.EnvelopeCache.key_for(clip, **params)  # type: ignore[arg-type]
+
+    assert key == aa.EnvelopeCache.key_for(clip, **params)  # type: ignore[arg-type]
+    for field_name, value in (("stream_index", 2), ("hop_length", 512), ("duration_seconds", 30.0)):
+        assert key != aa.EnvelopeCache.key_for(clip, **{**params, field_name: value})  # type: ignore[arg-type]
+
+    cache = aa.EnvelopeCache(tmp_path)
+    envelope = np.linspace(0.0, 1.0, 9, dtype=np.float32)
+    cache.store(clip, key, envelope)
+    loaded = cache.load(clip, key)
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded, envelope)
+    assert (cache.hits, cache.misses, cache.writes) == (1, 0, 1)
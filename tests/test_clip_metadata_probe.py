@@ -7,6 +7,7 @@ import pytest
 
 from src.datatypes import RuntimeConfig
 from src.frame_compare import selection as selection_module
+from src.frame_compare.artifact_index import ARTIFACT_INDEX_FILENAME
 from src.frame_compare.cli_runtime import ClipPlan
 
 
@@ -154,10 +155,10 @@ def test_probe_clip_metadata_reuses_disk_cache(monkeypatch: pytest.MonkeyPatch,
 
     selection_module.probe_clip_metadata(plans, runtime, cache_dir)
     assert len(init_calls) == len(plans)
-    probe_cache_dir = cache_dir / "probe"
-    assert probe_cache_dir.exists()
-    cached_files = list(probe_cache_dir.iterdir())
-    assert cached_files
+    index_path = cache_dir / ARTIFACT_INDEX_FILENAME
+    assert index_path.exists()
+    assert not (cache_dir / "probe").exists()
+    assert all(plan.probe_cache_path == index_path.resolve() for plan in plans)
 
     fresh_plans = [
         _make_plan(tmp_path / "Reference.mkv", reference=True),
@@ -267,3 +268,93 @@ def test_init_clips_respects_force_reprobe_flag(monkeypatch: pytest.MonkeyPatch,
 
     selection_module.init_clips(plans, RuntimeConfig(ram_limit_mb=256, force_reprobe=True), cache_dir)
     assert len(init_calls) == len(plans) * 2
+
+
+def test_init_clips_defers_source_open_until_frame_access(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    clip_specs = {
+        "Reference.mkv": dict(width=1920, height=1080, fps_num=24000, fps_den=1001, num_frames=2400),
+        "TargetA.mkv": dict(width=1280, height=720, fps_num=24000, fps_den=1001, num_frames=3600),
+    }
+    init_calls: list[str] = []
+
+    def fake_init_clip(path: str, **kwargs: object) -> types.SimpleNamespace:
+        name = Path(path).name
+        init_calls.append(name)
+        sink = kwargs.get("frame_props_sink")
+        if callable(sink):
+            sink({"_Matrix": 1})
+        return types.SimpleNamespace(**clip_specs[name])
+
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", fake_init_clip)
+    runtime = RuntimeConfig(ram_limit_mb=256)
+    cache_dir = tmp_path / "cache"
+    selection_module.probe_clip_metadata(
+        [_make_plan(tmp_path / "Reference.mkv", reference=True), _make_plan(tmp_path / "TargetA.mkv")],
+        runtime,
+        cache_dir,
+    )
+    init_calls.clear()
+
+    plans = [_make_plan(tmp_path / "Reference.mkv", reference=True), _make_plan(tmp_path / "TargetA.mkv")]
+    caplog.set_level("INFO", logger=selection_module.__name__)
+    selection_module.probe_clip_metadata(plans, runtime, cache_dir)
+    selection_module.init_clips(plans, runtime, cache_dir)
+
+    assert init_calls == []
+    assert "deferred=2" in caplog.text
+    reference, target = plans
+    assert isinstance(reference.clip, selection_module.vs_core.LazyClip)
+    assert isinstance(target.clip, selection_module.vs_core.LazyClip)
+    # Snapshot metadata answers geometry/length queries without opening the source.
+    assert reference.clip.num_frames == 2400
+    assert (target.clip.width, target.clip.height) == (1280, 720)
+    assert init_calls == []
+
+    assert selection_module.vs_core.resolve_clip(target.clip).num_frames == 3600
+    assert init_calls == ["TargetA.mkv"]
+    assert target.clip.is_open
+
+    caplog.clear()
+    selection_module.log_deferred_clip_summary(plans)
+    assert "Deferred clip summary: opened=1 skipped=1" in caplog.text
+
+
+def test_auto_source_mode_records_benchmark_winner(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(selection_module.vs_core, "get_source_preference", lambda: "auto")
+    monkeypatch.setattr(selection_module, "_AUTO_SOURCE_CHOICES", {})
+    benchmarks: list[str] = []
+
+    def fake_benchmark(path: str, **_kwargs: object) -> object:
+        benchmarks.append(Path(path).name)
+        return selection_module.vs_core.SourceBenchmark(winner="ffms2", timings={"ffms2": 0.1, "lsmas": 0.4})
+
+    plugins: list[object] = []
+
+    def fake_init_clip(path: str, **kwargs: object) -> types.SimpleNamespace:
+        plugins.append(kwargs.get("source_plugin"))
+        return types.SimpleNamespace(width=1920, height=1080, fps_num=24000, fps_den=1001, num_frames=240)
+
+    monkeypatch.setattr(selection_module.vs_core, "benchmark_source_plugins", fake_benchmark)
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", fake_init_clip)
+    runtime = RuntimeConfig(ram_limit_mb=256)
+    cache_dir = tmp_path / "cache"
+
+    plan = _make_plan(tmp_path / "Reference.ts", reference=True)
+    selection_module.probe_clip_metadata([plan], runtime, cache_dir)
+    assert benchmarks == ["Reference.ts"]
+    assert plugins == ["ffms2"]
+    assert plan.probe_snapshot is not None
+    assert plan.probe_snapshot.source_plugin == "ffms2"
+
+    # A later run reads the winner from the persisted snapshot instead of benchmarking.
+    monkeypatch.setattr(selection_module, "_AUTO_SOURCE_CHOICES", {})
+    fresh = _make_plan(tmp_path / "Reference.ts", reference=True)
+    selection_module.probe_clip_metadata([fresh], runtime, cache_dir)
+    fresh.clip = None
+    selection_module.init_clips([fresh], RuntimeConfig(ram_limit_mb=256, force_reprobe=True), cache_dir)
+    assert benchmarks == ["Reference.ts"]
+    assert plugins == ["ffms2", "ffms2"]
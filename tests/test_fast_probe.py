@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+from src.datatypes import AnalysisConfig, RuntimeConfig
+from src.frame_compare import selection as selection_module
+from src.frame_compare.cache import load_probe_snapshot
+from src.frame_compare.cli_runtime import ClipPlan
+from src.frame_compare.fast_probe import FastProbeResult, parse_ffprobe_payload, trimmed_frame_count
+
+
+@pytest.fixture(autouse=True)
+def _stub_vs_ram_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(selection_module.vs_core, "set_ram_limit", lambda *_args, **_kwargs: None)
+
+
+def _hdr_payload() -> dict[str, object]:
+    return {
+        "streams": [
+            {
+                "index": 0,
+                "codec_type": "video",
+                "width": 3840,
+                "height": 2160,
+                "r_frame_rate": "24000/1001",
+                "avg_frame_rate": "24000/1001",
+                "color_range": "tv",
+                "color_space": "bt2020nc",
+                "color_transfer": "smpte2084",
+                "color_primaries": "bt2020",
+                "chroma_location": "topleft",
+                "field_order": "progressive",
+                "sample_aspect_ratio": "1:1",
+                "tags": {"NUMBER_OF_FRAMES-eng": "34567", "DURATION-eng": "00:24:01.898000000"},
+                "side_data_list": [
+                    {
+                        "side_data_type": "DOVI configuration record",
+                        "dv_profile": 8,
+                        "dv_level": 6,
+                        "rpu_present_flag": 1,
+                        "el_present_flag": 0,
+                        "bl_present_flag": 1,
+                        "dv_bl_signal_compatibility_id": 1,
+                    }
+                ],
+            }
+        ],
+        "frames": [
+            {
+                "side_data_list": [
+                    {
+                        "side_data_type": "Mastering display metadata",
+                        "red_x": "34000/50000",
+                        "red_y": "16000/50000",
+                        "green_x": "13250/50000",
+                        "green_y": "34500/50000",
+                        "blue_x": "7500/50000",
+                        "blue_y": "3000/50000",
+                        "white_point_x": "15635/50000",
+                        "white_point_y": "16450/50000",
+                        "min_luminance": "50/10000",
+                        "max_luminance": "10000000/10000",
+                    },
+                    {"side_data_type": "Content light level metadata", "max_content": 1000, "max_average": 400},
+                ]
+            }
+        ],
+        "format": {"duration": "1441.898000"},
+    }
+
+
+def test_parse_ffprobe_payload_maps_hdr_and_dovi_props() -> None:
+    result = parse_ffprobe_payload(_hdr_payload())
+
+    assert result is not None
+    assert (result.width, result.height) == (3840, 2160)
+    assert result.fps == (24000, 1001)
+    assert result.num_frames == 34567
+    assert result.num_frames_exact is True
+    props = result.frame_props
+    assert props["_Matrix"] == 9
+    assert props["_Transfer"] == 16
+    assert props["_Primaries"] == 9
+    assert props["_ColorRange"] == 1
+    assert props["_ChromaLocation"] == 2
+    assert props["MasteringDisplayPrimariesX"] == pytest.approx([0.68, 0.265, 0.15])
+    assert props["MasteringDisplayMinLuminance"] == pytest.approx(0.005)
+    assert props["MasteringDisplayMaxLuminance"] == pytest.approx(1000.0)
+    assert props["ContentLightLevelMax"] == 1000
+    assert props["ContentLightLevelAverage"] == 400
+    assert props["DolbyVisionProfile"] == 8
+    assert props["DolbyVisionLevel"] == 6
+
+
+def test_parse_ffprobe_payload_estimates_frames_and_rejects_vfr() -> None:
+    payload = _hdr_payload()
+    stream = payload["streams"][0]  # type: ignore[index]
+    stream["tags"] = {}  # type: ignore[index]
+    estimated = parse_ffprobe_payload(payload)
+    assert estimated is not None
+    assert estimated.num_frames_exact is False
+    assert estimated.num_frames == round(1441.898 * 24000 / 1001)
+
+    stream["avg_frame_rate"] = "30000/1001"  # type: ignore[index]
+    assert parse_ffprobe_payload(payload) is None
+
+
+@pytest.mark.parametrize(
+    ("trim_start", "trim_end", "expected"),
+    [(0, None, 100), (10, None, 90), (-5, None, 105), (10, -10, 80), (0, 40, 40), (-5, 0, 105)],
+)
+def test_trimmed_frame_count_matches_slice_semantics(trim_start: int, trim_end: int | None, expected: int) -> None:
+    assert trimmed_frame_count(100, trim_start, trim_end) == expected
+
+
+def test_probe_uses_ffprobe_and_defers_indexing(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    ref_path = tmp_path / "Reference.mkv"
+    tgt_path = tmp_path / "Target.mkv"
+    for path in (ref_path, tgt_path):
+        path.write_bytes(b"\x00")
+    plans = [
+        ClipPlan(path=ref_path, metadata={"label": "ref"}, use_as_reference=True),
+        ClipPlan(path=tgt_path, metadata={"label": "tgt"}, trim_start=24),
+    ]
+
+    probe_results = {
+        "Reference.mkv": FastProbeResult(
+            width=1920, height=1080, fps=(24000, 1001), num_frames=2400, num_frames_exact=True,
+            frame_props={"_Matrix": 9, "_Transfer": 16},
+        ),
+        "Target.mkv": FastProbeResult(
+            width=1920, height=1080, fps=(25, 1), num_frames=2500, num_frames_exact=True,
+            frame_props={"_Matrix": 1},
+        ),
+    }
+
+    def fake_fast_probe(path: Path) -> FastProbeResult:
+        return probe_results[path.name]
+
+    monkeypatch.setattr(selection_module, "fast_probe_available", lambda: True)
+    monkeypatch.setattr(selection_module, "fast_probe_clip", fake_fast_probe)
+
+    release_index = threading.Event()
+    indexed: list[str] = []
+
+    def fake_index_clip(path: str, *, cache_dir: str | None = None) -> None:
+        release_index.wait(timeout=5)
+        indexed.append(Path(path).name)
+
+    init_calls: list[str] = []
+
+    def fake_init_clip(path: str, *, fps_map=None, frame_props_sink=None, **_kwargs: object) -> types.SimpleNamespace:
+        name = Path(path).name
+        init_calls.append(name)
+        if frame_props_sink is not None:
+            frame_props_sink({"_Matrix": 9, "_Transfer": 16, "_ChromaLocation": 2})
+        fps_num, fps_den = fps_map or (24000, 1001)
+        return types.SimpleNamespace(width=1920, height=1080, fps_num=fps_num, fps_den=fps_den, num_frames=2400)
+
+    monkeypatch.setattr(selection_module.vs_core, "index_clip", fake_index_clip)
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", fake_init_clip)
+
+    cache_dir = tmp_path / "cache"
+    runtime = RuntimeConfig(ram_limit_mb=512)
+    selection_module.probe_clip_metadata(plans, runtime, cache_dir)
+
+    assert init_calls == []
+    assert all(plan.clip is None for plan in plans)
+    reference, target = plans
+    assert reference.source_num_frames == 2400
+    assert target.source_num_frames == 2476
+    assert target.effective_fps == (24000, 1001)
+    assert target.source_fps == (25, 1)
+    assert reference.probe_snapshot is not None
+    assert reference.probe_snapshot.tonemap_prop_keys == ("_Matrix", "_Transfer")
+    assert reference.probe_cache_key is not None
+    persisted = load_probe_snapshot(cache_dir, reference.probe_cache_key)
+    assert persisted is not None and persisted.probe_backend == "ffprobe"
+
+    release_index.set()
+    assert selection_module.wait_for_background_indexing(timeout=5)
+    assert sorted(indexed) == ["Reference.mkv", "Target.mkv"]
+
+    selection_module.init_clips(plans, runtime, cache_dir)
+    assert init_calls == []
+    assert selection_module.vs_core.resolve_clip(reference.clip).num_frames == 2400
+    assert init_calls == ["Reference.mkv"]
+    assert reference.source_frame_props == {"_Matrix": 9, "_Transfer": 16, "_ChromaLocation": 2}
+    assert reference.probe_snapshot is not None
+    assert reference.probe_snapshot.probe_backend == "vapoursynth"
+
+
+def test_fast_probe_snapshots_seed_deferred_clips(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    ref_path = tmp_path / "Reference.mkv"
+    tgt_path = tmp_path / "Target.mkv"
+    for path in (ref_path, tgt_path):
+        path.write_bytes(b"\x00")
+    plans = [
+        ClipPlan(path=ref_path, metadata={"label": "ref"}, use_as_reference=True),
+        ClipPlan(path=tgt_path, metadata={"label": "tgt"}, trim_start=24),
+    ]
+    probe_results = {
+        "Reference.mkv": FastProbeResult(width=1920, height=1080, fps=(24000, 1001), num_frames=2400, num_frames_exact=True),
+        "Target.mkv": FastProbeResult(width=1280, height=720, fps=(25, 1), num_frames=2500, num_frames_exact=True),
+    }
+    monkeypatch.setattr(selection_module, "fast_probe_available", lambda: True)
+
+    def fake_fast_probe(path: Path) -> FastProbeResult:
+        return probe_results[path.name]
+
+    monkeypatch.setattr(selection_module, "fast_probe_clip", fake_fast_probe)
+    monkeypatch.setattr(selection_module, "_schedule_background_index", lambda path, cache_dir_str: False)
+    init_calls: list[str] = []
+
+    def fake_init_clip(path: str, **_kwargs: object) -> types.SimpleNamespace:
+        init_calls.append(Path(path).name)
+        return types.SimpleNamespace(width=1920, height=1080, fps_num=24000, fps_den=1001, num_frames=2400)
+
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", fake_init_clip)
+
+    runtime = RuntimeConfig(ram_limit_mb=512)
+    cache_dir = tmp_path / "cache"
+    selection_module.probe_clip_metadata(plans, runtime, cache_dir)
+    selection_module.init_clips(plans, runtime, cache_dir)
+    _specs, window, _collapsed = selection_module.resolve_selection_windows(plans, AnalysisConfig())
+
+    assert init_calls == []
+    reference, target = plans
+    assert isinstance(target.clip, selection_module.vs_core.LazyClip)
+    assert target.clip.num_frames == 2476
+    assert (target.clip.width, target.clip.height) == (1280, 720)
+    assert (target.clip.fps_num, target.clip.fps_den) == (24000, 1001)
+    assert window[1] <= 2476
+    assert isinstance(reference.clip, selection_module.vs_core.LazyClip)
+    assert not reference.clip.is_open
+
+
+def test_estimated_frame_counts_are_not_persisted_or_trusted(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    clip_path = tmp_path / "Only.mkv"
+    clip_path.write_bytes(b"\x00")
+    plan = ClipPlan(path=clip_path, metadata={"label": "only"}, use_as_reference=True)
+    estimate = FastProbeResult(width=1920, height=1080, fps=(24000, 1001), num_frames=2402, num_frames_exact=False)
+    monkeypatch.setattr(selection_module, "fast_probe_available", lambda: True)
+    monkeypatch.setattr(selection_module, "fast_probe_clip", lambda path: estimate)
+    indexed: list[str] = []
+
+    def fake_index_clip(path: str, *, cache_dir: str | None = None) -> None:
+        indexed.append(Path(path).name)
+
+    init_calls: list[str] = []
+
+    def fake_init_clip(path: str, **_kwargs: object) -> types.SimpleNamespace:
+        init_calls.append(Path(path).name)
+        return types.SimpleNamespace(width=1920, height=1080, fps_num=24000, fps_den=1001, num_frames=2400)
+
+    monkeypatch.setattr(selection_module.vs_core, "index_clip", fake_index_clip)
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", fake_init_clip)
+
+    runtime = RuntimeConfig(ram_limit_mb=512)
+    cache_dir = tmp_path / "cache"
+    selection_module.probe_clip_metadata([plan], runtime, cache_dir)
+
+    assert plan.source_num_frames == 2402
+    assert plan.probe_snapshot is not None and not plan.probe_snapshot.num_frames_exact
+    assert plan.probe_cache_key is not None
+    assert load_probe_snapshot(cache_dir, plan.probe_cache_key) is None
+    assert selection_module.wait_for_background_indexing(timeout=5)
+    assert indexed == ["Only.mkv"]
+
+    selection_module.init_clips([plan], runtime, cache_dir)
+    assert isinstance(plan.clip, selection_module.vs_core.LazyClip)
+    assert plan.clip.width == 1920
+    assert init_calls == []
+    assert plan.clip.num_frames == 2400
+    assert init_calls == ["Only.mkv"]
+    assert plan.source_num_frames == 2400
+    persisted = load_probe_snapshot(cache_dir, plan.probe_cache_key)
+    assert persisted is not None
+    assert (persisted.probe_backend, persisted.source_num_frames) == ("vapoursynth", 2400)
+
+
+def test_probe_falls_back_to_vapoursynth_when_ffprobe_fails(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    clip_path = tmp_path / "Only.mkv"
+    clip_path.write_bytes(b"\x00")
+    plan = ClipPlan(path=clip_path, metadata={"label": "only"}, use_as_reference=True)
+
+    monkeypatch.setattr(selection_module, "fast_probe_available", lambda: True)
+    monkeypatch.setattr(selection_module, "fast_probe_clip", lambda path: None)
+    scheduled: list[Path] = []
+    monkeypatch.setattr(
+        selection_module,
+        "_schedule_background_index",
+        lambda path, cache_dir_str: scheduled.append(path) or True,
+    )
+
+    def fake_init_clip(path: str, **_kwargs: object) -> types.SimpleNamespace:
+        return types.SimpleNamespace(width=640, height=360, fps_num=24, fps_den=1, num_frames=10)
+
+    monkeypatch.setattr(selection_module.vs_core, "init_clip", fake_init_clip)
+
+    selection_module.probe_clip_metadata([plan], RuntimeConfig(ram_limit_mb=512), tmp_path / "cache")
+
+    assert plan.clip is not None
+    assert plan.source_num_frames == 10
+    assert plan.probe_snapshot is not None
+    assert plan.probe_snapshot.probe_backend == "vapoursynth"
+    assert scheduled == []
@@ -6,7 +6,7 @@ from pathlib import Path
 from src.datatypes import ReportConfig
 from src.frame_compare.analysis import SelectionDetail
 from src.frame_compare.render.naming import SAFE_LABEL_META_KEY
-from src.frame_compare.report import generate_html_report
+from src.frame_compare.report import generate_html_report, update_report_slowpics_url
 
 
 def _touch(path: Path) -> None:
@@ -157,3 +157,30 @@ def test_generate_html_report_retains_duplicate_labels(tmp_path: Path) -> None:
     assert safe_labels == ["Dolby_Vision", "Dolby_Vision_2"]
     frame_files = payload["frames"][0]["files"]
     assert {entry["safe_label"] for entry in frame_files} == set(safe_labels)
+
+
+def test_update_report_slowpics_url_patches_generated_report(tmp_path: Path) -> None:
+    screen = tmp_path / "screens" / "7 - Encode A.png"
+    _touch(screen)
+    report_dir = tmp_path / "report"
+    index_path = generate_html_report(
+        report_dir=report_dir,
+        report_cfg=ReportConfig(enable=True, title="Pending </script> Upload"),
+        frames=[7],
+        selection_details={},
+        image_paths=[str(screen)],
+        plans=[{"label": "Encode A", "metadata": {}, "path": screen}],
+        metadata_title=None,
+        include_metadata="minimal",
+        slowpics_url=None,
+    )
+    before = json.loads((report_dir / "data.json").read_text(encoding="utf-8"))
+
+    update_report_slowpics_url(index_path, "https://slow.pics/c/late")
+
+    after = json.loads((report_dir / "data.json").read_text(encoding="utf-8"))
+    assert after == {**before, "slowpics_url": "https://slow.pics/c/late"}
+    html_text = index_path.read_text(encoding="utf-8")
+    assert '"slowpics_url":"https://slow.pics/c/late"' in html_text
+    assert "<title>Pending &lt;/script&gt; Upload</title>" in html_text
+    assert "Pending <\\/script> Upload" in html_text
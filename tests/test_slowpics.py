@@ -217,7 +217,10 @@ def test_session_bootstrap_single_shot(
             captured_adapter["pool_connections"] = pool_connections
             captured_adapter["pool_maxsize"] = pool_maxsize
 
-    monkeypatch.setattr(slowpics, "HTTPAdapter", DummyAdapter)
+        def close(self) -> None:
+            return None
+
+    monkeypatch.setattr(slowpics, "SharedHTTPAdapter", DummyAdapter)
     caplog.set_level(logging.INFO, logger="src.frame_compare.slowpics")
 
     responses = [
@@ -386,6 +389,33 @@ def test_progress_callback_invoked_per_image(tmp_path: Path, monkeypatch: pytest
     assert sum(calls) == len(files)
 
 
+def test_prepare_image_runs_before_each_upload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cfg = SlowpicsConfig(collection_name="Example")
+    files = [
+        _write_image(tmp_path, "10 - ClipA.png"),
+        _write_image(tmp_path, "10 - ClipB.png"),
+    ]
+    responses = [
+        FakeResponse(200),
+        FakeResponse(200, {"collectionUuid": "abc", "key": "def", "images": [["img1", "img2"]]}),
+        FakeResponse(200, text="OK"),
+        FakeResponse(200, text="OK"),
+    ]
+    _install_session(monkeypatch, responses)
+    prepared: list[Path] = []
+
+    slowpics.upload_comparison(
+        [str(path) for path in files],
+        tmp_path,
+        cfg,
+        prepare_image=prepared.append,
+        max_workers=1,
+    )
+
+    assert prepared == files
+    assert [instance.fields["file"][0] for instance in DummyEncoder.instances[1:]] == [path.name for path in files]
+
+
 def test_worker_sessions_reused_for_multiple_uploads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     cfg = SlowpicsConfig(collection_name="ReusePool")
     files = [
@@ -629,3 +659,101 @@ def test_missing_key_raises(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) ->
 
     with pytest.raises(slowpics.SlowpicsAPIError, match="Missing collection key in slow.pics response"):
         slowpics.upload_comparison([str(image)], tmp_path, cfg)
+
+
+def test_upload_journal_tolerates_torn_lines_and_detects_changed_screens(tmp_path: Path) -> None:
+    first = _write_image(tmp_path, "10 - A.png")
+    second = _write_image(tmp_path, "10 - B.png")
+    journal = slowpics.UploadJournal.create(
+        tmp_path,
+        collection_uuid="col",
+        canonical_url="https://slow.pics/c/key",
+        browser_id="browser",
+        collection_name="Name",
+        jobs=[(first, "img-a"), (second, "img-b")],
+    )
+    journal.mark_done(first)
+    with journal.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"done": "10 - B')
+
+    loaded = slowpics.UploadJournal.load(tmp_path)
+
+    assert loaded is not None
+    assert loaded.completed == {"10 - A.png"}
+    assert loaded.pending() == [(second, "img-b")]
+    assert loaded.matches([str(first), str(second)])
+    # Pending screenshots may still shrink (lossless recompression); uploaded ones may not change.
+    second.write_bytes(b"recompressed")
+    assert loaded.matches([str(first), str(second)])
+    first.write_bytes(b"re-rendered")
+    assert not loaded.matches([str(first), str(second)])
+    assert not loaded.matches([str(second)])
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_adaptive_concurrency_grows_while_throughput_improves_and_halves_on_throttle() -> None:
+    clock = _FakeClock()
+    controller = slowpics.AdaptiveConcurrency(2, maximum=4, clock=clock)
+
+    def _window(seconds: float, *, throttled: bool = False) -> None:
+        slots = controller.limit
+        for _ in range(slots):
+            assert controller.try_acquire(1_000) == 0.0
+        assert controller.try_acquire(1_000) is None
+        clock.now += seconds
+        for index in range(slots):
+            controller.release(1_000, throttled=throttled and index == 0)
+
+    _window(1.0)  # 2 KB/s beats the empty baseline
+    assert controller.limit == 3
+    _window(1.0)  # 3 KB/s
+    assert controller.limit == 4
+    _window(1.0)  # capped at maximum
+    assert controller.limit == 4
+    _window(1.0, throttled=True)
+    assert controller.limit == 2
+
+    stats = controller.stats()
+    assert (stats.peak_concurrency, stats.backoffs, stats.bytes_sent) == (4, 1, 13_000)
+    assert stats.mb_per_s == pytest.approx(13_000 / 4.0 / 1_000_000)
+
+
+def test_adaptive_concurrency_holds_when_throughput_stalls_and_paces_to_ceiling() -> None:
+    clock = _FakeClock()
+    controller = slowpics.AdaptiveConcurrency(1, maximum=8, clock=clock)
+    for seconds in (1.0, 1.0):
+        for _ in range(controller.limit):
+            controller.try_acquire(1_000)
+        clock.now += seconds
+        for _ in range(controller.limit):
+            controller.release(1_000)
+    # The second window moved 2 KB in 1 s; a third window no faster holds the limit.
+    assert controller.limit == 3
+    for _ in range(3):
+        controller.try_acquire(1_000)
+    clock.now += 1.5
+    for _ in range(3):
+        controller.release(1_000)
+    assert controller.limit == 3
+
+    paced = slowpics.AdaptiveConcurrency(3, maximum=3, adaptive=False, max_bytes_per_second=1_000, clock=clock)
+    assert [paced.try_acquire(500) for _ in range(3)] == [0.0, 0.5, 1.0]
+
+
+def test_explicit_worker_count_pins_upload_concurrency() -> None:
+    cfg = SlowpicsConfig(max_upload_concurrency=10)
+
+    pinned = slowpics._upload_concurrency(cfg, 2, default=3, jobs=20)
+    adaptive = slowpics._upload_concurrency(cfg, None, default=3, jobs=6)
+
+    assert (pinned.limit, pinned.maximum, pinned.adaptive) == (2, 2, False)
+    assert (adaptive.limit, adaptive.maximum, adaptive.adaptive) == (3, 6, True)
+    capped = slowpics._upload_concurrency(SlowpicsConfig(max_upload_concurrency=2), None, default=8, jobs=20)
+    assert (capped.limit, capped.maximum) == (2, 2)
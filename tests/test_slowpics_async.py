@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from src.datatypes import SlowpicsConfig
+from src.frame_compare import slowpics, slowpics_async
+from src.frame_compare.slowpics import SlowpicsAPIError
+from tools.slowpics_stub import SlowpicsStub
+
+
+def _write_screens(root: Path, frames: int, clips: int = 2, size: int = 200_000) -> List[Path]:
+    paths: List[Path] = []
+    for frame in range(frames):
+        for clip in range(clips):
+            path = root / f"{frame * 10} - Clip{clip}.png"
+            path.write_bytes(bytes([frame, clip]) * (size // 2 + frame))
+            paths.append(path)
+    return paths
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value: int) -> None:
+        with self._lock:
+            self.total += value
+
+
+def test_async_engine_streams_uploads_concurrently(tmp_path: Path) -> None:
+    screens = _write_screens(tmp_path, frames=4)
+    files = _Counter()
+    streamed = _Counter()
+
+    with SlowpicsStub(image_delay=0.05) as stub:
+        url = slowpics_async.upload_comparison_async(
+            [str(path) for path in screens],
+            tmp_path,
+            SlowpicsConfig(collection_name="Async Run"),
+            progress_callback=files,
+            byte_progress_callback=streamed,
+            max_workers=4,
+            base_url=stub.base_url,
+        )
+
+    assert url == "https://slow.pics/c/stubkey"
+    assert stub.bad_xsrf == 0
+    assert stub.collections[0]["collectionName"] == b"Async Run"
+    assert sorted(stub.images.values()) == sorted(path.read_bytes() for path in screens)
+    assert 1 < stub.peak_in_flight <= 4
+    assert files.total == len(screens)
+    assert streamed.total == sum(path.stat().st_size for path in screens)
+    assert (tmp_path / "Async_Run.url").read_text(encoding="utf-8").endswith("URL=https://slow.pics/c/stubkey\n")
+
+
+def test_async_engine_retries_throttled_uploads_and_rewinds_progress(tmp_path: Path) -> None:
+    screens = _write_screens(tmp_path, frames=1)
+    streamed = _Counter()
+
+    with SlowpicsStub() as stub:
+        stub.image_failures.extend([(503, None), (429, "0")])
+        slowpics_async.upload_comparison_async(
+            [str(path) for path in screens],
+            tmp_path,
+            SlowpicsConfig(create_url_shortcut=False),
+            byte_progress_callback=streamed,
+            max_workers=1,
+            base_url=stub.base_url,
+        )
+
+    assert stub.image_attempts == len(screens) + 2
+    assert len(stub.images) == len(screens)
+    assert streamed.total == sum(path.stat().st_size for path in screens)
+
+
+def test_async_engine_reports_adaptive_stats_and_backs_off_on_throttle(tmp_path: Path) -> None:
+    screens = _write_screens(tmp_path, frames=3, size=8192)
+    reported: List[slowpics.UploadStats] = []
+
+    with SlowpicsStub() as stub:
+        stub.image_failures.append((503, None))
+        slowpics_async.upload_comparison_async(
+            [str(path) for path in screens],
+            tmp_path,
+            SlowpicsConfig(create_url_shortcut=False, max_upload_concurrency=4),
+            stats_callback=reported.append,
+            base_url=stub.base_url,
+        )
+
+    (stats,) = reported
+    assert stats.adaptive is True
+    assert stats.backoffs == 1
+    assert stats.bytes_sent == sum(path.stat().st_size for path in screens)
+    assert 1 <= stats.concurrency <= stats.peak_concurrency <= 4
+    assert stub.peak_in_flight <= 4
+
+
+def test_async_engine_prepares_each_image_before_streaming_it(tmp_path: Path) -> None:
+    screens = _write_screens(tmp_path, frames=2, size=4096)
+    prepared: List[Path] = []
+
+    def _shrink(path: Path) -> None:
+        prepared.append(path)
+        path.write_bytes(path.read_bytes()[:1024])
+
+    with SlowpicsStub() as stub:
+        slowpics_async.upload_comparison_async(
+            [str(path) for path in screens],
+            tmp_path,
+            SlowpicsConfig(create_url_shortcut=False),
+            prepare_image=_shrink,
+            base_url=stub.base_url,
+        )
+
+    assert sorted(prepared) == sorted(screens)
+    assert sorted(stub.images.values()) == sorted(path.read_bytes() for path in screens)
+    assert all(len(body) == 1024 for body in stub.images.values())
+
+
+def test_async_engine_gives_up_after_retry_budget(tmp_path: Path) -> None:
+    screens = _write_screens(tmp_path, frames=1, clips=1, size=1024)
+
+    with SlowpicsStub() as stub:
+        stub.image_failures.extend([(502, None)] * 4)
+        with pytest.raises(SlowpicsAPIError, match="502"):
+            slowpics_async.upload_comparison_async(
+                [str(path) for path in screens],
+                tmp_path,
+                SlowpicsConfig(create_url_shortcut=False),
+                base_url=stub.base_url,
+            )
+
+    assert stub.image_attempts == 4
+
+
+def test_async_engine_resumes_interrupted_upload_into_same_collection(tmp_path: Path) -> None:
+    screens = _write_screens(tmp_path, frames=2, size=4096)
+    image_files = [str(path) for path in screens]
+    cfg = SlowpicsConfig(collection_name="Resume Me", create_url_shortcut=False)
+
+    with SlowpicsStub() as stub:
+        stub.image_failures.extend([None, None, *[(502, None)] * 4])
+        with pytest.raises(SlowpicsAPIError):
+            slowpics_async.upload_comparison_async(image_files, tmp_path, cfg, max_workers=1, base_url=stub.base_url)
+        journal = slowpics.UploadJournal.load(tmp_path)
+        assert journal is not None
+        assert len(journal.completed) == 2
+
+        url = slowpics_async.upload_comparison_async(
+            image_files, tmp_path, cfg, max_workers=1, base_url=stub.base_url, resume=True
+        )
+
+    assert url == "https://slow.pics/c/stubkey"
+    assert len(stub.collections) == 1
+    assert sorted(stub.images) == sorted(journal.images.values())
+    assert not (tmp_path / slowpics.UPLOAD_JOURNAL_NAME).exists()
+
+
+def test_multipart_body_length_matches_stream(tmp_path: Path) -> None:
+    image = tmp_path / "0 - A.png"
+    image.write_bytes(b"\x89PNG" * 50_000)
+    body = slowpics_async.MultipartBody(
+        [("collectionUuid", "c"), ("imageUuid", "i")],
+        ("file", image, "image/png"),
+        trailing_fields=[("browserId", "b")],
+    )
+
+    async def _collect() -> bytes:
+        return b"".join([chunk async for chunk in body])
+
+    assert len(asyncio.run(_collect())) == body.length
+
+
+def test_upload_comparison_dispatches_to_async_engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: dict[str, Any] = {}
+
+    def fake_async(image_files: List[str], screen_dir: Path, cfg: SlowpicsConfig, **kwargs: Any) -> str:
+        captured.update(kwargs, files=image_files)
+        return "https://slow.pics/c/async"
+
+    monkeypatch.setattr(slowpics_async, "upload_comparison_async", fake_async)
+
+    url = slowpics.upload_comparison(["0 - A.png"], tmp_path, SlowpicsConfig(upload_engine="async"), max_workers=6)
+
+    assert url == "https://slow.pics/c/async"
+    assert captured["files"] == ["0 - A.png"]
+    assert captured["max_workers"] == 6
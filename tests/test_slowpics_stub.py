@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.datatypes import SlowpicsConfig
+from src.frame_compare import slowpics
+from tools import bench_slowpics_upload as bench
+from tools.slowpics_stub import SlowpicsStub
+
+
+def _screens(root: Path, count: int, size: int) -> List[str]:
+    return bench.write_images(root, count=count, size_bytes=size)
+
+
+def test_threaded_engine_resends_full_body_after_server_error(tmp_path: Path) -> None:
+    screens = _screens(tmp_path, 2, 20_000)
+
+    with SlowpicsStub() as stub:
+        stub.image_failures.append((503, "0"))
+        url = slowpics.upload_comparison(
+            screens,
+            tmp_path,
+            SlowpicsConfig(create_url_shortcut=False),
+            max_workers=1,
+            base_url=stub.base_url,
+        )
+
+    assert url == "https://slow.pics/c/stubkey"
+    assert stub.image_attempts == len(screens) + 1
+    assert sorted(stub.images.values()) == sorted(Path(path).read_bytes() for path in screens)
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_engines_retry_unhinted_throttle_on_the_same_schedule(tmp_path: Path, engine: str) -> None:
+    screens = _screens(tmp_path, 2, 20_000)
+
+    with SlowpicsStub() as stub:
+        stub.image_failures.append((429, None))
+        started = time.perf_counter()
+        slowpics.upload_comparison(
+            screens,
+            tmp_path,
+            SlowpicsConfig(create_url_shortcut=False, upload_engine=engine),
+            max_workers=1,
+            base_url=stub.base_url,
+        )
+        elapsed = time.perf_counter() - started
+
+    # urllib3 retries the first failure immediately, so neither engine pauses the host.
+    assert stub.image_attempts == len(screens) + 1
+    assert elapsed < 0.5
+
+
+def test_stub_bandwidth_cap_is_shared_across_connections(tmp_path: Path) -> None:
+    screens = _screens(tmp_path, 4, 50_000)
+
+    with SlowpicsStub(bandwidth=400_000) as stub:
+        started = time.perf_counter()
+        slowpics.upload_comparison(
+            screens,
+            tmp_path,
+            SlowpicsConfig(create_url_shortcut=False),
+            max_workers=4,
+            base_url=stub.base_url,
+        )
+        elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.45
+    assert len(stub.image_latencies) == len(screens)
+
+
+def test_benchmark_reports_retries_and_latency_per_scenario(tmp_path: Path) -> None:
+    profile = bench.StubProfile(error_rate=0.5, error_statuses=(503,), retry_after="0", seed=3)
+
+    results = bench.run_benchmark(
+        engines=["threads", "async"],
+        concurrency_levels=["2", bench.ADAPTIVE],
+        image_sizes_mb=[0.01],
+        images=4,
+        profile=profile,
+        workdir=tmp_path,
+    )
+
+    assert [(row.engine, row.concurrency) for row in results] == [
+        ("threads", "2"),
+        ("threads", bench.ADAPTIVE),
+        ("async", "2"),
+        ("async", bench.ADAPTIVE),
+    ]
+    for row in results:
+        assert row.error is None
+        assert row.retries > 0
+        assert row.backoffs > 0
+        assert row.mb_per_s > 0
+        assert 0 < row.p50_ms <= row.p95_ms <= row.max_ms
+    assert results[0].final_concurrency == results[0].peak_concurrency == 2
+    table = bench.format_table(results)
+    assert table.count("\n") == len(results) + 1
@@ -1,6 +1,10 @@
 import asyncio
-from collections.abc import Iterator
-from typing import Dict, List
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, cast
 
 import click
 import httpx
@@ -12,6 +16,7 @@ from src.frame_compare import tmdb_workflow
 from src.tmdb import (
     MOVIE,
     TV,
+    TMDBCacheMissError,
     TMDBCandidate,
     TMDBConfig,
     TMDBResolution,
@@ -26,6 +31,7 @@ def clear_tmdb_cache() -> Iterator[None]:
     tmdb_module._CACHE.clear()
     yield
     tmdb_module._CACHE.configure(max_entries=original_max)
+    tmdb_module._CACHE.attach(None)
     tmdb_module._CACHE.clear()
 
 
@@ -414,6 +420,211 @@ def test_tmdb_backoff_and_cache(monkeypatch: pytest.MonkeyPatch) -> None:
     assert attempts["count"] == 1
 
 
+def _cache_test_handler(calls: List[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {
+                        "id": 77,
+                        "title": "Disk Cache",
+                        "release_date": "2021-01-01",
+                        "popularity": 4.0,
+                    }
+                ]
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _refusing_transport(refused: List[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        refused.append(request.url.path)
+        return httpx.Response(500, json={"status_code": 500})
+
+    return httpx.MockTransport(handler)
+
+
+def test_persistent_cache_serves_later_runs_and_offline_mode(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    calls: List[str] = []
+    refused: List[str] = []
+    cfg = TMDBConfig(api_key="token", cache_dir=str(tmp_path / "tmdb"))
+
+    first = asyncio.run(
+        resolve_tmdb("Disk.Cache.2021.mkv", config=cfg, http_transport=_cache_test_handler(calls))
+    )
+    assert first is not None and first.tmdb_id == "77"
+    assert calls[0] == "/3/search/movie"
+    first_calls = len(calls)
+
+    # A new process starts with an empty in-memory cache.
+    tmdb_module._CACHE.clear()
+    second = asyncio.run(
+        resolve_tmdb("Disk.Cache.2021.mkv", config=cfg, http_transport=_refusing_transport(refused))
+    )
+    assert second is not None and second.tmdb_id == "77"
+
+    # Offline mode ignores expiry and needs no API key; misses never hit the network.
+    real_time = time.time
+    monkeypatch.setattr(tmdb_module.time, "time", lambda: real_time() + 10 * 86400)
+    tmdb_module._CACHE.clear()
+    offline_cfg = replace(cfg, api_key="", offline=True)
+    third = asyncio.run(
+        resolve_tmdb("Disk.Cache.2021.mkv", config=offline_cfg, http_transport=_refusing_transport(refused))
+    )
+    assert third is not None and third.tmdb_id == "77"
+    assert refused == []
+    with pytest.raises(TMDBCacheMissError, match="offline"):
+        asyncio.run(
+            resolve_tmdb("Unseen.Title.1999.mkv", config=offline_cfg, http_transport=_refusing_transport(refused))
+        )
+
+    # Online lookups honour the TTL and refetch once the entry has expired.
+    tmdb_module._CACHE.clear()
+    asyncio.run(
+        resolve_tmdb("Disk.Cache.2021.mkv", config=cfg, http_transport=_cache_test_handler(calls))
+    )
+    assert len(calls) > first_calls
+    assert refused == []
+
+
+def test_persistent_cache_io_runs_off_the_event_loop(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    store_threads: Dict[str, List[int]] = {"load": [], "save": []}
+    original_load = tmdb_module._PersistentStore.load
+    original_save = tmdb_module._PersistentStore.save
+
+    def recording_load(self: object, *args: Any, **kwargs: Any) -> Any:
+        store_threads["load"].append(threading.get_ident())
+        return original_load(self, *args, **kwargs)
+
+    def recording_save(self: object, *args: Any, **kwargs: Any) -> None:
+        store_threads["save"].append(threading.get_ident())
+        original_save(self, *args, **kwargs)
+
+    monkeypatch.setattr(tmdb_module._PersistentStore, "load", recording_load)
+    monkeypatch.setattr(tmdb_module._PersistentStore, "save", recording_save)
+    calls: List[str] = []
+    cfg = TMDBConfig(api_key="token", cache_dir=str(tmp_path / "tmdb"))
+
+    async def _resolve() -> tuple[TMDBResolution | None, int]:
+        result = await resolve_tmdb("Disk.Cache.2021.mkv", config=cfg, http_transport=_cache_test_handler(calls))
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(_resolve())
+
+    assert result is not None and result.tmdb_id == "77"
+    assert store_threads["load"] and store_threads["save"]
+    assert loop_thread not in store_threads["load"] + store_threads["save"]
+
+
+def test_persistent_cache_evicts_beyond_max_entries(tmp_path: Path) -> None:
+    store = tmdb_module._PersistentStore(tmp_path)
+    tmdb_module._CACHE.configure(max_entries=2)
+    tmdb_module._CACHE.attach(store)
+
+    for name in ("a", "b", "c"):
+        tmdb_module._CACHE.set((f"/path/{name}", ()), {"id": name}, ttl_seconds=60)
+    tmdb_module._CACHE.clear()
+
+    assert tmdb_module._CACHE.get(("/path/a", ()), 60) is None
+    assert tmdb_module._CACHE.get(("/path/c", ()), 60) == {"id": "c"}
+    assert store.load(("/path/b", ()), 60) is not None
+
+
+def _async_mock_transport(
+    handler: Callable[[httpx.Request], Awaitable[httpx.Response]],
+) -> httpx.MockTransport:
+    # MockTransport awaits coroutine handlers under AsyncClient; the stubs only type sync ones.
+    return httpx.MockTransport(cast(Callable[[httpx.Request], httpx.Response], handler))
+
+
+def test_query_plans_run_concurrently_but_resolve_in_plan_order() -> None:
+    started: List[str] = []
+    in_flight = {"now": 0, "peak": 0}
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        started.append(f"{request.url.path}?{params.get('year') or params.get('first_air_date_year')}")
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            if request.url.path.endswith("/search/tv"):
+                # A later plan answers first with its own strong match; it must not win.
+                # Cache lookups yield to worker threads, so let every plan slot fill first.
+                for _ in range(1000):
+                    if in_flight["now"] >= tmdb_module._PLAN_CONCURRENCY:
+                        break
+                    await asyncio.sleep(0.001)
+                release.set()
+                return httpx.Response(
+                    200,
+                    json={"results": [{"id": 2, "name": "Race Title", "first_air_date": "2019-01-01"}]},
+                )
+            if params.get("year") == "2019":
+                await release.wait()
+                return httpx.Response(
+                    200,
+                    json={"results": [{"id": 1, "title": "Race Title", "release_date": "2019-01-01"}]},
+                )
+            # Lower-priority plans stay pending until the strong match cancels them.
+            await asyncio.Event().wait()
+            raise AssertionError("cancelled plan completed")
+        finally:
+            in_flight["now"] -= 1
+
+    cfg = TMDBConfig(api_key="token")
+    result = asyncio.run(
+        resolve_tmdb("Race.Title.2019.mkv", config=cfg, http_transport=_async_mock_transport(handler))
+    )
+
+    assert result is not None
+    assert (result.category, result.tmdb_id) == (MOVIE, "1")
+    assert started[0] == "/3/search/movie?2019"
+    assert in_flight["peak"] == tmdb_module._PLAN_CONCURRENCY
+    assert in_flight["now"] == 0
+
+
+def test_alias_titles_are_fetched_in_parallel() -> None:
+    in_flight = {"now": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/search/movie"):
+            return httpx.Response(
+                200,
+                json={
+                    "results": [
+                        {"id": idx, "title": f"Alias Probe {idx}", "release_date": "2015-01-01"}
+                        for idx in range(1, 4)
+                    ]
+                },
+            )
+        if path.endswith("/alternative_titles"):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            titles = [{"title": "Alias Probe"}] if path.startswith("/3/movie/2/") else []
+            return httpx.Response(200, json={"titles": titles})
+        return httpx.Response(200, json={"results": []})
+
+    cfg = TMDBConfig(api_key="token")
+    result = asyncio.run(
+        resolve_tmdb("Alias.Probe.2015.mkv", config=cfg, http_transport=_async_mock_transport(handler))
+    )
+
+    assert result is not None
+    assert result.tmdb_id == "2"
+    assert "alias" in result.candidate.reason
+    assert in_flight["peak"] == 3
+
+
 def test_prompt_manual_tmdb_sanitizes_titles(monkeypatch: MonkeyPatch) -> None:
     candidate = TMDBCandidate(
         category=MOVIE,
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Iterable, List
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from src import tmdb as tmdb_module
+from src.frame_compare.cli_entry import main
+from src.tmdb import MOVIE, TV, TMDBConfig, resolve_tmdb
+from src.tmdb_index import IndexedTitle, TitleIndex, TitleIndexError, build_title_index, open_title_index
+
+FIXTURES = Path(__file__).parent / "fixtures" / "tmdb"
+DUMPS = [FIXTURES / "movie_ids_01_15_2026.json", FIXTURES / "tv_series_ids_01_15_2026.json.gz"]
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> Path:
+    destination = tmp_path / "tmdb-titles.sqlite3"
+    build_title_index(DUMPS, destination)
+    return destination
+
+
+def _recording_transport(calls: List[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/search/movie"):
+            return httpx.Response(
+                200,
+                json={
+                    "results": [
+                        {
+                            "id": 310131,
+                            "title": "The Witch",
+                            "release_date": "2015-01-27",
+                            "popularity": 28.7,
+                        }
+                    ]
+                },
+            )
+        return httpx.Response(200, json={"results": [], "titles": []})
+
+    return httpx.MockTransport(handler)
+
+
+def test_build_title_index_reads_plain_and_gzipped_dumps(tmp_path: Path) -> None:
+    stats = build_title_index(DUMPS, tmp_path / "index.sqlite3")
+
+    assert (stats.movies, stats.tv) == (5, 3)
+    # The adult entry and the non-Latin title (empty once normalised) are skipped;
+    # the malformed line never becomes a record.
+    assert stats.skipped == 2
+    assert not (tmp_path / "index.sqlite3.tmp").exists()
+
+
+def test_title_index_search_ranks_by_shared_grams(index_path: Path) -> None:
+    index = open_title_index(index_path)
+
+    hits = index.search(tmdb_module._normalized_variants("Matrix"))
+    assert [(hit.category, hit.tmdb_id) for hit in hits[:2]] == [(MOVIE, "603"), (MOVIE, "604")]
+    assert all(hit.tmdb_id != "999001" for hit in hits)
+
+    tv_hits = index.search(tmdb_module._normalized_variants("Breaking Bad"))
+    assert (tv_hits[0].category, tv_hits[0].tmdb_id, tv_hits[0].year) == (TV, "1396", None)
+
+    django = index.search(tmdb_module._normalized_variants("Django Unchained"))[0]
+    assert django.year == 2012
+
+
+def test_resolve_uses_index_without_network(index_path: Path) -> None:
+    calls: List[str] = []
+    cfg = TMDBConfig(api_key="", title_index=str(index_path))
+
+    result = asyncio.run(
+        resolve_tmdb("The.Matrix.1999.1080p.BluRay.mkv", config=cfg, http_transport=_recording_transport(calls))
+    )
+
+    assert result is not None
+    assert (result.category, result.tmdb_id, result.candidate.reason) == (MOVIE, "603", "title-index")
+    assert calls == []
+
+
+def test_resolve_searches_index_off_the_event_loop(index_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    search_threads: List[int] = []
+    original_search = TitleIndex.search
+
+    def recording_search(self: TitleIndex, query_norms: Iterable[str], *, limit: int = 20) -> List[IndexedTitle]:
+        search_threads.append(threading.get_ident())
+        return original_search(self, query_norms, limit=limit)
+
+    monkeypatch.setattr(TitleIndex, "search", recording_search)
+    cfg = TMDBConfig(api_key="", title_index=str(index_path))
+
+    async def _resolve() -> tuple[object, int]:
+        result = await resolve_tmdb("The.Matrix.1999.mkv", config=cfg, http_transport=_recording_transport([]))
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(_resolve())
+
+    assert result is not None
+    assert len(search_threads) == 1
+    assert search_threads[0] != loop_thread
+
+
+def test_resolve_falls_back_to_api_when_index_is_ambiguous(index_path: Path) -> None:
+    calls: List[str] = []
+    cfg = TMDBConfig(api_key="token", title_index=str(index_path))
+
+    result = asyncio.run(
+        resolve_tmdb("The.Witch.2015.mkv", config=cfg, http_transport=_recording_transport(calls))
+    )
+
+    assert result is not None
+    assert result.tmdb_id == "310131"
+    assert result.candidate.reason != "title-index"
+    assert calls and calls[0] == "/3/search/movie"
+
+
+def test_open_title_index_rejects_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(TitleIndexError, match="not found"):
+        open_title_index(tmp_path / "missing.sqlite3")
+
+
+def test_cli_build_index_reports_counts(tmp_path: Path) -> None:
+    destination = tmp_path / "out" / "titles.sqlite3"
+    result = CliRunner().invoke(
+        main,
+        ["tmdb", "build-index", *(str(path) for path in DUMPS), "--out", str(destination)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "movies=5 tv=3 skipped=2" in result.output
+    assert destination.is_file()
@@ -1,5 +1,5 @@
 import types
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 import pytest
 from pytest import MonkeyPatch
@@ -129,3 +129,45 @@ def test_metadata_includes_year_and_ids(monkeypatch: MonkeyPatch) -> None:
     assert meta["imdb_id"] == "tt7654321"
     assert meta["tvdb_id"] == ""
     assert meta["title"] == "Sample"
+
+
+def _count_parser_calls(monkeypatch: MonkeyPatch) -> List[str]:
+    calls: List[str] = []
+    original = utils._invoke_parser
+
+    def counting(parser: Callable[[str], Any], file_name: str) -> Optional[Dict[str, Any]]:
+        calls.append(file_name)
+        return original(parser, file_name)
+
+    monkeypatch.setattr(utils, "_invoke_parser", counting)
+    return calls
+
+
+def test_filename_parse_cache_survives_process_restart(monkeypatch: MonkeyPatch) -> None:
+    calls = _count_parser_calls(monkeypatch)
+    name = "Cache.Probe.S02E05.Episode.Title.1080p.WEB-DL-Team.mkv"
+
+    first = utils.cached_filename_parse("guessit", name)
+    assert first is not None and first["episode"] == 5
+    assert utils.cached_filename_parse("guessit", name) == first
+
+    utils._PARSE_CACHE.clear()  # a new run starts with an empty in-memory memo
+    assert utils.cached_filename_parse("guessit", name) == first
+    assert calls == [name]
+
+    meta = utils.parse_filename_metadata(name, prefer_guessit=True, always_full_filename=False)
+    assert meta["label"].startswith("[Team] Cache Probe S02E05")
+    assert calls == [name]
+
+
+def test_prime_filename_parses_uses_process_pool(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(utils, "_PARSE_POOL_MIN_FILES", 2)
+    names = [f"Pool.Batch.S01E{episode:02d}.720p.mkv" for episode in range(1, 4)]
+
+    assert utils.prime_filename_parses(names, max_workers=2) == 3
+    calls = _count_parser_calls(monkeypatch)
+
+    assert utils.prime_filename_parses(names, max_workers=2) == 0
+    episodes = [(utils.cached_filename_parse("guessit", name) or {}).get("episode") for name in names]
+    assert episodes == [1, 2, 3]
+    assert calls == []
@@ -1101,3 +1101,56 @@ def test_process_clip_rehydrates_mastering_metadata_from_plan(monkeypatch: Any)
 
     assert result.tonemap.applied is True
     assert result.tonemap.reason is None
+
+
+class _SeekBenchClip:
+    def __init__(self, clock: List[float], cost: float, num_frames: int = 500) -> None:
+        self._clock = clock
+        self._cost = cost
+        self.num_frames = num_frames
+        self.requested: List[int] = []
+
+    def get_frame(self, index: int) -> object:
+        self.requested.append(index)
+        self._clock[0] += self._cost
+        return object()
+
+
+def test_benchmark_source_plugins_picks_faster_plugin(monkeypatch: Any, tmp_path: Path) -> None:
+    clock = [0.0]
+    clips = {
+        "lsmas": _SeekBenchClip(clock, cost=0.05),
+        "ffms2": _SeekBenchClip(clock, cost=0.01),
+    }
+    cache_files: List[str] = []
+
+    def _source(plugin: str) -> Any:
+        def _open(path: str, cachefile: str) -> _SeekBenchClip:
+            cache_files.append(Path(cachefile).name)
+            return clips[plugin]
+
+        return _open
+
+    core = types.SimpleNamespace(
+        lsmas=types.SimpleNamespace(LWLibavSource=_source("lsmas")),
+        ffms2=types.SimpleNamespace(Source=_source("ffms2")),
+    )
+    monkeypatch.setattr(vs_source, "_benchmark_clock", lambda: clock[0])
+
+    result = vs_source.benchmark_source_plugins(str(tmp_path / "movie.ts"), cache_dir=tmp_path, core=core)
+
+    assert result.winner == "ffms2"
+    assert result.timings["lsmas"] == pytest.approx(0.3)
+    assert result.timings["ffms2"] == pytest.approx(0.06)
+    assert sorted(cache_files) == ["movie.ts.ffindex", "movie.ts.lwi"]
+    # Both plugins seek to the same seeded frames.
+    assert clips["lsmas"].requested == clips["ffms2"].requested
+    assert len(set(clips["lsmas"].requested)) == 6
+
+
+def test_build_source_order_honours_per_file_choice(monkeypatch: Any) -> None:
+    monkeypatch.setattr(vs_core.env, "_SOURCE_PREFERENCE", "auto")
+    assert vs_source._build_source_order() == ["lsmas", "ffms2"]
+    assert vs_source._build_source_order("ffms2") == ["ffms2", "lsmas"]
+    monkeypatch.setattr(vs_core.env, "_SOURCE_PREFERENCE", "ffms2")
+    assert vs_source._build_source_order() == ["ffms2", "lsmas"]
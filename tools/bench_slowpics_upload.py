@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Benchmark slow.pics upload throughput against the local stand-in server."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.datatypes import SlowpicsConfig  # noqa: E402
+from src.frame_compare import slowpics  # noqa: E402
+from tools.slowpics_stub import SlowpicsStub  # noqa: E402
+
+ADAPTIVE = "adaptive"
+
+
+@dataclasses.dataclass(frozen=True)
+class StubProfile:
+    """Network conditions the stand-in server simulates for every scenario."""
+
+    latency: float = 0.0
+    bandwidth_mbps: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: Sequence[int] = (429, 503)
+    retry_after: Optional[str] = None
+    seed: int = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchResult:
+    engine: str
+    concurrency: str
+    image_mb: float
+    images: int
+    seconds: float
+    mb_per_s: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    retries: int
+    backoffs: int
+    final_concurrency: int
+    peak_concurrency: int
+    error: Optional[str] = None
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def write_images(directory: Path, *, count: int, size_bytes: int, seed: int = 0) -> List[str]:
+    """Write *count* incompressible fake screenshots named like rendered frames."""
+
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: List[str] = []
+    for index in range(count):
+        path = directory / f"{(index // 2) * 10} - Clip{index % 2}.png"
+        path.write_bytes(rng.randbytes(size_bytes))
+        paths.append(str(path))
+    return paths
+
+
+def run_scenario(
+    image_files: Sequence[str],
+    screen_dir: Path,
+    *,
+    engine: str,
+    concurrency: str,
+    profile: StubProfile,
+    max_concurrency: int,
+) -> BenchResult:
+    """Upload *image_files* once to a fresh stand-in server and measure the run."""
+
+    adaptive = concurrency == ADAPTIVE
+    cfg = SlowpicsConfig(
+        collection_name="Benchmark",
+        create_url_shortcut=False,
+        upload_engine=engine,
+        adaptive_concurrency=adaptive,
+        max_upload_concurrency=max_concurrency,
+    )
+    stats: List[slowpics.UploadStats] = []
+    error: Optional[str] = None
+    sizes = [Path(path).stat().st_size for path in image_files]
+    with SlowpicsStub(
+        latency=profile.latency,
+        bandwidth=profile.bandwidth_mbps * 1_000_000 / 8,
+        error_rate=profile.error_rate,
+        error_statuses=profile.error_statuses,
+        retry_after=profile.retry_after,
+        seed=profile.seed,
+    ) as stub:
+        started = time.perf_counter()
+        try:
+            slowpics.upload_comparison(
+                list(image_files),
+                screen_dir,
+                cfg,
+                stats_callback=stats.append,
+                max_workers=None if adaptive else int(concurrency),
+                base_url=stub.base_url,
+            )
+        except slowpics.SlowpicsAPIError as exc:
+            error = str(exc)
+            (screen_dir / slowpics.UPLOAD_JOURNAL_NAME).unlink(missing_ok=True)
+        seconds = time.perf_counter() - started
+        latencies = [value * 1000 for value in stub.image_latencies.values()]
+        uploaded = sum(len(body) for body in stub.images.values())
+        attempts, stored = stub.image_attempts, len(stub.images)
+
+    final = stats[-1] if stats else None
+    return BenchResult(
+        engine=engine,
+        concurrency=concurrency,
+        image_mb=round(sizes[0] / 1_000_000, 3) if sizes else 0.0,
+        images=len(image_files),
+        seconds=round(seconds, 3),
+        mb_per_s=round(uploaded / 1_000_000 / seconds, 2) if seconds > 0 else 0.0,
+        p50_ms=round(_percentile(latencies, 0.5), 1),
+        p95_ms=round(_percentile(latencies, 0.95), 1),
+        max_ms=round(max(latencies, default=0.0), 1),
+        retries=attempts - stored,
+        backoffs=final.backoffs if final else 0,
+        final_concurrency=final.concurrency if final else 0,
+        peak_concurrency=final.peak_concurrency if final else 0,
+        error=error,
+    )
+
+
+def run_benchmark(
+    *,
+    engines: Sequence[str],
+    concurrency_levels: Sequence[str],
+    image_sizes_mb: Sequence[float],
+    images: int,
+    profile: StubProfile,
+    workdir: Path,
+) -> List[BenchResult]:
+    """Run every engine × image size × concurrency combination and collect the results."""
+
+    # Adaptive runs may grow up to the config default; pinned levels must fit under the ceiling too.
+    max_concurrency = max([12, *(int(level) for level in concurrency_levels if level != ADAPTIVE)])
+    results: List[BenchResult] = []
+    for size_mb in image_sizes_mb:
+        screen_dir = workdir / f"{size_mb:g}MB"
+        image_files = write_images(screen_dir, count=images, size_bytes=int(size_mb * 1_000_000), seed=profile.seed)
+        for engine in engines:
+            for level in concurrency_levels:
+                results.append(
+                    run_scenario(
+                        image_files,
+                        screen_dir,
+                        engine=engine,
+                        concurrency=level,
+                        profile=profile,
+                        max_concurrency=max_concurrency,
+                    )
+                )
+    return results
+
+
+def format_table(results: Sequence[BenchResult]) -> str:
+    header = "| engine | concurrency | image MB | images | s | MB/s | p50 ms | p95 ms | max ms | retries | backoffs | final/peak |"
+    lines = [header, "|" + "---|" * (header.count("|") - 1)]
+    for row in results:
+        cells = [
+            row.engine,
+            row.concurrency,
+            f"{row.image_mb:g}",
+            str(row.images),
+            f"{row.seconds:.2f}",
+            f"{row.mb_per_s:.2f}" if row.error is None else f"failed: {row.error}",
+            f"{row.p50_ms:.0f}",
+            f"{row.p95_ms:.0f}",
+            f"{row.max_ms:.0f}",
+            str(row.retries),
+            str(row.backoffs),
+            f"{row.final_concurrency}/{row.peak_concurrency}",
+        ]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _parse_levels(value: str) -> List[str]:
+    levels: List[str] = []
+    for item in value.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        if item != ADAPTIVE and (not item.isdigit() or int(item) < 1):
+            raise argparse.ArgumentTypeError(f"invalid concurrency level: {item!r}")
+        levels.append(item)
+    return levels
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--engine", default="threads", help="Comma-separated engines: threads, async.")
+    parser.add_argument(
+        "--concurrency",
+        type=_parse_levels,
+        default=_parse_levels("1,2,4,8,adaptive"),
+        help="Comma-separated worker counts and/or 'adaptive' (default: 1,2,4,8,adaptive).",
+    )
+    parser.add_argument("--sizes", default="1,4", help="Comma-separated image sizes in MB (default: 1,4).")
+    parser.add_argument("--images", type=int, default=24, help="Images per scenario (default: 24).")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every stub response.")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="Shared upload cap in Mbit/s (0 = off).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of image uploads answered with an error.")
+    parser.add_argument("--error-statuses", default="429,503", help="Statuses drawn for injected errors.")
+    parser.add_argument("--retry-after", default=None, help="Retry-After header sent with injected errors.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for image contents and error injection.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    profile = StubProfile(
+        latency=args.latency,
+        bandwidth_mbps=args.bandwidth_mbps,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(",") if status.strip()),
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory(prefix="slowpics-bench-") as workdir:
+        results = run_benchmark(
+            engines=[engine.strip() for engine in args.engine.split(",") if engine.strip()],
+            concurrency_levels=args.concurrency,
+            image_sizes_mb=[float(size) for size in args.sizes.split(",") if size.strip()],
+            images=args.images,
+            profile=profile,
+            workdir=Path(workdir),
+        )
+    print(format_table(results))
+    if args.json is not None:
+        payload: Dict[str, Any] = {
+            "profile": dataclasses.asdict(profile),
+            "results": [dataclasses.asdict(row) for row in results],
+        }
+        args.json.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return 1 if any(row.error for row in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
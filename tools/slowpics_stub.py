@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Local slow.pics stand-in for exercising and benchmarking the real upload engines over HTTP."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+XSRF_COOKIE = "stub%3Dtoken"
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+def _parse_multipart(content_type: str, body: bytes) -> Dict[str, bytes]:
+    boundary = content_type.split("boundary=", 1)[1].strip().encode("ascii")
+    fields: Dict[str, bytes] = {}
+    for part in body.split(b"--" + boundary):
+        if not part or part.startswith(b"--"):
+            continue
+        head, _, value = part.strip(b"\r\n").partition(b"\r\n\r\n")
+        for line in head.decode("utf-8").split("\r\n"):
+            if line.lower().startswith("content-disposition"):
+                name = line.split('name="', 1)[1].split('"', 1)[0]
+                fields[name] = value
+    return fields
+
+
+class SlowpicsStub:
+    """
+    Threaded HTTP server implementing the legacy slow.pics endpoints.
+
+    ``image_failures`` queues ``(status, retry_after)`` answers for the next image
+    upload attempts (``None`` lets that attempt through); once it is empty,
+    ``error_rate`` answers that share of image uploads with a status drawn from
+    ``error_statuses``. ``latency`` delays every response, ``image_delay`` holds each
+    image upload open so tests can observe concurrency, and ``bandwidth`` (bytes per
+    second, shared by all connections like a single uplink) paces request bodies.
+
+    ``image_latencies`` maps each stored image UUID to the seconds between its first
+    attempt arriving and its successful response, so retries count against it.
+    """
+
+    def __init__(
+        self,
+        *,
+        image_delay: float = 0.0,
+        latency: float = 0.0,
+        bandwidth: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (429, 503),
+        retry_after: Optional[str] = None,
+        seed: Optional[int] = None,
+        port: int = 0,
+    ) -> None:
+        self.image_delay = image_delay
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.image_failures: Deque[Optional[Tuple[int, Optional[str]]]] = deque()
+        self.collections: List[Dict[str, bytes]] = []
+        self.images: Dict[str, bytes] = {}
+        self.image_latencies: Dict[str, float] = {}
+        self.image_attempts = 0
+        self.injected_errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.bad_xsrf = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._first_attempt: Dict[str, float] = {}
+        self._link_free_at = 0.0
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - stdlib signature
+                return None
+
+            def _reply(self, status: int, body: bytes, headers: Dict[str, str] | None = None) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self, length: int) -> bytes:
+                chunks: List[bytes] = []
+                remaining = length
+                while remaining > 0:
+                    chunk = self.rfile.read(min(_READ_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        break
+                    stub._pace(len(chunk))
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+                return b"".join(chunks)
+
+            def do_GET(self) -> None:  # noqa: N802 - stdlib hook
+                if self.path == "/comparison":
+                    self._reply(200, b"<html></html>", {"Set-Cookie": f"XSRF-TOKEN={XSRF_COOKIE}; Path=/"})
+                else:
+                    self._reply(404, b"not found")
+
+            def do_POST(self) -> None:  # noqa: N802 - stdlib hook
+                started = time.monotonic()
+                body = self._read_body(int(self.headers.get("Content-Length", "0")))
+                if self.headers.get("X-XSRF-TOKEN") != unquote(XSRF_COOKIE):
+                    with stub._lock:
+                        stub.bad_xsrf += 1
+                    self._reply(403, b'{"error": "xsrf"}')
+                    return
+                fields = _parse_multipart(self.headers.get("Content-Type", ""), body)
+                if self.path == "/upload/comparison":
+                    self._create_collection(fields)
+                elif self.path == "/upload/image":
+                    self._upload_image(fields, started)
+                else:
+                    self._reply(404, b"not found")
+
+            def _create_collection(self, fields: Dict[str, bytes]) -> None:
+                counts: Dict[int, int] = {}
+                for name in fields:
+                    if name.startswith("comparisons[") and ".imageNames[" in name:
+                        index = int(name.split("[", 1)[1].split("]", 1)[0])
+                        counts[index] = counts.get(index, 0) + 1
+                images = [[uuid.uuid4().hex for _ in range(counts[idx])] for idx in sorted(counts)]
+                with stub._lock:
+                    stub.collections.append(fields)
+                payload = {"collectionUuid": uuid.uuid4().hex, "key": "stubkey", "images": images}
+                self._reply(200, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+            def _upload_image(self, fields: Dict[str, bytes], started: float) -> None:
+                if "imageUuid" not in fields or "file" not in fields:
+                    self._reply(400, b'{"error": "malformed upload"}')
+                    return
+                image_uuid = fields["imageUuid"].decode("ascii")
+                with stub._lock:
+                    stub.image_attempts += 1
+                    stub._first_attempt.setdefault(image_uuid, started)
+                    failure = stub._next_failure()
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    if stub.image_delay:
+                        time.sleep(stub.image_delay)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                if failure is not None:
+                    status, retry_after = failure
+                    self._reply(status, b"busy", {"Retry-After": retry_after} if retry_after else None)
+                    return
+                with stub._lock:
+                    stub.images[image_uuid] = fields["file"]
+                    stub.image_latencies[image_uuid] = time.monotonic() + stub.latency - stub._first_attempt[image_uuid]
+                self._reply(200, b"OK")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _next_failure(self) -> Optional[Tuple[int, Optional[str]]]:
+        """Pick the answer for an image upload attempt; callers hold ``_lock``."""
+
+        if self.image_failures:
+            return self.image_failures.popleft()
+        if self.error_rate and self.error_statuses and self._random.random() < self.error_rate:
+            self.injected_errors += 1
+            return self._random.choice(self.error_statuses), self.retry_after
+        return None
+
+    def _pace(self, nbytes: int) -> None:
+        """Hold the reading thread until the shared link has carried *nbytes*."""
+
+        if self.bandwidth <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._link_free_at = max(self._link_free_at, now) + nbytes / self.bandwidth
+            wait = self._link_free_at - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def __enter__(self) -> "SlowpicsStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local slow.pics stand-in until interrupted.")
+    parser.add_argument("--port", type=int, default=0, help="Port to bind on 127.0.0.1 (default: any free port).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="Shared upload cap in Mbit/s (0 = off).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of image uploads answered with an error.")
+    parser.add_argument(
+        "--error-statuses",
+        default="429,503",
+        help="Comma-separated statuses drawn for injected errors (default: 429,503).",
+    )
+    parser.add_argument("--retry-after", default=None, help="Retry-After header sent with injected errors.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for error injection.")
+    args = parser.parse_args(argv)
+
+    stub = SlowpicsStub(
+        latency=args.latency,
+        bandwidth=args.bandwidth_mbps * 1_000_000 / 8,
+        error_rate=args.error_rate,
+        error_statuses=[int(status) for status in args.error_statuses.split(",") if status.strip()],
+        retry_after=args.retry_after,
+        seed=args.seed,
+        port=args.port,
+    )
+    print(f"slow.pics stub listening on {stub.base_url}", flush=True)
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+    print(
+        f"collections={len(stub.collections)} images={len(stub.images)} "
+        f"attempts={stub.image_attempts} injected_errors={stub.injected_errors}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
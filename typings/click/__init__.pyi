@@ -130,6 +130,17 @@ class Choice:
     def __init__(self, choices: Any, case_sensitive: bool = ...) -> None: ...
 
 
+class IntRange:
+    def __init__(
+        self,
+        min: int | None = ...,
+        max: int | None = ...,
+        min_open: bool = ...,
+        max_open: bool = ...,
+        clamp: bool = ...,
+    ) -> None: ...
+
+
 class ClickException(Exception):
     message: str
     def __init__(self, message: str) -> None: ...
@@ -152,5 +163,6 @@ __all__ = [
     "Exit",
     "exceptions",
     "Choice",
+    "IntRange",
     "ClickException",
 ]
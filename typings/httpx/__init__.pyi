@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterator
 from typing import Any, Mapping, Protocol
 
 
@@ -16,9 +16,17 @@ class Request(Protocol):
 class Response:
     status_code: int
     text: str
+    content: bytes
     headers: Mapping[str, str]
 
-    def __init__(self, status_code: int, *, json: Any | None = ..., text: str | None = ...) -> None: ...
+    def __init__(
+        self,
+        status_code: int,
+        *,
+        json: Any | None = ...,
+        text: str | None = ...,
+        headers: Mapping[str, str] | None = ...,
+    ) -> None: ...
     def json(self) -> Any: ...
 
 
@@ -26,6 +34,15 @@ class BaseTransport(Protocol):
     async def handle_async_request(self, request: Request) -> Response: ...
 
 
+class AsyncBaseTransport:
+    async def handle_async_request(self, request: Request) -> Response: ...
+    async def aclose(self) -> None: ...
+
+
+class AsyncHTTPTransport(AsyncBaseTransport):
+    def __init__(self, *args: Any, **kwargs: Any) -> None: ...
+
+
 class Timeout:
     def __init__(self, *args: Any, **kwargs: Any) -> None: ...
 
@@ -36,6 +53,25 @@ class RequestError(Exception):
     def __init__(self, message: str = ..., *, request: Request | None = ...) -> None: ...
 
 
+class TransportError(RequestError): ...
+
+
+class Limits:
+    def __init__(
+        self,
+        *,
+        max_connections: int | None = ...,
+        max_keepalive_connections: int | None = ...,
+        keepalive_expiry: float | None = ...,
+    ) -> None: ...
+
+
+class Cookies:
+    def get(self, name: str, default: str | None = ...) -> str | None: ...
+    def set(self, name: str, value: str, domain: str = ..., path: str = ...) -> None: ...
+    def items(self) -> Iterator[tuple[str, str]]: ...
+
+
 class MockTransport(BaseTransport):
     def __init__(self, handler: Callable[[Request], Response]) -> None: ...
     async def handle_async_request(self, request: Request) -> Response: ...
@@ -43,7 +79,10 @@ class MockTransport(BaseTransport):
 
 
 class AsyncClient:
+    cookies: Cookies
+
     def __init__(self, *args: Any, **kwargs: Any) -> None: ...
+    async def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Response: ...
     async def get(self, url: str, *args: Any, **kwargs: Any) -> Response: ...
     async def post(self, url: str, *args: Any, **kwargs: Any) -> Response: ...
     async def aclose(self) -> None: ...
@@ -34,5 +34,9 @@ def approx(expected: Any, *args: Any, **kwargs: Any) -> Any: ...
 
 class LogCaptureFixture:
     def at_level(self, *args: Any, **kwargs: Any) -> ContextManager[Any]: ...
+    def set_level(self, level: int | str, logger: str | None = ...) -> None: ...
+    def clear(self) -> None: ...
     @property
     def messages(self) -> Sequence[str]: ...
+    @property
+    def text(self) -> str: ...
@@ -11,6 +11,10 @@ class HTTPError(RequestException):
     def __init__(self, message: str = ..., *, response: Response | None = ...) -> None: ...
 
 
+class Timeout(RequestException):
+    ...
+
+
 class Response:
     status_code: int
     text: str